@@ -71,6 +71,21 @@ DAILY_SYNC_TASKS: tuple[DailySyncTask, ...] = (
         group="factor_and_flow",
         script_path="backend/scripts/daily/sync_moneyflow_hsgt.py",
     ),
+    DailySyncTask(
+        task_id="build_forward_returns",
+        group="factor_and_flow",
+        script_path="backend/scripts/daily/build_forward_returns.py",
+    ),
+    DailySyncTask(
+        task_id="build_rolling_stats",
+        group="factor_and_flow",
+        script_path="backend/scripts/daily/build_rolling_stats.py",
+    ),
+    DailySyncTask(
+        task_id="build_market_breadth",
+        group="factor_and_flow",
+        script_path="backend/scripts/daily/build_market_breadth.py",
+    ),
     DailySyncTask(
         task_id="sync_income",
         group="financials_and_corporate",
@@ -1,24 +1,103 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 import json
 import logging
 import socket
+import threading
+import time
 from urllib import error as urllib_error
 from urllib import request as urllib_request
 
 from bson import ObjectId
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
 
 from app.core.config import settings
 from app.core.security import TokenDecodeError, safe_decode_access_token
 from app.data.mongo_users import get_user_by_id
+from app.services.api_audit_queue import enqueue_api_audit_log
 
 logger = logging.getLogger(__name__)
 
 _bearer_scheme = HTTPBearer(auto_error=False)
 
 
+class _VerifiedTokenCache:
+    """Successful auth-service verifications keyed by token hash.
+
+    An entry lives until the token's own ``exp`` claim or ``auth_verify_cache_seconds``,
+    whichever comes first, so revocations are picked up on that cadence. Failures are
+    never cached.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[float, dict[str, object]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> dict[str, object] | None:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.time():
+                self._entries.pop(key, None)
+                return None
+            return copy.deepcopy(user)
+
+    def put(self, token: str, user: dict[str, object]) -> None:
+        ttl_seconds = float(settings.auth_verify_cache_seconds)
+        if ttl_seconds <= 0:
+            return
+        now = time.time()
+        expires_at = now + ttl_seconds
+        token_exp = _unverified_token_expiry(token)
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        if expires_at <= now:
+            return
+        with self._lock:
+            if len(self._entries) >= max(int(settings.auth_verify_cache_max_entries), 1):
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                while len(self._entries) >= max(int(settings.auth_verify_cache_max_entries), 1):
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[self._key(token)] = (expires_at, copy.deepcopy(user))
+
+    def invalidate(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _unverified_token_expiry(token: str) -> float | None:
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except (JWTError, ValueError, AttributeError):
+        return None
+    try:
+        return float(exp) if exp is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+_verified_tokens = _VerifiedTokenCache()
+
+
+def invalidate_verified_token(token: str) -> None:
+    _verified_tokens.invalidate(token)
+
+
 def _get_user_from_access_token(token: str) -> dict[str, object]:
     try:
         payload = safe_decode_access_token(token)
@@ -59,6 +138,15 @@ def _build_personal_auth_user(payload: dict[str, object]) -> dict[str, object]:
 
 
 def _verify_with_personal_authenticator(token: str) -> dict[str, object]:
+    cached = _verified_tokens.get(token)
+    if cached is not None:
+        return cached
+    user = _request_personal_authenticator_verify(token)
+    _verified_tokens.put(token, user)
+    return user
+
+
+def _request_personal_authenticator_verify(token: str) -> dict[str, object]:
     verify_url = str(settings.auth_verify_url or "").strip()
     if not verify_url:
         raise RuntimeError("AUTH_VERIFY_URL is not configured")
@@ -128,8 +216,7 @@ def get_current_user(
 ) -> dict[str, object]:
     user = _get_user_from_credentials(credentials)
     try:
-        from app.data.mongo_api_audit import insert_api_audit_log
-        insert_api_audit_log(
+        enqueue_api_audit_log(
             user_id=str(user.get("_id") or ""),
             username=str(user.get("username") or ""),
             endpoint=request.url.path,
@@ -137,7 +224,7 @@ def get_current_user(
             status_code=200,
         )
     except Exception:
-        logger.debug("api audit log write failed", exc_info=True)
+        logger.debug("api audit log enqueue failed", exc_info=True)
     return user
 
 
@@ -54,6 +54,7 @@ def run_agent_freedom(
     trade_date: str | None = Query(default=None),
     strategy_version_id: str | None = Query(default=None),
     account_id: str = Query(default="main"),
+    bypass_ai_cache: bool = Query(default=False),
     current_user: dict[str, object] = Depends(require_admin_user),
 ) -> dict[str, Any]:
     del current_user
@@ -62,6 +63,7 @@ def run_agent_freedom(
             trade_date=trade_date,
             strategy_version_id=strategy_version_id,
             account_id=account_id,
+            bypass_ai_cache=bypass_ai_cache,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
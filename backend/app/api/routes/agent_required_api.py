@@ -25,6 +25,7 @@ from app.data.mongo_shenwan import (
 )
 from app.data.mongo_shenwan_daily import list_latest_trade_dates
 from app.data.mongo_shenwan_member import list_shenwan_members
+from app.data.partition_paths import partition_files, years_for_rows
 from app.services.indicator_fields_service import (
     list_indicator_fields,
     normalize_requested_indicators,
@@ -192,13 +193,13 @@ def _apply_adj(*, ts_code: str, items: list[dict[str, Any]], adj: str) -> list[d
         return items
 
     code = _normalize_ts_code(ts_code)
-    adj_root = settings.data_dir / "raw" / "adj_factor" / f"ts_code={code}"
-    if not adj_root.exists():
+    # qfq/hfq rebase on the max/min factor over the whole history, so every year is read.
+    adj_files = partition_files(settings.data_dir / "raw" / "adj_factor", code)
+    if not adj_files:
         return items
-    adj_glob = str(adj_root / "year=*" / "part-*.parquet")
     df = _safe_fetch_df(
         "SELECT trade_date, adj_factor FROM read_parquet(?, union_by_name=true) WHERE ts_code = ? ORDER BY trade_date",
-        [adj_glob, code],
+        [adj_files, code],
     )
     factors = {
         str(row["trade_date"]): float(row["adj_factor"])
@@ -334,16 +335,15 @@ def stock_daily(
         code = _normalize_ts_code(ts_code)
         start = _normalize_date(start_date)
         end = _normalize_date(end_date)
-        root = settings.data_dir / "raw" / "daily" / f"ts_code={code}"
-        if not root.exists():
+        part_files = partition_files(settings.data_dir / "raw" / "daily", code, start_date=start or None, end_date=end or None)
+        if not part_files:
             return _ok([])
-        part_glob = str(root / "year=*" / "part-*.parquet")
         query = [
             "SELECT ts_code, trade_date, open, high, low, close, pre_close, change, pct_chg, vol, amount",
             "FROM read_parquet(?, union_by_name=true)",
             "WHERE ts_code = ?",
         ]
-        params: list[Any] = [part_glob, code]
+        params: list[Any] = [part_files, code]
         if start:
             query.append("AND trade_date >= ?")
             params.append(start)
@@ -402,20 +402,21 @@ def stock_daily_recent(
 ) -> dict[str, Any]:
     try:
         code = _normalize_ts_code(ts_code)
-        root = settings.data_dir / "raw" / "daily" / f"ts_code={code}"
-        if not root.exists():
+        daily_root = settings.data_dir / "raw" / "daily"
+        all_files = partition_files(daily_root, code)
+        if not all_files:
             return _ok([])
-        part_glob = str(root / "year=*" / "part-*.parquet")
-        df = _safe_fetch_df(
-            """
+        query = """
             SELECT ts_code, trade_date, open, high, low, close, pre_close, change, pct_chg, vol, amount
             FROM read_parquet(?, union_by_name=true)
             WHERE ts_code = ?
             ORDER BY trade_date DESC
             LIMIT ?
-            """,
-            [part_glob, code, n],
-        )
+            """
+        part_files = partition_files(daily_root, code, latest_years=years_for_rows(n))
+        df = _safe_fetch_df(query, [part_files, code, n])
+        if len(df) < n and len(part_files) < len(all_files):
+            df = _safe_fetch_df(query, [all_files, code, n])
         items = _to_records(df)
         items.reverse()
         items = _apply_adj(ts_code=code, items=items, adj=adj)
@@ -482,17 +483,16 @@ def stock_daily_basic(
         code = _normalize_ts_code(ts_code)
         start = _normalize_date(start_date)
         end = _normalize_date(end_date)
-        root = settings.data_dir / "raw" / "daily_basic" / f"ts_code={code}"
-        if not root.exists():
+        part_files = partition_files(settings.data_dir / "raw" / "daily_basic", code, start_date=start or None, end_date=end or None)
+        if not part_files:
             return _ok([])
-        part_glob = str(root / "year=*" / "part-*.parquet")
         query = [
             "SELECT ts_code, trade_date, close, turnover_rate, turnover_rate_f, volume_ratio, pe, pe_ttm, pb, ps, ps_ttm,",
             "dv_ratio, dv_ttm, total_share, float_share, free_share, total_mv, circ_mv",
             "FROM read_parquet(?, union_by_name=true)",
             "WHERE ts_code = ?",
         ]
-        params: list[Any] = [part_glob, code]
+        params: list[Any] = [part_files, code]
         if start:
             query.append("AND trade_date >= ?")
             params.append(start)
@@ -592,8 +592,13 @@ def stock_indicators(
         requested = indicators if indicators is not None else fields
         selected_indicators, missing_indicators = normalize_requested_indicators(requested)
 
-        root = settings.data_dir / "features" / "indicators" / f"ts_code={code}"
-        if not root.exists():
+        part_files = partition_files(
+            settings.data_dir / "features" / "indicators",
+            code,
+            start_date=start or None,
+            end_date=end or None,
+        )
+        if not part_files:
             if format_value == "records":
                 return _ok([], total=0, indicators=selected_indicators, missing_indicators=missing_indicators)
             return _ok(
@@ -608,10 +613,9 @@ def stock_indicators(
                 missing_indicators=missing_indicators,
             )
 
-        part_glob = str(root / "year=*" / "part-*.parquet")
         selected_columns = ["ts_code", "trade_date", *selected_indicators]
         query = [f"SELECT {', '.join(selected_columns)} FROM read_parquet(?, union_by_name=true) WHERE ts_code = ?"]
-        params: list[Any] = [part_glob, code]
+        params: list[Any] = [part_files, code]
         if start:
             query.append("AND trade_date >= ?")
             params.append(start)
@@ -1053,16 +1057,15 @@ def stock_limit_prices(
         code = _normalize_ts_code(ts_code)
         start = _normalize_date(start_date)
         end = _normalize_date(end_date)
-        root = settings.data_dir / "raw" / "daily_limit" / f"ts_code={code}"
-        if not root.exists():
+        part_files = partition_files(settings.data_dir / "raw" / "daily_limit", code, start_date=start or None, end_date=end or None)
+        if not part_files:
             return _ok([])
-        part_glob = str(root / "year=*" / "part-*.parquet")
         query = [
             "SELECT ts_code, trade_date, pre_close, up_limit, down_limit",
             "FROM read_parquet(?, union_by_name=true)",
             "WHERE ts_code = ?",
         ]
-        params: list[Any] = [part_glob, code]
+        params: list[Any] = [part_files, code]
         if start:
             query.append("AND trade_date >= ?")
             params.append(start)
@@ -5,9 +5,9 @@ import socket
 from urllib import error as urllib_error
 from urllib import request as urllib_request
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
-from app.api.deps import _verify_with_personal_authenticator, get_current_user
+from app.api.deps import _verify_with_personal_authenticator, get_current_user, invalidate_verified_token
 from app.core.config import settings
 from app.data.mongo_users import serialize_user
 from app.schemas.auth import LoginRequest, LogoutRequest, MeResponse, RefreshRequest, TokenResponse
@@ -194,9 +194,12 @@ def refresh(payload: RefreshRequest, response: Response) -> TokenResponse:
 
 
 @router.post("/auth/logout")
-def logout(payload: LogoutRequest, response: Response) -> dict[str, bool]:
+def logout(payload: LogoutRequest, request: Request, response: Response) -> dict[str, bool]:
     del response
     _logout_with_personal_authenticator(payload.refresh_token)
+    scheme, _, access_token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and access_token.strip():
+        invalidate_verified_token(access_token.strip())
     return {"ok": True}
 
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
@@ -8,14 +8,17 @@ from pydantic import BaseModel, Field
 from app.api.stock_code import resolve_ts_code_input
 from app.api.deps import get_current_username
 from app.services.backtest_service import (
+    cancel_backtest_run,
     compare_backtests,
     create_backtest_run_meta,
     delete_backtest_run_meta,
+    enqueue_backtest_run,
     get_backtest_detail,
     get_backtest_drawdown,
     get_backtest_holdings_summary,
     get_backtest_nav,
     get_backtest_positions,
+    get_backtest_profile,
     get_backtest_signals,
     get_backtest_trades_by_code,
     get_backtest_trades,
@@ -33,10 +36,13 @@ class BacktestCreateRequest(BaseModel):
     run_type: str = Field(default="range")
     initial_capital: float = Field(default=1_000_000.0, gt=0)
     run_id: str | None = None
+    enqueue: bool = True
 
 
 class BacktestCompareRequest(BaseModel):
     run_ids: list[str] = Field(min_length=2, max_length=5)
+    max_points: int | None = Field(default=None, ge=10, le=20000)
+    downsample: Literal["minmax", "lttb"] = "minmax"
 
 
 @router.post("/backtests")
@@ -60,6 +66,8 @@ def create_backtest(
         if "not found" in detail:
             raise HTTPException(status_code=404, detail=detail) from exc
         raise HTTPException(status_code=400, detail=detail) from exc
+    if payload.enqueue:
+        item = enqueue_backtest_run(str(item.get("run_id") or "")) or item
     return item
 
 
@@ -91,8 +99,8 @@ def compare_backtest_items(payload: BacktestCompareRequest) -> dict[str, Any]:
     run_ids = [str(item).strip() for item in payload.run_ids if str(item).strip()]
     if len(run_ids) < 2 or len(run_ids) > 5:
         raise HTTPException(status_code=400, detail="run_ids length must be 2~5")
-    items = compare_backtests(run_ids)
-    return {"items": items, "total": len(items)}
+    result = compare_backtests(run_ids, max_points=payload.max_points, downsample=payload.downsample)
+    return {**result, "total": len(result["items"])}
 
 
 @router.get("/backtests/{run_id}")
@@ -114,6 +122,25 @@ def delete_backtest(run_id: str) -> dict[str, Any]:
     return {"run_id": run_id, "deleted": True}
 
 
+@router.post("/backtests/{run_id}/enqueue")
+def enqueue_backtest(run_id: str) -> dict[str, Any]:
+    try:
+        item = enqueue_backtest_run(run_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if not item:
+        raise HTTPException(status_code=404, detail="run not found")
+    return item
+
+
+@router.post("/backtests/{run_id}/cancel")
+def cancel_backtest(run_id: str) -> dict[str, Any]:
+    status = cancel_backtest_run(run_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="run not found")
+    return {"run_id": run_id, "status": status}
+
+
 @router.get("/backtests/{run_id}/nav")
 def get_backtest_nav_items(run_id: str) -> dict[str, Any]:
     run = get_backtest_detail(run_id)
@@ -132,6 +159,14 @@ def get_backtest_drawdown_items(run_id: str) -> dict[str, Any]:
     return {"run_id": run_id, "items": items, "total": len(items)}
 
 
+@router.get("/backtests/{run_id}/profile")
+def get_backtest_profile_item(run_id: str) -> dict[str, Any]:
+    profile = get_backtest_profile(run_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="run not found")
+    return {"run_id": run_id, "profile": profile}
+
+
 @router.get("/backtests/{run_id}/trades")
 def list_backtest_trade_items(
     run_id: str,
@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field, field_validator
 
 from app.core.cache import cache_delete_pattern
+from app.data.mongo_daily_stock_pattern_hits import set_daily_stock_pattern_hit_user_state
 from app.data.mongo_daily_stock_signals import update_stock_resonance_state
 from app.services.daily_stock_signals_service import (
     get_daily_stock_signal_by_type,
@@ -99,6 +100,13 @@ def update_resonance_state(payload: ResonanceStatePayload) -> dict[str, object]:
     if not success:
         raise HTTPException(status_code=404, detail="Stock not found in resonance group")
 
+    set_daily_stock_pattern_hit_user_state(
+        trade_date=payload.trade_date,
+        ts_code=payload.ts_code,
+        signal_side=payload.signal_side,
+        resonance_level=payload.resonance_level,
+        user_state=payload.user_state,
+    )
     cache_delete_pattern(f"signals:overview:{payload.trade_date}:*")
     cache_delete_pattern(f"signals:patterns:*:{payload.trade_date}")
 
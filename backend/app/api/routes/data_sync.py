@@ -3,10 +3,16 @@ from __future__ import annotations
 import datetime as dt
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from app.api.deps import require_admin_user
-from app.services.data_sync_service import get_calendar_status, get_missing_dates
+from app.services.data_sync_service import (
+    get_calendar_status,
+    get_missing_dates,
+    get_sync_job_logs,
+    stream_sync_job_logs,
+)
 
 router = APIRouter()
 
@@ -49,3 +55,41 @@ def get_data_sync_missing(
         return get_missing_dates(start_date=normalized_start, end_date=normalized_end)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/data-sync/jobs/{job_id}/logs")
+def get_data_sync_job_logs(
+    job_id: str,
+    offset: int = Query(default=0, ge=0),
+    line: int | None = Query(default=None, ge=0),
+    limit: int = Query(default=200_000, ge=1, le=1_000_000),
+    current_user: dict[str, object] = Depends(require_admin_user),
+) -> dict[str, Any]:
+    del current_user
+    try:
+        return get_sync_job_logs(job_id, offset=offset, limit=limit, line=line)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.get("/data-sync/jobs/{job_id}/logs/stream")
+def stream_data_sync_job_logs(
+    job_id: str,
+    offset: int = Query(default=0, ge=0),
+    line: int | None = Query(default=None, ge=0),
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+    current_user: dict[str, object] = Depends(require_admin_user),
+) -> StreamingResponse:
+    del current_user
+    # EventSource reconnects send the id of the last event, which is the next byte offset.
+    if last_event_id and last_event_id.isdigit():
+        offset, line = int(last_event_id), None
+    try:
+        events = stream_sync_job_logs(job_id, offset=offset, line=line)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
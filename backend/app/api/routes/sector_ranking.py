@@ -3,19 +3,18 @@ from __future__ import annotations
 from fastapi import APIRouter, Query
 
 from app.data.mongo_citic_daily import (
-    build_citic_avg_rankings,
     get_citic_level_member_totals,
     get_citic_daily_rankings,
     list_citic_trade_dates,
     list_latest_citic_trade_dates,
 )
 from app.data.mongo_shenwan_daily import (
-    build_avg_rankings,
     get_shenwan_level_member_totals,
     get_daily_rankings,
     list_latest_trade_dates,
     list_trade_dates,
 )
+from app.services.sector_ranking_service import get_avg_rankings, get_ranking_history
 
 router = APIRouter()
 
@@ -113,17 +112,9 @@ def get_sector_ranking_history(
         dates = list_latest_citic_trade_dates(limit=days, level=level)
     else:
         dates = list_latest_trade_dates(limit=days, level=level)
-    data = []
-    for trade_date in dates:
-        if source_value == "ci":
-            top, bottom, _total = get_citic_daily_rankings(
-                trade_date=trade_date, level=level, top_n=top_n, bottom_n=bottom_n
-            )
-        else:
-            top, bottom, _total = get_daily_rankings(
-                trade_date=trade_date, level=level, top_n=top_n, bottom_n=bottom_n
-            )
-        data.append({"trade_date": trade_date, "top": top, "bottom": bottom})
+    data = get_ranking_history(
+        source=source_value, trade_dates=dates, level=level, top_n=top_n, bottom_n=bottom_n
+    )
     return {"source": source_value, "level": level, "days": len(dates), "data": data}
 
 
@@ -138,14 +129,11 @@ def get_sector_ranking_avg(
     source_value = _normalize_source(source)
     if source_value == "ci":
         dates = list_latest_citic_trade_dates(limit=5, before_or_on=calc_date, level=level)
-        result = build_citic_avg_rankings(
-            trade_dates=dates, level=level, top_n=top_n, bottom_n=bottom_n
-        )
     else:
         dates = list_latest_trade_dates(limit=5, before_or_on=calc_date, level=level)
-        result = build_avg_rankings(
-            trade_dates=dates, level=level, top_n=top_n, bottom_n=bottom_n
-        )
+    result = get_avg_rankings(
+        source=source_value, trade_dates=dates, level=level, top_n=top_n, bottom_n=bottom_n
+    )
     return {
         "source": source_value,
         "calc_date": dates[0] if dates else None,
@@ -19,7 +19,7 @@ from app.data.mongo_groups import (
     update_stock_remark,
 )
 from app.data.mongo_stock import get_stock_by_code
-from app.services.stocks_service import get_latest_daily_changes, get_latest_daily_basic_for_codes, get_last_n_days_pct_chg, get_latest_stock_signals
+from app.services.batch_quote_service import get_batch_quotes, quotes_by_code
 
 router = APIRouter()
 
@@ -109,26 +109,10 @@ def list_group_stocks(group_id: str) -> dict[str, list[dict[str, object]]]:
         raise HTTPException(status_code=404, detail="Group not found")
     items = list_group_items(group_obj_id)
     codes = [item.get("ts_code") for item in items if item.get("ts_code")]
-    change_map = get_latest_daily_changes(codes)
-    basic_map = get_latest_daily_basic_for_codes(codes)
-    pct_map = get_last_n_days_pct_chg(codes, n=5)
-    signal_map = get_latest_stock_signals(codes)
+    quote_map = quotes_by_code(get_batch_quotes(codes))
     serialized = []
     for item in items:
-        change = change_map.get(item.get("ts_code"))
-        basic = basic_map.get(item.get("ts_code"))
-        pct_data = pct_map.get(item.get("ts_code"))
-        sig = signal_map.get(item.get("ts_code"))
-
-        # Compute 3-day and 5-day pct_chg from the 5-day query
-        pct_chg_3d = None
-        pct_chg_5d = None
-        if pct_data:
-            pct_chg_5d = pct_data.get("pct_chg_nd")
-            vals = [pct_data.get(f"pct_chg_{i}") for i in range(1, 4)]
-            if any(v is not None for v in vals):
-                pct_chg_3d = sum(v for v in vals if v is not None)
-
+        quote = quote_map.get(item.get("ts_code")) or {}
         serialized.append(
             {
                 "ts_code": item.get("ts_code"),
@@ -136,15 +120,19 @@ def list_group_stocks(group_id: str) -> dict[str, list[dict[str, object]]]:
                 "industry": item.get("industry"),
                 "market": item.get("market"),
                 "remark": item.get("remark", ""),
-                "latest_trade_date": change.get("trade_date") if change else None,
-                "latest_change": change.get("change") if change else None,
-                "latest_pct_chg": change.get("pct_chg") if change else None,
-                "pct_chg_3d": pct_chg_3d,
-                "pct_chg_5d": pct_chg_5d,
-                "total_mv": basic.get("total_mv") if basic else None,
-                "circ_mv": basic.get("circ_mv") if basic else None,
-                "latest_signal": sig.get("signal") if sig else None,
-                "latest_signal_date": sig.get("trading_date") if sig else None,
+                "latest_trade_date": quote.get("trade_date"),
+                "latest_close": quote.get("close"),
+                "latest_change": quote.get("change"),
+                "latest_pct_chg": quote.get("pct_chg_1d"),
+                "pct_chg_3d": quote.get("pct_chg_3d"),
+                "pct_chg_5d": quote.get("pct_chg_5d"),
+                "pct_chg_20d": quote.get("pct_chg_20d"),
+                "turnover_rate": quote.get("turnover_rate"),
+                "limit_status": quote.get("limit_status"),
+                "total_mv": quote.get("total_mv"),
+                "circ_mv": quote.get("circ_mv"),
+                "latest_signal": quote.get("latest_signal"),
+                "latest_signal_date": quote.get("latest_signal_date"),
             }
         )
     return {"items": serialized}
@@ -1,8 +1,10 @@
 import logging
 
 from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
 
-from app.api.stock_code import resolve_ts_code_input
+from app.api.stock_code import resolve_ts_code_input, resolve_ts_codes_input
+from app.services.batch_quote_service import MAX_BATCH_CODES, get_batch_quotes, quotes_to_columns
 from app.services.stocks_service import (
     get_adj_factor,
     get_daily,
@@ -18,6 +20,11 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+class BatchQuoteRequest(BaseModel):
+    ts_codes: list[str] = Field(min_length=1, max_length=MAX_BATCH_CODES)
+    include_signal: bool = True
+
+
 @router.get("/stocks")
 def list_stocks(
     page: int = Query(default=1, ge=1),
@@ -45,6 +52,19 @@ def list_stocks(
     return {"items": items, "total": total, "page": page, "page_size": page_size}
 
 
+@router.post("/stocks/quotes/batch")
+def batch_quotes(payload: BatchQuoteRequest) -> dict[str, object]:
+    """Latest close, 1/3/5/20-day returns, turnover, limit status and signal, one array per field."""
+    try:
+        codes = resolve_ts_codes_input(payload.ts_codes, strict=True)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if not codes:
+        raise HTTPException(status_code=400, detail="ts_codes is required")
+    quotes = get_batch_quotes(codes, include_signal=payload.include_signal)
+    return {"columns": quotes_to_columns(quotes), "total": len(quotes)}
+
+
 @router.get("/stocks/industries")
 def list_industries() -> dict[str, list[str]]:
     items = get_industries()
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
-from app.api.deps import get_current_username
+from app.api.deps import get_current_username, require_admin_user
+from app.services.factor_analysis_service import get_factor_analysis, submit_factor_analysis
 from app.services.strategy_service import (
     create_strategy,
     create_version,
@@ -40,6 +41,20 @@ class StrategyVersionCreateRequest(BaseModel):
     version: str | None = None
 
 
+class FactorAnalysisRequest(BaseModel):
+    strategy_key: str = Field(default="multifactor_v1", min_length=1, max_length=80)
+    start_date: str = Field(min_length=8, max_length=10)
+    end_date: str = Field(min_length=8, max_length=10)
+    score_direction: Literal["normal", "reverse"] = "normal"
+    horizons: list[int] = Field(default_factory=lambda: [1, 5, 10, 20], min_length=1)
+    basis: Literal["cc", "oo"] = "cc"
+    quantiles: int = Field(default=10, ge=2, le=50)
+    top_k: int = Field(default=100, ge=1, le=1000)
+    min_list_days: int = Field(default=120, ge=0)
+    min_amount: float = Field(default=25_000.0, ge=0)
+    params: dict[str, Any] = Field(default_factory=dict)
+
+
 @router.get("/strategies/engine")
 def list_engine_strategies() -> dict[str, Any]:
     items = list_available_engine_strategies()
@@ -151,3 +166,39 @@ def create_strategy_version(
             raise HTTPException(status_code=404, detail=detail) from exc
         raise HTTPException(status_code=400, detail=detail) from exc
     return item
+
+
+@router.post("/strategies/factor-analysis", status_code=202)
+def analyze_strategy_factor(
+    payload: FactorAnalysisRequest,
+    current_user: dict[str, object] = Depends(require_admin_user),
+) -> dict[str, Any]:
+    try:
+        return submit_factor_analysis(
+            created_by=str(current_user.get("username") or ""),
+            strategy_key=payload.strategy_key,
+            start_date=payload.start_date,
+            end_date=payload.end_date,
+            score_direction=payload.score_direction,
+            horizons=payload.horizons,
+            basis=payload.basis,
+            quantiles=payload.quantiles,
+            top_k=payload.top_k,
+            min_list_days=payload.min_list_days,
+            min_amount=payload.min_amount,
+            params=payload.params,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/strategies/factor-analysis/{job_id}")
+def get_strategy_factor_analysis(
+    job_id: str,
+    current_user: dict[str, object] = Depends(require_admin_user),
+) -> dict[str, Any]:
+    del current_user
+    job = get_factor_analysis(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="factor analysis job not found")
+    return job
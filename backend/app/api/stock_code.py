@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
 
+from app.data.mongo import get_collection
 from app.data.mongo_stock import get_ts_code_by_symbol
 
 _PREFIX_PATTERN = re.compile(r"^(SH|SZ|BJ)(\d{6})$", re.IGNORECASE)
@@ -22,11 +24,7 @@ def _infer_exchange(symbol: str) -> str | None:
     return None
 
 
-def resolve_ts_code_input(value: str, *, strict: bool = False) -> str:
-    text = str(value or "").strip().upper()
-    if not text:
-        raise ValueError("ts_code is required")
-
+def _resolve_text(text: str, value: str, *, strict: bool, lookup_symbol: Callable[[str], str | None]) -> str:
     if "." in text:
         return text
 
@@ -39,7 +37,7 @@ def resolve_ts_code_input(value: str, *, strict: bool = False) -> str:
         return f"{match.group(1)}.{match.group(2)}"
 
     if _SYMBOL_PATTERN.match(text):
-        mapped = get_ts_code_by_symbol(text)
+        mapped = lookup_symbol(text)
         if mapped:
             return str(mapped).strip().upper()
         inferred = _infer_exchange(text)
@@ -51,11 +49,24 @@ def resolve_ts_code_input(value: str, *, strict: bool = False) -> str:
     return text
 
 
-def resolve_ts_codes_input(values: list[str]) -> list[str]:
-    result: list[str] = []
-    for value in values:
-        code = resolve_ts_code_input(value, strict=False)
-        if code:
-            result.append(code)
-    return list(dict.fromkeys(result))
+def _ts_codes_by_symbol(symbols: list[str]) -> dict[str, str]:
+    if not symbols:
+        return {}
+    cursor = get_collection("stock_basic").find({"symbol": {"$in": symbols}}, {"_id": 0, "symbol": 1, "ts_code": 1})
+    return {str(row["symbol"]): str(row["ts_code"]) for row in cursor if row.get("symbol") and row.get("ts_code")}
+
 
+def resolve_ts_code_input(value: str, *, strict: bool = False) -> str:
+    text = str(value or "").strip().upper()
+    if not text:
+        raise ValueError("ts_code is required")
+    return _resolve_text(text, value, strict=strict, lookup_symbol=get_ts_code_by_symbol)
+
+
+def resolve_ts_codes_input(values: list[str], *, strict: bool = False) -> list[str]:
+    """Resolve many inputs at once: blank entries are skipped and bare symbols share one ``$in`` lookup."""
+    texts = [(str(value or "").strip().upper(), value) for value in values]
+    texts = [(text, value) for text, value in texts if text]
+    mapped = _ts_codes_by_symbol(sorted({text for text, _ in texts if _SYMBOL_PATTERN.match(text)}))
+    result = [_resolve_text(text, value, strict=strict, lookup_symbol=mapped.get) for text, value in texts]
+    return list(dict.fromkeys(result))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import datetime as dt
 from pathlib import Path
 
 from app.audit.models import DatasetConfig
@@ -12,7 +13,12 @@ def _normalize_date(value: object) -> str:
     return str(value or "").replace("-", "").strip()
 
 
-def _date_filter_sql(field_name: str, start_date: str | None, end_date: str | None) -> tuple[str, list[str]]:
+def _date_filter_sql(
+    field_name: str,
+    start_date: str | None,
+    end_date: str | None,
+    trade_dates: list[str] | None = None,
+) -> tuple[str, list[str]]:
     normalized = f"REPLACE(CAST({field_name} AS VARCHAR), '-', '')"
     clauses: list[str] = []
     params: list[str] = []
@@ -22,6 +28,10 @@ def _date_filter_sql(field_name: str, start_date: str | None, end_date: str | No
     if end_date:
         clauses.append(f"{normalized} <= ?")
         params.append(end_date)
+    if trade_dates is not None:
+        placeholders = ", ".join("?" for _ in trade_dates)
+        clauses.append(f"{normalized} IN ({placeholders})")
+        params.extend(trade_dates)
     if not clauses:
         return "", params
     return f"WHERE {' AND '.join(clauses)}", params
@@ -50,6 +60,16 @@ def _parquet_glob(location: str) -> str:
     return str(root / "ts_code=*/year=*/part-*.parquet")
 
 
+def _parquet_year_globs(location: str, trade_dates: list[str]) -> list[str]:
+    root = settings.data_dir / location
+    globs: list[str] = []
+    for year in sorted({item[:4] for item in trade_dates}):
+        if next(root.glob(f"ts_code=*/year={year}"), None) is None:
+            continue
+        globs.append(str(root / f"ts_code=*/year={year}/part-*.parquet"))
+    return globs
+
+
 def load_open_trade_dates(start_date: str | None = None, end_date: str | None = None, exchange: str = "SSE") -> list[str]:
     query: dict[str, object] = {"exchange": exchange, "is_open": {"$in": ["1", 1]}}
     date_query: dict[str, str] = {}
@@ -63,21 +83,57 @@ def load_open_trade_dates(start_date: str | None = None, end_date: str | None =
     return [_normalize_date(item.get("cal_date")) for item in cursor if item.get("cal_date")]
 
 
+def load_synced_trade_dates(tasks: list[str], *, since: dt.datetime) -> list[str]:
+    """Trade dates whose sync manifest (data_sync_date) was written after ``since``."""
+    if not tasks:
+        return []
+    values = get_collection("data_sync_date").distinct(
+        "trade_date",
+        {"task": {"$in": list(tasks)}, "completed_at": {"$gt": since}},
+    )
+    return sorted({_normalize_date(item) for item in values if _normalize_date(item)})
+
+
 def load_counts_by_date(
     config: DatasetConfig,
     *,
     count_mode: str = "auto",
     start_date: str | None = None,
     end_date: str | None = None,
+) -> dict[str, int]:
+    return _load_counts(config, count_mode=count_mode, start_date=start_date, end_date=end_date, trade_dates=None)
+
+
+def load_counts_for_dates(
+    config: DatasetConfig,
+    trade_dates: list[str],
+    *,
+    count_mode: str = "auto",
+) -> dict[str, int]:
+    """Rescan only ``trade_dates``; parquet datasets only open the matching year= partitions."""
+    normalized = sorted({_normalize_date(item) for item in trade_dates if _normalize_date(item)})
+    if not normalized:
+        return {}
+    return _load_counts(config, count_mode=count_mode, start_date=None, end_date=None, trade_dates=normalized)
+
+
+def _load_counts(
+    config: DatasetConfig,
+    *,
+    count_mode: str,
+    start_date: str | None,
+    end_date: str | None,
+    trade_dates: list[str] | None,
 ) -> dict[str, int]:
     if count_mode == "auto":
         count_mode = "distinct" if config.audit_mode == "date_and_coverage" else "rows"
+    kwargs = {"count_mode": count_mode, "start_date": start_date, "end_date": end_date, "trade_dates": trade_dates}
     if config.storage_type == "parquet":
-        return _load_parquet_counts_by_date(config, count_mode=count_mode, start_date=start_date, end_date=end_date)
+        return _load_parquet_counts_by_date(config, **kwargs)
     if config.storage_type == "duckdb":
-        return _load_duckdb_counts_by_date(config, count_mode=count_mode, start_date=start_date, end_date=end_date)
+        return _load_duckdb_counts_by_date(config, **kwargs)
     if config.storage_type == "mongo":
-        return _load_mongo_counts_by_date(config, count_mode=count_mode, start_date=start_date, end_date=end_date)
+        return _load_mongo_counts_by_date(config, **kwargs)
     raise ValueError(f"unsupported storage_type: {config.storage_type}")
 
 
@@ -87,13 +143,18 @@ def _load_parquet_counts_by_date(
     count_mode: str,
     start_date: str | None,
     end_date: str | None,
+    trade_dates: list[str] | None = None,
 ) -> dict[str, int]:
     root = settings.data_dir / config.location
     if not root.exists():
         return {}
-    glob = _parquet_glob(config.location)
+    sources: str | list[str] = _parquet_glob(config.location)
+    if trade_dates is not None:
+        sources = _parquet_year_globs(config.location, trade_dates)
+        if not sources:
+            return {}
     date_expr = f"REPLACE(CAST({config.date_field} AS VARCHAR), '-', '')"
-    where_sql, params = _date_filter_sql(config.date_field, start_date, end_date)
+    where_sql, params = _date_filter_sql(config.date_field, start_date, end_date, trade_dates)
     excluded_sql, excluded_params = _excluded_ts_code_filter_sql(config)
     if excluded_sql:
         connector = " AND " if where_sql else "WHERE "
@@ -110,7 +171,7 @@ def _load_parquet_counts_by_date(
         "GROUP BY 1 ORDER BY 1"
     )
     with get_connection(read_only=True) as con:
-        rows = con.execute(query, [glob, *params]).fetchall()
+        rows = con.execute(query, [sources, *params]).fetchall()
     return {str(trade_date): int(value) for trade_date, value in rows if trade_date}
 
 
@@ -120,9 +181,10 @@ def _load_duckdb_counts_by_date(
     count_mode: str,
     start_date: str | None,
     end_date: str | None,
+    trade_dates: list[str] | None = None,
 ) -> dict[str, int]:
     date_expr = f"REPLACE(CAST({config.date_field} AS VARCHAR), '-', '')"
-    where_sql, params = _date_filter_sql(config.date_field, start_date, end_date)
+    where_sql, params = _date_filter_sql(config.date_field, start_date, end_date, trade_dates)
     excluded_sql, excluded_params = _excluded_ts_code_filter_sql(config)
     if excluded_sql:
         connector = " AND " if where_sql else "WHERE "
@@ -149,14 +211,17 @@ def _load_mongo_counts_by_date(
     count_mode: str,
     start_date: str | None,
     end_date: str | None,
+    trade_dates: list[str] | None = None,
 ) -> dict[str, int]:
     collection = get_collection(config.location)
     match: dict[str, object] = {config.date_field: {"$exists": True, "$ne": None}}
-    date_query: dict[str, str] = {}
+    date_query: dict[str, object] = {}
     if start_date:
         date_query["$gte"] = start_date
     if end_date:
         date_query["$lte"] = end_date
+    if trade_dates is not None:
+        date_query["$in"] = list(trade_dates)
     if date_query:
         match[config.date_field] = {"$exists": True, "$ne": None, **date_query}
     if config.coverage_key and (config.baseline_excluded_ts_code_suffixes or config.baseline_excluded_ts_codes):
@@ -3,6 +3,7 @@ from __future__ import annotations
 from collections import Counter
 from typing import Any
 
+from app.audit.count_cache import AuditCountCache
 from app.audit.models import AuditRunResult
 from app.data.mongo_data_integrity_audit import upsert_data_integrity_audit_run
 from scripts.audit.run_data_integrity_audit import run_audit
@@ -61,7 +62,7 @@ def run_weekly_airflow_audit(
     scheduled_for: str,
 ) -> dict[str, Any]:
     run_id = _build_weekly_run_id(scheduled_for)
-    result = run_audit(run_id=run_id)
+    result = run_audit(run_id=run_id, count_cache=AuditCountCache())
     payload = build_airflow_audit_run_document(
         result=result,
         dag_id=dag_id,
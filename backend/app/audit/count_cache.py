@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Callable
+
+from app.audit.adapters import load_counts_by_date, load_counts_for_dates, load_synced_trade_dates
+from app.audit.models import DatasetConfig
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+FULL_REFRESH_DAYS = 7
+
+FullScan = Callable[..., dict[str, int]]
+DateScan = Callable[..., dict[str, int]]
+TouchedDates = Callable[..., list[str]]
+
+
+def _utcnow() -> dt.datetime:
+    return dt.datetime.now(dt.UTC)
+
+
+def build_cache_key(config: DatasetConfig, count_mode: str) -> str:
+    signature = json.dumps(
+        {
+            "storage_type": config.storage_type,
+            "location": config.location,
+            "date_field": config.date_field,
+            "coverage_key": config.coverage_key,
+            "count_mode": count_mode,
+            "excluded_suffixes": sorted(config.baseline_excluded_ts_code_suffixes),
+            "excluded_codes": sorted(config.baseline_excluded_ts_codes),
+        },
+        sort_keys=True,
+    )
+    digest = hashlib.sha1(signature.encode("utf-8")).hexdigest()[:12]
+    return f"{config.name}__{count_mode}__{digest}"
+
+
+def _filter_range(counts: dict[str, int], start_date: str | None, end_date: str | None) -> dict[str, int]:
+    return {
+        trade_date: value
+        for trade_date, value in counts.items()
+        if (not start_date or trade_date >= start_date) and (not end_date or trade_date <= end_date)
+    }
+
+
+class AuditCountCache:
+    """Persisted per-(dataset, trade_date) counts refreshed from the data_sync_date manifest.
+
+    A cold or expired entry triggers one full scan; afterwards only trade dates whose
+    manifest was written since the previous refresh are rescanned. Datasets without
+    ``sync_tasks`` are always scanned directly because nothing tells us what changed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        *,
+        full_scan: FullScan = load_counts_by_date,
+        date_scan: DateScan = load_counts_for_dates,
+        touched_dates: TouchedDates = load_synced_trade_dates,
+        full_refresh_days: int = FULL_REFRESH_DAYS,
+        clock: Callable[[], dt.datetime] = _utcnow,
+    ) -> None:
+        self._cache_dir = Path(cache_dir or settings.data_dir / "audit_cache")
+        self._full_scan = full_scan
+        self._date_scan = date_scan
+        self._touched_dates = touched_dates
+        self._full_refresh = dt.timedelta(days=full_refresh_days)
+        self._clock = clock
+
+    def load(
+        self,
+        config: DatasetConfig,
+        *,
+        count_mode: str,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> dict[str, int]:
+        if not config.sync_tasks:
+            return self._full_scan(config, count_mode=count_mode, start_date=start_date, end_date=end_date)
+
+        key = build_cache_key(config, count_mode)
+        refreshed_at = self._clock()
+        entry = self._read(key)
+        if entry is None or refreshed_at - entry["full_scan_at"] >= self._full_refresh:
+            counts = self._full_scan(config, count_mode=count_mode, start_date=None, end_date=None)
+            full_scan_at = refreshed_at
+            logger.info("audit count cache %s: full scan dates=%s", key, len(counts))
+        else:
+            counts = dict(entry["counts"])
+            full_scan_at = entry["full_scan_at"]
+            touched = self._touched_dates(list(config.sync_tasks), since=entry["refreshed_at"])
+            if touched:
+                rescanned = self._date_scan(config, touched, count_mode=count_mode)
+                for trade_date in touched:
+                    if trade_date in rescanned:
+                        counts[trade_date] = int(rescanned[trade_date])
+                    else:
+                        counts.pop(trade_date, None)
+            logger.info("audit count cache %s: rescanned dates=%s", key, len(touched))
+
+        self._write(key, counts=counts, refreshed_at=refreshed_at, full_scan_at=full_scan_at)
+        return _filter_range(counts, start_date, end_date)
+
+    def _path(self, key: str) -> Path:
+        return self._cache_dir / f"{key}.json"
+
+    def _read(self, key: str) -> dict | None:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            if payload.get("version") != CACHE_VERSION:
+                return None
+            return {
+                "counts": {str(k): int(v) for k, v in (payload.get("counts") or {}).items()},
+                "refreshed_at": dt.datetime.fromisoformat(payload["refreshed_at"]),
+                "full_scan_at": dt.datetime.fromisoformat(payload["full_scan_at"]),
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("audit count cache %s unreadable, rebuilding", key, exc_info=True)
+            return None
+
+    def _write(self, key: str, *, counts: dict[str, int], refreshed_at: dt.datetime, full_scan_at: dt.datetime) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": CACHE_VERSION,
+            "refreshed_at": refreshed_at.isoformat(),
+            "full_scan_at": full_scan_at.isoformat(),
+            "counts": dict(sorted(counts.items())),
+        }
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
@@ -26,6 +26,7 @@ class DatasetConfig:
     rowcount_reference_storage_type: StorageType | None = None
     rowcount_reference_location: str | None = None
     rowcount_reference_date_field: str | None = None
+    sync_tasks: list[str] = field(default_factory=list)
 
 
 @dataclass
@@ -29,6 +29,7 @@ def get_dataset_registry() -> OrderedDict[str, DatasetConfig]:
             date_field="trade_date",
             audit_mode="date_only",
             coverage_key="ts_code",
+            sync_tasks=["pull_daily"],
         ),
         DatasetConfig(
             name="daily_basic",
@@ -40,6 +41,7 @@ def get_dataset_registry() -> OrderedDict[str, DatasetConfig]:
             baseline_dataset="daily",
             baseline_excluded_ts_code_suffixes=[".BJ"],
             baseline_excluded_ts_codes=["600018.SH"],
+            sync_tasks=["pull_daily"],
         ),
         DatasetConfig(
             name="daily_limit",
@@ -51,6 +53,7 @@ def get_dataset_registry() -> OrderedDict[str, DatasetConfig]:
             baseline_dataset="daily",
             baseline_excluded_ts_code_suffixes=[".BJ"],
             baseline_excluded_ts_codes=["001914.SZ"],
+            sync_tasks=["pull_daily"],
         ),
         DatasetConfig(
             name="indicators",
@@ -60,6 +63,7 @@ def get_dataset_registry() -> OrderedDict[str, DatasetConfig]:
             audit_mode="date_and_coverage",
             coverage_key="ts_code",
             baseline_dataset="daily",
+            sync_tasks=["sync_stk_factor_pro"],
         ),
         DatasetConfig(
             name="adj_factor",
@@ -69,6 +73,7 @@ def get_dataset_registry() -> OrderedDict[str, DatasetConfig]:
             audit_mode="date_and_coverage",
             coverage_key="ts_code",
             baseline_dataset="daily",
+            sync_tasks=["pull_daily", "sync_adj_factor"],
         ),
         DatasetConfig(
             name="cyq_perf",
@@ -80,6 +85,7 @@ def get_dataset_registry() -> OrderedDict[str, DatasetConfig]:
             baseline_dataset="daily",
             baseline_excluded_ts_code_suffixes=[".BJ"],
             baseline_excluded_ts_codes=["300114.SZ", "600898.SH"],
+            sync_tasks=["sync_cyq_perf"],
         ),
         DatasetConfig(
             name="moneyflow_dc",
@@ -90,6 +96,7 @@ def get_dataset_registry() -> OrderedDict[str, DatasetConfig]:
             coverage_key="ts_code",
             baseline_dataset="daily",
             ignored_trade_dates=["20231122"],
+            sync_tasks=["sync_moneyflow_dc"],
         ),
         DatasetConfig(
             name="shenwan_daily",
@@ -97,6 +104,7 @@ def get_dataset_registry() -> OrderedDict[str, DatasetConfig]:
             location="shenwan_daily",
             date_field="trade_date",
             audit_mode="date_and_rowcount",
+            sync_tasks=["sync_shenwan_daily"],
         ),
         DatasetConfig(
             name="citic_daily",
@@ -104,6 +112,7 @@ def get_dataset_registry() -> OrderedDict[str, DatasetConfig]:
             location="citic_daily",
             date_field="trade_date",
             audit_mode="date_and_rowcount",
+            sync_tasks=["sync_zhishu_data"],
         ),
         DatasetConfig(
             name="market_index_dailybasic",
@@ -112,6 +121,7 @@ def get_dataset_registry() -> OrderedDict[str, DatasetConfig]:
             date_field="trade_date",
             audit_mode="date_and_rowcount",
             ignored_rowcount_trade_dates=["20100531"],
+            sync_tasks=["sync_zhishu_data"],
         ),
         DatasetConfig(
             name="index_factor_pro",
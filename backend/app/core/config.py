@@ -32,6 +32,22 @@ class Settings(BaseSettings):
     auth_logout_url: str = ""
     auth_verify_url: str = ""
     auth_verify_timeout_seconds: float = 5.0
+    auth_verify_cache_seconds: int = 60
+    auth_verify_cache_max_entries: int = 10000
+    api_audit_queue_max_size: int = 10000
+    api_audit_batch_size: int = 200
+    api_audit_flush_interval_seconds: float = 1.0
+    research_section_workers: int = 8
+    research_section_timeout_seconds: float = 10.0
+    factor_analysis_workers: int = 4
+    backtest_workers: int = 2
+    backtest_queue_poll_seconds: float = 2.0
+    backtest_job_stale_seconds: int = 600
+    backtest_job_max_attempts: int = 3
+    data_sync_log_poll_seconds: float = 0.5
+    data_sync_log_index_every: int = 1000
+    data_sync_log_heartbeat_seconds: float = 15.0
+    data_sync_status_check_seconds: float = 5.0
     auth_cookie_domain: str | None = None
     auth_cookie_secure: bool = False
     auth_cookie_samesite: str = "lax"
@@ -42,6 +58,7 @@ class Settings(BaseSettings):
     ai_runner_token: str = ""
     ai_runner_timeout_seconds: int = 90
     ai_runner_max_retries: int = 2
+    ai_runner_run_deadline_seconds: int = 300
 
     feishu_webhook_url: str | None = None
 
@@ -8,6 +8,7 @@ import pandas as pd
 import uuid
 
 from app.core.config import settings
+from app.data.partition_paths import partition_files, years_for_rows
 
 logger = logging.getLogger(__name__)
 
@@ -260,57 +261,66 @@ def upsert_daily_limit(df: pd.DataFrame) -> int:
     return df.shape[0]
 
 
+def _fetch_stock_rows(
+    root,
+    ts_code: str,
+    *,
+    full_query: str,
+    limited_query: str,
+    limit: int | None,
+) -> pd.DataFrame:
+    all_files = partition_files(root, ts_code)
+    if not all_files:
+        return pd.DataFrame()
+    with get_connection(read_only=True) as con:
+        if limit is None or limit <= 0:
+            return con.execute(full_query, [all_files, ts_code]).fetchdf()
+        files = partition_files(root, ts_code, latest_years=years_for_rows(limit))
+        rows = con.execute(limited_query, [files, ts_code, limit]).fetchdf()
+        if len(rows) < limit and len(files) < len(all_files):
+            rows = con.execute(limited_query, [all_files, ts_code, limit]).fetchdf()
+    return rows
+
+
 def has_stock_data(ts_code: str) -> bool:
     """Check if stock has any data in parquet files (daily, daily_basic, or daily_limit)."""
-    daily_root = settings.data_dir / "raw" / "daily" / f"ts_code={ts_code}"
-    if not daily_root.exists():
+    files = partition_files(settings.data_dir / "raw" / "daily", ts_code, latest_years=1)
+    if not files:
         return False
 
-    part_glob = str(daily_root / "year=*/part-*.parquet")
     query = "SELECT COUNT(*) as cnt FROM read_parquet(?) WHERE ts_code = ?"
     with get_connection(read_only=True) as con:
         try:
-            result = con.execute(query, [part_glob, ts_code]).fetchone()
+            result = con.execute(query, [files, ts_code]).fetchone()
             return result[0] > 0 if result else False
         except duckdb.CatalogException:
             return False
 
 
 def list_daily(ts_code: str, limit: int | None = None) -> list[dict[str, object]]:
-    daily_root = settings.data_dir / "raw" / "daily" / f"ts_code={ts_code}"
-    if not daily_root.exists():
-        return []
-
-    part_glob = str(daily_root / "year=*/part-*.parquet")
-    if limit is not None and limit > 0:
-        query = (
-            "SELECT ts_code, trade_date, open, high, low, close, vol, amount "
-            "FROM ("
-            "  SELECT ts_code, trade_date, open, high, low, close, vol, amount "
-            "  FROM read_parquet(?) WHERE ts_code = ? ORDER BY trade_date DESC LIMIT ?"
-            ") ORDER BY trade_date"
+    columns = "ts_code, trade_date, open, high, low, close, vol, amount"
+    try:
+        rows = _fetch_stock_rows(
+            settings.data_dir / "raw" / "daily",
+            ts_code,
+            full_query=f"SELECT {columns} FROM read_parquet(?) WHERE ts_code = ? ORDER BY trade_date",
+            limited_query=(
+                f"SELECT {columns} FROM ("
+                f"  SELECT {columns} FROM read_parquet(?) WHERE ts_code = ? ORDER BY trade_date DESC LIMIT ?"
+                ") ORDER BY trade_date"
+            ),
+            limit=limit,
         )
-        params = [part_glob, ts_code, limit]
-    else:
-        query = (
-            "SELECT ts_code, trade_date, open, high, low, close, vol, amount "
-            "FROM read_parquet(?) WHERE ts_code = ? ORDER BY trade_date"
-        )
-        params = [part_glob, ts_code]
-    with get_connection(read_only=True) as con:
-        try:
-            rows = con.execute(query, params).fetchdf()
-        except duckdb.CatalogException:
-            return []
+    except duckdb.CatalogException:
+        return []
     return rows.to_dict(orient="records")
 
 
 def list_daily_basic(ts_code: str) -> list[dict[str, object]]:
-    daily_basic_root = settings.data_dir / "raw" / "daily_basic" / f"ts_code={ts_code}"
-    if not daily_basic_root.exists():
+    files = partition_files(settings.data_dir / "raw" / "daily_basic", ts_code)
+    if not files:
         return []
 
-    part_glob = str(daily_basic_root / "year=*/part-*.parquet")
     query = (
         "SELECT ts_code, trade_date, close, turnover_rate, turnover_rate_f, "
         "volume_ratio, pe, pe_ttm, pb, ps, ps_ttm, dv_ratio, dv_ttm, "
@@ -319,85 +329,65 @@ def list_daily_basic(ts_code: str) -> list[dict[str, object]]:
     )
     with get_connection(read_only=True) as con:
         try:
-            rows = con.execute(query, [part_glob, ts_code]).fetchdf()
+            rows = con.execute(query, [files, ts_code]).fetchdf()
         except duckdb.CatalogException:
             return []
     return rows.to_dict(orient="records")
 
 
 def list_stk_limit(ts_code: str) -> list[dict[str, object]]:
-    daily_limit_root = settings.data_dir / "raw" / "daily_limit" / f"ts_code={ts_code}"
-    if not daily_limit_root.exists():
+    files = partition_files(settings.data_dir / "raw" / "daily_limit", ts_code)
+    if not files:
         return []
 
-    part_glob = str(daily_limit_root / "year=*/part-*.parquet")
     query = (
         "SELECT trade_date, ts_code, pre_close, up_limit, down_limit "
         "FROM read_parquet(?) WHERE ts_code = ? ORDER BY trade_date"
     )
     with get_connection(read_only=True) as con:
         try:
-            rows = con.execute(query, [part_glob, ts_code]).fetchdf()
+            rows = con.execute(query, [files, ts_code]).fetchdf()
         except duckdb.CatalogException:
             return []
     return rows.to_dict(orient="records")
 
 
 def list_adj_factor(ts_code: str, limit: int | None = None) -> list[dict[str, object]]:
-    adj_factor_root = settings.data_dir / "raw" / "adj_factor" / f"ts_code={ts_code}"
-    if not adj_factor_root.exists():
-        return []
-
-    part_glob = str(adj_factor_root / "year=*/part-*.parquet")
-    if limit is not None and limit > 0:
-        query = (
-            "SELECT ts_code, trade_date, adj_factor "
-            "FROM ("
-            "  SELECT ts_code, trade_date, adj_factor "
-            "  FROM read_parquet(?) WHERE ts_code = ? ORDER BY trade_date DESC LIMIT ?"
-            ") ORDER BY trade_date"
-        )
-        params = [part_glob, ts_code, limit]
-    else:
-        query = (
-            "SELECT ts_code, trade_date, adj_factor "
-            "FROM read_parquet(?) WHERE ts_code = ? ORDER BY trade_date"
+    columns = "ts_code, trade_date, adj_factor"
+    try:
+        rows = _fetch_stock_rows(
+            settings.data_dir / "raw" / "adj_factor",
+            ts_code,
+            full_query=f"SELECT {columns} FROM read_parquet(?) WHERE ts_code = ? ORDER BY trade_date",
+            limited_query=(
+                f"SELECT {columns} FROM ("
+                f"  SELECT {columns} FROM read_parquet(?) WHERE ts_code = ? ORDER BY trade_date DESC LIMIT ?"
+                ") ORDER BY trade_date"
+            ),
+            limit=limit,
         )
-        params = [part_glob, ts_code]
-    with get_connection(read_only=True) as con:
-        try:
-            rows = con.execute(query, params).fetchdf()
-        except duckdb.CatalogException:
-            return []
+    except duckdb.CatalogException:
+        return []
     return rows.to_dict(orient="records")
 
 
 def list_indicators(ts_code: str, limit: int | None = None) -> list[dict[str, object]]:
     """Get technical indicators for a stock."""
-    indicators_root = settings.data_dir / "features" / "indicators" / f"ts_code={ts_code}"
-    if not indicators_root.exists():
-        return []
-
-    part_glob = str(indicators_root / "year=*/part-*.parquet")
-    if limit is not None and limit > 0:
-        query = (
-            "SELECT * FROM ("
-            "  SELECT * FROM read_parquet(?, union_by_name = true) "
-            "  WHERE ts_code = ? ORDER BY trade_date DESC LIMIT ?"
-            ") ORDER BY trade_date"
+    try:
+        rows = _fetch_stock_rows(
+            settings.data_dir / "features" / "indicators",
+            ts_code,
+            full_query="SELECT * FROM read_parquet(?, union_by_name = true) WHERE ts_code = ? ORDER BY trade_date",
+            limited_query=(
+                "SELECT * FROM ("
+                "  SELECT * FROM read_parquet(?, union_by_name = true) "
+                "  WHERE ts_code = ? ORDER BY trade_date DESC LIMIT ?"
+                ") ORDER BY trade_date"
+            ),
+            limit=limit,
         )
-        params = [part_glob, ts_code, limit]
-    else:
-        query = (
-            "SELECT * FROM read_parquet(?, union_by_name = true) "
-            "WHERE ts_code = ? ORDER BY trade_date"
-        )
-        params = [part_glob, ts_code]
-    with get_connection(read_only=True) as con:
-        try:
-            rows = con.execute(query, params).fetchdf()
-        except duckdb.CatalogException:
-            return []
+    except duckdb.CatalogException:
+        return []
     return rows.to_dict(orient="records")
 
 
@@ -409,12 +399,8 @@ def list_latest_daily_changes(ts_codes: list[str]) -> dict[str, dict[str, object
     if not daily_root.exists():
         return {}
 
-    part_globs: list[str] = []
-    for code in ts_codes:
-        code_dir = daily_root / f"ts_code={code}"
-        if code_dir.exists():
-            part_globs.append(str(code_dir / "year=*/part-*.parquet"))
-    if not part_globs:
+    part_files = partition_files(daily_root, ts_codes, latest_years=1)
+    if not part_files:
         return {}
 
     query = f"""
@@ -436,7 +422,7 @@ def list_latest_daily_changes(ts_codes: list[str]) -> dict[str, dict[str, object
     """
     with get_connection(read_only=True) as con:
         try:
-            rows = con.execute(query, [part_globs]).fetchdf()
+            rows = con.execute(query, [part_files]).fetchdf()
         except (duckdb.CatalogException, duckdb.IOException):
             return {}
 
@@ -461,12 +447,8 @@ def list_latest_daily_basic(ts_codes: list[str]) -> dict[str, dict[str, object]]
     if not basic_root.exists():
         return {}
 
-    part_globs: list[str] = []
-    for code in ts_codes:
-        code_dir = basic_root / f"ts_code={code}"
-        if code_dir.exists():
-            part_globs.append(str(code_dir / "year=*/part-*.parquet"))
-    if not part_globs:
+    part_files = partition_files(basic_root, ts_codes, latest_years=1)
+    if not part_files:
         return {}
 
     query = f"""
@@ -484,7 +466,7 @@ def list_latest_daily_basic(ts_codes: list[str]) -> dict[str, dict[str, object]]
     """
     with get_connection(read_only=True) as con:
         try:
-            rows = con.execute(query, [part_globs]).fetchdf()
+            rows = con.execute(query, [part_files]).fetchdf()
         except (duckdb.CatalogException, duckdb.IOException):
             return {}
 
@@ -508,12 +490,8 @@ def list_latest_daily_prices(ts_codes: list[str]) -> dict[str, dict[str, object]
     if not daily_root.exists():
         return {}
 
-    part_globs: list[str] = []
-    for code in ts_codes:
-        code_dir = daily_root / f"ts_code={code}"
-        if code_dir.exists():
-            part_globs.append(str(code_dir / "year=*/part-*.parquet"))
-    if not part_globs:
+    part_files = partition_files(daily_root, ts_codes, latest_years=1)
+    if not part_files:
         return {}
 
     query = """
@@ -535,7 +513,7 @@ def list_latest_daily_prices(ts_codes: list[str]) -> dict[str, dict[str, object]
     """
     with get_connection(read_only=True) as con:
         try:
-            rows = con.execute(query, [part_globs]).fetchdf()
+            rows = con.execute(query, [part_files]).fetchdf()
         except (duckdb.CatalogException, duckdb.IOException):
             return {}
 
@@ -557,10 +535,19 @@ def list_latest_daily_prices(ts_codes: list[str]) -> dict[str, dict[str, object]
     return result
 
 
+def compound_pct_chg_sql(days: int) -> str:
+    """Aggregate compounding ``pct_chg`` over rows with ``rn <= days`` (percent); null with fewer rows."""
+    days = int(days)
+    return (
+        f"CASE WHEN COUNT(pct_chg) FILTER (WHERE rn <= {days}) = {days} "
+        f"THEN (EXP(SUM(LN(GREATEST(1 + pct_chg / 100, 1e-9))) FILTER (WHERE rn <= {days})) - 1) * 100 END"
+    )
+
+
 def list_last_n_days_pct_chg(
     ts_codes: list[str], n: int = 3
 ) -> dict[str, dict[str, object]]:
-    """近 N 个交易日涨跌幅合计，key 为 ts_code，value 含 pct_chg_3d（或 pct_chg_nd）。"""
+    """近 N 个交易日复利累计涨跌幅，key 为 ts_code，value 含 pct_chg_nd（不足 N 个交易日为 None）。"""
     if not ts_codes or n < 1:
         return {}
 
@@ -568,15 +555,11 @@ def list_last_n_days_pct_chg(
     if not daily_root.exists():
         return {}
 
-    part_globs: list[str] = []
-    for code in ts_codes:
-        code_dir = daily_root / f"ts_code={code}"
-        if code_dir.exists():
-            part_globs.append(str(code_dir / "year=*/part-*.parquet"))
-    if not part_globs:
+    part_files = partition_files(daily_root, ts_codes)
+    if not part_files:
         return {}
 
-    query = """
+    query = f"""
         SELECT ts_code,
                MAX(CASE WHEN rn = 1 THEN pct_chg END) AS pct_chg_1,
                MAX(CASE WHEN rn = 2 THEN pct_chg END) AS pct_chg_2,
@@ -588,7 +571,7 @@ def list_last_n_days_pct_chg(
                MAX(CASE WHEN rn = 3 THEN trade_date END) AS trade_date_3,
                MAX(CASE WHEN rn = 4 THEN trade_date END) AS trade_date_4,
                MAX(CASE WHEN rn = 5 THEN trade_date END) AS trade_date_5,
-               SUM(pct_chg) AS pct_chg_nd
+               {compound_pct_chg_sql(n)} AS pct_chg_nd
         FROM (
             SELECT ts_code,
                    trade_date,
@@ -601,14 +584,14 @@ def list_last_n_days_pct_chg(
     """
     with get_connection(read_only=True) as con:
         try:
-            rows = con.execute(query, [part_globs, n]).fetchdf()
+            rows = con.execute(query, [part_files, n]).fetchdf()
         except (duckdb.CatalogException, duckdb.IOException):
             return {}
 
     if rows.empty:
         return {}
 
-    rows = rows.where(pd.notna(rows), None)
+    rows = rows.astype(object).where(pd.notna(rows), None)
     result: dict[str, dict[str, object]] = {}
     for row in rows.to_dict(orient="records"):
         ts_code = row.pop("ts_code", None)
@@ -637,12 +620,8 @@ def list_daily_changes_for_date(ts_codes: list[str], trade_date: str) -> dict[st
     if not daily_root.exists():
         return {}
 
-    part_globs: list[str] = []
-    for code in ts_codes:
-        code_dir = daily_root / f"ts_code={code}"
-        if code_dir.exists():
-            part_globs.append(str(code_dir / "year=*/part-*.parquet"))
-    if not part_globs:
+    part_files = partition_files(daily_root, ts_codes, start_date=trade_date, end_date=trade_date)
+    if not part_files:
         return {}
 
     placeholders = ", ".join(["?"] * len(ts_codes))
@@ -656,7 +635,7 @@ def list_daily_changes_for_date(ts_codes: list[str], trade_date: str) -> dict[st
     """
     with get_connection(read_only=True) as con:
         try:
-            rows = con.execute(query, [part_globs, trade_date, *ts_codes]).fetchdf()
+            rows = con.execute(query, [part_files, trade_date, *ts_codes]).fetchdf()
         except (duckdb.CatalogException, duckdb.IOException):
             return {}
 
@@ -680,12 +659,8 @@ def get_next_trade_date(ts_codes: list[str], trade_date: str) -> str | None:
     if not daily_root.exists():
         return None
 
-    part_globs: list[str] = []
-    for code in ts_codes:
-        code_dir = daily_root / f"ts_code={code}"
-        if code_dir.exists():
-            part_globs.append(str(code_dir / "year=*/part-*.parquet"))
-    if not part_globs:
+    part_files = partition_files(daily_root, ts_codes, start_date=trade_date)
+    if not part_files:
         return None
 
     query = """
@@ -695,7 +670,7 @@ def get_next_trade_date(ts_codes: list[str], trade_date: str) -> str | None:
     """
     with get_connection(read_only=True) as con:
         try:
-            row = con.execute(query, [part_globs, trade_date]).fetchone()
+            row = con.execute(query, [part_files, trade_date]).fetchone()
         except (duckdb.CatalogException, duckdb.IOException):
             return None
     if not row:
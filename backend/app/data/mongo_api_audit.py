@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Iterable
+from typing import Any
+
+from pymongo import ASCENDING, DESCENDING
+
+from app.data.mongo import get_collection
+
+COLLECTION_NAME = "api_audit_logs"
+
+_INDEX_READY = False
+
+
+def ensure_api_audit_indexes() -> None:
+    collection = get_collection(COLLECTION_NAME)
+    collection.create_index([("created_at", DESCENDING)], name="idx_created_at")
+    collection.create_index([("user_id", ASCENDING), ("created_at", DESCENDING)], name="idx_user_created_at")
+
+
+def _collection():
+    global _INDEX_READY
+    if not _INDEX_READY:
+        ensure_api_audit_indexes()
+        _INDEX_READY = True
+    return get_collection(COLLECTION_NAME)
+
+
+def _audit_doc(
+    *,
+    user_id: str,
+    username: str,
+    endpoint: str,
+    method: str,
+    status_code: int,
+    created_at: dt.datetime | None = None,
+) -> dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "username": username,
+        "endpoint": endpoint,
+        "method": method,
+        "status_code": status_code,
+        "created_at": created_at or dt.datetime.now(dt.UTC),
+    }
+
+
+def insert_api_audit_log(
+    *,
+    user_id: str,
+    username: str,
+    endpoint: str,
+    method: str,
+    status_code: int,
+    created_at: dt.datetime | None = None,
+) -> None:
+    _collection().insert_one(
+        _audit_doc(
+            user_id=user_id,
+            username=username,
+            endpoint=endpoint,
+            method=method,
+            status_code=status_code,
+            created_at=created_at,
+        )
+    )
+
+
+def insert_api_audit_logs(records: Iterable[dict[str, Any]]) -> int:
+    docs = [_audit_doc(**record) for record in records]
+    if not docs:
+        return 0
+    _collection().insert_many(docs, ordered=False)
+    return len(docs)
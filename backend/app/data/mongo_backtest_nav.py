@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+from pymongo import ASCENDING
+
+from app.data.mongo import get_collection
+
+# Daily NAV rows written by the engine, one document per (run_id, trade_date).
+COLLECTION_NAME = "backtest_nav_daily"
+
+
+def iter_backtest_nav_for_runs(run_ids: list[str], batch_size: int = 5000) -> Iterator[dict[str, Any]]:
+    """Stream the NAV points of several runs with one ``$in`` query instead of one per run."""
+    if not run_ids:
+        return iter(())
+    cursor = get_collection(COLLECTION_NAME).find(
+        {"run_id": {"$in": list(run_ids)}},
+        {"_id": 0, "run_id": 1, "trade_date": 1, "nav": 1},
+        sort=[("run_id", ASCENDING), ("trade_date", ASCENDING)],
+        batch_size=batch_size,
+    )
+    return iter(cursor)
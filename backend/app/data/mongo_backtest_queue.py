@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import datetime as dt
+from typing import Any
+
+from pymongo import ASCENDING, ReturnDocument
+
+from app.data.mongo import get_collection
+
+# Queue state lives on the run meta documents themselves: a run is queued while it has
+# ``queued_at`` set and ``status == "pending"``; a claimed run carries the claiming worker and
+# a heartbeat that the dispatcher refreshes with every progress report while the run's process
+# is alive.
+COLLECTION_NAME = "backtest_runs"
+
+_INDEX_READY = False
+
+
+def ensure_backtest_queue_indexes() -> None:
+    collection = get_collection(COLLECTION_NAME)
+    collection.create_index(
+        [("status", ASCENDING), ("queued_at", ASCENDING)],
+        name="idx_status_queued_at",
+    )
+    collection.create_index(
+        [("status", ASCENDING), ("heartbeat_at", ASCENDING)],
+        name="idx_status_heartbeat_at",
+    )
+
+
+def _collection():
+    global _INDEX_READY
+    if not _INDEX_READY:
+        ensure_backtest_queue_indexes()
+        _INDEX_READY = True
+    return get_collection(COLLECTION_NAME)
+
+
+def _now() -> dt.datetime:
+    return dt.datetime.now(dt.UTC)
+
+
+class MongoBacktestQueue:
+    """Persisted backtest job queue backed by the ``backtest_runs`` collection."""
+
+    def enqueue(self, run_id: str) -> bool:
+        result = _collection().update_one(
+            {"run_id": run_id, "status": {"$in": ["pending", "failed", "cancelled"]}},
+            {
+                "$set": {
+                    "status": "pending",
+                    "queued_at": _now(),
+                    "cancel_requested": False,
+                    "progress": {},
+                    "attempts": 0,
+                    "error_message": "",
+                },
+                "$unset": {"worker_id": "", "heartbeat_at": ""},
+            },
+        )
+        return result.matched_count > 0
+
+    def claim(self, worker_id: str) -> dict[str, Any] | None:
+        now = _now()
+        return _collection().find_one_and_update(
+            {"status": "pending", "queued_at": {"$ne": None}},
+            {
+                "$set": {"status": "running", "worker_id": worker_id, "heartbeat_at": now, "started_at": now},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("queued_at", ASCENDING)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def report_progress(self, run_id: str, progress: dict[str, Any]) -> bool:
+        """Store ``progress`` on the run and return whether cancellation was requested."""
+        doc = _collection().find_one_and_update(
+            {"run_id": run_id},
+            {"$set": {"progress": progress, "heartbeat_at": _now()}},
+            projection={"_id": 0, "cancel_requested": 1},
+        )
+        return bool(doc and doc.get("cancel_requested"))
+
+    def request_cancel(self, run_id: str) -> str | None:
+        """Cancel a queued run outright, or flag a running one; returns the resulting status."""
+        collection = _collection()
+        queued = collection.update_one(
+            {"run_id": run_id, "status": "pending", "queued_at": {"$ne": None}},
+            {"$set": {"status": "cancelled", "cancel_requested": True, "finished_at": _now()}},
+        )
+        if queued.modified_count:
+            return "cancelled"
+        running = collection.update_one({"run_id": run_id, "status": "running"}, {"$set": {"cancel_requested": True}})
+        if running.matched_count:
+            return "cancelling"
+        doc = collection.find_one({"run_id": run_id}, {"_id": 0, "status": 1})
+        return str(doc.get("status")) if doc else None
+
+    def finish(self, run_id: str, status: str, error_message: str = "") -> None:
+        """Record the final state if the run itself did not (e.g. its process was killed)."""
+        collection = _collection()
+        collection.update_one(
+            {"run_id": run_id, "status": "running"},
+            {"$set": {"status": status, "error_message": error_message, "finished_at": _now()}},
+        )
+        collection.update_one({"run_id": run_id}, {"$unset": {"worker_id": "", "heartbeat_at": ""}})
+
+    def release(self, run_id: str) -> None:
+        """Put a running run back at the head of the queue (its process was stopped on shutdown)."""
+        _collection().update_one(
+            {"run_id": run_id, "status": "running"},
+            {"$set": {"status": "pending", "progress": {}}, "$unset": {"worker_id": "", "heartbeat_at": ""}},
+        )
+
+    def requeue_stale(self, stale_before: dt.datetime, max_attempts: int) -> int:
+        """Requeue running runs whose dispatcher stopped heartbeating; give up after ``max_attempts``."""
+        collection = _collection()
+        stale = {"status": "running", "queued_at": {"$ne": None}, "heartbeat_at": {"$lt": stale_before}}
+        collection.update_many(
+            {**stale, "attempts": {"$gte": max_attempts}},
+            {
+                "$set": {"status": "failed", "error_message": "backtest worker lost", "finished_at": _now()},
+                "$unset": {"worker_id": "", "heartbeat_at": ""},
+            },
+        )
+        requeued = collection.update_many(
+            stale,
+            {"$set": {"status": "pending", "progress": {}}, "$unset": {"worker_id": "", "heartbeat_at": ""}},
+        )
+        return int(requeued.modified_count)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Iterable
+from typing import Any
+
+from pymongo import ASCENDING, DESCENDING, ReplaceOne
+
+from app.data.mongo import get_collection
+
+COLLECTION_NAME = "daily_stock_pattern_hits"
+
+_INDEX_READY = False
+
+
+def ensure_daily_stock_pattern_hit_indexes() -> None:
+    collection = get_collection(COLLECTION_NAME)
+    collection.create_index(
+        [("trade_date", ASCENDING), ("ts_code", ASCENDING)],
+        unique=True,
+        name="idx_trade_date_ts_code",
+    )
+    collection.create_index(
+        [("ts_code", ASCENDING), ("trade_date", DESCENDING)],
+        name="idx_ts_code_trade_date",
+    )
+
+
+def get_daily_stock_pattern_hits_collection():
+    global _INDEX_READY
+    if not _INDEX_READY:
+        ensure_daily_stock_pattern_hit_indexes()
+        _INDEX_READY = True
+    return get_collection(COLLECTION_NAME)
+
+
+def replace_daily_stock_pattern_hits(docs: list[dict[str, Any]], *, trade_dates: Iterable[str] = ()) -> int:
+    """Make ``docs`` the only hit rows of every trade_date in ``trade_dates`` or in ``docs``.
+
+    Rows are upserted on (trade_date, ts_code) before the stale ones are deleted, so readers
+    never see a regenerated date empty; a date in ``trade_dates`` without docs is cleared.
+    """
+    now = dt.datetime.now(dt.UTC)
+    codes_by_date: dict[str, list[str]] = {str(trade_date): [] for trade_date in trade_dates if trade_date}
+    ops: list[ReplaceOne] = []
+    for doc in docs:
+        if not doc.get("trade_date") or not doc.get("ts_code"):
+            continue
+        record = dict(doc)
+        record.pop("_id", None)
+        record["updated_at"] = now
+        trade_date, ts_code = str(record["trade_date"]), str(record["ts_code"])
+        codes_by_date.setdefault(trade_date, []).append(ts_code)
+        ops.append(ReplaceOne({"trade_date": trade_date, "ts_code": ts_code}, record, upsert=True))
+    if not codes_by_date:
+        return 0
+
+    collection = get_daily_stock_pattern_hits_collection()
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+    for trade_date, ts_codes in codes_by_date.items():
+        collection.delete_many({"trade_date": trade_date, "ts_code": {"$nin": ts_codes}})
+    return len(ops)
+
+
+def get_daily_stock_pattern_hit(trade_date: str, ts_code: str) -> dict[str, Any] | None:
+    return get_daily_stock_pattern_hits_collection().find_one(
+        {"trade_date": trade_date, "ts_code": ts_code},
+        {"_id": 0, "updated_at": 0},
+    )
+
+
+def list_daily_stock_pattern_hits_for_stock(
+    ts_code: str,
+    *,
+    start_date: str | None = None,
+    limit: int = 365,
+) -> list[dict[str, Any]]:
+    query: dict[str, Any] = {"ts_code": ts_code}
+    if start_date:
+        query["trade_date"] = {"$gte": start_date}
+    cursor = (
+        get_daily_stock_pattern_hits_collection()
+        .find(query, {"_id": 0, "updated_at": 0})
+        .sort("trade_date", DESCENDING)
+        .limit(max(int(limit), 1))
+    )
+    return list(cursor)
+
+
+def set_daily_stock_pattern_hit_user_state(
+    *,
+    trade_date: str,
+    ts_code: str,
+    signal_side: str,
+    resonance_level: str,
+    user_state: str | None,
+) -> bool:
+    result = get_daily_stock_pattern_hits_collection().update_one(
+        {"trade_date": trade_date, "ts_code": ts_code},
+        {"$set": {"pattern_resonance.$[entry].user_state": user_state}},
+        array_filters=[{"entry.signal_side": signal_side, "entry.resonance_level": resonance_level}],
+    )
+    return result.matched_count > 0
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import datetime as dt
+from typing import Any
+
+from pymongo import ASCENDING, DESCENDING
+
+from app.data.mongo import get_collection
+
+COLLECTION_NAME = "factor_analysis_jobs"
+
+_INDEX_READY = False
+
+
+def ensure_factor_analysis_job_indexes() -> None:
+    collection = get_collection(COLLECTION_NAME)
+    collection.create_index([("job_id", ASCENDING)], unique=True, name="idx_job_id")
+    collection.create_index([("created_at", DESCENDING)], name="idx_created_at")
+
+
+def _collection():
+    global _INDEX_READY
+    if not _INDEX_READY:
+        ensure_factor_analysis_job_indexes()
+        _INDEX_READY = True
+    return get_collection(COLLECTION_NAME)
+
+
+def create_factor_analysis_job(*, job_id: str, params: dict[str, Any], created_by: str) -> None:
+    now = dt.datetime.now(dt.UTC)
+    _collection().insert_one(
+        {
+            "job_id": job_id,
+            "status": "pending",
+            "params": params,
+            "created_by": created_by,
+            "created_at": now,
+            "updated_at": now,
+            "error_message": "",
+        }
+    )
+
+
+def update_factor_analysis_job(job_id: str, **fields: Any) -> None:
+    _collection().update_one(
+        {"job_id": job_id},
+        {"$set": {**fields, "updated_at": dt.datetime.now(dt.UTC)}},
+    )
+
+
+def get_factor_analysis_job(job_id: str) -> dict[str, Any] | None:
+    return _collection().find_one({"job_id": job_id}, {"_id": 0})
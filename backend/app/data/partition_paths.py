@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+# Directory listings younger than this are not cached: a part file written in the same
+# mtime tick as the listing would otherwise stay invisible until the next write.
+_SETTLE_SECONDS = 1.0
+_MAX_CACHED_DIRS = 200_000
+# Lower bound on rows per stock-year (a full trading year has ~242 sessions), used to size
+# "newest N rows" reads before falling back to the full history.
+_MIN_ROWS_PER_YEAR = 200
+
+_listing_cache: dict[str, tuple[int, tuple[str, ...]]] = {}
+_cache_lock = threading.Lock()
+
+
+def clear_partition_cache() -> None:
+    with _cache_lock:
+        _listing_cache.clear()
+
+
+def _list_dir(path: Path) -> tuple[str, ...]:
+    """Sorted entries of ``path``, reused while the directory mtime is unchanged."""
+    key = str(path)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return ()
+    with _cache_lock:
+        cached = _listing_cache.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        names = tuple(sorted(os.listdir(path)))
+    except (FileNotFoundError, NotADirectoryError):
+        return ()
+    if time.time() - mtime_ns / 1e9 > _SETTLE_SECONDS:
+        with _cache_lock:
+            if len(_listing_cache) >= _MAX_CACHED_DIRS:
+                _listing_cache.clear()
+            _listing_cache[key] = (mtime_ns, names)
+    return names
+
+
+def years_for_rows(limit: int) -> int:
+    """Newest year partitions to read first when only the latest ``limit`` rows are needed.
+
+    Callers must fall back to the full file list if the pruned read returns fewer rows.
+    """
+    return max(int(limit), 0) // _MIN_ROWS_PER_YEAR + 1
+
+
+def _year_dirs(code_dir: Path, start_year: int | None, end_year: int | None) -> list[tuple[int, Path]]:
+    years: list[tuple[int, Path]] = []
+    for name in _list_dir(code_dir):
+        if not name.startswith("year="):
+            continue
+        try:
+            year = int(name[5:])
+        except ValueError:
+            continue
+        if (start_year is not None and year < start_year) or (end_year is not None and year > end_year):
+            continue
+        years.append((year, code_dir / name))
+    return years
+
+
+def _part_files(year_dir: Path) -> list[str]:
+    return [
+        str(year_dir / name)
+        for name in _list_dir(year_dir)
+        if name.startswith("part-") and name.endswith(".parquet")
+    ]
+
+
+def partition_codes(root: Path) -> list[str]:
+    """Codes that have a ``ts_code=<code>`` directory under ``root``, for all-stock reads."""
+    return [name[8:] for name in _list_dir(root) if name.startswith("ts_code=")]
+
+
+def partition_files(
+    root: Path,
+    ts_codes: str | Iterable[str],
+    *,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    latest_years: int | None = None,
+) -> list[str]:
+    """Explicit Parquet file list for ``root/ts_code=<code>/year=<YYYY>/part-*.parquet``.
+
+    Only ``year=`` directories overlapping [start_date, end_date] (YYYYMMDD, either side
+    optional) are listed, so DuckDB never opens partitions the date filter would discard.
+    ``latest_years`` keeps each stock's newest N non-empty years, for "latest rows" reads.
+    An empty list means no matching data; callers should skip the query.
+    """
+    codes = [ts_codes] if isinstance(ts_codes, str) else list(dict.fromkeys(ts_codes))
+    start_year = int(start_date[:4]) if start_date else None
+    end_year = int(end_date[:4]) if end_date else None
+    files: list[str] = []
+    for code in codes:
+        per_year = [
+            parts
+            for _, year_dir in _year_dirs(root / f"ts_code={code}", start_year, end_year)
+            if (parts := _part_files(year_dir))
+        ]
+        if latest_years is not None:
+            per_year = per_year[-latest_years:] if latest_years > 0 else []
+        for parts in per_year:
+            files.extend(parts)
+    return files
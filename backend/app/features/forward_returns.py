@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+
+from app.core.config import settings
+from app.data.duckdb_store import get_connection
+from app.data.partition_paths import partition_codes, partition_files
+
+logger = logging.getLogger(__name__)
+
+FORWARD_HORIZONS = (1, 3, 5, 10, 20)
+PRICE_BASES = ("cc", "oo")
+# Calendar days loaded past a year end so the last rows of the year get full horizons.
+_LOOKAHEAD_CALENDAR_DAYS = 45
+
+
+def forward_return_column(horizon: int, basis: str = "cc") -> str:
+    if horizon not in FORWARD_HORIZONS:
+        raise ValueError(f"unsupported forward horizon: {horizon}")
+    if basis not in PRICE_BASES:
+        raise ValueError(f"unsupported forward return basis: {basis}")
+    return f"ret_{basis}_{horizon}d"
+
+
+def forward_returns_root() -> Path:
+    return settings.data_dir / "features" / "forward_returns"
+
+
+def compute_forward_returns(prices: pd.DataFrame) -> pd.DataFrame:
+    """Compute percent forward returns for every (ts_code, trade_date) row.
+
+    ``ret_cc_Nd`` is close(T+N) / close(T) - 1, the return of a position held from the
+    signal close. ``ret_oo_Nd`` is open(T+1+N) / open(T+1) - 1, the tradable return of
+    entering at the next open. Prices are back-adjusted with ``adj_factor`` when present.
+    N counts the stock's own trading rows, so suspensions are skipped.
+    """
+    columns = ["ts_code", "trade_date", *(forward_return_column(h, b) for b in PRICE_BASES for h in FORWARD_HORIZONS)]
+    if prices.empty:
+        return pd.DataFrame(columns=columns)
+
+    frame = prices.copy()
+    if "adj_factor" not in frame.columns:
+        frame["adj_factor"] = 1.0
+    frame = frame[["ts_code", "trade_date", "open", "close", "adj_factor"]]
+    frame["ts_code"] = frame["ts_code"].astype(str)
+    frame["trade_date"] = frame["trade_date"].astype(str)
+    frame = frame.sort_values(["ts_code", "trade_date"], kind="mergesort").reset_index(drop=True)
+
+    adj_factor = pd.to_numeric(frame["adj_factor"], errors="coerce").groupby(frame["ts_code"], sort=False).ffill()
+    frame["adj_factor"] = adj_factor.groupby(frame["ts_code"], sort=False).bfill().fillna(1.0)
+
+    close = pd.to_numeric(frame["close"], errors="coerce") * frame["adj_factor"]
+    open_ = pd.to_numeric(frame["open"], errors="coerce") * frame["adj_factor"]
+    close = close.where(close > 0)
+    open_ = open_.where(open_ > 0)
+    by_code = frame["ts_code"]
+
+    result = frame[["ts_code", "trade_date"]].copy()
+    entry_open = open_.groupby(by_code, sort=False).shift(-1)
+    for horizon in FORWARD_HORIZONS:
+        exit_close = close.groupby(by_code, sort=False).shift(-horizon)
+        exit_open = open_.groupby(by_code, sort=False).shift(-(horizon + 1))
+        result[forward_return_column(horizon, "cc")] = ((exit_close / close - 1.0) * 100).round(4)
+        result[forward_return_column(horizon, "oo")] = ((exit_open / entry_open - 1.0) * 100).round(4)
+    return result[columns]
+
+
+def _load_price_panel(*, start_date: str, end_date: str) -> pd.DataFrame:
+    raw_root = settings.data_dir / "raw"
+    daily_files = partition_files(
+        raw_root / "daily", partition_codes(raw_root / "daily"), start_date=start_date, end_date=end_date
+    )
+    adj_files = partition_files(
+        raw_root / "adj_factor", partition_codes(raw_root / "adj_factor"), start_date=start_date, end_date=end_date
+    )
+    if not daily_files:
+        logger.warning("no daily partitions for %s-%s under %s", start_date, end_date, raw_root / "daily")
+        return pd.DataFrame(columns=["ts_code", "trade_date", "open", "close", "adj_factor"])
+    daily_query = """
+        SELECT ts_code, trade_date, open, close
+        FROM read_parquet(?, hive_partitioning=1, union_by_name=true)
+        WHERE trade_date BETWEEN ? AND ?
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY ts_code, trade_date) = 1
+    """
+    adj_query = """
+        SELECT ts_code, trade_date, MAX(adj_factor) AS adj_factor
+        FROM read_parquet(?, hive_partitioning=1, union_by_name=true)
+        WHERE trade_date BETWEEN ? AND ?
+        GROUP BY ts_code, trade_date
+    """
+    adj = pd.DataFrame(columns=["ts_code", "trade_date", "adj_factor"])
+    with get_connection(read_only=True) as con:
+        prices = con.execute(daily_query, [daily_files, start_date, end_date]).fetchdf()
+        if adj_files:
+            try:
+                adj = con.execute(adj_query, [adj_files, start_date, end_date]).fetchdf()
+            except (duckdb.IOException, duckdb.CatalogException):
+                pass
+    if prices.empty:
+        return prices
+    prices["trade_date"] = prices["trade_date"].astype(str)
+    adj["trade_date"] = adj["trade_date"].astype(str)
+    return prices.merge(adj, on=["ts_code", "trade_date"], how="left")
+
+
+def build_forward_returns_for_year(year: str) -> int:
+    """Recompute and atomically replace the forward-return partition of one year."""
+    start_date = f"{year}0101"
+    end_dt = dt.datetime.strptime(f"{year}1231", "%Y%m%d") + dt.timedelta(days=_LOOKAHEAD_CALENDAR_DAYS)
+    prices = _load_price_panel(start_date=start_date, end_date=end_dt.strftime("%Y%m%d"))
+    returns = compute_forward_returns(prices)
+    returns = returns[returns["trade_date"].str.startswith(year)]
+
+    partition_dir = forward_returns_root() / f"year={year}"
+    partition_dir.mkdir(parents=True, exist_ok=True)
+    target = partition_dir / "part-0.parquet"
+    tmp_path = partition_dir / "part-0.parquet.tmp"
+    returns.to_parquet(tmp_path, index=False, engine="pyarrow")
+    tmp_path.replace(target)
+    logger.info("forward returns year=%s rows=%s", year, len(returns))
+    return len(returns)
+
+
+def years_touched_by_sync(start_date: str, end_date: str) -> list[str]:
+    """Years whose forward returns change when prices in [start_date, end_date] change."""
+    first = dt.datetime.strptime(start_date, "%Y%m%d") - dt.timedelta(days=_LOOKAHEAD_CALENDAR_DAYS)
+    return [str(year) for year in range(first.year, int(end_date[:4]) + 1)]
+
+
+def _year_globs(start_date: str | None, end_date: str | None) -> list[str]:
+    root = forward_returns_root()
+    globs = []
+    for partition in sorted(root.glob("year=*")):
+        year = partition.name.split("=", 1)[1]
+        if start_date and year < start_date[:4]:
+            continue
+        if end_date and year > end_date[:4]:
+            continue
+        if any(partition.glob("part-*.parquet")):
+            globs.append(str(partition / "part-*.parquet"))
+    return globs
+
+
+def load_forward_returns(
+    *,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    ts_codes: Iterable[str] | None = None,
+    horizons: Iterable[int] = FORWARD_HORIZONS,
+    bases: Iterable[str] = PRICE_BASES,
+) -> pd.DataFrame:
+    columns = [forward_return_column(h, b) for b in bases for h in horizons]
+    globs = _year_globs(start_date, end_date)
+    if not globs:
+        logger.warning(
+            "forward return store has no partitions for %s-%s under %s, run scripts/daily/build_forward_returns.py",
+            start_date or "*",
+            end_date or "*",
+            forward_returns_root(),
+        )
+        return pd.DataFrame(columns=["ts_code", "trade_date", *columns])
+
+    clauses: list[str] = []
+    params: list[object] = [globs]
+    if start_date:
+        clauses.append("trade_date >= ?")
+        params.append(start_date)
+    if end_date:
+        clauses.append("trade_date <= ?")
+        params.append(end_date)
+    codes = sorted({str(code) for code in ts_codes}) if ts_codes is not None else None
+    if codes is not None:
+        if not codes:
+            return pd.DataFrame(columns=["ts_code", "trade_date", *columns])
+        clauses.append(f"ts_code IN ({', '.join('?' for _ in codes)})")
+        params.extend(codes)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    query = f"""
+        SELECT ts_code, trade_date, {', '.join(columns)}
+        FROM read_parquet(?, union_by_name=true)
+        {where}
+        ORDER BY trade_date, ts_code
+    """
+    with get_connection(read_only=True) as con:
+        frame = con.execute(query, params).fetchdf()
+    return frame.astype({"ts_code": str, "trade_date": str}) if not frame.empty else frame
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import pandas as pd
+
+from app.core.config import settings
+from app.data.duckdb_store import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Report fields carried into the point-in-time store, per TuShare dataset. Names are unique
+# across datasets so they can be attached to a panel without prefixes.
+PIT_FIELDS: dict[str, tuple[str, ...]] = {
+    "income": ("total_revenue", "revenue", "operate_profit", "n_income_attr_p", "basic_eps"),
+    "balancesheet": ("total_assets", "total_liab", "total_hldr_eqy_exc_min_int"),
+    "cashflow": ("n_cashflow_act", "free_cashflow"),
+    "fina_indicator": (
+        "roe",
+        "roa",
+        "grossprofit_margin",
+        "netprofit_margin",
+        "debt_to_assets",
+        "or_yoy",
+        "netprofit_yoy",
+        "bps",
+        "eps",
+    ),
+}
+FIELD_DATASETS: dict[str, str] = {field: dataset for dataset, fields in PIT_FIELDS.items() for field in fields}
+# Consolidated statements and their restated versions; parent-only statements are skipped.
+_CONSOLIDATED_REPORT_TYPES = ("1", "4")
+
+
+def normalize_fundamental_fields(value: Any) -> list[str]:
+    """Supported field names from a list or comma separated string, de-duplicated in order."""
+    if isinstance(value, str):
+        tokens = [item.strip() for item in value.split(",")]
+    elif isinstance(value, (list, tuple, set)):
+        tokens = [str(item).strip() for item in value]
+    else:
+        tokens = []
+    fields: list[str] = []
+    for token in tokens:
+        if token in FIELD_DATASETS and token not in fields:
+            fields.append(token)
+    return fields
+
+
+def fundamentals_root() -> Path:
+    return settings.data_dir / "features" / "fundamentals_pit"
+
+
+def pit_index_path(dataset: str) -> Path:
+    if dataset not in PIT_FIELDS:
+        raise ValueError(f"unsupported financial dataset: {dataset}")
+    return fundamentals_root() / f"dataset={dataset}" / "part-0.parquet"
+
+
+def period_column(dataset: str) -> str:
+    """Name of the attached column holding the report period the values came from."""
+    return f"{dataset}_end_date"
+
+
+def build_pit_index(reports: pd.DataFrame, fields: Iterable[str]) -> pd.DataFrame:
+    """Reduce report rows to one row per (ts_code, f_ann_date) holding the latest known period.
+
+    A row's knowledge date is ``f_ann_date`` (first announcement) falling back to ``ann_date``.
+    Walking each stock's rows by knowledge date, a row only becomes current if its period is
+    at least as new as every period already announced: a restatement of the current period
+    replaces it from its own announcement date on, while a late restatement of an older
+    period never shadows a newer report. The result is sorted by (ts_code, f_ann_date) for
+    ASOF joins.
+    """
+    columns = ["ts_code", "f_ann_date", "end_date", "ann_date", *fields]
+    if reports.empty:
+        return pd.DataFrame(columns=columns)
+    data = reports.copy()
+    for column in columns:
+        if column not in data.columns:
+            data[column] = None
+    data["ann_date"] = data["ann_date"].astype("string")
+    data["f_ann_date"] = data["f_ann_date"].astype("string").fillna(data["ann_date"])
+    data["end_date"] = data["end_date"].astype("string")
+    data = data.dropna(subset=["ts_code", "f_ann_date", "end_date"])
+    if data.empty:
+        return pd.DataFrame(columns=columns)
+    if "update_flag" in data.columns:
+        data["_version"] = pd.to_numeric(data["update_flag"], errors="coerce").fillna(0)
+    else:
+        data["_version"] = 0
+    data = data.sort_values(["ts_code", "f_ann_date", "end_date", "_version"], kind="stable")
+
+    period = data["end_date"].astype("int64")
+    latest_period = period.groupby(data["ts_code"], sort=False).cummax()
+    data = data[period == latest_period]
+    data = data.drop_duplicates(["ts_code", "f_ann_date"], keep="last")
+    return data[columns].reset_index(drop=True)
+
+
+def _report_glob(dataset: str) -> str:
+    return str(settings.data_dir / "raw" / dataset / "ts_code=*" / "year=*" / "part-*.parquet")
+
+
+def _load_reports(dataset: str) -> pd.DataFrame:
+    glob = _report_glob(dataset)
+    wanted = ["ts_code", "ann_date", "f_ann_date", "end_date", "report_type", "update_flag", *PIT_FIELDS[dataset]]
+    with get_connection(read_only=True) as con:
+        try:
+            available = {
+                row[0] for row in con.execute("DESCRIBE SELECT * FROM read_parquet(?, union_by_name=true)", [glob]).fetchall()
+            }
+        except (duckdb.IOException, duckdb.CatalogException):
+            return pd.DataFrame(columns=wanted)
+        select = ", ".join(column if column in available else f"NULL AS {column}" for column in wanted)
+        where = ""
+        if "report_type" in available:
+            where = f"WHERE report_type IS NULL OR CAST(report_type AS VARCHAR) IN {_CONSOLIDATED_REPORT_TYPES}"
+        frame = con.execute(f"SELECT {select} FROM read_parquet(?, union_by_name=true) {where}", [glob]).fetchdf()
+    return frame
+
+
+def _write_index(dataset: str, rows: pd.DataFrame) -> None:
+    target = pit_index_path(dataset)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name("part-0.parquet.tmp")
+    rows.to_parquet(tmp_path, index=False, engine="pyarrow")
+    tmp_path.replace(target)
+
+
+def build_fundamentals_pit(datasets: Iterable[str] | None = None) -> dict[str, int]:
+    """Rebuild the point-in-time index of each dataset from its synced report rows.
+
+    Report tables are small next to the price data, so every run rewrites each index in full;
+    that also picks up restatements that arrive for any period.
+    """
+    counts: dict[str, int] = {}
+    for dataset in datasets or PIT_FIELDS:
+        if dataset not in PIT_FIELDS:
+            raise ValueError(f"unsupported financial dataset: {dataset}")
+        rows = build_pit_index(_load_reports(dataset), PIT_FIELDS[dataset])
+        _write_index(dataset, rows)
+        counts[dataset] = len(rows)
+        logger.info("fundamentals pit index rebuilt: dataset=%s rows=%s", dataset, len(rows))
+    return counts
+
+
+def _resolve_fields(fields: Iterable[str] | None) -> dict[str, list[str]]:
+    selected = list(FIELD_DATASETS) if fields is None else list(dict.fromkeys(fields))
+    by_dataset: dict[str, list[str]] = {}
+    for field in selected:
+        dataset = FIELD_DATASETS.get(field)
+        if dataset is None:
+            raise ValueError(f"unsupported fundamental field: {field}")
+        by_dataset.setdefault(dataset, []).append(field)
+    return by_dataset
+
+
+def attach_fundamentals(
+    panel: pd.DataFrame,
+    *,
+    fields: Iterable[str] | None = None,
+    trade_date: str | None = None,
+) -> pd.DataFrame:
+    """Attach the fundamentals known as of each row's trade date to a (ts_code, trade_date) panel.
+
+    All requested datasets are joined in one DuckDB query, one ``ASOF LEFT JOIN`` per dataset
+    on ``f_ann_date <= trade_date``, so a value is only visible from its announcement date on.
+    ``trade_date`` overrides the panel column for single-date frames. For each joined dataset
+    the source report period is added as ``<dataset>_end_date``. Row order is preserved.
+    """
+    by_dataset = _resolve_fields(fields)
+    result = panel.copy()
+    added = [column for dataset, names in by_dataset.items() for column in [*names, period_column(dataset)]]
+    if result.empty:
+        for column in added:
+            result[column] = pd.Series(dtype=object)
+        return result
+
+    keys = pd.DataFrame(
+        {
+            "row_id": range(len(result)),
+            "ts_code": result["ts_code"].astype(str).to_numpy(),
+            "trade_date": str(trade_date) if trade_date is not None else result["trade_date"].astype(str).to_numpy(),
+        }
+    )
+    selects: list[str] = []
+    joins: list[str] = []
+    params: list[object] = []
+    for idx, (dataset, names) in enumerate(by_dataset.items()):
+        path = pit_index_path(dataset)
+        if not path.exists():
+            selects.extend(f"NULL AS {column}" for column in [*names, period_column(dataset)])
+            continue
+        alias = f"f{idx}"
+        selects.extend(f"{alias}.{name}" for name in names)
+        selects.append(f"{alias}.end_date AS {period_column(dataset)}")
+        joins.append(
+            f"ASOF LEFT JOIN read_parquet(?) AS {alias} "
+            f"ON k.ts_code = {alias}.ts_code AND k.trade_date >= {alias}.f_ann_date"
+        )
+        params.append(str(path))
+    query = f"SELECT k.row_id, {', '.join(selects)} FROM pit_keys AS k {' '.join(joins)} ORDER BY k.row_id"
+    with get_connection(read_only=True) as con:
+        con.register("pit_keys", keys)
+        try:
+            attached = con.execute(query, params).fetchdf()
+        finally:
+            con.unregister("pit_keys")
+    for column in added:
+        result[column] = attached[column].to_numpy()
+    return result
@@ -0,0 +1,463 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.core.config import settings
+from app.data.duckdb_store import get_connection
+from app.data.partition_paths import partition_codes, partition_files
+from app.features.rolling_stats import run_lengths
+
+logger = logging.getLogger(__name__)
+
+# Same layout as scripts/daily/sync_stk_factor_pro.py writes into features/indicators.
+INDICATOR_COLUMNS = [
+    "ts_code",
+    "trade_date",
+    "close_qfq",
+    "ma5",
+    "ma10",
+    "ma20",
+    "ma30",
+    "ma60",
+    "ma90",
+    "ma250",
+    "macd",
+    "macd_signal",
+    "macd_hist",
+    "kdj_k",
+    "kdj_d",
+    "kdj_j",
+    "boll_upper",
+    "boll_middle",
+    "boll_lower",
+    "rsi6",
+    "rsi12",
+    "rsi24",
+    "atr",
+    "cci",
+    "wr",
+    "wr1",
+    "updays",
+    "downdays",
+    "pe",
+    "pe_ttm",
+    "pb",
+    "turnover_rate",
+    "turnover_rate_f",
+    "volume_ratio",
+]
+DAILY_BASIC_COLUMNS = ["pe", "pe_ttm", "pb", "turnover_rate", "turnover_rate_f", "volume_ratio"]
+
+MA_WINDOWS = (5, 10, 20, 30, 60, 90, 250)
+RSI_WINDOWS = (6, 12, 24)
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+KDJ_WINDOW, KDJ_SMOOTH = 9, 3
+BOLL_WINDOW, BOLL_WIDTH = 20, 2.0
+ATR_WINDOW = 20
+CCI_WINDOW = 14
+WR_WINDOW, WR1_WINDOW = 10, 6
+
+# Recursive (EMA/SMA) values carried between incremental runs, in back-adjusted price units.
+STATE_COLUMNS = [
+    "ts_code",
+    "trade_date",
+    "ema_fast",
+    "ema_slow",
+    "dea",
+    "kdj_k",
+    "kdj_d",
+    *[f"rsi{window}_{part}" for window in RSI_WINDOWS for part in ("up", "abs")],
+]
+# Calendar days re-read before a stock's state date so every window (up to MA250) is full.
+WARMUP_CALENDAR_DAYS = 730
+FULL_HISTORY_START = "19900101"
+_CCI_BLOCK_COLUMNS = 500
+
+
+def indicator_state_path() -> Path:
+    return settings.data_dir / "features" / "indicator_state" / "part-0.parquet"
+
+
+def _to_matrix(values: np.ndarray, position: np.ndarray, column: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+    matrix = np.full(shape, np.nan)
+    matrix[position, column] = values
+    return matrix
+
+
+def _recursive_mean(values: np.ndarray, alpha: float, seed: np.ndarray) -> np.ndarray:
+    """Column-wise ``y = y_prev + alpha * (x - y_prev)`` (TDX ``SMA``/``EMA``).
+
+    The recursion starts from ``seed`` where given, otherwise from the first non-NaN
+    input; NaN inputs carry the previous value forward.
+    """
+    out = np.empty_like(values)
+    prev = seed.astype(float).copy()
+    for row in range(values.shape[0]):
+        x = values[row]
+        prev = np.where(np.isnan(x), prev, np.where(np.isnan(prev), x, prev + alpha * (x - prev)))
+        out[row] = prev
+    return out
+
+
+def _rolling(matrix: np.ndarray, window: int, how: str, *, min_periods: int | None = None) -> np.ndarray:
+    """Column-wise rolling aggregate in one pass over the column-major flattened matrix.
+
+    ``window - 1`` NaN rows are stacked on top so no window reaches into the previous column.
+    """
+    padded = np.vstack([np.full((window - 1, matrix.shape[1]), np.nan), matrix])
+    series = pd.Series(padded.ravel(order="F"))
+    rolling = series.rolling(window, min_periods=window if min_periods is None else min_periods)
+    values = rolling.std(ddof=0) if how == "std" else getattr(rolling, how)()
+    return values.to_numpy().reshape(padded.shape, order="F")[window - 1 :]
+
+
+def _mean_abs_deviation(matrix: np.ndarray, window: int) -> np.ndarray:
+    result = np.full(matrix.shape, np.nan)
+    if matrix.shape[0] < window:
+        return result
+    for block in range(0, matrix.shape[1], _CCI_BLOCK_COLUMNS):
+        stop = min(block + _CCI_BLOCK_COLUMNS, matrix.shape[1])
+        view = sliding_window_view(matrix[:, block:stop], window, axis=0)
+        centered = view - view.mean(axis=2, keepdims=True)
+        result[window - 1 :, block:stop] = np.abs(centered).mean(axis=2)
+    return result
+
+
+def _shift_down(matrix: np.ndarray) -> np.ndarray:
+    shifted = np.full(matrix.shape, np.nan)
+    shifted[1:] = matrix[:-1]
+    return shifted
+
+
+def compute_indicators(
+    prices: pd.DataFrame,
+    *,
+    state: pd.DataFrame | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Derive stk_factor_pro style qfq indicators from raw daily prices and adj_factor.
+
+    ``prices`` holds ts_code, trade_date, high, low, close and adj_factor rows. Each
+    stock is laid out as one column of a (row position x stock) matrix so rolling
+    windows and recursions run across all stocks at once. Indicators are computed on
+    back-adjusted prices and rebased to the row's own adj_factor, which is what a
+    stk_factor_pro pull on that trade date returns.
+
+    With ``state`` (see ``STATE_COLUMNS``), rows on or before a stock's state date only
+    feed rolling windows; recursions continue from the stored values and only later
+    rows are returned. Returns (indicator rows, state as of each stock's last row).
+    """
+    empty = pd.DataFrame(columns=[column for column in INDICATOR_COLUMNS if column not in DAILY_BASIC_COLUMNS])
+    if prices.empty:
+        return empty, pd.DataFrame(columns=STATE_COLUMNS)
+
+    frame = prices.copy()
+    frame["ts_code"] = frame["ts_code"].astype(str).str.upper()
+    frame["trade_date"] = frame["trade_date"].astype(str)
+    for column in ["high", "low", "close", "adj_factor"]:
+        frame[column] = pd.to_numeric(frame.get(column), errors="coerce")
+    frame = frame.dropna(subset=["close"])
+    frame = frame.drop_duplicates(subset=["ts_code", "trade_date"], keep="last")
+    frame = frame.sort_values(["ts_code", "trade_date"], kind="stable").reset_index(drop=True)
+    if frame.empty:
+        return empty, pd.DataFrame(columns=STATE_COLUMNS)
+
+    adj = frame.groupby("ts_code", sort=False)["adj_factor"].ffill()
+    adj = adj.groupby(frame["ts_code"], sort=False).bfill().fillna(1.0).to_numpy(dtype=float)
+    close_raw = frame["close"].to_numpy(dtype=float)
+    high_raw = frame["high"].fillna(frame["close"]).to_numpy(dtype=float)
+    low_raw = frame["low"].fillna(frame["close"]).to_numpy(dtype=float)
+
+    # Rows are sorted by ts_code, so factorize yields codes in sorted order.
+    column, codes = pd.factorize(frame["ts_code"])
+    codes = np.asarray(codes, dtype=object)
+    starts = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+    position = np.arange(len(frame)) - np.repeat(starts, np.diff(np.r_[starts, len(frame)]))
+    shape = (int(position.max()) + 1, len(codes))
+    dates = frame["trade_date"].to_numpy()
+
+    close = _to_matrix(close_raw * adj, position, column, shape)
+    high = _to_matrix(high_raw * adj, position, column, shape)
+    low = _to_matrix(low_raw * adj, position, column, shape)
+    base = _to_matrix(adj, position, column, shape)
+
+    state_frame = (
+        state.drop_duplicates(subset=["ts_code"], keep="last").set_index("ts_code")
+        if state is not None and not state.empty
+        else pd.DataFrame(columns=STATE_COLUMNS).set_index("ts_code")
+    )
+    state_frame = state_frame.reindex(codes)
+
+    def seed(name: str) -> np.ndarray:
+        return pd.to_numeric(state_frame[name], errors="coerce").to_numpy(dtype=float)
+
+    state_dates = pd.to_numeric(state_frame["trade_date"], errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+    emit = frame["trade_date"].astype(np.int64).to_numpy() > state_dates[column]
+    carried = _to_matrix(np.where(emit, 0.0, 1.0), position, column, shape) == 1.0
+
+    def recursive(values: np.ndarray, alpha: float, seed_values: np.ndarray) -> np.ndarray:
+        return _recursive_mean(np.where(carried, np.nan, values), alpha, seed_values)
+
+    prev_close = _shift_down(close)
+    diff = close - prev_close
+
+    outputs: dict[str, np.ndarray] = {"close_qfq": close / base}
+    for window in MA_WINDOWS:
+        outputs[f"ma{window}"] = _rolling(close, window, "mean") / base
+
+    ema_fast = recursive(close, 2.0 / (MACD_FAST + 1), seed("ema_fast"))
+    ema_slow = recursive(close, 2.0 / (MACD_SLOW + 1), seed("ema_slow"))
+    dif = ema_fast - ema_slow
+    dea = recursive(dif, 2.0 / (MACD_SIGNAL + 1), seed("dea"))
+    outputs["macd"] = dif / base
+    outputs["macd_signal"] = dea / base
+    outputs["macd_hist"] = 2.0 * (dif - dea) / base
+
+    kdj_high = _rolling(high, KDJ_WINDOW, "max", min_periods=1)
+    kdj_low = _rolling(low, KDJ_WINDOW, "min", min_periods=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsv = (close - kdj_low) / (kdj_high - kdj_low) * 100.0
+    kdj_k = recursive(rsv, 1.0 / KDJ_SMOOTH, seed("kdj_k"))
+    kdj_d = recursive(kdj_k, 1.0 / KDJ_SMOOTH, seed("kdj_d"))
+    outputs["kdj_k"] = kdj_k
+    outputs["kdj_d"] = kdj_d
+    outputs["kdj_j"] = 3.0 * kdj_k - 2.0 * kdj_d
+
+    boll_middle = _rolling(close, BOLL_WINDOW, "mean")
+    boll_std = _rolling(close, BOLL_WINDOW, "std")
+    outputs["boll_upper"] = (boll_middle + BOLL_WIDTH * boll_std) / base
+    outputs["boll_middle"] = boll_middle / base
+    outputs["boll_lower"] = (boll_middle - BOLL_WIDTH * boll_std) / base
+
+    rsi_states: dict[str, np.ndarray] = {}
+    for window in RSI_WINDOWS:
+        up = recursive(np.maximum(diff, 0.0), 1.0 / window, seed(f"rsi{window}_up"))
+        total = recursive(np.abs(diff), 1.0 / window, seed(f"rsi{window}_abs"))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            outputs[f"rsi{window}"] = up / total * 100.0
+        rsi_states[f"rsi{window}_up"] = up
+        rsi_states[f"rsi{window}_abs"] = total
+
+    true_range = np.maximum(np.maximum(high - low, np.abs(prev_close - high)), np.abs(prev_close - low))
+    outputs["atr"] = _rolling(true_range, ATR_WINDOW, "mean") / base
+
+    typical = (high + low + close) / 3.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        outputs["cci"] = (typical - _rolling(typical, CCI_WINDOW, "mean")) / (
+            0.015 * _mean_abs_deviation(typical, CCI_WINDOW)
+        )
+
+    for name, window in (("wr", WR_WINDOW), ("wr1", WR1_WINDOW)):
+        highest = _rolling(high, window, "max", min_periods=1)
+        lowest = _rolling(low, window, "min", min_periods=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            outputs[name] = (highest - close) / (highest - lowest) * 100.0
+
+    result = pd.DataFrame({"ts_code": frame["ts_code"].to_numpy(), "trade_date": dates})
+    for name in INDICATOR_COLUMNS:
+        if name in outputs:
+            result[name] = outputs[name][position, column]
+    diff_long = diff[position, column]
+    result["updays"] = run_lengths(diff_long > 0, starts)
+    result["downdays"] = run_lengths(diff_long < 0, starts)
+    result = result.replace([np.inf, -np.inf], np.nan)
+
+    lasts = np.r_[starts[1:], len(frame)] - 1
+    last_position, last_column = position[lasts], column[lasts]
+    new_state = pd.DataFrame(
+        {
+            "ts_code": codes[last_column],
+            "trade_date": dates[lasts],
+            "ema_fast": ema_fast[last_position, last_column],
+            "ema_slow": ema_slow[last_position, last_column],
+            "dea": dea[last_position, last_column],
+            "kdj_k": kdj_k[last_position, last_column],
+            "kdj_d": kdj_d[last_position, last_column],
+            **{name: values[last_position, last_column] for name, values in rsi_states.items()},
+        }
+    )
+    new_state = new_state[emit[lasts]].reset_index(drop=True)
+    return result[emit].reset_index(drop=True), new_state[STATE_COLUMNS]
+
+
+def _raw_files(dataset: str, *, start_date: str, end_date: str, ts_codes: Sequence[str] | None = None) -> list[str]:
+    root = settings.data_dir / "raw" / dataset
+    codes = partition_codes(root) if ts_codes is None else ts_codes
+    return partition_files(root, codes, start_date=start_date, end_date=end_date)
+
+
+def _load_price_rows(*, start_date: str, end_date: str, ts_codes: Sequence[str] | None = None) -> pd.DataFrame:
+    daily_files = _raw_files("daily", start_date=start_date, end_date=end_date, ts_codes=ts_codes)
+    if not daily_files:
+        return pd.DataFrame(columns=["ts_code", "trade_date", "high", "low", "close", "adj_factor"])
+    adj_files = _raw_files("adj_factor", start_date=start_date, end_date=end_date, ts_codes=ts_codes)
+    daily_query = """
+        SELECT ts_code, trade_date, high, low, close
+        FROM read_parquet(?, hive_partitioning=1, union_by_name=true)
+        WHERE trade_date BETWEEN ? AND ?
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY ts_code, trade_date) = 1
+    """
+    adj_query = """
+        SELECT ts_code, trade_date, MAX(adj_factor) AS adj_factor
+        FROM read_parquet(?, hive_partitioning=1, union_by_name=true)
+        WHERE trade_date BETWEEN ? AND ?
+        GROUP BY ts_code, trade_date
+    """
+    adj = pd.DataFrame(columns=["ts_code", "trade_date", "adj_factor"])
+    with get_connection(read_only=True) as con:
+        daily = con.execute(daily_query, [daily_files, start_date, end_date]).fetchdf()
+        if adj_files:
+            try:
+                adj = con.execute(adj_query, [adj_files, start_date, end_date]).fetchdf()
+            except (duckdb.IOException, duckdb.CatalogException):
+                pass
+    if daily.empty:
+        return daily
+    daily["trade_date"] = daily["trade_date"].astype(str)
+    adj["trade_date"] = adj["trade_date"].astype(str)
+    return daily.merge(adj, on=["ts_code", "trade_date"], how="left")
+
+
+def _list_codes_with_rows(*, start_date: str, end_date: str) -> list[str]:
+    daily_files = _raw_files("daily", start_date=start_date, end_date=end_date)
+    if not daily_files:
+        return []
+    query = """
+        SELECT DISTINCT ts_code
+        FROM read_parquet(?, hive_partitioning=1, union_by_name=true)
+        WHERE trade_date BETWEEN ? AND ?
+        ORDER BY ts_code
+    """
+    with get_connection(read_only=True) as con:
+        rows = con.execute(query, [daily_files, start_date, end_date]).fetchall()
+    return [str(row[0]) for row in rows]
+
+
+def _load_daily_basic(*, start_date: str, end_date: str, ts_codes: Sequence[str]) -> pd.DataFrame:
+    empty = pd.DataFrame(columns=["ts_code", "trade_date", *DAILY_BASIC_COLUMNS])
+    basic_files = _raw_files("daily_basic", start_date=start_date, end_date=end_date, ts_codes=ts_codes)
+    if not basic_files:
+        return empty
+    query = f"""
+        SELECT ts_code, trade_date, {", ".join(DAILY_BASIC_COLUMNS)}
+        FROM read_parquet(?, hive_partitioning=1, union_by_name=true)
+        WHERE trade_date BETWEEN ? AND ?
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY ts_code, trade_date) = 1
+    """
+    with get_connection(read_only=True) as con:
+        try:
+            frame = con.execute(query, [basic_files, start_date, end_date]).fetchdf()
+        except (duckdb.IOException, duckdb.CatalogException):
+            return empty
+    frame["trade_date"] = frame["trade_date"].astype(str)
+    return frame
+
+
+def load_indicator_state() -> pd.DataFrame:
+    path = indicator_state_path()
+    if not path.exists():
+        return pd.DataFrame(columns=STATE_COLUMNS)
+    return pd.read_parquet(path)
+
+
+def save_indicator_state(state: pd.DataFrame) -> int:
+    path = indicator_state_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".parquet.tmp")
+    state[STATE_COLUMNS].sort_values("ts_code").to_parquet(tmp_path, index=False, engine="pyarrow")
+    tmp_path.replace(path)
+    return len(state)
+
+
+def _batches(items: Sequence[str], size: int) -> Iterable[list[str]]:
+    for start in range(0, len(items), size):
+        yield list(items[start : start + size])
+
+
+def build_indicators(
+    *,
+    start_date: str,
+    end_date: str,
+    ts_codes: Sequence[str] | None = None,
+    rebuild: bool = False,
+    batch_size: int = 500,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Compute indicator rows for stocks trading in [start_date, end_date].
+
+    Stocks with a stored state extend it: a warm-up window is re-read and every row
+    after the state date up to ``end_date`` is returned, which also fills gaps left by
+    missed runs. Stocks without state (or everything when ``rebuild``) are computed
+    from full history and only rows inside the range are returned. Stocks whose state is
+    already at or past ``end_date`` (a historical backfill) are recomputed the same way
+    but keep their stored state. Returns the rows (``INDICATOR_COLUMNS``) and the merged
+    state to persist once the rows are saved.
+    """
+    stored_state = pd.DataFrame(columns=STATE_COLUMNS) if rebuild else load_indicator_state()
+    codes = sorted({str(code).upper() for code in ts_codes}) if ts_codes else _list_codes_with_rows(
+        start_date=start_date, end_date=end_date
+    )
+    state_by_code = stored_state.set_index("ts_code")["trade_date"].astype(str).to_dict()
+    stateful = [code for code in codes if code in state_by_code and state_by_code[code] < end_date]
+    stateless = [code for code in codes if code not in state_by_code]
+    ahead = [code for code in codes if code in state_by_code and state_by_code[code] >= end_date]
+    if ahead:
+        logger.warning(
+            "indicators: %s stocks have state at or after %s; recomputing them from full history "
+            "without updating state (use --rebuild-state to reset it)",
+            len(ahead),
+            end_date,
+        )
+
+    frames: list[pd.DataFrame] = []
+    states: list[pd.DataFrame] = []
+    for batch in _batches(stateful, batch_size):
+        first_state_date = min(state_by_code[code] for code in batch)
+        warmup_start = dt.datetime.strptime(first_state_date, "%Y%m%d") - dt.timedelta(days=WARMUP_CALENDAR_DAYS)
+        prices = _load_price_rows(start_date=warmup_start.strftime("%Y%m%d"), end_date=end_date, ts_codes=batch)
+        rows, state = compute_indicators(prices, state=stored_state[stored_state["ts_code"].isin(batch)])
+        frames.append(rows)
+        states.append(state)
+    for batch_codes, keep_state in ((stateless, True), (ahead, False)):
+        for batch in _batches(batch_codes, batch_size):
+            prices = _load_price_rows(start_date=FULL_HISTORY_START, end_date=end_date, ts_codes=batch)
+            rows, state = compute_indicators(prices)
+            frames.append(rows[rows["trade_date"] >= start_date])
+            if keep_state:
+                states.append(state)
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=INDICATOR_COLUMNS), stored_state
+    rows = pd.concat(frames, ignore_index=True)
+    basic = _load_daily_basic(
+        start_date=rows["trade_date"].min(),
+        end_date=rows["trade_date"].max(),
+        ts_codes=sorted(rows["ts_code"].unique()),
+    )
+    rows = rows.merge(basic, on=["ts_code", "trade_date"], how="left")
+
+    updated = [frame for frame in states if not frame.empty]
+    merged_state = stored_state
+    if updated:
+        updated_state = pd.concat(updated, ignore_index=True)
+        merged_state = pd.concat(
+            [stored_state[~stored_state["ts_code"].isin(updated_state["ts_code"])], updated_state],
+            ignore_index=True,
+        )
+    logger.info(
+        "indicators computed: stateful=%s stateless=%s ahead=%s rows=%s range=%s-%s",
+        len(stateful),
+        len(stateless),
+        len(ahead),
+        len(rows),
+        start_date,
+        end_date,
+    )
+    return rows[INDICATOR_COLUMNS], merged_state[STATE_COLUMNS]
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.data.duckdb_store import get_connection
+from app.data.partition_paths import partition_codes, partition_files
+from app.data.mongo import get_collection
+
+logger = logging.getLogger(__name__)
+
+INDEX_TS_CODE = "000001.SH"
+INDEX_COL = "index_factor_pro"
+# Rows in the new-high window (about one trading year) and the calendar days read before the
+# first rebuilt date so that window is complete.
+NEW_HIGH_WINDOW = 250
+_BREADTH_LOOKBACK_CALENDAR_DAYS = 380
+# Index momentum horizons, counted like the regime's former skip(20)/skip(60) lookups: the
+# close N+1 index rows back.
+MOMENTUM_HORIZONS = (20, 60)
+_INDEX_LOOKBACK_CALENDAR_DAYS = 120
+FULL_HISTORY_START = "19900101"
+
+BREADTH_COLUMNS = [
+    "trade_date",
+    "total",
+    "up",
+    "down",
+    "flat",
+    "up_ratio",
+    "limit_up",
+    "limit_down",
+    "new_high",
+    "new_high_share",
+    "index_close",
+    *[f"index_ret_{days}d" for days in MOMENTUM_HORIZONS],
+]
+
+
+def market_breadth_path(data_dir: Path | str | None = None) -> Path:
+    return Path(data_dir or settings.data_dir) / "features" / "market_breadth" / "part-0.parquet"
+
+
+def _raw_files(dataset: str, *, start_date: str, end_date: str) -> list[str]:
+    root = settings.data_dir / "raw" / dataset
+    return partition_files(root, partition_codes(root), start_date=start_date, end_date=end_date)
+
+
+def _load_breadth_counts(*, start_date: str, end_date: str) -> pd.DataFrame:
+    """Per-date advance/decline, limit and new-high counts in one GROUP BY over the daily files."""
+    history_start = dt.datetime.strptime(start_date, "%Y%m%d") - dt.timedelta(days=_BREADTH_LOOKBACK_CALENDAR_DAYS)
+    bounds = [history_start.strftime("%Y%m%d"), end_date]
+    daily_files = _raw_files("daily", start_date=bounds[0], end_date=end_date)
+    if not daily_files:
+        return pd.DataFrame(columns=BREADTH_COLUMNS[:10])
+    params: list[object] = [daily_files, *bounds]
+    adj_files = _raw_files("adj_factor", start_date=bounds[0], end_date=end_date)
+    limit_files = _raw_files("daily_limit", start_date=start_date, end_date=end_date)
+    adj_join = "SELECT NULL::VARCHAR AS ts_code, NULL::VARCHAR AS trade_date, NULL::DOUBLE AS adj_factor"
+    if adj_files:
+        adj_join = """
+            SELECT ts_code, trade_date, MAX(adj_factor) AS adj_factor
+            FROM read_parquet(?, hive_partitioning=1, union_by_name=true)
+            WHERE trade_date BETWEEN ? AND ?
+            GROUP BY ts_code, trade_date
+        """
+        params.extend([adj_files, *bounds])
+    limit_join = "SELECT NULL::VARCHAR AS ts_code, NULL::VARCHAR AS trade_date, NULL::DOUBLE AS up_limit, NULL::DOUBLE AS down_limit"
+    if limit_files:
+        limit_join = """
+            SELECT ts_code, trade_date, MAX(up_limit) AS up_limit, MAX(down_limit) AS down_limit
+            FROM read_parquet(?, hive_partitioning=1, union_by_name=true)
+            WHERE trade_date BETWEEN ? AND ?
+            GROUP BY ts_code, trade_date
+        """
+        params.extend([limit_files, start_date, end_date])
+    params.extend([start_date, end_date])
+    query = f"""
+        WITH daily AS (
+            SELECT ts_code, trade_date, close, pct_chg
+            FROM read_parquet(?, hive_partitioning=1, union_by_name=true)
+            WHERE trade_date BETWEEN ? AND ?
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY ts_code, trade_date) = 1
+        ),
+        adj AS ({adj_join}),
+        lim AS ({limit_join}),
+        windowed AS (
+            SELECT
+                d.ts_code,
+                d.trade_date,
+                d.close,
+                d.pct_chg,
+                d.close * COALESCE(a.adj_factor, 1) AS adj_close,
+                COUNT(*) OVER w AS span,
+                MAX(d.close * COALESCE(a.adj_factor, 1)) OVER w AS window_high
+            FROM daily AS d
+            LEFT JOIN adj AS a ON a.ts_code = d.ts_code AND a.trade_date = d.trade_date
+            WINDOW w AS (
+                PARTITION BY d.ts_code ORDER BY d.trade_date
+                ROWS BETWEEN {NEW_HIGH_WINDOW - 1} PRECEDING AND CURRENT ROW
+            )
+        )
+        SELECT
+            w.trade_date,
+            COUNT(*) AS total,
+            COUNT_IF(w.pct_chg > 0) AS up,
+            COUNT_IF(w.pct_chg < 0) AS down,
+            COUNT_IF(w.pct_chg = 0) AS flat,
+            COUNT_IF(l.up_limit > 0 AND w.close >= l.up_limit) AS limit_up,
+            COUNT_IF(l.down_limit > 0 AND w.close <= l.down_limit) AS limit_down,
+            COUNT_IF(w.span = {NEW_HIGH_WINDOW} AND w.adj_close >= w.window_high) AS new_high
+        FROM windowed AS w
+        LEFT JOIN lim AS l ON l.ts_code = w.ts_code AND l.trade_date = w.trade_date
+        WHERE w.trade_date BETWEEN ? AND ?
+        GROUP BY w.trade_date
+        ORDER BY w.trade_date
+    """
+    with get_connection(read_only=True) as con:
+        counts = con.execute(query, params).fetchdf()
+    if counts.empty:
+        return pd.DataFrame(columns=BREADTH_COLUMNS[:10])
+    counts["trade_date"] = counts["trade_date"].astype(str)
+    counts["up_ratio"] = counts["up"] / counts["total"]
+    counts["new_high_share"] = counts["new_high"] / counts["total"]
+    return counts[BREADTH_COLUMNS[:10]]
+
+
+def _load_index_returns(*, start_date: str, end_date: str) -> pd.DataFrame:
+    columns = ["trade_date", "index_close", *[f"index_ret_{days}d" for days in MOMENTUM_HORIZONS]]
+    history_start = dt.datetime.strptime(start_date, "%Y%m%d") - dt.timedelta(days=_INDEX_LOOKBACK_CALENDAR_DAYS)
+    cursor = get_collection(INDEX_COL).find(
+        {
+            "ts_code": INDEX_TS_CODE,
+            "trade_date": {"$gte": history_start.strftime("%Y%m%d"), "$lte": end_date},
+            "close": {"$ne": None},
+        },
+        {"_id": 0, "trade_date": 1, "close": 1},
+    ).sort("trade_date", 1)
+    closes = pd.DataFrame(list(cursor), columns=["trade_date", "close"])
+    if closes.empty:
+        return pd.DataFrame(columns=columns)
+    closes["trade_date"] = closes["trade_date"].astype(str)
+    closes["index_close"] = pd.to_numeric(closes["close"], errors="coerce")
+    for days in MOMENTUM_HORIZONS:
+        previous = closes["index_close"].shift(days + 1)
+        closes[f"index_ret_{days}d"] = np.where(previous > 0, (closes["index_close"] / previous - 1) * 100, np.nan)
+    closes = closes[closes["trade_date"] >= start_date]
+    return closes[columns]
+
+
+def compute_market_breadth(start_date: str, end_date: str) -> pd.DataFrame:
+    """One row per trade date in [start_date, end_date] with breadth counts and index returns."""
+    counts = _load_breadth_counts(start_date=start_date, end_date=end_date)
+    index_returns = _load_index_returns(start_date=start_date, end_date=end_date)
+    merged = counts.merge(index_returns, on="trade_date", how="outer")
+    return merged.reindex(columns=BREADTH_COLUMNS).sort_values("trade_date").reset_index(drop=True)
+
+
+def build_market_breadth(start_date: str, end_date: str) -> int:
+    """Recompute breadth rows for [start_date, end_date] and merge them into the store.
+
+    The store is one small file (one row per trade date); rows outside the range are kept.
+    """
+    rows = compute_market_breadth(start_date, end_date)
+    written = len(rows)
+    target = market_breadth_path()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.exists():
+        existing = pd.read_parquet(target)
+        keep = (existing["trade_date"] < start_date) | (existing["trade_date"] > end_date)
+        rows = pd.concat([existing[keep], rows], ignore_index=True)
+    rows = rows.sort_values("trade_date", kind="stable")
+    tmp_path = target.with_name("part-0.parquet.tmp")
+    rows.to_parquet(tmp_path, index=False, engine="pyarrow")
+    tmp_path.replace(target)
+    logger.info("market breadth updated: %s-%s rows=%s", start_date, end_date, written)
+    return written
+
+
+def load_market_breadth(
+    start_date: str, end_date: str, *, data_dir: Path | str | None = None
+) -> dict[str, dict[str, object]]:
+    """Stored breadth rows keyed by trade date; missing values come back as None."""
+    target = market_breadth_path(data_dir)
+    if not target.exists():
+        return {}
+    with get_connection(read_only=True) as con:
+        frame = con.execute(
+            "SELECT * FROM read_parquet(?) WHERE trade_date BETWEEN ? AND ? ORDER BY trade_date",
+            [str(target), start_date, end_date],
+        ).fetchdf()
+    if frame.empty:
+        return {}
+    frame = frame.astype(object).where(pd.notna(frame), None)
+    return {str(row["trade_date"]): row for row in frame.to_dict(orient="records")}
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.core.config import settings
+from app.data.duckdb_store import get_connection
+from app.data.partition_paths import partition_codes, partition_files
+
+logger = logging.getLogger(__name__)
+
+ROLLING_WINDOWS = (5, 10, 20, 60)
+# Calendar days of history read before the first rebuilt date so 60-row windows are complete.
+_LOOKBACK_CALENDAR_DAYS = 130
+# Rows per block when materialising (rows x window) matrices.
+_MATRIX_BLOCK_ROWS = 200_000
+
+_WINDOW_FIELDS = (
+    "trade_days",
+    "first_date",
+    "ret",
+    "up_days",
+    "down_days",
+    "flat_days",
+    "max_up_streak",
+    "max_down_streak",
+    "avg_amount",
+    "max_drawdown",
+)
+
+
+def rolling_stat_column(field: str, window: int) -> str:
+    if window not in ROLLING_WINDOWS:
+        raise ValueError(f"unsupported rolling window: {window}")
+    if field not in _WINDOW_FIELDS:
+        raise ValueError(f"unsupported rolling stat: {field}")
+    return f"{field}_{window}d"
+
+
+def rolling_stats_root() -> Path:
+    return settings.data_dir / "features" / "rolling_stats"
+
+
+def rolling_stats_columns() -> list[str]:
+    columns = ["ts_code", "trade_date", "latest_close", "latest_pct_chg", "up_streak", "down_streak"]
+    columns.extend(rolling_stat_column(field, window) for window in ROLLING_WINDOWS for field in _WINDOW_FIELDS)
+    return columns
+
+
+def run_lengths(hits: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Length of the current run of True at each row; runs restart at every ``starts`` offset."""
+    hits = hits.astype(np.int64)
+    running = np.cumsum(hits)
+    breaks = hits == 0
+    breaks[starts] = True
+    # Running count just before each break, carried forward; running is non-decreasing.
+    base = np.maximum.accumulate(np.where(breaks, running - hits, 0))
+    return running - base
+
+
+def _window_max_streak(streak: np.ndarray, span: np.ndarray, window: int) -> np.ndarray:
+    """Longest run inside the trailing ``span`` rows, with runs clipped at the window start."""
+    result = np.zeros(len(streak), dtype=np.int64)
+    padded = np.r_[np.zeros(window - 1, dtype=np.int64), streak]
+    offsets = np.arange(window)
+    for block in range(0, len(streak), _MATRIX_BLOCK_ROWS):
+        stop = min(block + _MATRIX_BLOCK_ROWS, len(streak))
+        view = sliding_window_view(padded, window)[block:stop]
+        first = window - span[block:stop, None]
+        # Rows before the window start are masked; a run entering the window is clipped to its in-window part.
+        clipped = np.minimum(view, offsets[None, :] - first + 1)
+        result[block:stop] = np.where(offsets[None, :] >= first, clipped, 0).max(axis=1)
+    return result
+
+
+def _window_max_drawdown(price: np.ndarray, span: np.ndarray, window: int) -> np.ndarray:
+    """Largest peak-to-trough decline (percent) inside the trailing ``span`` rows."""
+    result = np.zeros(len(price), dtype=float)
+    padded = np.r_[np.full(window - 1, np.nan), price]
+    offsets = np.arange(window)
+    for block in range(0, len(price), _MATRIX_BLOCK_ROWS):
+        stop = min(block + _MATRIX_BLOCK_ROWS, len(price))
+        view = sliding_window_view(padded, window)[block:stop]
+        masked = np.where(offsets[None, :] >= window - span[block:stop, None], view, np.nan)
+        peaks = np.fmax.accumulate(masked, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            drawdown = 1.0 - masked / peaks
+        result[block:stop] = np.nan_to_num(np.nanmax(np.where(np.isnan(drawdown), 0.0, drawdown), axis=1)) * 100
+    return result
+
+
+def compute_rolling_stats(daily: pd.DataFrame) -> pd.DataFrame:
+    """Per (ts_code, trade_date) trailing-window stats over each stock's own trading rows.
+
+    Window stats use the stock-daily-stats screen definitions: ``ret`` is
+    close(T) / pre_close(first row) - 1 and directions compare close with pre_close.
+    ``max_drawdown`` uses back-adjusted closes when ``adj_factor`` is present.
+    """
+    if daily.empty:
+        return pd.DataFrame(columns=rolling_stats_columns())
+
+    frame = daily.copy()
+    frame["ts_code"] = frame["ts_code"].astype(str).str.upper()
+    frame["trade_date"] = frame["trade_date"].astype(str)
+    for column in ["close", "pre_close", "pct_chg", "amount"]:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    frame = frame.dropna(subset=["close", "pre_close", "amount"])
+    frame = frame.drop_duplicates(subset=["ts_code", "trade_date"], keep="last")
+    frame = frame.sort_values(["ts_code", "trade_date"], kind="stable").reset_index(drop=True)
+    if frame.empty:
+        return pd.DataFrame(columns=rolling_stats_columns())
+
+    codes = frame["ts_code"].to_numpy()
+    dates = frame["trade_date"].to_numpy()
+    close = frame["close"].to_numpy(dtype=float)
+    pre_close = frame["pre_close"].to_numpy(dtype=float)
+    amount = frame["amount"].to_numpy(dtype=float)
+    if "adj_factor" in frame.columns:
+        adj_factor = pd.to_numeric(frame["adj_factor"], errors="coerce").groupby(frame["ts_code"], sort=False).ffill()
+        adj_close = close * adj_factor.fillna(1.0).to_numpy(dtype=float)
+    else:
+        adj_close = close
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fallback_pct = np.where(pre_close != 0, (close - pre_close) / pre_close * 100, np.nan)
+    pct_chg = frame["pct_chg"].to_numpy(dtype=float)
+    pct_chg = np.where(np.isnan(pct_chg), fallback_pct, pct_chg)
+    direction = np.sign(close - pre_close)
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(codes)]))
+    position = np.arange(len(codes)) - group_start
+    up_streak = run_lengths(direction > 0, starts)
+    down_streak = run_lengths(direction < 0, starts)
+
+    result = pd.DataFrame(
+        {
+            "ts_code": codes,
+            "trade_date": dates,
+            "latest_close": close,
+            "latest_pct_chg": pct_chg,
+            "up_streak": up_streak,
+            "down_streak": down_streak,
+        }
+    )
+    cum_up = np.r_[0, np.cumsum(direction > 0)]
+    cum_down = np.r_[0, np.cumsum(direction < 0)]
+    cum_amount = np.r_[0.0, np.cumsum(amount)]
+    rows = np.arange(len(codes))
+    for window in ROLLING_WINDOWS:
+        span = np.minimum(position, window - 1) + 1
+        first = rows - span + 1
+        up_days = cum_up[rows + 1] - cum_up[first]
+        down_days = cum_down[rows + 1] - cum_down[first]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ret = (close / pre_close[first] - 1.0) * 100.0
+        result[rolling_stat_column("trade_days", window)] = span
+        result[rolling_stat_column("first_date", window)] = dates[first]
+        result[rolling_stat_column("ret", window)] = np.where(pre_close[first] > 0, ret, np.nan)
+        result[rolling_stat_column("up_days", window)] = up_days
+        result[rolling_stat_column("down_days", window)] = down_days
+        result[rolling_stat_column("flat_days", window)] = span - up_days - down_days
+        result[rolling_stat_column("max_up_streak", window)] = _window_max_streak(up_streak, span, window)
+        result[rolling_stat_column("max_down_streak", window)] = _window_max_streak(down_streak, span, window)
+        result[rolling_stat_column("avg_amount", window)] = (cum_amount[rows + 1] - cum_amount[first]) / span
+        result[rolling_stat_column("max_drawdown", window)] = _window_max_drawdown(adj_close, span, window)
+    return result[rolling_stats_columns()]
+
+
+def _load_daily_panel(*, start_date: str, end_date: str) -> pd.DataFrame:
+    raw_root = settings.data_dir / "raw"
+    daily_files = partition_files(
+        raw_root / "daily", partition_codes(raw_root / "daily"), start_date=start_date, end_date=end_date
+    )
+    adj_files = partition_files(
+        raw_root / "adj_factor", partition_codes(raw_root / "adj_factor"), start_date=start_date, end_date=end_date
+    )
+    if not daily_files:
+        logger.warning("no daily partitions for %s-%s under %s", start_date, end_date, raw_root / "daily")
+        return pd.DataFrame(columns=["ts_code", "trade_date", "close", "pre_close", "pct_chg", "amount", "adj_factor"])
+    daily_query = """
+        SELECT ts_code, trade_date, close, pre_close, pct_chg, amount
+        FROM read_parquet(?, hive_partitioning=1, union_by_name=true)
+        WHERE trade_date BETWEEN ? AND ?
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY ts_code, trade_date) = 1
+    """
+    adj_query = """
+        SELECT ts_code, trade_date, MAX(adj_factor) AS adj_factor
+        FROM read_parquet(?, hive_partitioning=1, union_by_name=true)
+        WHERE trade_date BETWEEN ? AND ?
+        GROUP BY ts_code, trade_date
+    """
+    adj = pd.DataFrame(columns=["ts_code", "trade_date", "adj_factor"])
+    with get_connection(read_only=True) as con:
+        daily = con.execute(daily_query, [daily_files, start_date, end_date]).fetchdf()
+        if adj_files:
+            try:
+                adj = con.execute(adj_query, [adj_files, start_date, end_date]).fetchdf()
+            except (duckdb.IOException, duckdb.CatalogException):
+                pass
+    if daily.empty:
+        return daily
+    daily["trade_date"] = daily["trade_date"].astype(str)
+    adj["trade_date"] = adj["trade_date"].astype(str)
+    return daily.merge(adj, on=["ts_code", "trade_date"], how="left")
+
+
+def _write_year_partition(year: str, rows: pd.DataFrame, *, replace_from: str, replace_to: str) -> int:
+    partition_dir = rolling_stats_root() / f"year={year}"
+    partition_dir.mkdir(parents=True, exist_ok=True)
+    target = partition_dir / "part-0.parquet"
+    if target.exists():
+        existing = pd.read_parquet(target)
+        keep = (existing["trade_date"] < replace_from) | (existing["trade_date"] > replace_to)
+        rows = pd.concat([existing[keep], rows], ignore_index=True)
+    rows = rows.sort_values(["trade_date", "ts_code"], kind="stable")
+    tmp_path = partition_dir / "part-0.parquet.tmp"
+    rows.to_parquet(tmp_path, index=False, engine="pyarrow")
+    tmp_path.replace(target)
+    return len(rows)
+
+
+def build_rolling_stats(start_date: str, end_date: str) -> int:
+    """Recompute rolling stats for trade dates in [start_date, end_date] and merge them into the store.
+
+    Only the lookback needed by the longest window is re-read: the daily and adj_factor
+    files of the one or two years that lookback spans, not the full history.
+    """
+    history_start = dt.datetime.strptime(start_date, "%Y%m%d") - dt.timedelta(days=_LOOKBACK_CALENDAR_DAYS)
+    daily = _load_daily_panel(start_date=history_start.strftime("%Y%m%d"), end_date=end_date)
+    stats = compute_rolling_stats(daily)
+    stats = stats[(stats["trade_date"] >= start_date) & (stats["trade_date"] <= end_date)]
+
+    written = 0
+    for year in range(int(start_date[:4]), int(end_date[:4]) + 1):
+        year_text = str(year)
+        year_rows = stats[stats["trade_date"].str.startswith(year_text)]
+        _write_year_partition(
+            year_text,
+            year_rows,
+            replace_from=max(start_date, f"{year_text}0101"),
+            replace_to=min(end_date, f"{year_text}1231"),
+        )
+        written += len(year_rows)
+    logger.info("rolling stats updated: %s-%s rows=%s", start_date, end_date, written)
+    return written
+
+
+def load_rolling_stats_for_date(
+    trade_date: str,
+    *,
+    window: int,
+    ts_codes: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """One row per stock with a trading row on ``trade_date``, limited to ``window`` columns."""
+    window_columns = [rolling_stat_column(field, window) for field in _WINDOW_FIELDS]
+    columns = ["ts_code", "trade_date", "latest_close", "latest_pct_chg", "up_streak", "down_streak", *window_columns]
+    partition = rolling_stats_root() / f"year={trade_date[:4]}" / "part-0.parquet"
+    if not partition.exists():
+        return pd.DataFrame(columns=columns)
+
+    params: list[object] = [str(partition), trade_date]
+    where = "trade_date = ?"
+    codes = sorted({str(code).upper() for code in ts_codes}) if ts_codes is not None else None
+    if codes is not None:
+        if not codes:
+            return pd.DataFrame(columns=columns)
+        where += f" AND ts_code IN ({', '.join('?' for _ in codes)})"
+        params.extend(codes)
+    query = f"SELECT {', '.join(columns)} FROM read_parquet(?) WHERE {where}"
+    with get_connection(read_only=True) as con:
+        frame = con.execute(query, params).fetchdf()
+    return frame.astype({"ts_code": str, "trade_date": str}) if not frame.empty else frame
@@ -12,6 +12,7 @@ from app.data.mongo_strategy_job_run import ensure_strategy_job_run_indexes
 from app.data.mongo_strategy_signal import ensure_strategy_signal_indexes
 from app.data.mongo_agent_freedom import ensure_agent_freedom_indexes
 from app.data.redis_client import close_redis_client
+from app.services.api_audit_queue import shutdown_api_audit_queue
 
 
 def create_app() -> FastAPI:
@@ -52,10 +53,12 @@ def create_app() -> FastAPI:
         from app.data.mongo_users import ensure_users_indexes
         from app.data.mongo_refresh_tokens import ensure_refresh_token_indexes
         from app.data.mongo_backtest import ensure_strategy_backtest_indexes
+        from app.data.mongo_backtest_queue import ensure_backtest_queue_indexes
 
         ensure_users_indexes()
         ensure_refresh_token_indexes()
         ensure_strategy_backtest_indexes()
+        ensure_backtest_queue_indexes()
         ensure_strategy_signal_indexes()
         ensure_strategy_job_run_indexes()
         ensure_data_sync_job_run_indexes()
@@ -63,13 +66,18 @@ def create_app() -> FastAPI:
         from app.data.mongo_data_sync_date import ensure_data_sync_date_indexes
         from app.data.mongo_api_audit import ensure_api_audit_indexes
         from app.data.mongo_market_regime import ensure_market_regime_indexes
+        from app.data.mongo_daily_stock_pattern_hits import ensure_daily_stock_pattern_hit_indexes
+        from app.data.mongo_factor_analysis_job import ensure_factor_analysis_job_indexes
 
         ensure_data_sync_date_indexes()
         ensure_api_audit_indexes()
         ensure_market_regime_indexes()
+        ensure_daily_stock_pattern_hit_indexes()
+        ensure_factor_analysis_job_indexes()
 
     @application.on_event("shutdown")
     def _shutdown() -> None:
+        shutdown_api_audit_queue()
         close_read_connection()
         close_redis_client()
 
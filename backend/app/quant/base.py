@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any, Protocol
 
 import numpy as np
 import pandas as pd
 
-from app.quant.factors_stock import build_stock_factor_scores
+from app.quant.factors_stock import build_stock_factor_panel_scores, build_stock_factor_scores
 
 
 @dataclass(slots=True)
@@ -19,6 +20,14 @@ class StrategyContext:
 
 
 class StrategyProtocol(Protocol):
+    """Strategies score one trade date per ``score`` call.
+
+    A strategy may also define ``score_panel(panel, params)`` that scores a stacked
+    (trade_date, ts_code) panel in one pass, ranking per ``trade_date``. It must return
+    the same rows and scores as calling ``score`` date by date, and cannot depend on the
+    per-date market regime or exposure. Use :func:`score_contexts` to pick it up when present.
+    """
+
     key: str
     name: str
 
@@ -26,6 +35,37 @@ class StrategyProtocol(Protocol):
         ...
 
 
+def score_contexts(strategy: StrategyProtocol, contexts: Sequence[StrategyContext]) -> dict[str, pd.DataFrame]:
+    """Score several trade dates that share params, keyed by trade_date.
+
+    Uses ``strategy.score_panel`` when the strategy defines it, otherwise ``score`` per date.
+    Dates whose frame scores empty are left out.
+    """
+    score_panel = getattr(strategy, "score_panel", None)
+    if score_panel is None or len(contexts) <= 1:
+        scored_by_date: dict[str, pd.DataFrame] = {}
+        for context in contexts:
+            scored = strategy.score(context)
+            if scored is not None and not scored.empty:
+                scored_by_date[context.trade_date] = scored
+        return scored_by_date
+
+    frames = [
+        context.frame.assign(trade_date=context.trade_date)
+        for context in contexts
+        if context.frame is not None and not context.frame.empty
+    ]
+    if not frames:
+        return {}
+    scored = score_panel(pd.concat(frames, ignore_index=True), contexts[0].params)
+    if scored is None or scored.empty:
+        return {}
+    return {
+        str(trade_date): group.reset_index(drop=True)
+        for trade_date, group in scored.groupby("trade_date", sort=False)
+    }
+
+
 class MultiFactorV1Strategy:
     key = "multifactor_v1"
     name = "多因子趋势增强V1"
@@ -33,6 +73,9 @@ class MultiFactorV1Strategy:
     def score(self, context: StrategyContext) -> pd.DataFrame:
         return build_stock_factor_scores(context.frame, context.params)
 
+    def score_panel(self, panel: pd.DataFrame, params: dict[str, Any]) -> pd.DataFrame:
+        return build_stock_factor_panel_scores(panel, params)
+
 
 def _clip_score(series: pd.Series | np.ndarray) -> pd.Series:
     if isinstance(series, pd.Series):
@@ -42,9 +85,10 @@ def _clip_score(series: pd.Series | np.ndarray) -> pd.Series:
     return target.fillna(0.0).clip(lower=0.0, upper=100.0)
 
 
-def _rank_score(series: pd.Series, *, ascending: bool) -> pd.Series:
+def _rank_score(series: pd.Series, *, ascending: bool, groups: pd.Series | None = None) -> pd.Series:
     valid = pd.to_numeric(series, errors="coerce").replace([np.inf, -np.inf], np.nan)
-    return valid.rank(method="average", ascending=ascending, pct=True).fillna(0.5) * 100.0
+    ranker = valid.groupby(groups, sort=False) if groups is not None else valid
+    return ranker.rank(method="average", ascending=ascending, pct=True).fillna(0.5) * 100.0
 
 
 def _to_weight(value: Any, default: float) -> float:
@@ -80,83 +124,94 @@ class MuseCatV1Strategy:
         frame = context.frame
         if frame is None or frame.empty:
             return pd.DataFrame()
+        return _musecat_scores(frame.copy(), context.params or {}, groups=None)
 
-        data = frame.copy()
-        def _numeric_series(column: str, default: float) -> pd.Series:
-            if column in data.columns:
-                raw = data[column]
-            else:
-                raw = pd.Series(default, index=data.index, dtype=float)
-            series = pd.to_numeric(raw, errors="coerce")
-            if isinstance(series, pd.Series):
-                series = series.reindex(data.index)
-            else:
-                series = pd.Series(series, index=data.index)
-            return series.fillna(default)
-
-        def _piecewise(condition: pd.Series, yes: float, no: float = 0.0) -> pd.Series:
-            cond = pd.Series(condition, index=data.index).fillna(False).astype(bool)
-            values = np.where(cond.to_numpy(), yes, no)
-            return pd.Series(values, index=data.index, dtype=float)
-
-        close = _numeric_series("close_qfq", float("nan"))
-        ma20 = _numeric_series("ma20", float("nan"))
-        ma60 = _numeric_series("ma60", float("nan"))
-        pct_chg = _numeric_series("pct_chg", 0.0)
-        macd = _numeric_series("macd", 0.0)
-        macd_signal = _numeric_series("macd_signal", 0.0)
-        macd_hist = _numeric_series("macd_hist", 0.0)
-        rsi12 = _numeric_series("rsi12", 50.0)
-        amount = _numeric_series("amount", float("nan"))
-        turnover = _numeric_series("turnover_rate", float("nan"))
-        vol_ratio = _numeric_series("volume_ratio", float("nan"))
-        pe_ttm = _numeric_series("pe_ttm", float("nan"))
-        pb = _numeric_series("pb", float("nan"))
-        sector_strength = _numeric_series("sector_strength", 50.0)
-
-        momentum = _clip_score(
-            _rank_score(pct_chg.clip(lower=-15.0, upper=15.0), ascending=True) * 0.45
-            + _piecewise((close > ma20) & (ma20 > ma60), 35.0, 8.0)
-            + _piecewise(macd_hist > 0, 20.0, 6.0)
-        )
-        reversal = _clip_score(
-            _piecewise((rsi12 >= 35) & (rsi12 <= 75), 72.0, 35.0)
-            + _piecewise((pct_chg >= -6.0) & (pct_chg <= 7.0), 16.0, 6.0)
-        )
-        quality = _clip_score(_rank_score(pe_ttm, ascending=False) * 0.6 + _rank_score(pb, ascending=False) * 0.4)
-        liquidity = _clip_score(
-            _rank_score(amount, ascending=True) * 0.45
-            + _rank_score(turnover, ascending=True) * 0.25
-            + _rank_score(vol_ratio, ascending=True) * 0.30
-        )
-
-        weights = _musecat_weights(context.params or {})
-        breakout_bonus = _to_weight((context.params or {}).get("musecat_breakout_bonus"), 5.0)
-        drawdown_penalty = _to_weight((context.params or {}).get("musecat_drawdown_penalty"), 6.0)
-        zero_axis_cross_bonus = _to_weight((context.params or {}).get("musecat_macd_zero_axis_cross_bonus"), 8.0)
-        depth_scale = _to_weight((context.params or {}).get("musecat_macd_zero_axis_depth_scale"), 3.0)
-        if depth_scale <= 0:
-            depth_scale = 3.0
-        composite = (
-            momentum * weights["momentum"]
-            + reversal * weights["reversal"]
-            + quality * weights["quality"]
-            + liquidity * weights["liquidity"]
-        )
-        total = _clip_score(composite * 0.85 + sector_strength * 0.15)
-        # Quantify "golden cross below zero axis": the more negative MACD, the stronger the bonus.
-        zero_axis_cross = (macd_hist > 0) & (macd < 0) & (macd_signal < 0)
-        near_zero_turn = (macd_hist > 0) & ((macd < 0) | (macd_signal < 0))
-        # Depth weight: 0 when macd>=0, min(-macd/depth_scale, 1) when macd<0 (e.g. -3 vs -1 => 1.0 vs 0.33)
-        depth_weight = (np.maximum(-macd, 0.0) / depth_scale).clip(upper=1.0)
-        total = total + zero_axis_cross_bonus * depth_weight * zero_axis_cross.astype(float)
-        total = total + _piecewise(~zero_axis_cross & near_zero_turn, zero_axis_cross_bonus * 0.4, 0.0)
-        total = total + _piecewise((close > ma20) & (macd_hist > 0), breakout_bonus, 0.0)
-        total = total - _piecewise((close < ma20) | (rsi12 > 85) | (pct_chg > 9.5), drawdown_penalty, 0.0)
-        data["momentum_score"] = momentum
-        data["reversal_score"] = reversal
-        data["quality_score"] = quality
-        data["liquidity_score"] = liquidity
-        data["macd_zero_axis_cross"] = zero_axis_cross.astype(int)
-        data["total_score"] = _clip_score(total)
-        return data
+    def score_panel(self, panel: pd.DataFrame, params: dict[str, Any]) -> pd.DataFrame:
+        if panel is None or panel.empty:
+            return pd.DataFrame()
+        data = panel.reset_index(drop=True)
+        return _musecat_scores(data, params or {}, groups=data["trade_date"])
+
+
+def _musecat_scores(data: pd.DataFrame, params: dict[str, Any], groups: pd.Series | None) -> pd.DataFrame:
+    def _numeric_series(column: str, default: float) -> pd.Series:
+        if column in data.columns:
+            raw = data[column]
+        else:
+            raw = pd.Series(default, index=data.index, dtype=float)
+        series = pd.to_numeric(raw, errors="coerce")
+        if isinstance(series, pd.Series):
+            series = series.reindex(data.index)
+        else:
+            series = pd.Series(series, index=data.index)
+        return series.fillna(default)
+
+    def _piecewise(condition: pd.Series, yes: float, no: float = 0.0) -> pd.Series:
+        cond = pd.Series(condition, index=data.index).fillna(False).astype(bool)
+        values = np.where(cond.to_numpy(), yes, no)
+        return pd.Series(values, index=data.index, dtype=float)
+
+    close = _numeric_series("close_qfq", float("nan"))
+    ma20 = _numeric_series("ma20", float("nan"))
+    ma60 = _numeric_series("ma60", float("nan"))
+    pct_chg = _numeric_series("pct_chg", 0.0)
+    macd = _numeric_series("macd", 0.0)
+    macd_signal = _numeric_series("macd_signal", 0.0)
+    macd_hist = _numeric_series("macd_hist", 0.0)
+    rsi12 = _numeric_series("rsi12", 50.0)
+    amount = _numeric_series("amount", float("nan"))
+    turnover = _numeric_series("turnover_rate", float("nan"))
+    vol_ratio = _numeric_series("volume_ratio", float("nan"))
+    pe_ttm = _numeric_series("pe_ttm", float("nan"))
+    pb = _numeric_series("pb", float("nan"))
+    sector_strength = _numeric_series("sector_strength", 50.0)
+
+    momentum = _clip_score(
+        _rank_score(pct_chg.clip(lower=-15.0, upper=15.0), ascending=True, groups=groups) * 0.45
+        + _piecewise((close > ma20) & (ma20 > ma60), 35.0, 8.0)
+        + _piecewise(macd_hist > 0, 20.0, 6.0)
+    )
+    reversal = _clip_score(
+        _piecewise((rsi12 >= 35) & (rsi12 <= 75), 72.0, 35.0)
+        + _piecewise((pct_chg >= -6.0) & (pct_chg <= 7.0), 16.0, 6.0)
+    )
+    quality = _clip_score(
+        _rank_score(pe_ttm, ascending=False, groups=groups) * 0.6
+        + _rank_score(pb, ascending=False, groups=groups) * 0.4
+    )
+    liquidity = _clip_score(
+        _rank_score(amount, ascending=True, groups=groups) * 0.45
+        + _rank_score(turnover, ascending=True, groups=groups) * 0.25
+        + _rank_score(vol_ratio, ascending=True, groups=groups) * 0.30
+    )
+
+    weights = _musecat_weights(params)
+    breakout_bonus = _to_weight(params.get("musecat_breakout_bonus"), 5.0)
+    drawdown_penalty = _to_weight(params.get("musecat_drawdown_penalty"), 6.0)
+    zero_axis_cross_bonus = _to_weight(params.get("musecat_macd_zero_axis_cross_bonus"), 8.0)
+    depth_scale = _to_weight(params.get("musecat_macd_zero_axis_depth_scale"), 3.0)
+    if depth_scale <= 0:
+        depth_scale = 3.0
+    composite = (
+        momentum * weights["momentum"]
+        + reversal * weights["reversal"]
+        + quality * weights["quality"]
+        + liquidity * weights["liquidity"]
+    )
+    total = _clip_score(composite * 0.85 + sector_strength * 0.15)
+    # Quantify "golden cross below zero axis": the more negative MACD, the stronger the bonus.
+    zero_axis_cross = (macd_hist > 0) & (macd < 0) & (macd_signal < 0)
+    near_zero_turn = (macd_hist > 0) & ((macd < 0) | (macd_signal < 0))
+    # Depth weight: 0 when macd>=0, min(-macd/depth_scale, 1) when macd<0 (e.g. -3 vs -1 => 1.0 vs 0.33)
+    depth_weight = (np.maximum(-macd, 0.0) / depth_scale).clip(upper=1.0)
+    total = total + zero_axis_cross_bonus * depth_weight * zero_axis_cross.astype(float)
+    total = total + _piecewise(~zero_axis_cross & near_zero_turn, zero_axis_cross_bonus * 0.4, 0.0)
+    total = total + _piecewise((close > ma20) & (macd_hist > 0), breakout_bonus, 0.0)
+    total = total - _piecewise((close < ma20) | (rsi12 > 85) | (pct_chg > 9.5), drawdown_penalty, 0.0)
+    data["momentum_score"] = momentum
+    data["reversal_score"] = reversal
+    data["quality_score"] = quality
+    data["liquidity_score"] = liquidity
+    data["macd_zero_axis_cross"] = zero_axis_cross.astype(int)
+    data["total_score"] = _clip_score(total)
+    return data
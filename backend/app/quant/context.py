@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, TypeVar
 
 import pandas as pd
 
@@ -14,6 +15,22 @@ from app.data.duckdb_backtest_store import (
     list_stock_universe,
 )
 from app.data.mongo import get_collection
+from app.features.fundamentals import attach_fundamentals
+
+_T = TypeVar("_T")
+
+_SECTOR_SOURCES = (("shenwan_daily", "sw"), ("citic_daily", "ci"))
+
+
+class _QueryCounter:
+    """Counts the DuckDB/Mongo reads one bundle load actually issues."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def run(self, loader: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+        self.count += 1
+        return loader(*args, **kwargs)
 
 
 @dataclass(slots=True)
@@ -28,6 +45,8 @@ class DailyDataBundle:
     sector_rows_t: list[dict[str, Any]]
     shenwan_member_codes_t: dict[str, list[str]]
     citic_member_codes_t: dict[str, list[str]]
+    rows_loaded: int = 0
+    query_count: int = 0
 
 
 def _active_members_query(trade_date: str) -> dict[str, Any]:
@@ -62,29 +81,12 @@ def _normalize_ci_code(value: Any) -> str:
     return f"{root}.CI"
 
 
-def _get_sector_strength_rows(*, trade_date: str, level: int = 3) -> list[dict[str, Any]]:
-    sw_rows = list(
-        get_collection("shenwan_daily").find(
-            {"trade_date": trade_date, "level": level},
-            {"_id": 0, "ts_code": 1, "name": 1, "rank": 1, "rank_total": 1, "pct_change": 1},
-        )
+def _get_sector_strength_rows(*, collection_name: str, source: str, trade_date: str, level: int = 3) -> list[dict[str, Any]]:
+    cursor = get_collection(collection_name).find(
+        {"trade_date": trade_date, "level": level},
+        {"_id": 0, "ts_code": 1, "name": 1, "rank": 1, "rank_total": 1, "pct_change": 1},
     )
-    ci_rows = list(
-        get_collection("citic_daily").find(
-            {"trade_date": trade_date, "level": level},
-            {"_id": 0, "ts_code": 1, "name": 1, "rank": 1, "rank_total": 1, "pct_change": 1},
-        )
-    )
-    rows: list[dict[str, Any]] = []
-    for item in sw_rows:
-        row = dict(item)
-        row["source"] = "sw"
-        rows.append(row)
-    for item in ci_rows:
-        row = dict(item)
-        row["source"] = "ci"
-        rows.append(row)
-    return rows
+    return [{**item, "source": source} for item in cursor]
 
 
 def _get_shenwan_member_codes_for_date(*, trade_date: str) -> dict[str, list[str]]:
@@ -154,18 +156,31 @@ def load_daily_data_bundle(
     trade_date: str,
     next_trade_date: str,
     universe_df: pd.DataFrame | None = None,
+    fundamental_fields: Sequence[str] | None = None,
 ) -> DailyDataBundle:
-    base_universe = universe_df if universe_df is not None else list_stock_universe()
-    daily_t = load_daily_for_date(trade_date)
-    daily_basic_t = load_daily_basic_for_date(trade_date)
-    indicators_t = load_indicators_for_date(trade_date)
-
-    daily_t1 = load_daily_for_date(next_trade_date)
-    limit_t1 = load_daily_limit_for_date(next_trade_date)
-    market_factor_t = get_market_factor_for_date(trade_date=trade_date, ts_code="000300.SH")
-    sector_rows_t = _get_sector_strength_rows(trade_date=trade_date, level=3)
-    shenwan_member_codes_t = _get_shenwan_member_codes_for_date(trade_date=trade_date)
-    citic_member_codes_t = _get_citic_member_codes_for_date(trade_date=trade_date)
+    """Load everything the engine needs for one trading day.
+
+    ``fundamental_fields`` optionally attaches point-in-time report fields (see
+    ``app.features.fundamentals.FIELD_DATASETS``) to ``frame_t`` as of ``trade_date``.
+    """
+    queries = _QueryCounter()
+    base_universe = universe_df if universe_df is not None else queries.run(list_stock_universe)
+    daily_t = queries.run(load_daily_for_date, trade_date)
+    daily_basic_t = queries.run(load_daily_basic_for_date, trade_date)
+    indicators_t = queries.run(load_indicators_for_date, trade_date)
+
+    daily_t1 = queries.run(load_daily_for_date, next_trade_date)
+    limit_t1 = queries.run(load_daily_limit_for_date, next_trade_date)
+    market_factor_t = queries.run(get_market_factor_for_date, trade_date=trade_date, ts_code="000300.SH")
+    sector_rows_t = [
+        row
+        for collection_name, source in _SECTOR_SOURCES
+        for row in queries.run(
+            _get_sector_strength_rows, collection_name=collection_name, source=source, trade_date=trade_date, level=3
+        )
+    ]
+    shenwan_member_codes_t = queries.run(_get_shenwan_member_codes_for_date, trade_date=trade_date)
+    citic_member_codes_t = queries.run(_get_citic_member_codes_for_date, trade_date=trade_date)
 
     frame_t = _merge_frames(
         universe_df=base_universe,
@@ -173,8 +188,13 @@ def load_daily_data_bundle(
         basic_df=daily_basic_t,
         indicators_df=indicators_t,
     )
+    if fundamental_fields and not frame_t.empty:
+        frame_t = queries.run(attach_fundamentals, frame_t, fields=fundamental_fields, trade_date=trade_date)
     frame_t1 = base_universe[["ts_code"]].copy()
     frame_t1 = frame_t1.merge(daily_t1, on="ts_code", how="left")
+    loaded_frames = [daily_t, daily_basic_t, indicators_t, daily_t1, limit_t1]
+    rows_loaded = sum(len(item) for item in loaded_frames if item is not None)
+    rows_loaded += len(sector_rows_t) + len(shenwan_member_codes_t) + len(citic_member_codes_t)
 
     return DailyDataBundle(
         trade_date=trade_date,
@@ -187,4 +207,6 @@ def load_daily_data_bundle(
         sector_rows_t=sector_rows_t,
         shenwan_member_codes_t=shenwan_member_codes_t,
         citic_member_codes_t=citic_member_codes_t,
+        rows_loaded=rows_loaded,
+        query_count=queries.count,
     )
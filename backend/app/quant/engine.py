@@ -4,6 +4,7 @@ import datetime as dt
 import logging
 import math
 from collections import deque
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from typing import Any
 
@@ -12,6 +13,7 @@ import pandas as pd
 
 from app.data.duckdb_backtest_store import list_open_trade_dates, list_stock_universe, normalize_date
 from app.data.tushare_client import fetch_index_weight
+from app.features.fundamentals import normalize_fundamental_fields
 from app.data.mongo_backtest import (
     clear_backtest_run_details,
     update_backtest_run,
@@ -21,13 +23,14 @@ from app.data.mongo_backtest import (
     upsert_backtest_trades,
 )
 from app.quant.allocator import calc_target_amount, calc_target_weight, pick_worst_holding, should_rotate
-from app.quant.base import StrategyContext, StrategyProtocol
-from app.quant.context import load_daily_data_bundle
+from app.quant.base import StrategyContext, StrategyProtocol, score_contexts
+from app.quant.context import DailyDataBundle, load_daily_data_bundle
 from app.quant.execution import execute_orders
 from app.quant.factors_market import classify_market_regime
 from app.quant.factors_sector import build_sector_strength_maps
 from app.quant.metrics import build_summary_metrics
 from app.quant.portfolio import PortfolioState
+from app.quant.profiling import EngineProfiler
 
 logger = logging.getLogger(__name__)
 
@@ -80,9 +83,25 @@ DEFAULT_BACKTEST_PARAMS: dict[str, Any] = {
     "max_annual_trade_count": 0,
     "max_annual_buy_count": 0,
     "max_annual_sell_count": 0,
+    "fundamental_fields": [],
 }
 
 
+SCORE_BLOCK_DAYS = 20
+
+
+class BacktestCancelled(Exception):
+    """Raised from a progress callback to stop a run cooperatively between trade days."""
+
+
+@dataclass(slots=True)
+class _PreparedDay:
+    idx: int
+    next_trade_date: str
+    bundle: DailyDataBundle
+    context: StrategyContext
+
+
 @dataclass(slots=True)
 class BacktestRunConfig:
     run_id: str
@@ -92,6 +111,9 @@ class BacktestRunConfig:
     end_date: str
     initial_capital: float = 1_000_000.0
     params_snapshot: dict[str, Any] | None = None
+    profile_hotspots: bool = False
+    # Called after each simulated day with (exec_date, day_index, total_days); may raise BacktestCancelled.
+    on_progress: Callable[[str, int, int], None] | None = None
 
 
 def _to_float(value: Any, default: float = 0.0) -> float:
@@ -498,6 +520,13 @@ class BacktestEngine:
         return merged
 
     def run(self, config: BacktestRunConfig) -> dict[str, Any]:
+        profiler = EngineProfiler(capture_hotspots=config.profile_hotspots)
+        try:
+            return self._run(config, profiler)
+        finally:
+            profiler.stop()
+
+    def _run(self, config: BacktestRunConfig, profiler: EngineProfiler) -> dict[str, Any]:
         start_date = normalize_date(config.start_date)
         end_date = normalize_date(config.end_date)
         params = self._merge_params(config.params_snapshot)
@@ -505,10 +534,12 @@ class BacktestEngine:
         allowed_boards = _normalize_allowed_boards(params.get("allowed_boards"))
         initial_capital = float(config.initial_capital)
         run_id = config.run_id
+        profiler.start()
 
         update_backtest_run(run_id=run_id, status="running", error_message="", summary_metrics={})
         clear_backtest_run_details(run_id)
 
+        profiler.switch("setup")
         open_dates = list_open_trade_dates(start_date=start_date, end_date=end_date)
         if len(open_dates) < 2:
             raise ValueError(f"not enough trading days in range: {start_date} - {end_date}")
@@ -530,6 +561,7 @@ class BacktestEngine:
                 logger.warning("universe filter skipped: index=%s has no members", universe_index_code)
         if universe_df.empty:
             raise ValueError("stock universe is empty after index filter")
+        profiler.pause()
 
         trade_index_map = {trade_date: idx for idx, trade_date in enumerate(open_dates)}
         portfolio = PortfolioState(initial_capital=initial_capital, cash=initial_capital, positions={})
@@ -539,6 +571,7 @@ class BacktestEngine:
         min_gross_exposure = max(min(_to_float(params.get("min_gross_exposure"), 0.0), 1.0), 0.0)
         use_member_sector_mapping = _to_bool(params.get("use_member_sector_mapping"), True)
         sector_source_weights = _normalize_sector_source_weights(params.get("sector_source_weights"))
+        fundamental_fields = normalize_fundamental_fields(params.get("fundamental_fields"))
         max_daily_buy_count = _normalize_limit(params.get("max_daily_buy_count"), 99)
         max_daily_sell_count = _normalize_limit(params.get("max_daily_sell_count"), 99)
         max_daily_trade_count = _normalize_limit(params.get("max_daily_trade_count"), 99)
@@ -574,44 +607,30 @@ class BacktestEngine:
         nav_rows: list[dict[str, Any]] = []
         all_trades: list[dict[str, Any]] = []
 
-        for idx, trade_date in enumerate(open_dates[:-1], start=1):
+        def _prepare_day(idx: int, trade_date: str) -> _PreparedDay | None:
             next_trade_date = open_dates[idx]
-            execution_trade_index = trade_index_map.get(next_trade_date, idx)
-            window_start_index = execution_trade_index - annual_trade_window_days + 1
-            while trade_events and trade_events[0][0] < window_start_index:
-                trade_events.popleft()
-
-            annual_trade_budget = -1
-            annual_buy_budget = -1
-            annual_sell_budget = -1
-            if max_annual_trade_count > 0 or max_annual_buy_count > 0 or max_annual_sell_count > 0:
-                rolling_trade_count = len(trade_events)
-                rolling_buy_count = sum(1 for _, side in trade_events if side == "BUY")
-                rolling_sell_count = rolling_trade_count - rolling_buy_count
-                if max_annual_trade_count > 0:
-                    annual_trade_budget = max(max_annual_trade_count - rolling_trade_count, 0)
-                if max_annual_buy_count > 0:
-                    annual_buy_budget = max(max_annual_buy_count - rolling_buy_count, 0)
-                if max_annual_sell_count > 0:
-                    annual_sell_budget = max(max_annual_sell_count - rolling_sell_count, 0)
-
-            bundle = load_daily_data_bundle(
-                trade_date=trade_date,
-                next_trade_date=next_trade_date,
-                universe_df=universe_df,
-            )
+            with profiler.phase("load_bundle"):
+                bundle = load_daily_data_bundle(
+                    trade_date=trade_date,
+                    next_trade_date=next_trade_date,
+                    universe_df=universe_df,
+                    fundamental_fields=fundamental_fields,
+                )
+            profiler.count("bundles_loaded")
+            profiler.count("rows_loaded", bundle.rows_loaded)
+            profiler.count("queries_issued", bundle.query_count)
             if bundle.frame_t.empty:
                 logger.info("[%s/%s] %s frame empty, skip", idx, len(open_dates) - 1, trade_date)
-                continue
+                return None
 
+            profiler.switch("filter")
             market_row = bundle.market_factor_t or {}
             market_regime, exposure = classify_market_regime(
                 market_row,
                 recent_pct_changes=market_pct_history,
             )
             market_pct_history.append(_to_float(market_row.get("pct_change"), 0.0))
-            if len(market_pct_history) > 40:
-                market_pct_history = market_pct_history[-40:]
+            del market_pct_history[:-40]
             exposure_map = dict(params.get("market_exposure") or {})
             market_exposure = _to_float(exposure_map.get(market_regime), exposure)
             if market_exposure < market_exposure_floor:
@@ -628,9 +647,12 @@ class BacktestEngine:
             frame = frame[frame["amount"].fillna(0) >= _to_float(params.get("min_avg_amount_20d"), 25_000.0)]
             frame = frame[frame["close"].notna() & frame["open"].notna()]
             if frame.empty:
+                profiler.pause()
                 logger.info("[%s/%s] %s no candidates after filters", idx, len(open_dates) - 1, trade_date)
-                continue
+                return None
+            profiler.count("candidate_rows", len(frame))
 
+            profiler.switch("sector_mapping")
             sector_strength_maps = build_sector_strength_maps(bundle.sector_rows_t)
             sector_strength_name_map = sector_strength_maps.get("name", {})
             sector_strength_sw_map = sector_strength_maps.get("sw_code", {})
@@ -661,10 +683,55 @@ class BacktestEngine:
                 market_exposure=market_exposure,
                 params=params,
             )
-            scored = self.strategy.score(strategy_context)
-            if scored.empty:
-                logger.info("[%s/%s] %s score empty", idx, len(open_dates) - 1, trade_date)
-                continue
+            profiler.pause()
+            return _PreparedDay(idx=idx, next_trade_date=next_trade_date, bundle=bundle, context=strategy_context)
+
+        def _iter_scored_days() -> Iterator[tuple[_PreparedDay, pd.DataFrame]]:
+            # Days are prepared in blocks so strategies with score_panel score a block in one pass.
+            pending: list[_PreparedDay] = []
+            last_idx = len(open_dates) - 1
+            for idx, trade_date in enumerate(open_dates[:-1], start=1):
+                day = _prepare_day(idx, trade_date)
+                if day is not None:
+                    pending.append(day)
+                if not pending or (len(pending) < SCORE_BLOCK_DAYS and idx < last_idx):
+                    continue
+                with profiler.phase("scoring"):
+                    scored_by_date = score_contexts(self.strategy, [item.context for item in pending])
+                for item in pending:
+                    scored = scored_by_date.get(item.context.trade_date)
+                    if scored is None or scored.empty:
+                        logger.info("[%s/%s] %s score empty", item.idx, last_idx, item.context.trade_date)
+                        continue
+                    yield item, scored
+                pending = []
+
+        for day, scored in _iter_scored_days():
+            idx = day.idx
+            trade_date = day.context.trade_date
+            next_trade_date = day.next_trade_date
+            bundle = day.bundle
+            market_regime = day.context.market_regime
+            market_exposure = day.context.market_exposure
+            profiler.switch("order_generation")
+            execution_trade_index = trade_index_map.get(next_trade_date, idx)
+            window_start_index = execution_trade_index - annual_trade_window_days + 1
+            while trade_events and trade_events[0][0] < window_start_index:
+                trade_events.popleft()
+
+            annual_trade_budget = -1
+            annual_buy_budget = -1
+            annual_sell_budget = -1
+            if max_annual_trade_count > 0 or max_annual_buy_count > 0 or max_annual_sell_count > 0:
+                rolling_trade_count = len(trade_events)
+                rolling_buy_count = sum(1 for _, side in trade_events if side == "BUY")
+                rolling_sell_count = rolling_trade_count - rolling_buy_count
+                if max_annual_trade_count > 0:
+                    annual_trade_budget = max(max_annual_trade_count - rolling_trade_count, 0)
+                if max_annual_buy_count > 0:
+                    annual_buy_budget = max(max_annual_buy_count - rolling_buy_count, 0)
+                if max_annual_sell_count > 0:
+                    annual_sell_budget = max(max_annual_sell_count - rolling_sell_count, 0)
 
             scored["raw_score"] = scored.get("total_score", 0).fillna(0.0)
             scored["score"] = scored["raw_score"].apply(lambda x: _effective_score(x, score_direction))
@@ -1014,6 +1081,7 @@ class BacktestEngine:
                     row["target_weight"] = _to_float(order.get("target_weight"))
                     row["target_amount"] = _to_float(order.get("target_amount"))
 
+            profiler.switch("execution")
             orders = sell_orders + buy_orders
             next_daily = bundle.frame_t1
             next_limit = bundle.limit_t1
@@ -1027,8 +1095,10 @@ class BacktestEngine:
                 next_limit_df=next_limit,
                 trade_index=execution_trade_index,
             )
+            profiler.switch("persist")
             if trades:
                 upsert_backtest_trades(trades)
+                profiler.count("rows_written", len(trades))
                 all_trades.extend(trades)
                 for trade in trades:
                     side = str(trade.get("side") or "").upper()
@@ -1041,6 +1111,7 @@ class BacktestEngine:
                             last_exit_trade_index[trade_ts_code] = trade_index_value
                         sell_signal_streak.pop(str(trade.get("ts_code") or ""), None)
 
+            profiler.switch("valuation")
             close_map_t1 = {}
             if next_daily is not None and not next_daily.empty:
                 for row in next_daily.to_dict(orient="records"):
@@ -1078,9 +1149,12 @@ class BacktestEngine:
                 "exposure": (total_equity_t1 - portfolio.cash) / total_equity_t1 if total_equity_t1 > 0 else 0.0,
                 "benchmark_nav": None,
             }
+            profiler.switch("persist")
             upsert_backtest_nav([nav_row])
+            profiler.count("rows_written")
             nav_rows.append(nav_row)
 
+            profiler.switch("valuation")
             score_map_for_snapshot = {str(row.get("ts_code")): _to_float(row.get("score")) for row in scored.to_dict(orient="records")}
             position_rows = portfolio.to_positions_snapshot(
                 run_id=run_id,
@@ -1089,8 +1163,10 @@ class BacktestEngine:
                 score_map=score_map_for_snapshot,
                 trade_index_map=trade_index_map,
             )
+            profiler.switch("persist")
             if position_rows:
                 upsert_backtest_positions(position_rows)
+                profiler.count("rows_written", len(position_rows))
 
             signal_records = list(signal_rows.values())
             if signal_store_topk > 0 and len(signal_records) > signal_store_topk:
@@ -1103,6 +1179,9 @@ class BacktestEngine:
                 )[:signal_store_topk]
             if signal_records:
                 upsert_backtest_signals(signal_records)
+                profiler.count("rows_written", len(signal_records))
+            profiler.pause()
+            profiler.count("days_simulated")
 
             logger.info(
                 "[%s/%s] signal_date=%s exec_date=%s direction=%s orders=%s trades=%s nav=%.4f cash=%.2f positions=%s",
@@ -1117,11 +1196,22 @@ class BacktestEngine:
                 portfolio.cash,
                 portfolio.holding_count(),
             )
-
-        summary_metrics = build_summary_metrics(
-            nav_rows=nav_rows,
-            initial_capital=initial_capital,
-            trades=all_trades,
+            if config.on_progress is not None:
+                config.on_progress(next_trade_date, idx, len(open_dates) - 1)
+
+        with profiler.phase("summary"):
+            summary_metrics = build_summary_metrics(
+                nav_rows=nav_rows,
+                initial_capital=initial_capital,
+                trades=all_trades,
+            )
+        profiler.stop()
+        perf_profile = profiler.summary()
+        summary_metrics["perf_profile"] = perf_profile
+        logger.info(
+            "run profile: total=%.2fs phases=%s",
+            perf_profile["total_seconds"],
+            ", ".join(f"{name}={item['seconds']:.2f}s" for name, item in perf_profile["phases"].items()),
         )
         update_backtest_run(
             run_id=run_id,
@@ -1137,6 +1227,14 @@ def run_backtest_with_guard(strategy: StrategyProtocol, config: BacktestRunConfi
     engine = BacktestEngine(strategy=strategy)
     try:
         return engine.run(config)
+    except BacktestCancelled:
+        update_backtest_run(
+            run_id=config.run_id,
+            status="cancelled",
+            error_message="cancelled",
+            finished_at=dt.datetime.now(dt.UTC),
+        )
+        raise
     except Exception as exc:
         update_backtest_run(
             run_id=config.run_id,
@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.features.forward_returns import forward_return_column
+from app.quant.base import StrategyContext, StrategyProtocol, score_contexts
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ANALYSIS_HORIZONS = (1, 5, 10, 20)
+DEFAULT_CHUNK_DAYS = 250
+
+
+@dataclass(slots=True)
+class FactorAnalysisResult:
+    daily: pd.DataFrame
+    quantile_returns: pd.DataFrame
+    summary: dict[str, Any] = field(default_factory=dict)
+
+
+def _ret_column(horizon: int) -> str:
+    return f"fwd_{horizon}d_ret"
+
+
+def _float_or_none(value: Any) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not np.isfinite(number):
+        return None
+    return number
+
+
+def build_score_panel(
+    strategy: StrategyProtocol,
+    panel: pd.DataFrame,
+    *,
+    params: dict[str, Any] | None = None,
+    score_column: str = "total_score",
+    score_direction: str = "normal",
+    market_regime: str = "neutral",
+) -> pd.DataFrame:
+    """Score a stacked (trade_date, ts_code) panel and return trade_date, ts_code, score.
+
+    Strategies with ``score_panel`` score the whole panel in one pass.
+
+    ``reverse`` direction mirrors the score as 100 - score; scores are clipped to [0, 100]
+    like the backtest engine does.
+    """
+    if panel is None or panel.empty:
+        return pd.DataFrame(columns=["trade_date", "ts_code", "score"])
+
+    score_panel = getattr(strategy, "score_panel", None)
+    if score_panel is not None:
+        scored = score_panel(panel, dict(params or {}))
+    else:
+        contexts = [
+            StrategyContext(
+                trade_date=str(trade_date),
+                frame=frame,
+                market_regime=market_regime,
+                market_exposure=1.0,
+                params=dict(params or {}),
+            )
+            for trade_date, frame in panel.groupby("trade_date", sort=True)
+        ]
+        scored_by_date = score_contexts(strategy, contexts)
+        scored = pd.concat(scored_by_date.values(), ignore_index=True) if scored_by_date else None
+    if scored is None or scored.empty or score_column not in scored.columns:
+        return pd.DataFrame(columns=["trade_date", "ts_code", "score"])
+
+    scores = pd.DataFrame(
+        {
+            "trade_date": scored["trade_date"].astype(str),
+            "ts_code": scored["ts_code"].astype(str),
+            "score": pd.to_numeric(scored[score_column], errors="coerce"),
+        }
+    )
+    scores["score"] = scores["score"].fillna(0.0)
+    if score_direction == "reverse":
+        scores["score"] = 100.0 - scores["score"]
+    scores["score"] = scores["score"].clip(lower=0.0, upper=100.0)
+    return scores
+
+
+def attach_forward_returns(
+    scores: pd.DataFrame,
+    forward_returns: pd.DataFrame,
+    *,
+    horizons: Sequence[int] = DEFAULT_ANALYSIS_HORIZONS,
+    basis: str = "cc",
+) -> pd.DataFrame:
+    """Join store forward returns (percent) onto a score panel as ``fwd_Nd_ret`` fractions."""
+    source_columns = {forward_return_column(h, basis): _ret_column(h) for h in horizons}
+    keep = ["trade_date", "ts_code", *source_columns]
+    returns = forward_returns.reindex(columns=keep).rename(columns=source_columns)
+    returns = returns.astype({"trade_date": str, "ts_code": str})
+    for column in source_columns.values():
+        returns[column] = pd.to_numeric(returns[column], errors="coerce") / 100.0
+    frame = scores.astype({"trade_date": str, "ts_code": str}).merge(returns, on=["trade_date", "ts_code"], how="left")
+    return frame
+
+
+def _grouped_corr(keys: pd.Series, x: pd.Series, y: pd.Series, *, min_count: int = 3) -> pd.Series:
+    """Per-group Pearson correlation computed from grouped moments in one pass."""
+    frame = pd.DataFrame({"key": keys.to_numpy(), "x": x.to_numpy(dtype=float), "y": y.to_numpy(dtype=float)})
+    grouped = frame.groupby("key", sort=True)
+    frame["dx"] = frame["x"] - grouped["x"].transform("mean")
+    frame["dy"] = frame["y"] - grouped["y"].transform("mean")
+    frame["dxy"] = frame["dx"] * frame["dy"]
+    frame["dxx"] = frame["dx"] * frame["dx"]
+    frame["dyy"] = frame["dy"] * frame["dy"]
+    sums = frame.groupby("key", sort=True).agg(
+        n=("x", "size"),
+        dxy=("dxy", "sum"),
+        dxx=("dxx", "sum"),
+        dyy=("dyy", "sum"),
+    )
+    denominator = np.sqrt(sums["dxx"] * sums["dyy"])
+    corr = sums["dxy"] / denominator.where(denominator > 1e-12)
+    return corr.where(sums["n"] >= min_count)
+
+
+def _previous_date_map(dates: Sequence[str]) -> dict[str, str]:
+    return {current: previous for previous, current in zip(dates[:-1], dates[1:])}
+
+
+def _top_k_turnover(frame: pd.DataFrame, dates: Sequence[str], top_k: int) -> pd.Series:
+    ordered = frame.sort_values(["trade_date", "score", "ts_code"], ascending=[True, False, True], kind="mergesort")
+    top = ordered[ordered.groupby("trade_date", sort=False).cumcount() < top_k][["trade_date", "ts_code"]]
+    next_date = {previous: current for current, previous in _previous_date_map(dates).items()}
+    carried = top.assign(trade_date=top["trade_date"].map(next_date)).dropna(subset=["trade_date"])
+    overlap = top.merge(carried, on=["trade_date", "ts_code"], how="inner").groupby("trade_date").size()
+    size = top.groupby("trade_date").size()
+    has_previous = size.index.isin(list(next_date.values()))
+    turnover = 1.0 - overlap.reindex(size.index, fill_value=0) / size.clip(lower=1)
+    return turnover.where(has_previous)
+
+
+def _factor_autocorr(frame: pd.DataFrame, dates: Sequence[str]) -> pd.Series:
+    ranks = frame[["trade_date", "ts_code"]].copy()
+    ranks["rank"] = frame.groupby("trade_date", sort=False)["score"].rank(pct=True)
+    next_date = {previous: current for current, previous in _previous_date_map(dates).items()}
+    previous = ranks.assign(trade_date=ranks["trade_date"].map(next_date)).dropna(subset=["trade_date"])
+    paired = ranks.merge(previous, on=["trade_date", "ts_code"], how="inner", suffixes=("", "_prev"))
+    if paired.empty:
+        return pd.Series(dtype=float)
+    return _grouped_corr(paired["trade_date"], paired["rank"], paired["rank_prev"])
+
+
+def _analyze_chunk(
+    frame: pd.DataFrame,
+    lead_date: str | None,
+    horizons: Sequence[int],
+    quantiles: int,
+    top_k: int,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Daily metrics for the dates of one chunk.
+
+    ``lead_date`` is the last date of the previous chunk; it is only used as the "previous
+    day" for turnover and autocorrelation and is not reported.
+    """
+    frame = frame.dropna(subset=["score"])
+    dates = sorted(frame["trade_date"].unique().tolist())
+    daily = pd.DataFrame(index=pd.Index(dates, name="trade_date"))
+    daily["sample_size"] = frame.groupby("trade_date").size()
+
+    quantile_frames: list[pd.DataFrame] = []
+    for horizon in horizons:
+        column = _ret_column(horizon)
+        valid = frame.dropna(subset=[column])
+        if valid.empty:
+            continue
+        by_date = valid.groupby("trade_date", sort=False)
+        score_rank = by_date["score"].rank(method="average")
+        ret_rank = by_date[column].rank(method="average")
+        daily[f"rank_ic_{horizon}d"] = _grouped_corr(valid["trade_date"], score_rank, ret_rank)
+        daily[f"pearson_ic_{horizon}d"] = _grouped_corr(valid["trade_date"], valid["score"], valid[column])
+
+        counts = by_date["score"].transform("size")
+        bucketed = valid.loc[counts >= quantiles, ["trade_date", column]].copy()
+        if bucketed.empty:
+            continue
+        first_rank = by_date["score"].rank(method="first")[counts >= quantiles]
+        bucket_counts = counts[counts >= quantiles]
+        bucketed["bucket"] = (np.floor((first_rank - 1) * quantiles / bucket_counts) + 1).astype(int)
+        bucket_ret = bucketed.groupby(["trade_date", "bucket"], sort=True)[column].mean().unstack("bucket")
+        bucket_ret = bucket_ret.reindex(columns=range(1, quantiles + 1))
+        daily[f"long_short_{horizon}d"] = bucket_ret[quantiles] - bucket_ret[1]
+        quantile_frames.append(
+            bucket_ret.stack(future_stack=True).rename("ret").reset_index().assign(horizon=horizon)
+        )
+
+    daily["top_k_turnover"] = _top_k_turnover(frame, dates, top_k)
+    daily["factor_autocorr"] = _factor_autocorr(frame, dates)
+
+    if lead_date is not None:
+        daily = daily.drop(index=lead_date, errors="ignore")
+    quantile_returns = (
+        pd.concat(quantile_frames, ignore_index=True)
+        if quantile_frames
+        else pd.DataFrame(columns=["trade_date", "bucket", "ret", "horizon"])
+    )
+    if lead_date is not None and not quantile_returns.empty:
+        quantile_returns = quantile_returns[quantile_returns["trade_date"] != lead_date]
+    return daily.reset_index(), quantile_returns[["trade_date", "horizon", "bucket", "ret"]]
+
+
+def _chunk_panel(frame: pd.DataFrame, chunk_days: int) -> list[tuple[pd.DataFrame, str | None]]:
+    dates = sorted(frame["trade_date"].unique().tolist())
+    chunks: list[tuple[pd.DataFrame, str | None]] = []
+    for start in range(0, len(dates), chunk_days):
+        lead_date = dates[start - 1] if start > 0 else None
+        window = dates[max(start - 1, 0) : start + chunk_days]
+        chunks.append((frame[frame["trade_date"].isin(window)], lead_date))
+    return chunks
+
+
+def _attach_base_horizon_columns(
+    daily: pd.DataFrame,
+    quantile_returns: pd.DataFrame,
+    *,
+    horizon: int,
+    quantiles: int,
+) -> pd.DataFrame:
+    """Unsuffixed daily columns of the base (shortest) horizon, as the factor report writes them.
+
+    Adds ``pearson_ic``, ``rank_ic``, ``bucket_N_ret``, ``top_bucket_ret``, ``bottom_bucket_ret``
+    and ``long_short_ret``.
+    """
+    frame = daily.copy()
+    frame["pearson_ic"] = frame.get(f"pearson_ic_{horizon}d", np.nan)
+    frame["rank_ic"] = frame.get(f"rank_ic_{horizon}d", np.nan)
+    rows = quantile_returns[quantile_returns["horizon"] == horizon]
+    buckets = rows.pivot_table(index="trade_date", columns="bucket", values="ret", aggfunc="first")
+    buckets = buckets.reindex(index=frame["trade_date"], columns=range(1, quantiles + 1))
+    for bucket in range(1, quantiles + 1):
+        frame[f"bucket_{bucket}_ret"] = pd.to_numeric(buckets[bucket], errors="coerce").to_numpy()
+    frame["top_bucket_ret"] = frame[f"bucket_{quantiles}_ret"]
+    frame["bottom_bucket_ret"] = frame["bucket_1_ret"]
+    frame["long_short_ret"] = frame["top_bucket_ret"] - frame["bottom_bucket_ret"]
+    return frame
+
+
+def _cum_return(daily: pd.DataFrame, column: str) -> float | None:
+    if column not in daily.columns or daily.empty:
+        return None
+    return _float_or_none((1.0 + pd.to_numeric(daily[column], errors="coerce").fillna(0.0)).prod() - 1.0)
+
+
+def _column_mean(daily: pd.DataFrame, column: str) -> float | None:
+    return _float_or_none(pd.to_numeric(daily[column], errors="coerce").mean()) if column in daily.columns else None
+
+
+def _summarize(
+    daily: pd.DataFrame,
+    quantile_returns: pd.DataFrame,
+    *,
+    horizons: Sequence[int],
+    quantiles: int,
+    top_k: int,
+) -> dict[str, Any]:
+    base_horizon = min(horizons) if horizons else None
+    rank_ic = pd.to_numeric(daily["rank_ic"], errors="coerce").dropna() if "rank_ic" in daily.columns else pd.Series(dtype=float)
+    long_short = (
+        pd.to_numeric(daily["long_short_ret"], errors="coerce").dropna()
+        if "long_short_ret" in daily.columns
+        else pd.Series(dtype=float)
+    )
+    # Compounding is only meaningful for non-overlapping (one-day) returns.
+    compounding = base_horizon == 1
+    summary: dict[str, Any] = {
+        "days": int(len(daily)),
+        "quantiles": quantiles,
+        "deciles": quantiles,
+        "top_k": top_k,
+        "base_horizon": base_horizon,
+        "mean_pearson_ic": _column_mean(daily, "pearson_ic"),
+        "mean_rank_ic": _float_or_none(rank_ic.mean()),
+        "ic_positive_ratio": _float_or_none((rank_ic > 0).mean()) if not rank_ic.empty else None,
+        "mean_top_bucket_ret": _column_mean(daily, "top_bucket_ret"),
+        "mean_bottom_bucket_ret": _column_mean(daily, "bottom_bucket_ret"),
+        "mean_long_short_ret": _float_or_none(long_short.mean()),
+        "long_short_win_rate": _float_or_none((long_short > 0).mean()) if not long_short.empty else None,
+        "long_short_cum_return": _cum_return(daily, "long_short_ret") if compounding else None,
+        "top_bucket_cum_return": _cum_return(daily, "top_bucket_ret") if compounding else None,
+        "bottom_bucket_cum_return": _cum_return(daily, "bottom_bucket_ret") if compounding else None,
+        "avg_top_k_turnover": _float_or_none(daily["top_k_turnover"].mean()) if not daily.empty else None,
+        "median_top_k_turnover": _float_or_none(daily["top_k_turnover"].median()) if not daily.empty else None,
+        "mean_factor_autocorr": _float_or_none(daily["factor_autocorr"].mean()) if not daily.empty else None,
+        "horizons": {},
+    }
+    for horizon in horizons:
+        ic_column = f"rank_ic_{horizon}d"
+        if ic_column not in daily.columns:
+            continue
+        rank_ic = daily[ic_column].dropna()
+        ic_std = rank_ic.std()
+        long_short = daily[f"long_short_{horizon}d"].dropna() if f"long_short_{horizon}d" in daily else pd.Series(dtype=float)
+        buckets = quantile_returns[quantile_returns["horizon"] == horizon].groupby("bucket")["ret"].mean()
+        summary["horizons"][str(horizon)] = {
+            "ic_days": int(len(rank_ic)),
+            "mean_rank_ic": _float_or_none(rank_ic.mean()),
+            "rank_ic_std": _float_or_none(ic_std),
+            "rank_icir": _float_or_none(rank_ic.mean() / ic_std) if ic_std and ic_std > 0 else None,
+            "ic_positive_ratio": _float_or_none((rank_ic > 0).mean()) if not rank_ic.empty else None,
+            "mean_pearson_ic": _float_or_none(daily[f"pearson_ic_{horizon}d"].mean()),
+            "mean_long_short_ret": _float_or_none(long_short.mean()),
+            "long_short_win_rate": _float_or_none((long_short > 0).mean()) if not long_short.empty else None,
+            "mean_top_bucket_ret": _float_or_none(buckets.get(quantiles)),
+            "mean_bottom_bucket_ret": _float_or_none(buckets.get(1)),
+            "mean_quantile_ret": {str(int(bucket)): _float_or_none(value) for bucket, value in buckets.items()},
+        }
+    return summary
+
+
+def analyze_factor_panel(
+    panel: pd.DataFrame,
+    *,
+    horizons: Iterable[int] = DEFAULT_ANALYSIS_HORIZONS,
+    quantiles: int = 10,
+    top_k: int = 100,
+    workers: int = 1,
+    chunk_days: int = DEFAULT_CHUNK_DAYS,
+) -> FactorAnalysisResult:
+    """Cross-sectional factor diagnostics over a stacked score panel.
+
+    ``panel`` has one row per (trade_date, ts_code) with ``score`` and the ``fwd_Nd_ret``
+    columns produced by :func:`attach_forward_returns`. Every metric is computed with
+    grouped operations per trade date; with ``workers > 1`` date chunks are analysed in
+    separate processes.
+    """
+    horizons = tuple(int(h) for h in horizons)
+    quantiles = max(int(quantiles), 2)
+    top_k = max(int(top_k), 1)
+    if panel is None or panel.empty:
+        empty_daily = pd.DataFrame(columns=["trade_date", "sample_size", "top_k_turnover", "factor_autocorr"])
+        empty_quantiles = pd.DataFrame(columns=["trade_date", "horizon", "bucket", "ret"])
+        return FactorAnalysisResult(
+            daily=empty_daily,
+            quantile_returns=empty_quantiles,
+            summary=_summarize(empty_daily, empty_quantiles, horizons=horizons, quantiles=quantiles, top_k=top_k),
+        )
+
+    frame = panel.reindex(columns=["trade_date", "ts_code", "score", *(_ret_column(h) for h in horizons)])
+    frame = frame.astype({"trade_date": str, "ts_code": str})
+    chunks = _chunk_panel(frame, max(int(chunk_days), 2))
+    if workers > 1 and len(chunks) > 1:
+        # spawn, not fork: the API process is multi-threaded.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=context) as executor:
+            results = list(
+                executor.map(
+                    _analyze_chunk,
+                    [chunk for chunk, _ in chunks],
+                    [lead for _, lead in chunks],
+                    [horizons] * len(chunks),
+                    [quantiles] * len(chunks),
+                    [top_k] * len(chunks),
+                )
+            )
+    else:
+        results = [_analyze_chunk(chunk, lead, horizons, quantiles, top_k) for chunk, lead in chunks]
+
+    daily = pd.concat([item[0] for item in results], ignore_index=True).sort_values("trade_date", ignore_index=True)
+    quantile_returns = pd.concat([item[1] for item in results], ignore_index=True)
+    quantile_returns = quantile_returns.sort_values(["horizon", "trade_date", "bucket"], ignore_index=True)
+    daily = _attach_base_horizon_columns(daily, quantile_returns, horizon=min(horizons), quantiles=quantiles)
+    summary = _summarize(daily, quantile_returns, horizons=horizons, quantiles=quantiles, top_k=top_k)
+    logger.info("factor analysis done: days=%s chunks=%s workers=%s", summary["days"], len(chunks), workers)
+    return FactorAnalysisResult(daily=daily, quantile_returns=quantile_returns, summary=summary)
@@ -18,9 +18,10 @@ def _clip_series(series: pd.Series, low: float = 0.0, high: float = 100.0) -> pd
     return series.fillna(0.0).clip(lower=low, upper=high)
 
 
-def _safe_rank_score(series: pd.Series, ascending: bool = True) -> pd.Series:
+def _safe_rank_score(series: pd.Series, ascending: bool = True, groups: pd.Series | None = None) -> pd.Series:
     valid = series.replace([np.inf, -np.inf], np.nan)
-    pct = valid.rank(method="average", ascending=ascending, pct=True)
+    ranker = valid.groupby(groups, sort=False) if groups is not None else valid
+    pct = ranker.rank(method="average", ascending=ascending, pct=True)
     return pct.fillna(0.5) * 100.0
 
 
@@ -48,24 +49,31 @@ def _trend_score(frame: pd.DataFrame) -> pd.Series:
     return _clip_series(score)
 
 
-def _value_quality_score(frame: pd.DataFrame) -> pd.Series:
-    pe_score = _safe_rank_score(frame.get("pe_ttm"), ascending=False)
-    pb_score = _safe_rank_score(frame.get("pb"), ascending=False)
-    return _clip_series(pe_score * 0.6 + pb_score * 0.4)
+def _value_quality_score(frame: pd.DataFrame, groups: pd.Series | None = None) -> pd.Series:
+    pe_score = _safe_rank_score(frame.get("pe_ttm"), ascending=False, groups=groups)
+    pb_score = _safe_rank_score(frame.get("pb"), ascending=False, groups=groups)
+    # roe / debt_to_assets are only present when point-in-time fundamentals were attached.
+    if "roe" not in frame.columns or "debt_to_assets" not in frame.columns:
+        return _clip_series(pe_score * 0.6 + pb_score * 0.4)
+    roe_score = _safe_rank_score(pd.to_numeric(frame["roe"], errors="coerce"), ascending=True, groups=groups)
+    leverage_score = _safe_rank_score(
+        pd.to_numeric(frame["debt_to_assets"], errors="coerce"), ascending=False, groups=groups
+    )
+    return _clip_series(pe_score * 0.4 + pb_score * 0.25 + roe_score * 0.25 + leverage_score * 0.1)
 
 
-def _liquidity_stability_score(frame: pd.DataFrame) -> pd.Series:
+def _liquidity_stability_score(frame: pd.DataFrame, groups: pd.Series | None = None) -> pd.Series:
     amount = frame.get("amount")
     turnover = frame.get("turnover_rate")
     atr = frame.get("atr")
     close = frame.get("close_qfq")
     vol_ratio = frame.get("volume_ratio")
 
-    amount_score = _safe_rank_score(amount, ascending=True)
-    turnover_score = _safe_rank_score(turnover, ascending=True)
+    amount_score = _safe_rank_score(amount, ascending=True, groups=groups)
+    turnover_score = _safe_rank_score(turnover, ascending=True, groups=groups)
     atr_ratio = (atr / close.replace(0, np.nan)).replace([np.inf, -np.inf], np.nan)
-    atr_score = _safe_rank_score(atr_ratio, ascending=False)
-    activity = _safe_rank_score(vol_ratio, ascending=True)
+    atr_score = _safe_rank_score(atr_ratio, ascending=False, groups=groups)
+    activity = _safe_rank_score(vol_ratio, ascending=True, groups=groups)
     return _clip_series(amount_score * 0.35 + turnover_score * 0.25 + atr_score * 0.25 + activity * 0.15)
 
 
@@ -91,16 +99,10 @@ def _resolve_factor_weights(params: dict[str, Any] | None) -> dict[str, float]:
     return {key: weight / total for key, weight in parsed.items()}
 
 
-def build_stock_factor_scores(
-    frame: pd.DataFrame,
-    params: dict[str, Any] | None = None,
-) -> pd.DataFrame:
-    if frame is None or frame.empty:
-        return pd.DataFrame()
-    data = frame.copy()
+def _score_frame(data: pd.DataFrame, params: dict[str, Any] | None, groups: pd.Series | None) -> pd.DataFrame:
     data["stock_trend"] = _trend_score(data)
-    data["value_quality"] = _value_quality_score(data)
-    data["liquidity_stability"] = _liquidity_stability_score(data)
+    data["value_quality"] = _value_quality_score(data, groups)
+    data["liquidity_stability"] = _liquidity_stability_score(data, groups)
     weights = _resolve_factor_weights(params)
     data["total_score"] = (
         data["stock_trend"] * weights["stock_trend"]
@@ -109,3 +111,23 @@ def build_stock_factor_scores(
         + data["liquidity_stability"] * weights["liquidity_stability"]
     ).clip(lower=0.0, upper=100.0)
     return data
+
+
+def build_stock_factor_scores(
+    frame: pd.DataFrame,
+    params: dict[str, Any] | None = None,
+) -> pd.DataFrame:
+    if frame is None or frame.empty:
+        return pd.DataFrame()
+    return _score_frame(frame.copy(), params, groups=None)
+
+
+def build_stock_factor_panel_scores(
+    panel: pd.DataFrame,
+    params: dict[str, Any] | None = None,
+) -> pd.DataFrame:
+    """Score a stacked multi-date panel; cross-sectional ranks are taken per ``trade_date``."""
+    if panel is None or panel.empty:
+        return pd.DataFrame()
+    data = panel.reset_index(drop=True)
+    return _score_frame(data, params, groups=data["trade_date"])
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def align_nav_panel(rows: Iterable[dict[str, Any]], run_ids: Sequence[str]) -> tuple[list[str], np.ndarray]:
+    """Align NAV rows of several runs on the union of their trade dates.
+
+    Returns the sorted dates and a ``(len(run_ids), len(dates))`` float matrix. Gaps inside a
+    run's own date range carry its last NAV forward; dates outside that range stay NaN.
+    """
+    position = {run_id: idx for idx, run_id in enumerate(run_ids)}
+    points: list[tuple[int, str, float]] = []
+    for row in rows:
+        idx = position.get(str(row.get("run_id") or ""))
+        trade_date = str(row.get("trade_date") or "")
+        nav = row.get("nav")
+        if idx is None or not trade_date or nav is None:
+            continue
+        points.append((idx, trade_date, float(nav)))
+    dates = sorted({trade_date for _, trade_date, _ in points})
+    date_idx = {trade_date: idx for idx, trade_date in enumerate(dates)}
+    matrix = np.full((len(run_ids), len(dates)), np.nan)
+    for idx, trade_date, nav in points:
+        matrix[idx, date_idx[trade_date]] = nav
+    for series in matrix:
+        valid = np.flatnonzero(~np.isnan(series))
+        if valid.size == 0:
+            continue
+        first, last = valid[0], valid[-1]
+        # Forward fill inside [first, last] via the index of the latest valid observation.
+        filled = np.where(~np.isnan(series[first : last + 1]), np.arange(first, last + 1), 0)
+        series[first : last + 1] = series[np.maximum.accumulate(filled)]
+    return dates, matrix
+
+
+def nav_columns(matrix: np.ndarray) -> list[list[float | None]]:
+    """JSON-ready per-run arrays; NaN (no NAV on that date) becomes ``None``."""
+    return [[float(value) if math.isfinite(value) else None for value in series] for series in matrix.tolist()]
+
+
+def minmax_indices(matrix: np.ndarray, max_points: int) -> np.ndarray:
+    """Column indices keeping every run's min and max per bucket, plus both endpoints.
+
+    Buckets are sized so that the union over all runs never exceeds ``max_points``; the
+    decimated curves therefore keep every peak and trough the eye would notice.
+    """
+    n_runs, n_points = matrix.shape
+    if n_points <= max_points:
+        return np.arange(n_points)
+    n_buckets = max((max_points - 2) // (2 * max(n_runs, 1)), 1)
+    edges = np.linspace(1, n_points - 1, n_buckets + 1).astype(int)
+    keep = [0, n_points - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        bucket = matrix[:, start:end]
+        for series in bucket:
+            if np.isnan(series).all():
+                continue
+            keep.append(start + int(np.nanargmin(series)))
+            keep.append(start + int(np.nanargmax(series)))
+    return np.unique(np.asarray(keep, dtype=int))
+
+
+def lttb_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets selection over one series (NaNs count as missing)."""
+    n_points = values.shape[0]
+    if n_points <= max_points or max_points < 3:
+        return np.arange(n_points)
+    y = np.where(np.isnan(values), np.nanmean(values), values)
+    x = np.arange(n_points, dtype=float)
+    edges = np.linspace(1, n_points - 1, max_points - 1).astype(int)
+    keep = np.empty(max_points, dtype=int)
+    keep[0], keep[-1] = 0, n_points - 1
+    prev = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+        next_start, next_end = edges[bucket + 1], edges[bucket + 2] if bucket + 2 < len(edges) else n_points
+        next_end = max(next_end, next_start + 1)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[prev] - avg_x) * (y[start:end] - y[prev]) - (x[prev] - x[start:end]) * (avg_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        keep[bucket + 1] = prev
+    return np.unique(keep)
+
+
+def downsample_indices(matrix: np.ndarray, max_points: int | None, method: str = "minmax") -> np.ndarray:
+    n_points = matrix.shape[1]
+    if not max_points or n_points <= max_points:
+        return np.arange(n_points)
+    if method == "lttb":
+        # One shared index keeps the runs aligned; LTTB follows the cross-run average curve.
+        with np.errstate(all="ignore"):
+            driver = np.nanmean(matrix, axis=0) if matrix.shape[0] else np.zeros(n_points)
+        return lttb_indices(driver, max_points)
+    if method == "minmax":
+        return minmax_indices(matrix, max_points)
+    raise ValueError(f"unsupported downsample method: {method}")
+
+
+def _max_drawdown(nav: np.ndarray) -> float:
+    if nav.size == 0:
+        return 0.0
+    peak = np.maximum.accumulate(nav)
+    return float(np.min(np.where(peak > 0, nav / peak - 1.0, 0.0)))
+
+
+def _finite(value: float) -> float | None:
+    return float(value) if math.isfinite(value) else None
+
+
+def relative_metrics(matrix: np.ndarray, run_ids: Sequence[str], base_index: int = 0) -> list[dict[str, Any]]:
+    """Metrics of every run relative to ``run_ids[base_index]`` on their overlapping dates.
+
+    ``excess_max_drawdown`` is the max drawdown of the relative NAV (run / base), i.e. the
+    worst stretch of underperformance; ``tracking_error`` is annualised.
+    """
+    base = matrix[base_index]
+    base_id = run_ids[base_index]
+    items: list[dict[str, Any]] = []
+    for idx, run_id in enumerate(run_ids):
+        if idx == base_index:
+            continue
+        overlap = ~np.isnan(base) & ~np.isnan(matrix[idx])
+        run_nav, base_nav = matrix[idx][overlap], base[overlap]
+        item: dict[str, Any] = {
+            "run_id": run_id,
+            "base_run_id": base_id,
+            "overlap_days": int(overlap.sum()),
+            "correlation": None,
+            "tracking_error": None,
+            "excess_return": None,
+            "excess_max_drawdown": None,
+        }
+        if run_nav.size >= 2 and np.all(base_nav > 0) and np.all(run_nav > 0):
+            run_ret = run_nav[1:] / run_nav[:-1] - 1.0
+            base_ret = base_nav[1:] / base_nav[:-1] - 1.0
+            diff = run_ret - base_ret
+            if run_ret.size >= 2 and run_ret.std() > 0 and base_ret.std() > 0:
+                item["correlation"] = _finite(np.corrcoef(run_ret, base_ret)[0, 1])
+            if diff.size >= 2:
+                item["tracking_error"] = _finite(diff.std(ddof=1) * math.sqrt(TRADING_DAYS_PER_YEAR))
+            relative = (run_nav / run_nav[0]) / (base_nav / base_nav[0])
+            item["excess_return"] = _finite(relative[-1] - 1.0)
+            item["excess_max_drawdown"] = _max_drawdown(relative)
+        items.append(item)
+    return items
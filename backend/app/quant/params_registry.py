@@ -3,6 +3,7 @@ from __future__ import annotations
 import math
 from typing import Any
 
+from app.features.fundamentals import normalize_fundamental_fields
 from app.quant.engine import DEFAULT_BACKTEST_PARAMS
 
 DEFAULT_STRATEGY_KEY = "multifactor_v1"
@@ -218,6 +219,7 @@ def _normalize_known_keys(merged: dict[str, Any], defaults: dict[str, Any]) -> d
 
     merged["score_direction"] = _normalize_score_direction(merged.get("score_direction"))
     merged["allowed_boards"] = _normalize_allowed_boards(merged.get("allowed_boards"))
+    merged["fundamental_fields"] = normalize_fundamental_fields(merged.get("fundamental_fields"))
     merged["market_exposure"] = _normalize_market_exposure(
         merged.get("market_exposure"),
         defaults.get("market_exposure") if isinstance(defaults.get("market_exposure"), dict) else {"risk_on": 1.0, "neutral": 0.7, "risk_off": 0.4},
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+HOTSPOT_LIMIT = 25
+
+
+class EngineProfiler:
+    """Per-phase wall-clock timers and counters for one engine run.
+
+    Phases are flat (no nesting) so their seconds add up to the timed part of the run;
+    anything outside a phase is reported as ``unaccounted_seconds``. ``phase()`` times a
+    block, ``switch()`` closes the open stopwatch phase and starts the next one for long
+    straight-line code; do not open a ``phase()`` while a ``switch()`` phase is running.
+    ``capture_hotspots`` additionally runs cProfile over the whole run and keeps the top
+    functions.
+    """
+
+    def __init__(self, *, capture_hotspots: bool = False):
+        self._seconds: dict[str, float] = defaultdict(float)
+        self._calls: dict[str, int] = defaultdict(int)
+        self._counters: dict[str, int] = defaultdict(int)
+        self._profile = cProfile.Profile() if capture_hotspots else None
+        self._started_at = 0.0
+        self._elapsed = 0.0
+        self._current: str | None = None
+        self._current_began = 0.0
+        self._running = False
+
+    def start(self) -> None:
+        self._started_at = time.perf_counter()
+        self._running = True
+        if self._profile is not None:
+            self._profile.enable()
+
+    def stop(self) -> None:
+        """End the run; safe to call again, e.g. from a ``finally`` after an early error."""
+        if not self._running:
+            return
+        self._running = False
+        self.pause()
+        if self._profile is not None:
+            self._profile.disable()
+        self._elapsed = time.perf_counter() - self._started_at
+
+    def switch(self, name: str) -> None:
+        now = time.perf_counter()
+        self._close_current(now)
+        self._current = name
+        self._current_began = now
+        self._calls[name] += 1
+
+    def pause(self) -> None:
+        self._close_current(time.perf_counter())
+        self._current = None
+
+    def _close_current(self, now: float) -> None:
+        if self._current is not None:
+            self._seconds[self._current] += now - self._current_began
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._seconds[name] += time.perf_counter() - began
+            self._calls[name] += 1
+
+    def count(self, name: str, value: int = 1) -> None:
+        self._counters[name] += int(value)
+
+    def _hotspots(self) -> list[dict[str, Any]]:
+        if self._profile is None:
+            return []
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        rows = []
+        for (filename, lineno, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():  # type: ignore[attr-defined]
+            rows.append(
+                {
+                    "function": f"{filename}:{lineno}({func})",
+                    "calls": ncalls,
+                    "tottime": round(tottime, 4),
+                    "cumtime": round(cumtime, 4),
+                }
+            )
+        rows.sort(key=lambda row: row["cumtime"], reverse=True)
+        return rows[:HOTSPOT_LIMIT]
+
+    def summary(self) -> dict[str, Any]:
+        total = self._elapsed
+        timed = sum(self._seconds.values())
+        phases = {
+            name: {
+                "seconds": round(seconds, 4),
+                "calls": self._calls[name],
+                "share": round(seconds / total, 4) if total > 0 else 0.0,
+            }
+            for name, seconds in sorted(self._seconds.items(), key=lambda item: item[1], reverse=True)
+        }
+        result: dict[str, Any] = {
+            "total_seconds": round(total, 4),
+            "unaccounted_seconds": round(max(total - timed, 0.0), 4),
+            "phases": phases,
+            "counters": dict(sorted(self._counters.items())),
+        }
+        if self._profile is not None:
+            result["hotspots"] = self._hotspots()
+        return result
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import datetime as dt
 import math
+import time
 import uuid
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
 from types import SimpleNamespace
 from typing import Any
 
+from app.core.config import settings
 from app.data.duckdb_store import list_latest_daily_prices
 from app.data.mongo import get_collection
 from app.data.mongo_agent_freedom import (
@@ -242,6 +245,7 @@ def _log_skill_result(
         "attempts": result.attempts,
         "error": result.error,
         "model": result.model,
+        "cached": bool(getattr(result, "cached", False)),
         "input": input_payload,
         "output": result.data if result.ok else None,
     }
@@ -254,6 +258,7 @@ def _call_p0_skills(
     market_row: dict[str, Any] | None,
     signal_rows: list[dict[str, Any]],
     shenwan_rows: list[dict[str, Any]],
+    bypass_cache: bool = False,
 ) -> tuple[dict[str, Any], list[str], list[str]]:
     results: dict[str, Any] = {}
     degrade_flags: list[str] = []
@@ -290,21 +295,41 @@ def _call_p0_skills(
         },
     }
 
-    for skill_name in _SKILL_P0:
-        req_id = uuid.uuid4().hex
-        try:
-            result = call_skill(
+    # Skills are independent HTTP calls, so the AI phase costs the slowest skill rather
+    # than the sum; results are still logged and merged in _SKILL_P0 order.
+    request_ids = {skill_name: uuid.uuid4().hex for skill_name in _SKILL_P0}
+    deadline = time.monotonic() + max(int(settings.ai_runner_run_deadline_seconds), 1)
+    executor = ThreadPoolExecutor(max_workers=len(_SKILL_P0), thread_name_prefix="agent-skill")
+    try:
+        futures = {
+            skill_name: executor.submit(
+                call_skill,
                 skill_name=skill_name,
                 trade_date=trade_date,
-                request_id=req_id,
+                request_id=request_ids[skill_name],
                 input_payload=skill_inputs.get(skill_name, {}),
+                deadline=deadline,
+                bypass_cache=bypass_cache,
             )
+            for skill_name in _SKILL_P0
+        }
+        wait(futures.values(), timeout=max(deadline - time.monotonic(), 0.0))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for skill_name in _SKILL_P0:
+        req_id = request_ids[skill_name]
+        future = futures[skill_name]
+        try:
+            if not future.done():
+                raise TimeoutError("run deadline exceeded")
+            result = future.result()
         except Exception as exc:  # graceful degrade when runner is unavailable
             result = SimpleNamespace(
                 request_id=req_id,
                 skill_name=skill_name,
                 ok=False,
-                status="upstream_error",
+                status="timeout" if isinstance(exc, TimeoutError) else "upstream_error",
                 data=None,
                 error=str(exc),
                 latency_ms=0,
@@ -1016,6 +1041,7 @@ def run_agent_freedom_daily(
     trade_date: str | None = None,
     strategy_version_id: str | None = None,
     account_id: str = "main",
+    bypass_ai_cache: bool = False,
 ) -> dict[str, Any]:
     ensure_agent_freedom_indexes()
     normalized_date = _normalize_date(trade_date)
@@ -1085,6 +1111,7 @@ def run_agent_freedom_daily(
             market_row=market_row,
             signal_rows=signal_rows,
             shenwan_rows=shenwan_rows,
+            bypass_cache=bypass_ai_cache,
         )
         if pre_degrade_flags:
             degrade_flags.extend(pre_degrade_flags)
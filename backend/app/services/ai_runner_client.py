@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import math
 import socket
 import time
 import uuid
@@ -29,6 +30,7 @@ class SkillCallResult:
     latency_ms: int
     attempts: int
     model: str
+    cached: bool = False
 
 
 _ALLOWED_STATUS = {
@@ -139,7 +141,14 @@ def call_skill(
     trade_date: str,
     input_payload: dict[str, Any],
     request_id: str | None = None,
+    deadline: float | None = None,
+    bypass_cache: bool = False,
 ) -> SkillCallResult:
+    """Call one skill with retries; ``deadline`` is a ``time.monotonic()`` cut-off shared by a whole run.
+
+    The runner caches results by (skill, prompt version, model, input); ``bypass_cache``
+    forces a fresh inference and refreshes the cached entry.
+    """
     request_id = request_id or uuid.uuid4().hex
     base_url = str(settings.ai_runner_base_url or "").strip().rstrip("/")
     if not base_url:
@@ -153,6 +162,14 @@ def call_skill(
     last_code = "upstream_error"
 
     while attempts <= max_retries:
+        attempt_timeout = timeout_seconds
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                last_error = "run deadline exceeded"
+                last_code = "timeout"
+                break
+            attempt_timeout = max(min(timeout_seconds, math.ceil(remaining)), 1)
         attempts += 1
         started = time.perf_counter()
         try:
@@ -161,11 +178,12 @@ def call_skill(
                 payload={
                     "request_id": request_id,
                     "trade_date": trade_date,
-                    "timeout_sec": timeout_seconds,
+                    "timeout_sec": attempt_timeout,
                     "input": input_payload,
+                    "cache_bypass": bool(bypass_cache),
                 },
                 token=str(settings.ai_runner_token or "").strip(),
-                timeout_seconds=timeout_seconds,
+                timeout_seconds=attempt_timeout,
             )
             ok = bool(response.get("ok"))
             status = str(response.get("status") or "").strip()
@@ -189,6 +207,7 @@ def call_skill(
                 latency_ms=latency_ms,
                 attempts=attempts,
                 model=str(response.get("model") or ""),
+                cached=bool(response.get("cached")),
             )
         except AIRunnerError as exc:
             last_error = exc.message
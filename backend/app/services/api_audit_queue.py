@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+AuditSink = Callable[[list[dict[str, Any]]], None]
+
+_STOP = object()
+
+
+def _default_sink(records: list[dict[str, Any]]) -> None:
+    from app.data.mongo_api_audit import insert_api_audit_logs
+
+    insert_api_audit_logs(records)
+
+
+class ApiAuditQueue:
+    """Bounded in-process queue of API audit records drained by one background writer.
+
+    Records are written in batches of ``batch_size`` or every ``flush_interval_seconds``,
+    whichever comes first. When the queue is full new records are dropped and counted
+    instead of blocking the request thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        sink: AuditSink = _default_sink,
+        max_size: int | None = None,
+        batch_size: int | None = None,
+        flush_interval_seconds: float | None = None,
+        thread_factory: Callable[..., Any] = threading.Thread,
+    ) -> None:
+        self._sink = sink
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max(int(max_size or settings.api_audit_queue_max_size), 1))
+        self._batch_size = max(int(batch_size or settings.api_audit_batch_size), 1)
+        self._flush_interval = float(flush_interval_seconds or settings.api_audit_flush_interval_seconds)
+        self._thread_factory = thread_factory
+        self._lock = threading.Lock()
+        self._worker: Any = None
+        self._closed = False
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def enqueue(self, record: dict[str, Any]) -> bool:
+        if self._closed:
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                dropped = self.dropped
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning("api audit queue full, dropped=%s", dropped)
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop accepting records, flush what is queued and wait for the writer."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            worker = self._worker
+        if worker is None:
+            self._drain_remaining()
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("api audit queue still full at shutdown, pending records may be lost")
+        worker.join(timeout)
+        logger.info(
+            "api audit queue stopped: enqueued=%s written=%s dropped=%s failed=%s",
+            self.enqueued,
+            self.written,
+            self.dropped,
+            self.failed,
+        )
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is not None or self._closed:
+                return
+            self._worker = self._thread_factory(target=self._run, name="api-audit-writer", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        batch: list[dict[str, Any]] = []
+        deadline = time.monotonic() + self._flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._write(batch)
+                self._drain_remaining()
+                return
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= self._batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch = []
+                deadline = time.monotonic() + self._flush_interval
+
+    def _drain_remaining(self) -> None:
+        batch: list[dict[str, Any]] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                continue
+            batch.append(item)
+            if len(batch) >= self._batch_size:
+                self._write(batch)
+                batch = []
+        self._write(batch)
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            self._sink(list(batch))
+        except Exception:
+            with self._lock:
+                self.failed += len(batch)
+            logger.warning("api audit batch write failed, records=%s", len(batch), exc_info=True)
+            return
+        with self._lock:
+            self.written += len(batch)
+
+
+_api_audit_queue: ApiAuditQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def get_api_audit_queue() -> ApiAuditQueue:
+    global _api_audit_queue
+    with _queue_lock:
+        if _api_audit_queue is None:
+            _api_audit_queue = ApiAuditQueue()
+        return _api_audit_queue
+
+
+def enqueue_api_audit_log(
+    *,
+    user_id: str,
+    username: str,
+    endpoint: str,
+    method: str,
+    status_code: int,
+) -> bool:
+    return get_api_audit_queue().enqueue(
+        {
+            "user_id": user_id,
+            "username": username,
+            "endpoint": endpoint,
+            "method": method,
+            "status_code": status_code,
+            "created_at": dt.datetime.now(dt.UTC),
+        }
+    )
+
+
+def shutdown_api_audit_queue(timeout: float = 5.0) -> None:
+    global _api_audit_queue
+    with _queue_lock:
+        current = _api_audit_queue
+        _api_audit_queue = None
+    if current is not None:
+        current.shutdown(timeout)
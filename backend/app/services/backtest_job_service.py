@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import multiprocessing
+import queue
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Protocol
+
+from app.core.config import settings
+from app.quant.engine import BacktestCancelled
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[str, int, int], None]
+JobTarget = Callable[[dict[str, Any], ProgressCallback], Any]
+
+
+class BacktestQueue(Protocol):
+    def claim(self, worker_id: str) -> dict[str, Any] | None: ...
+
+    def report_progress(self, run_id: str, progress: dict[str, Any]) -> bool: ...
+
+    def finish(self, run_id: str, status: str, error_message: str = "") -> None: ...
+
+    def release(self, run_id: str) -> None: ...
+
+    def requeue_stale(self, stale_before: dt.datetime, max_attempts: int) -> int: ...
+
+
+def build_progress(current_date: str | None, done: int, total: int, elapsed_seconds: float) -> dict[str, Any]:
+    """Progress snapshot stored on the run meta; ETA extrapolates the average time per day."""
+    pct = done / total * 100 if total > 0 else 0.0
+    eta = elapsed_seconds / done * (total - done) if done > 0 else None
+    return {
+        "current_date": current_date,
+        "done_days": done,
+        "total_days": total,
+        "pct": round(pct, 2),
+        "elapsed_seconds": round(elapsed_seconds, 1),
+        "eta_seconds": round(eta, 1) if eta is not None else None,
+    }
+
+
+def run_backtest_job(run: dict[str, Any], on_progress: ProgressCallback) -> dict[str, Any]:
+    """Default job target: run the engine for a claimed run meta document."""
+    from app.quant.engine import run_backtest_with_guard
+    from app.services.backtest_service import prepare_backtest_execution
+
+    strategy, config = prepare_backtest_execution(run, on_progress=on_progress)
+    return run_backtest_with_guard(strategy=strategy, config=config)
+
+
+def _job_process_main(target: JobTarget, run: dict[str, Any], messages: Any, cancel_event: Any) -> None:
+    """Entry point of a job process; reports progress and the final status through ``messages``."""
+    run_id = str(run.get("run_id") or "")
+    started = time.monotonic()
+
+    def _on_progress(current_date: str, done: int, total: int) -> None:
+        messages.put(("progress", run_id, build_progress(current_date, done, total, time.monotonic() - started)))
+        if cancel_event.is_set():
+            raise BacktestCancelled(run_id)
+
+    try:
+        target(run, _on_progress)
+    except BacktestCancelled:
+        messages.put(("finished", run_id, ("cancelled", "cancelled")))
+    except Exception as exc:
+        logger.exception("backtest job failed: run_id=%s", run_id)
+        messages.put(("finished", run_id, ("failed", str(exc))))
+    else:
+        messages.put(("finished", run_id, ("success", "")))
+
+
+@dataclass
+class _Job:
+    run_id: str
+    process: Any
+    cancel_event: Any
+    progress: dict[str, Any] = field(default_factory=lambda: build_progress(None, 0, 0, 0.0))
+    outcome: tuple[str, str] | None = None
+
+
+class BacktestJobDispatcher:
+    """Runs queued backtests in a bounded pool of worker processes.
+
+    One poll claims pending runs up to ``max_workers``, relays the newest progress of each
+    live job to the queue (which doubles as the heartbeat and returns the cancel flag),
+    reaps finished processes and requeues runs whose dispatcher stopped heartbeating.
+    Cancellation is cooperative: the job process stops at its next progress report.
+    """
+
+    def __init__(
+        self,
+        *,
+        backtest_queue: BacktestQueue | None = None,
+        job_target: JobTarget = run_backtest_job,
+        max_workers: int | None = None,
+        poll_interval_seconds: float | None = None,
+        stale_seconds: int | None = None,
+        max_attempts: int | None = None,
+        mp_context: Any = None,
+        worker_id: str | None = None,
+    ) -> None:
+        if backtest_queue is None:
+            from app.data.mongo_backtest_queue import MongoBacktestQueue
+
+            backtest_queue = MongoBacktestQueue()
+        self._queue = backtest_queue
+        self._job_target = job_target
+        self._max_workers = max(int(max_workers or settings.backtest_workers), 1)
+        self._poll_interval = float(poll_interval_seconds or settings.backtest_queue_poll_seconds)
+        self._stale_seconds = int(stale_seconds or settings.backtest_job_stale_seconds)
+        self._max_attempts = max(int(max_attempts or settings.backtest_job_max_attempts), 1)
+        # Job processes are spawned so each one opens its own Mongo/DuckDB clients.
+        self._context = mp_context or multiprocessing.get_context("spawn")
+        self._messages = self._context.Queue()
+        self.worker_id = worker_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self._jobs: dict[str, _Job] = {}
+
+    @property
+    def active_run_ids(self) -> list[str]:
+        return list(self._jobs)
+
+    def run_forever(self, stop_event: threading.Event) -> None:
+        logger.info("backtest dispatcher started: worker_id=%s max_workers=%s", self.worker_id, self._max_workers)
+        try:
+            while not stop_event.is_set():
+                self.poll_once()
+                stop_event.wait(self._poll_interval)
+        finally:
+            self.shutdown()
+
+    def poll_once(self) -> None:
+        exited = [job for job in self._jobs.values() if not job.process.is_alive()]
+        self._drain_messages()
+        for job in list(self._jobs.values()):
+            if self._queue.report_progress(job.run_id, job.progress):
+                job.cancel_event.set()
+        for job in exited:
+            self._reap(job)
+        stale_before = dt.datetime.now(dt.UTC) - dt.timedelta(seconds=self._stale_seconds)
+        requeued = self._queue.requeue_stale(stale_before, self._max_attempts)
+        if requeued:
+            logger.warning("requeued %s stale backtest runs", requeued)
+        while len(self._jobs) < self._max_workers:
+            run = self._queue.claim(self.worker_id)
+            if not run:
+                break
+            self._start(run)
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop live job processes and hand their runs back to the queue."""
+        for job in list(self._jobs.values()):
+            job.process.terminate()
+            job.process.join(timeout)
+            self._queue.release(job.run_id)
+            logger.info("backtest run released on shutdown: run_id=%s", job.run_id)
+        self._jobs.clear()
+
+    def _start(self, run: dict[str, Any]) -> None:
+        run_id = str(run.get("run_id") or "")
+        cancel_event = self._context.Event()
+        process = self._context.Process(
+            target=_job_process_main,
+            args=(self._job_target, run, self._messages, cancel_event),
+            name=f"backtest-{run_id}",
+        )
+        process.start()
+        self._jobs[run_id] = _Job(run_id=run_id, process=process, cancel_event=cancel_event)
+        logger.info("backtest run started: run_id=%s pid=%s attempt=%s", run_id, process.pid, run.get("attempts"))
+
+    def _drain_messages(self) -> None:
+        while True:
+            try:
+                kind, run_id, payload = self._messages.get_nowait()
+            except queue.Empty:
+                return
+            job = self._jobs.get(run_id)
+            if job is None:
+                continue
+            if kind == "progress":
+                job.progress = payload
+            elif kind == "finished":
+                job.outcome = payload
+
+    def _reap(self, job: _Job) -> None:
+        job.process.join()
+        status, error_message = job.outcome or ("failed", f"backtest process exited with code {job.process.exitcode}")
+        self._queue.finish(job.run_id, status, error_message)
+        self._jobs.pop(job.run_id, None)
+        logger.info("backtest run finished: run_id=%s status=%s", job.run_id, status)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Any
 
+from app.data.mongo_backtest_nav import iter_backtest_nav_for_runs
+from app.data.mongo_backtest_queue import MongoBacktestQueue
 from app.data.mongo_backtest import (
     create_backtest_run,
     delete_backtest_run,
@@ -18,6 +21,13 @@ from app.data.mongo_backtest import (
     list_backtest_trades_by_code,
     list_backtest_trades,
 )
+from app.quant.base import StrategyProtocol
+from app.quant.engine import BacktestRunConfig
+from app.quant.nav_compare import align_nav_panel, downsample_indices, nav_columns, relative_metrics
+from app.quant.params_registry import validate_and_normalize_params
+from app.quant.registry import load_strategy
+
+_backtest_queue = MongoBacktestQueue()
 
 
 def create_backtest_run_meta(
@@ -163,25 +173,48 @@ def get_backtest_signals(
     )
 
 
-def compare_backtests(run_ids: list[str]) -> list[dict[str, Any]]:
-    runs = list_backtest_runs_by_ids(run_ids)
-    items: list[dict[str, Any]] = []
-    for run in runs:
-        run_id = str(run.get("run_id") or "")
-        if not run_id:
-            continue
-        nav_series = list_backtest_nav(run_id=run_id)
-        items.append(
-            {
-                "run_id": run_id,
-                "strategy_id": run.get("strategy_id"),
-                "strategy_version_id": run.get("strategy_version_id"),
-                "status": run.get("status"),
-                "summary_metrics": run.get("summary_metrics") or {},
-                "nav_series": nav_series,
-            }
-        )
-    return items
+def get_backtest_profile(run_id: str) -> dict[str, Any] | None:
+    run = get_backtest_run(run_id)
+    if not run:
+        return None
+    summary_metrics = run.get("summary_metrics") or {}
+    return dict(summary_metrics.get("perf_profile") or {})
+
+
+def compare_backtests(
+    run_ids: list[str],
+    *,
+    max_points: int | None = None,
+    downsample: str = "minmax",
+) -> dict[str, Any]:
+    """Compare runs on one date axis with columnar NAV arrays.
+
+    NAV of all runs comes from a single query and is aligned on the union of trade dates
+    (``None`` outside a run's range). ``max_points`` decimates the shared axis for charting;
+    the relative metrics against the first run are always computed at full resolution.
+    """
+    runs = {str(run.get("run_id") or ""): run for run in list_backtest_runs_by_ids(run_ids)}
+    ordered_ids = [run_id for run_id in dict.fromkeys(run_ids) if run_id in runs]
+    items = [
+        {
+            "run_id": run_id,
+            "strategy_id": runs[run_id].get("strategy_id"),
+            "strategy_version_id": runs[run_id].get("strategy_version_id"),
+            "status": runs[run_id].get("status"),
+            "summary_metrics": runs[run_id].get("summary_metrics") or {},
+        }
+        for run_id in ordered_ids
+    ]
+    dates, matrix = align_nav_panel(iter_backtest_nav_for_runs(ordered_ids), ordered_ids)
+    keep = downsample_indices(matrix, max_points, downsample)
+    return {
+        "items": items,
+        "run_ids": ordered_ids,
+        "dates": [dates[idx] for idx in keep],
+        "nav": nav_columns(matrix[:, keep]),
+        "total_points": len(dates),
+        "relative_metrics": relative_metrics(matrix, ordered_ids) if len(ordered_ids) >= 2 else [],
+    }
 
 
 def delete_backtest_run_meta(run_id: str) -> bool:
@@ -189,3 +222,51 @@ def delete_backtest_run_meta(run_id: str) -> bool:
     if not run:
         return False
     return delete_backtest_run(run_id)
+
+
+def enqueue_backtest_run(run_id: str) -> dict[str, Any] | None:
+    """Queue a pending, failed or cancelled run for the backtest workers."""
+    if not get_backtest_run(run_id):
+        return None
+    if not _backtest_queue.enqueue(run_id):
+        raise ValueError("only pending, failed or cancelled runs can be queued")
+    return get_backtest_run(run_id)
+
+
+def cancel_backtest_run(run_id: str) -> str | None:
+    """Cancel a queued run, or ask its worker to stop after the current trade day."""
+    return _backtest_queue.request_cancel(run_id)
+
+
+def prepare_backtest_execution(
+    run: dict[str, Any],
+    *,
+    strategy_key: str = "",
+    profile_hotspots: bool = False,
+    on_progress: Callable[[str, int, int], None] | None = None,
+) -> tuple[StrategyProtocol, BacktestRunConfig]:
+    """Resolve the strategy and engine config for a run meta document."""
+    strategy_version_id = str(run.get("strategy_version_id") or "")
+    version = get_strategy_version(strategy_version_id)
+    if not version:
+        raise ValueError(f"strategy version not found: {strategy_version_id}")
+    raw_params_snapshot = dict(version.get("params_snapshot") or {})
+    version_strategy_key = str(version.get("strategy_key") or "").strip() or str(raw_params_snapshot.get("strategy_key") or "multifactor_v1")
+    if strategy_key and strategy_key != version_strategy_key:
+        raise ValueError(
+            f"--strategy-key mismatch: cli={strategy_key}, version={version_strategy_key}, strategy_version_id={strategy_version_id}"
+        )
+    strategy_key = strategy_key or version_strategy_key
+    params_snapshot, _ = validate_and_normalize_params(strategy_key, raw_params_snapshot)
+    config = BacktestRunConfig(
+        run_id=str(run.get("run_id") or ""),
+        strategy_id=str(run.get("strategy_id") or ""),
+        strategy_version_id=strategy_version_id,
+        start_date=str(run.get("start_date") or ""),
+        end_date=str(run.get("end_date") or ""),
+        initial_capital=float(run.get("initial_capital") or 1_000_000.0),
+        params_snapshot=params_snapshot,
+        profile_hotspots=profile_hotspots,
+        on_progress=on_progress,
+    )
+    return load_strategy(strategy_key), config
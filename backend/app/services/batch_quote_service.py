@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from typing import Any
+
+import duckdb
+import pandas as pd
+
+from app.core.config import settings
+from app.data.duckdb_store import compound_pct_chg_sql, get_connection
+from app.data.partition_paths import partition_files, years_for_rows
+from app.services.stocks_service import get_latest_stock_signals
+
+# Compounded pct_chg over the latest N sessions (in percent, like pct_chg); a horizon is null
+# when the stock has fewer than N sessions.
+QUOTE_HORIZONS = (1, 3, 5, 20)
+MAX_BATCH_CODES = 5000
+
+QUOTE_COLUMNS = [
+    "ts_code",
+    "trade_date",
+    "close",
+    "change",
+    *[f"pct_chg_{days}d" for days in QUOTE_HORIZONS],
+    "turnover_rate",
+    "total_mv",
+    "circ_mv",
+    "up_limit",
+    "down_limit",
+    "limit_status",
+]
+
+_EMPTY_BASIC = (
+    "SELECT NULL::VARCHAR AS ts_code, NULL::VARCHAR AS trade_date, NULL::DOUBLE AS turnover_rate, "
+    "NULL::DOUBLE AS total_mv, NULL::DOUBLE AS circ_mv"
+)
+_EMPTY_LIMIT = "SELECT NULL::VARCHAR AS ts_code, NULL::VARCHAR AS trade_date, NULL::DOUBLE AS up_limit, NULL::DOUBLE AS down_limit"
+
+
+def _build_quote_query(*, has_basic: bool, has_limit: bool) -> str:
+    window = max(QUOTE_HORIZONS)
+    horizons = ",\n".join(f"{compound_pct_chg_sql(days)} AS pct_chg_{days}d" for days in QUOTE_HORIZONS)
+    basic = (
+        "SELECT ts_code, trade_date, turnover_rate, total_mv, circ_mv FROM read_parquet(?, hive_partitioning=1)"
+        if has_basic
+        else _EMPTY_BASIC
+    )
+    limits = (
+        "SELECT ts_code, trade_date, up_limit, down_limit FROM read_parquet(?, hive_partitioning=1)"
+        if has_limit
+        else _EMPTY_LIMIT
+    )
+    return f"""
+        WITH recent AS (
+            SELECT ts_code,
+                   trade_date,
+                   close,
+                   COALESCE(change, close - pre_close) AS change,
+                   COALESCE(pct_chg, (close - pre_close) / NULLIF(pre_close, 0) * 100) AS pct_chg,
+                   ROW_NUMBER() OVER (PARTITION BY ts_code ORDER BY trade_date DESC) AS rn
+            FROM read_parquet(?, hive_partitioning=1)
+            QUALIFY rn <= {window}
+        ),
+        latest AS (
+            SELECT ts_code,
+                   MAX(trade_date) FILTER (WHERE rn = 1) AS trade_date,
+                   MAX(close) FILTER (WHERE rn = 1) AS close,
+                   MAX(change) FILTER (WHERE rn = 1) AS change,
+                   COUNT(*) AS sessions,
+                   {horizons}
+            FROM recent
+            GROUP BY ts_code
+        ),
+        basic AS ({basic}),
+        limits AS ({limits})
+        SELECT l.*,
+               b.turnover_rate,
+               b.total_mv,
+               b.circ_mv,
+               lim.up_limit,
+               lim.down_limit,
+               CASE
+                   WHEN lim.up_limit > 0 AND l.close >= lim.up_limit THEN 'up'
+                   WHEN lim.down_limit > 0 AND l.close <= lim.down_limit THEN 'down'
+               END AS limit_status
+        FROM latest l
+        LEFT JOIN basic b ON b.ts_code = l.ts_code AND b.trade_date = l.trade_date
+        LEFT JOIN limits lim ON lim.ts_code = l.ts_code AND lim.trade_date = l.trade_date
+    """
+
+
+def _query_quotes(codes: list[str], *, daily_years: int) -> pd.DataFrame:
+    raw_root = settings.data_dir / "raw"
+    daily_files = partition_files(raw_root / "daily", codes, latest_years=daily_years)
+    if not daily_files:
+        return pd.DataFrame(columns=[*QUOTE_COLUMNS, "sessions"])
+    basic_files = partition_files(raw_root / "daily_basic", codes, latest_years=1)
+    limit_files = partition_files(raw_root / "daily_limit", codes, latest_years=1)
+    query = _build_quote_query(has_basic=bool(basic_files), has_limit=bool(limit_files))
+    params: list[Any] = [daily_files]
+    params.extend(files for files in (basic_files, limit_files) if files)
+    with get_connection(read_only=True) as con:
+        try:
+            return con.execute(query, params).fetchdf()
+        except (duckdb.CatalogException, duckdb.IOException):
+            return pd.DataFrame(columns=[*QUOTE_COLUMNS, "sessions"])
+
+
+def load_batch_quotes(ts_codes: list[str]) -> pd.DataFrame:
+    """Latest quote row per code from one DuckDB pass over daily, daily_basic and daily_limit.
+
+    The result has one row per requested code, in request order; codes without daily data
+    keep only ``ts_code``. The window is read from each stock's newest year partition;
+    only stocks with fewer sessions there (early January, new listings) are re-read with
+    enough older years to fill it.
+    """
+    codes = list(dict.fromkeys(code for code in ts_codes if code))
+    frame = pd.DataFrame({"ts_code": codes})
+    if not codes:
+        return frame.reindex(columns=QUOTE_COLUMNS)
+    window = max(QUOTE_HORIZONS)
+    rows = _query_quotes(codes, daily_years=1)
+    short = rows.loc[rows["sessions"] < window, "ts_code"].tolist()
+    if short:
+        refilled = _query_quotes(short, daily_years=years_for_rows(window) + 1)
+        rows = pd.concat([rows[~rows["ts_code"].isin(refilled["ts_code"])], refilled], ignore_index=True)
+    return frame.merge(rows, on="ts_code", how="left").reindex(columns=QUOTE_COLUMNS)
+
+
+def get_batch_quotes(ts_codes: list[str], *, include_signal: bool = True) -> pd.DataFrame:
+    """Quote frame plus the latest daily_signal per code (one Mongo aggregation)."""
+    quotes = load_batch_quotes(ts_codes)
+    if not include_signal:
+        return quotes
+    signal_map = get_latest_stock_signals(quotes["ts_code"].tolist()) if not quotes.empty else {}
+    quotes["latest_signal"] = quotes["ts_code"].map(lambda code: (signal_map.get(code) or {}).get("signal"))
+    quotes["latest_signal_date"] = quotes["ts_code"].map(lambda code: (signal_map.get(code) or {}).get("trading_date"))
+    return quotes
+
+
+def quotes_to_columns(quotes: pd.DataFrame) -> dict[str, list[Any]]:
+    """Columnar JSON payload: one list per field, NaN as ``None``."""
+    cleaned = quotes.astype(object).where(pd.notna(quotes), None)
+    return {column: cleaned[column].tolist() for column in cleaned.columns}
+
+
+def quotes_by_code(quotes: pd.DataFrame) -> dict[str, dict[str, Any]]:
+    cleaned = quotes.astype(object).where(pd.notna(quotes), None)
+    return {row["ts_code"]: row for row in cleaned.to_dict(orient="records")}
@@ -4,16 +4,21 @@ import datetime as dt
 import logging
 from typing import Any
 
+import pandas as pd
+
 from app.core.cache import cache_get, cache_set
-from app.data.duckdb_store import list_daily
 from app.data.mongo import get_collection
+from app.data.mongo_daily_stock_pattern_hits import (
+    get_daily_stock_pattern_hit,
+    list_daily_stock_pattern_hits_for_stock,
+)
 from app.data.mongo_daily_stock_signals import (
     get_signal_group,
     list_daily_stock_signal_dates,
     list_resonance_groups_for_date,
     list_signal_groups_for_date,
-    list_signals_for_stock,
 )
+from app.features.forward_returns import forward_return_column, load_forward_returns
 from app.signals.patterns.config import get_pattern_category_label, get_pattern_weight
 
 logger = logging.getLogger(__name__)
@@ -109,42 +114,87 @@ def get_daily_stock_signal_by_type(*, trade_date: str, signal_type: str) -> dict
     return get_signal_group(trade_date, signal_type)
 
 
+def _primary_pattern_entry(hit: dict[str, Any]) -> dict[str, Any] | None:
+    entries = hit.get("pattern_resonance") or []
+    return next((entry for entry in entries if entry.get("signal_side") == "buy"), None) or next(iter(entries), None)
+
+
+def _expand_pattern_hit(hit: dict[str, Any]) -> list[dict[str, Any]]:
+    trade_date = hit.get("trade_date")
+    stock = {
+        "ts_code": hit.get("ts_code"),
+        "name": hit.get("name"),
+        "industry": hit.get("industry"),
+        "close": hit.get("close"),
+        "pct_chg": hit.get("pct_chg"),
+        "volume_ratio": hit.get("volume_ratio"),
+    }
+    primary = _primary_pattern_entry(hit)
+    signal_stock = dict(stock)
+    if primary is not None:
+        signal_stock["weighted_score"] = primary.get("weighted_score")
+        signal_stock["patterns"] = _truncate_patterns(primary.get("patterns"))
+
+    rows: list[dict[str, Any]] = [
+        {
+            "trade_date": trade_date,
+            "signal_type": signal.get("signal_type"),
+            "signal_side": signal.get("signal_side"),
+            "stock": dict(signal_stock),
+        }
+        for signal in hit.get("signals") or []
+    ]
+    rows.extend(
+        {
+            "trade_date": trade_date,
+            "signal_side": entry.get("signal_side"),
+            "resonance_level": entry.get("resonance_level"),
+            "stock": {
+                **stock,
+                "weighted_score": entry.get("weighted_score"),
+                "patterns": _truncate_patterns(entry.get("patterns")),
+            },
+        }
+        for entry in hit.get("pattern_resonance") or []
+    )
+    return rows
+
+
 def get_stock_recent_signals(*, ts_code: str, limit_days: int = 30) -> list[dict[str, Any]]:
     cache_key = f"signals:stock:{ts_code}:{limit_days}"
     cached = cache_get(cache_key)
     if cached is not None:
         return cached
 
-    signals = list_signals_for_stock(ts_code=ts_code, limit_days=limit_days)
+    signal_dates = list_daily_stock_signal_dates(limit=limit_days)
+    hits = (
+        list_daily_stock_pattern_hits_for_stock(ts_code, start_date=min(signal_dates), limit=limit_days)
+        if signal_dates
+        else []
+    )
+    signals = [row for hit in hits for row in _expand_pattern_hit(hit)]
     if not signals:
         cache_set(cache_key, [], ttl_seconds=86400 * 7)
         return []
 
-    price_rows = list_daily(ts_code)
-    if not price_rows:
-        cache_set(cache_key, signals, ttl_seconds=86400 * 7)
-        return signals
-
-    closes: list[float] = []
-    date_to_idx: dict[str, int] = {}
-    for row in price_rows:
-        d = str(row.get("trade_date", ""))
-        c = row.get("close")
-        if d and c is not None:
-            date_to_idx[d] = len(closes)
-            closes.append(float(c))
+    trade_dates = [str(entry.get("trade_date") or "") for entry in signals]
+    forward = load_forward_returns(
+        start_date=min(trade_dates),
+        end_date=max(trade_dates),
+        ts_codes=[ts_code],
+        horizons=(1, 5),
+        bases=("cc",),
+    )
+    forward_by_date = {
+        str(row["trade_date"]): row
+        for row in forward.to_dict(orient="records")
+    }
 
     def _forward_return(trade_date: str, n_days: int) -> float | None:
-        idx = date_to_idx.get(trade_date)
-        if idx is None:
-            return None
-        target_idx = idx + n_days
-        if target_idx >= len(closes):
+        value = forward_by_date.get(trade_date, {}).get(forward_return_column(n_days, "cc"))
+        if value is None or pd.isna(value):
             return None
-        base = closes[idx]
-        if base == 0:
-            return None
-        return round((closes[target_idx] - base) / base * 100, 2)
+        return round(float(value), 2)
 
     for entry in signals:
         td = entry.get("trade_date", "")
@@ -161,37 +211,34 @@ def get_stock_pattern_details(*, ts_code: str, trade_date: str) -> dict[str, Any
     if cached is not None:
         return cached
 
-    for doc in get_collection("daily_stock_pattern_resonance").find(
-        {"trade_date": trade_date},
-        {"_id": 0},
-    ):
-        for stock in doc.get("stocks", []):
-            if stock.get("ts_code") == ts_code:
-                patterns = stock.get("patterns", [])
-                result = {
-                    "ts_code": ts_code,
-                    "trade_date": trade_date,
-                    "name": stock.get("name"),
-                    "industry": stock.get("industry"),
-                    "close": stock.get("close"),
-                    "pct_chg": stock.get("pct_chg"),
-                    "volume_ratio": stock.get("volume_ratio"),
-                    "weighted_score": stock.get("weighted_score"),
-                    "resonance_level": doc.get("resonance_level"),
-                    "signal_side": doc.get("signal_side"),
-                    "user_state": stock.get("user_state"),
-                    "patterns": [
-                        {
-                            "pattern": p,
-                            "weight": get_pattern_weight(p),
-                            "category": get_pattern_category_label(p),
-                        }
-                        for p in patterns
-                    ],
-                }
-                cache_set(cache_key, result, ttl_seconds=86400 * 7)
-                return result
-    return None
+    hit = get_daily_stock_pattern_hit(trade_date, ts_code)
+    entry = _primary_pattern_entry(hit) if hit else None
+    if entry is None:
+        return None
+
+    result = {
+        "ts_code": ts_code,
+        "trade_date": trade_date,
+        "name": hit.get("name"),
+        "industry": hit.get("industry"),
+        "close": hit.get("close"),
+        "pct_chg": hit.get("pct_chg"),
+        "volume_ratio": hit.get("volume_ratio"),
+        "weighted_score": entry.get("weighted_score"),
+        "resonance_level": entry.get("resonance_level"),
+        "signal_side": entry.get("signal_side"),
+        "user_state": entry.get("user_state"),
+        "patterns": [
+            {
+                "pattern": p,
+                "weight": get_pattern_weight(p),
+                "category": get_pattern_category_label(p),
+            }
+            for p in entry.get("patterns", [])
+        ],
+    }
+    cache_set(cache_key, result, ttl_seconds=86400 * 7)
+    return result
 
 
 def get_signal_statistics(*, trade_date: str | None = None) -> dict[str, Any]:
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
 import os
 import subprocess
+import threading
 import uuid
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
 
@@ -14,6 +17,7 @@ from app.data.mongo_data_sync_job_run import (
     get_data_sync_job_run,
     update_data_sync_job_run,
 )
+from app.services.sync_log_stream import LogFollower, LogFollowerHub, iter_log_events
 
 DISPLAY_TASKS = [
     {"task": "pull_daily", "label": "日线主链路"},
@@ -39,6 +43,13 @@ DISPLAY_TASKS = [
 WEEKLY_TASKS = ["sync_shenwan_members", "compact_parquet"]
 
 _JOB_PROCESSES: dict[str, subprocess.Popen[Any]] = {}
+# Job rows of jobs started here (and of finished jobs once seen), kept current by the exit
+# watcher so status polls and log streams do not go to Mongo while a job runs.
+_JOB_STATUS: dict[str, dict[str, Any]] = {}
+_JOB_STATUS_LOCK = threading.Lock()
+_ACTIVE_STATUSES = {"pending", "running"}
+_MAX_CACHED_FINISHED_JOBS = 256
+_LOG_HUB = LogFollowerHub()
 
 
 def normalize_ymd(value: str) -> str:
@@ -275,6 +286,7 @@ def create_sync_job(*, start_date: str, end_date: str, created_by: str) -> dict[
             started_at=now,
             error_message="",
         )
+        threading.Thread(target=_watch_process, args=(job_id, process), name=f"sync-job-{job_id}", daemon=True).start()
     except Exception as exc:
         update_data_sync_job_run(
             job_id=job_id,
@@ -288,7 +300,60 @@ def create_sync_job(*, start_date: str, end_date: str, created_by: str) -> dict[
     row = get_data_sync_job_run(job_id)
     if not row:
         raise RuntimeError("job created but cannot load record")
-    return row
+    return _cache_job(row)
+
+
+def _cache_job(row: dict[str, Any]) -> dict[str, Any]:
+    """Store ``row``; a final status already cached is never replaced by an active one.
+
+    Only the newest ``_MAX_CACHED_FINISHED_JOBS`` finished jobs are kept.
+    """
+    job_id = str(row.get("job_id") or "")
+    with _JOB_STATUS_LOCK:
+        cached = _JOB_STATUS.get(job_id)
+        if cached is not None and cached.get("status") not in _ACTIVE_STATUSES and row.get("status") in _ACTIVE_STATUSES:
+            return dict(cached)
+        _JOB_STATUS.pop(job_id, None)
+        _JOB_STATUS[job_id] = dict(row)
+        finished = [key for key, item in _JOB_STATUS.items() if item.get("status") not in _ACTIVE_STATUSES]
+        for key in finished[: max(len(finished) - _MAX_CACHED_FINISHED_JOBS, 0)]:
+            del _JOB_STATUS[key]
+    return dict(row)
+
+
+def _cached_job(job_id: str) -> dict[str, Any] | None:
+    with _JOB_STATUS_LOCK:
+        cached = _JOB_STATUS.get(job_id)
+    return dict(cached) if cached is not None else None
+
+
+def _watch_process(job_id: str, process: subprocess.Popen[Any]) -> None:
+    _on_process_exit(job_id, process.wait())
+
+
+def _finish_job_run_if_active(job_id: str, *, status: str, exit_code: int, error_message: str | None = None) -> bool:
+    """Write the final status unless the row already has one, e.g. ``cancelled`` by another worker."""
+    now = dt.datetime.now(dt.UTC)
+    fields: dict[str, Any] = {"status": status, "exit_code": exit_code, "finished_at": now, "updated_at": now}
+    if error_message is not None:
+        fields["error_message"] = error_message
+    result = get_collection("data_sync_job_runs").update_one(
+        {"job_id": job_id, "status": {"$in": sorted(_ACTIVE_STATUSES)}},
+        {"$set": fields},
+    )
+    return result.modified_count > 0
+
+
+def _on_process_exit(job_id: str, rc: int) -> None:
+    """Record the exit of a job started here, unless it was already stopped by the user."""
+    _JOB_PROCESSES.pop(job_id, None)
+    cached = _cached_job(job_id)
+    if cached is None or cached.get("status") in _ACTIVE_STATUSES:
+        status = "success" if rc == 0 else "failed"
+        _finish_job_run_if_active(job_id, status=status, exit_code=rc)
+        updated = get_data_sync_job_run(job_id)
+        _cache_job(updated or {**(cached or {"job_id": job_id}), "status": status, "exit_code": rc})
+    _LOG_HUB.mark_finished(job_id)
 
 
 def _refresh_running_status(job_id: str, row: dict[str, Any]) -> dict[str, Any]:
@@ -296,13 +361,12 @@ def _refresh_running_status(job_id: str, row: dict[str, Any]) -> dict[str, Any]:
         return row
 
     process = _JOB_PROCESSES.get(job_id)
-    now = dt.datetime.now(dt.UTC)
     if process is not None:
         rc = process.poll()
         if rc is None:
             return row
         status = "success" if rc == 0 else "failed"
-        update_data_sync_job_run(job_id=job_id, status=status, exit_code=rc, finished_at=now)
+        _finish_job_run_if_active(job_id, status=status, exit_code=rc)
         _JOB_PROCESSES.pop(job_id, None)
         updated = get_data_sync_job_run(job_id)
         return updated or row
@@ -313,11 +377,10 @@ def _refresh_running_status(job_id: str, row: dict[str, Any]) -> dict[str, Any]:
             os.kill(int(pid), 0)
             return row
         except ProcessLookupError:
-            update_data_sync_job_run(
-                job_id=job_id,
+            _finish_job_run_if_active(
+                job_id,
                 status="failed",
                 exit_code=-1,
-                finished_at=now,
                 error_message="process not found; state unknown",
             )
             updated = get_data_sync_job_run(job_id)
@@ -328,31 +391,54 @@ def _refresh_running_status(job_id: str, row: dict[str, Any]) -> dict[str, Any]:
 
 
 def get_sync_job(job_id: str) -> dict[str, Any] | None:
+    cached = _cached_job(job_id)
+    if cached is not None:
+        return cached
     row = get_data_sync_job_run(job_id)
     if not row:
         return None
-    return _refresh_running_status(job_id, row)
+    row = _refresh_running_status(job_id, row)
+    if row.get("status") not in _ACTIVE_STATUSES:
+        _cache_job(row)
+    return row
 
 
-def get_sync_job_logs(job_id: str, offset: int = 0, limit: int = 200_000) -> dict[str, Any]:
+def _job_is_finished(job_id: str) -> bool:
+    row = get_sync_job(job_id)
+    return not row or row.get("status") not in _ACTIVE_STATUSES
+
+
+def _job_log_path(job_id: str) -> tuple[dict[str, Any], Path | None]:
     row = get_sync_job(job_id)
     if not row:
         raise ValueError("job not found")
-
     log_file = str(row.get("log_file") or "")
-    if not log_file:
-        return {"job_id": job_id, "offset": offset, "next_offset": offset, "content": "", "eof": True}
+    return row, Path(log_file) if log_file else None
+
+
+def _acquire_follower(job_id: str, row: dict[str, Any], path: Path) -> LogFollower:
+    follower = _LOG_HUB.acquire(job_id, path, is_finished=lambda: _job_is_finished(job_id))
+    if row.get("status") not in _ACTIVE_STATUSES:
+        follower.mark_finished()
+    return follower
 
-    path = Path(log_file)
-    if not path.exists():
+
+def get_sync_job_logs(job_id: str, offset: int = 0, limit: int = 200_000, line: int | None = None) -> dict[str, Any]:
+    """Read a slice of the job log from a byte ``offset`` or, when given, a 0-based ``line``."""
+    row, path = _job_log_path(job_id)
+    if path is None or not path.exists():
         return {"job_id": job_id, "offset": offset, "next_offset": offset, "content": "", "eof": True}
 
-    size = path.stat().st_size
-    safe_offset = max(0, min(int(offset), size))
-    safe_limit = max(1, min(int(limit), 1_000_000))
-    with path.open("rb") as fh:
-        fh.seek(safe_offset)
-        chunk = fh.read(safe_limit)
+    follower = _acquire_follower(job_id, row, path)
+    try:
+        follower.poll_once()
+        size = follower.size
+        start = follower.offset_for_line(line) if line is not None else int(offset)
+        safe_offset = max(0, min(start, size))
+        safe_limit = max(1, min(int(limit), 1_000_000))
+        chunk = follower.read(safe_offset, safe_limit)
+    finally:
+        _LOG_HUB.release(job_id)
     content = chunk.decode("utf-8", errors="replace")
     next_offset = safe_offset + len(chunk)
     eof = next_offset >= size and row.get("status") in {"success", "failed"}
@@ -366,6 +452,42 @@ def get_sync_job_logs(job_id: str, offset: int = 0, limit: int = 200_000) -> dic
     }
 
 
+def stream_sync_job_logs(job_id: str, *, offset: int = 0, line: int | None = None) -> AsyncIterator[str]:
+    """Server-sent events tailing the job log from ``offset`` (or ``line``) until the job ends.
+
+    All streams of one job share a single file follower; the job status comes from the
+    in-memory cache that the process exit watcher keeps current. The stream is an async
+    generator so idle tails wait on the event loop instead of holding threadpool workers.
+    """
+    row, path = _job_log_path(job_id)
+    if path is None:
+        raise ValueError("job has no log file")
+
+    async def _events() -> AsyncIterator[str]:
+        # Subscribe on the first pull: a client that leaves before the body starts never runs
+        # this generator, so there is no subscriber to release.
+        follower = _acquire_follower(job_id, row, path)
+        try:
+            await asyncio.to_thread(follower.poll_once)
+            start = await asyncio.to_thread(follower.offset_for_line, line) if line is not None else max(int(offset), 0)
+            async for event in iter_log_events(follower, offset=start, job_status=lambda: _stream_status(job_id)):
+                yield event
+        finally:
+            _LOG_HUB.release(job_id)
+
+    return _events()
+
+
+def _stream_status(job_id: str) -> dict[str, Any]:
+    row = get_sync_job(job_id) or {}
+    return {
+        "job_id": job_id,
+        "status": row.get("status"),
+        "exit_code": row.get("exit_code"),
+        "error_message": row.get("error_message"),
+    }
+
+
 def stop_sync_job(job_id: str) -> dict[str, Any]:
     row = get_data_sync_job_run(job_id)
     if not row:
@@ -376,6 +498,8 @@ def stop_sync_job(job_id: str) -> dict[str, Any]:
         return row
 
     now = dt.datetime.now(dt.UTC)
+    # Cached first so the exit watcher does not record the SIGTERM exit as a failure.
+    _cache_job({**row, "status": "cancelled"})
     pid = row.get("pid")
     stopped = False
     if pid:
@@ -404,7 +528,8 @@ def stop_sync_job(job_id: str) -> dict[str, Any]:
         error_message="terminated by user",
         finished_at=now,
     )
+    _LOG_HUB.mark_finished(job_id)
     updated = get_data_sync_job_run(job_id)
     if not updated:
         raise ValueError("job not found")
-    return updated
+    return _cache_job(updated)
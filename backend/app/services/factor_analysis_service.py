@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import logging
+import uuid
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pandas as pd
+
+from app.core.config import settings
+from app.data.duckdb_backtest_store import list_open_trade_dates, list_stock_universe, normalize_date
+from app.data.mongo_factor_analysis_job import (
+    create_factor_analysis_job,
+    get_factor_analysis_job,
+    update_factor_analysis_job,
+)
+from app.features.fundamentals import normalize_fundamental_fields
+from app.features.forward_returns import FORWARD_HORIZONS, load_forward_returns
+from app.quant.context import load_daily_data_bundle
+from app.quant.factor_analysis import (
+    DEFAULT_ANALYSIS_HORIZONS,
+    FactorAnalysisResult,
+    analyze_factor_panel,
+    attach_forward_returns,
+    build_score_panel,
+)
+from app.quant.factors_sector import build_sector_strength_map
+from app.quant.registry import load_strategy
+
+logger = logging.getLogger(__name__)
+
+# Analyses take minutes and already fan out to worker processes; one runs at a time per API
+# process and the rest wait in this executor's queue.
+_JOB_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="factor-analysis")
+
+
+def _filter_tradable(frame: pd.DataFrame, *, trade_date: str, min_list_days: int, min_amount: float) -> pd.DataFrame:
+    list_date = pd.to_datetime(frame.get("list_date"), format="%Y%m%d", errors="coerce")
+    list_days = (pd.Timestamp(trade_date) - list_date).dt.days.fillna(0)
+    mask = (
+        (list_days >= min_list_days)
+        & (pd.to_numeric(frame.get("amount"), errors="coerce").fillna(0) >= min_amount)
+        & frame["close"].notna()
+        & frame["open"].notna()
+    )
+    return frame[mask]
+
+
+def load_factor_panel(
+    trade_dates: Sequence[str],
+    *,
+    universe_df: pd.DataFrame,
+    min_list_days: int = 120,
+    min_amount: float = 25_000.0,
+    fundamental_fields: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """Stack the filtered scoring frames of ``trade_dates`` into one (trade_date, ts_code) panel.
+
+    ``fundamental_fields`` attaches the same point-in-time fields a backtest of these params uses.
+    """
+    frames: list[pd.DataFrame] = []
+    for idx, trade_date in enumerate(trade_dates):
+        next_trade_date = trade_dates[idx + 1] if idx + 1 < len(trade_dates) else trade_date
+        bundle = load_daily_data_bundle(
+            trade_date=trade_date,
+            next_trade_date=next_trade_date,
+            universe_df=universe_df,
+            fundamental_fields=fundamental_fields,
+        )
+        frame = bundle.frame_t
+        if frame.empty:
+            continue
+        frame = _filter_tradable(frame, trade_date=trade_date, min_list_days=min_list_days, min_amount=min_amount)
+        if frame.empty:
+            continue
+        sector_strength_map = build_sector_strength_map(bundle.sector_rows_t)
+        frame = frame.assign(
+            trade_date=trade_date,
+            sector_strength=frame["industry"].map(sector_strength_map).fillna(50.0),
+        )
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def _validate_horizons(horizons: Sequence[int]) -> None:
+    unsupported = [h for h in horizons if h not in FORWARD_HORIZONS]
+    if unsupported:
+        raise ValueError(f"unsupported forward horizons: {unsupported}")
+
+
+def run_factor_analysis_for_strategy(
+    *,
+    strategy_key: str,
+    start_date: str,
+    end_date: str,
+    score_direction: str = "normal",
+    horizons: Sequence[int] = DEFAULT_ANALYSIS_HORIZONS,
+    basis: str = "cc",
+    quantiles: int = 10,
+    top_k: int = 100,
+    min_list_days: int = 120,
+    min_amount: float = 25_000.0,
+    params: dict[str, Any] | None = None,
+    workers: int | None = None,
+) -> FactorAnalysisResult:
+    start = normalize_date(start_date)
+    end = normalize_date(end_date)
+    _validate_horizons(horizons)
+    open_dates = list_open_trade_dates(start_date=start, end_date=end)
+    if len(open_dates) < 2:
+        raise ValueError("not enough trading days in selected range")
+
+    strategy = load_strategy(strategy_key)
+    universe_df = list_stock_universe()
+    if universe_df.empty:
+        raise ValueError("stock universe is empty")
+
+    panel = load_factor_panel(
+        open_dates,
+        universe_df=universe_df,
+        min_list_days=max(int(min_list_days), 0),
+        min_amount=max(float(min_amount), 0.0),
+        fundamental_fields=normalize_fundamental_fields((params or {}).get("fundamental_fields")),
+    )
+    scores = build_score_panel(strategy, panel, params=params, score_direction=score_direction)
+    forward_returns = load_forward_returns(start_date=start, end_date=end, horizons=horizons, bases=[basis])
+    analysis_panel = attach_forward_returns(scores, forward_returns, horizons=horizons, basis=basis)
+    result = analyze_factor_panel(
+        analysis_panel,
+        horizons=horizons,
+        quantiles=quantiles,
+        top_k=top_k,
+        workers=workers or settings.factor_analysis_workers,
+    )
+    next_trade_date = dict(zip(open_dates[:-1], open_dates[1:]))
+    result.daily.insert(1, "next_trade_date", result.daily["trade_date"].map(next_trade_date))
+    result.summary.update(
+        {
+            "strategy_key": strategy.key,
+            "score_direction": score_direction,
+            "start_date": start,
+            "end_date": end,
+            "basis": basis,
+            "min_list_days": min_list_days,
+            "min_amount": min_amount,
+        }
+    )
+    logger.info("factor analysis strategy=%s start=%s end=%s rows=%s", strategy.key, start, end, len(analysis_panel))
+    return result
+
+
+def run_factor_analysis(**kwargs: Any) -> dict[str, Any]:
+    """API payload: summary plus JSON-safe daily metrics."""
+    result = run_factor_analysis_for_strategy(**kwargs)
+    daily = result.daily.astype(object).where(result.daily.notna(), None)
+    return {"summary": result.summary, "daily": daily.to_dict(orient="records")}
+
+
+def _run_factor_analysis_job(job_id: str, params: dict[str, Any]) -> None:
+    update_factor_analysis_job(job_id, status="running")
+    try:
+        result = run_factor_analysis(**params)
+    except Exception as exc:
+        logger.exception("factor analysis job failed: job_id=%s", job_id)
+        update_factor_analysis_job(job_id, status="failed", error_message=str(exc))
+        return
+    update_factor_analysis_job(job_id, status="success", result=result)
+
+
+def submit_factor_analysis(*, created_by: str, executor: Any = None, **params: Any) -> dict[str, Any]:
+    """Record a factor analysis job and run it in the background; poll it with get_factor_analysis."""
+    normalize_date(params["start_date"])
+    normalize_date(params["end_date"])
+    _validate_horizons(params.get("horizons") or DEFAULT_ANALYSIS_HORIZONS)
+    job_id = uuid.uuid4().hex
+    create_factor_analysis_job(job_id=job_id, params=params, created_by=str(created_by or ""))
+    (executor or _JOB_EXECUTOR).submit(_run_factor_analysis_job, job_id, params)
+    return get_factor_analysis(job_id) or {"job_id": job_id, "status": "pending"}
+
+
+def get_factor_analysis(job_id: str) -> dict[str, Any] | None:
+    return get_factor_analysis_job(job_id)
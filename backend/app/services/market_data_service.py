@@ -6,6 +6,7 @@ import pandas as pd
 from app.core.config import settings
 from app.data import mongo_ccass_hold, mongo_hk_hold, mongo_moneyflow_hsgt, mongo_stk_surv
 from app.data.duckdb_store import get_connection
+from app.data.partition_paths import partition_files
 
 
 def _query_parquet(
@@ -14,10 +15,14 @@ def _query_parquet(
     start_date: str,
     end_date: str,
 ) -> list[dict]:
-    parquet_root = settings.data_dir / "features" / feature_dir / f"ts_code={ts_code}"
-    if not parquet_root.exists():
+    files = partition_files(
+        settings.data_dir / "features" / feature_dir,
+        ts_code,
+        start_date=start_date or None,
+        end_date=end_date or None,
+    )
+    if not files:
         return []
-    part_glob = str(parquet_root / "year=*/part-*.parquet")
     query = (
         "SELECT * FROM read_parquet(?, union_by_name = true) "
         "WHERE ts_code = ? AND trade_date BETWEEN ? AND ? "
@@ -25,7 +30,7 @@ def _query_parquet(
     )
     with get_connection(read_only=True) as con:
         try:
-            rows = con.execute(query, [part_glob, ts_code, start_date, end_date]).fetchdf()
+            rows = con.execute(query, [files, ts_code, start_date, end_date]).fetchdf()
         except (duckdb.CatalogException, duckdb.IOException):
             return []
     if rows.empty:
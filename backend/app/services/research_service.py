@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import datetime as dt
-from collections.abc import Iterable
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Any
 
 import duckdb
@@ -14,6 +17,12 @@ from app.data.duckdb_store import get_connection
 from app.data.mongo import get_collection
 from app.data.mongo_index_data import DEFAULT_INDEX_DAILY_WHITELIST
 from app.data.mongo_stock import get_stock_basic_by_code
+from app.data.partition_paths import partition_files, years_for_rows
+
+logger = logging.getLogger(__name__)
+
+_section_executor: ThreadPoolExecutor | None = None
+_section_executor_lock = threading.Lock()
 
 
 def _normalize_ts_code(ts_code: str) -> str:
@@ -66,18 +75,24 @@ def _query_duckdb_table(
 ) -> list[dict[str, Any]]:
     """Read from Parquet files using DuckDB as query engine."""
     if ts_code:
-        parquet_root = settings.data_dir / "raw" / table / f"ts_code={ts_code}"
-        if not parquet_root.exists():
+        # Only trade_date-keyed tables are partitioned by the year of the filtered column.
+        by_trade_date = date_field == "trade_date"
+        source: str | list[str] = partition_files(
+            settings.data_dir / "raw" / table,
+            ts_code,
+            start_date=start_date if by_trade_date else None,
+            end_date=end_date if by_trade_date else None,
+        )
+        if not source:
             return []
-        glob = str(parquet_root / "year=*" / "part-*.parquet")
     else:
         parquet_root = settings.data_dir / "raw" / table
         if not parquet_root.exists():
             return []
-        glob = str(parquet_root / "ts_code=*" / "year=*" / "part-*.parquet")
+        source = str(parquet_root / "ts_code=*" / "year=*" / "part-*.parquet")
 
     query = ["SELECT * FROM read_parquet(?, union_by_name=true) WHERE 1=1"]
-    params: list[Any] = [glob]
+    params: list[Any] = [source]
     if ts_code:
         query.append("AND ts_code = ?")
         params.append(ts_code)
@@ -104,15 +119,15 @@ def _query_partitioned_parquet(
     end_date: str | None = None,
     limit: int | None = None,
 ) -> list[dict[str, Any]]:
-    parquet_root = settings.data_dir / base_dir / dataset / f"ts_code={ts_code}"
-    if not parquet_root.exists():
+    root = settings.data_dir / base_dir / dataset
+    all_files = partition_files(root, ts_code, start_date=start_date, end_date=end_date)
+    if not all_files:
         return []
-    part_glob = str(parquet_root / "year=*/part-*.parquet")
     query = [
         "SELECT * FROM read_parquet(?, hive_partitioning=1, union_by_name=true)",
         "WHERE ts_code = ?",
     ]
-    params: list[Any] = [part_glob, ts_code]
+    params: list[Any] = [ts_code]
     if start_date:
         query.append("AND trade_date >= ?")
         params.append(start_date)
@@ -120,10 +135,18 @@ def _query_partitioned_parquet(
         query.append("AND trade_date <= ?")
         params.append(end_date)
     query.append("ORDER BY trade_date DESC")
-    if limit is not None:
-        query.append("LIMIT ?")
-        params.append(int(limit))
-    return _to_records(_safe_fetch_df(" ".join(query), params))
+    if limit is None:
+        return _to_records(_safe_fetch_df(" ".join(query), [all_files, *params]))
+
+    query.append("LIMIT ?")
+    params.append(int(limit))
+    files = all_files
+    if not start_date:
+        files = partition_files(root, ts_code, end_date=end_date, latest_years=years_for_rows(limit))
+    df = _safe_fetch_df(" ".join(query), [files, *params])
+    if len(df) < int(limit) and len(files) < len(all_files):
+        df = _safe_fetch_df(" ".join(query), [all_files, *params])
+    return _to_records(df)
 
 
 def _query_mongo(
@@ -390,29 +413,88 @@ def _get_index_available_dates(limit: int = 60) -> list[str]:
     return sorted([str(item) for item in dates if item], reverse=True)[:limit]
 
 
+def _get_section_executor() -> ThreadPoolExecutor:
+    global _section_executor
+    with _section_executor_lock:
+        if _section_executor is None:
+            _section_executor = ThreadPoolExecutor(
+                max_workers=max(int(settings.research_section_workers), 1),
+                thread_name_prefix="research-section",
+            )
+        return _section_executor
+
+
+def _run_sections(
+    sections: dict[str, Callable[[], Any]],
+    *,
+    fallback: Callable[[], Any] = lambda: None,
+) -> tuple[dict[str, Any], list[str]]:
+    """Run independent lookups concurrently and return ``(results, degraded_sections)``.
+
+    DuckDB reads go through per-thread cursors of the shared read connection and Mongo
+    reads through the shared client pool. A section that raises or is still running
+    at ``research_section_timeout_seconds`` gets ``fallback()`` instead of failing the page.
+    """
+    executor = _get_section_executor()
+    futures = {name: executor.submit(loader) for name, loader in sections.items()}
+    wait(futures.values(), timeout=max(float(settings.research_section_timeout_seconds), 0.0))
+
+    results: dict[str, Any] = {}
+    degraded: list[str] = []
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            logger.warning("research section %s timed out", name)
+            results[name] = fallback()
+            degraded.append(name)
+            continue
+        try:
+            results[name] = future.result()
+        except Exception:
+            logger.warning("research section %s failed", name, exc_info=True)
+            results[name] = fallback()
+            degraded.append(name)
+    return results, degraded
+
+
 def get_stock_research_overview(ts_code: str) -> dict[str, Any]:
     code = _normalize_ts_code(ts_code)
-    return {
-        "ts_code": code,
-        "basic": _get_stock_basic(code),
-        "latest_daily": _get_latest_daily(code),
-        "latest_daily_basic": _get_latest_daily_basic(code),
-        "latest_indicators": _get_latest_indicator(code),
-        "latest_financial_indicator": _get_latest_financial_indicator(code),
-        "latest_dividend_summary": _get_dividend_summary(code),
-        "latest_holder_summary": _get_holder_summary(code),
-        "latest_flow_summary": _get_flow_summary(code),
-        "latest_event_summary": _get_event_summary(code),
-        "latest_chip_summary": _get_chip_summary(code),
-    }
+    sections, degraded = _run_sections(
+        {
+            "basic": lambda: _get_stock_basic(code),
+            "latest_daily": lambda: _get_latest_daily(code),
+            "latest_daily_basic": lambda: _get_latest_daily_basic(code),
+            "latest_indicators": lambda: _get_latest_indicator(code),
+            "latest_financial_indicator": lambda: _get_latest_financial_indicator(code),
+            "latest_dividend_summary": lambda: _get_dividend_summary(code),
+            "latest_holder_summary": lambda: _get_holder_summary(code),
+            "latest_flow_summary": lambda: _get_flow_summary(code),
+            "latest_event_summary": lambda: _get_event_summary(code),
+            "latest_chip_summary": lambda: _get_chip_summary(code),
+        }
+    )
+    return {"ts_code": code, **sections, "degraded_sections": degraded}
 
 
 def get_stock_research_financials(ts_code: str, limit: int = 8) -> dict[str, Any]:
     code = _normalize_ts_code(ts_code)
-    indicators = _query_duckdb_table("fina_indicator", ts_code=code, date_field="end_date", order_fields=["end_date DESC", "ann_date DESC"], limit=limit)
-    income = _query_duckdb_table("income", ts_code=code, date_field="end_date", order_fields=["end_date DESC", "ann_date DESC"], limit=limit)
-    balance = _query_duckdb_table("balancesheet", ts_code=code, date_field="end_date", order_fields=["end_date DESC", "ann_date DESC"], limit=limit)
-    cashflow = _query_duckdb_table("cashflow", ts_code=code, date_field="end_date", order_fields=["end_date DESC", "ann_date DESC"], limit=limit)
+    order_fields = ["end_date DESC", "ann_date DESC"]
+    sections, degraded = _run_sections(
+        {
+            name: (lambda table=table: _query_duckdb_table(table, ts_code=code, date_field="end_date", order_fields=order_fields, limit=limit))
+            for name, table in (
+                ("indicators", "fina_indicator"),
+                ("income", "income"),
+                ("balance", "balancesheet"),
+                ("cashflow", "cashflow"),
+            )
+        },
+        fallback=list,
+    )
+    indicators = sections["indicators"]
+    income = sections["income"]
+    balance = sections["balance"]
+    cashflow = sections["cashflow"]
     periods = []
     for row in indicators or income or balance or cashflow:
         end_date = row.get("end_date")
@@ -426,6 +508,7 @@ def get_stock_research_financials(ts_code: str, limit: int = 8) -> dict[str, Any
         "income": income,
         "balance": balance,
         "cashflow": cashflow,
+        "degraded_sections": degraded,
     }
 
 
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from pymongo import ASCENDING
+
+from app.data.mongo import get_collection
+
+# Daily industry snapshots per ranking source; both collections share the document shape
+# (ts_code, name, level, trade_date, pct_change, rank, rank_total, close, vol, amount).
+_SOURCE_COLLECTIONS = {"sw": "shenwan_daily", "ci": "citic_daily"}
+_AVG_DAYS = 5
+_RANKING_FIELDS = ("ts_code", "name", "pct_change", "rank", "rank_total", "close", "vol", "amount")
+
+_INDEXED: set[str] = set()
+
+
+def _ranking_collection(source: str):
+    name = _SOURCE_COLLECTIONS.get(source)
+    if name is None:
+        raise ValueError(f"unsupported sector ranking source: {source}")
+    collection = get_collection(name)
+    if name not in _INDEXED:
+        # Serves the $match on (level, trade_date) and the pct_change ordering inside each date.
+        collection.create_index(
+            [("level", ASCENDING), ("trade_date", ASCENDING), ("pct_change", ASCENDING)],
+            name="idx_level_trade_date_pct_change",
+        )
+        _INDEXED.add(name)
+    return collection
+
+
+def build_history_pipeline(
+    *,
+    trade_dates: list[str],
+    level: int,
+    top_n: int,
+    bottom_n: int,
+) -> list[dict[str, object]]:
+    """Top/bottom ``pct_change`` members of every date in one ``$group`` pass.
+
+    Orders match the single-date ``find`` queries: top by pct_change desc, bottom by
+    pct_change asc, ties broken by ts_code in both.
+    """
+    output = {field: f"${field}" for field in _RANKING_FIELDS}
+    group: dict[str, object] = {"_id": "$trade_date", "total": {"$sum": 1}}
+    if top_n > 0:
+        group["top"] = {"$topN": {"n": top_n, "sortBy": {"pct_change": -1, "ts_code": 1}, "output": output}}
+    if bottom_n > 0:
+        group["bottom"] = {"$topN": {"n": bottom_n, "sortBy": {"pct_change": 1, "ts_code": 1}, "output": output}}
+    return [
+        {"$match": {"level": level, "trade_date": {"$in": list(trade_dates)}}},
+        {"$group": group},
+    ]
+
+
+def build_avg_pipeline(
+    *,
+    trade_dates: list[str],
+    level: int,
+    top_n: int,
+    bottom_n: int,
+) -> list[dict[str, object]]:
+    """Per-industry average rank over ``trade_dates``, strongest and weakest in one ``$facet``."""
+    return [
+        {"$match": {"level": level, "trade_date": {"$in": list(trade_dates)}}},
+        {
+            "$group": {
+                "_id": "$ts_code",
+                "name": {"$max": "$name"},
+                "days": {"$push": {"trade_date": "$trade_date", "rank": "$rank", "pct_change": "$pct_change"}},
+                "rank_avg": {"$avg": "$rank"},
+                "pct_sum": {"$sum": "$pct_change"},
+            }
+        },
+        {"$match": {"rank_avg": {"$ne": None}}},
+        {
+            "$facet": {
+                "strongest": [{"$sort": {"rank_avg": 1, "_id": 1}}, {"$limit": max(top_n, 1)}],
+                "weakest": [{"$sort": {"rank_avg": -1, "_id": 1}}, {"$limit": max(bottom_n, 1)}],
+            }
+        },
+    ]
+
+
+def get_ranking_history(
+    *,
+    source: str,
+    trade_dates: list[str],
+    level: int,
+    top_n: int = 5,
+    bottom_n: int = 5,
+) -> list[dict[str, object]]:
+    """Top/bottom members for each of ``trade_dates`` from a single aggregation, in input order."""
+    if not trade_dates:
+        return []
+    pipeline = build_history_pipeline(trade_dates=trade_dates, level=level, top_n=top_n, bottom_n=bottom_n)
+    by_date = {doc["_id"]: doc for doc in _ranking_collection(source).aggregate(pipeline)}
+    data: list[dict[str, object]] = []
+    for trade_date in trade_dates:
+        doc = by_date.get(trade_date, {})
+        data.append(
+            {
+                "trade_date": trade_date,
+                "top": list(doc.get("top", [])),
+                "bottom": list(doc.get("bottom", [])),
+            }
+        )
+    return data
+
+
+def _avg_row(doc: dict[str, object], trade_dates: list[str], level: int) -> dict[str, object]:
+    days = {item.get("trade_date"): item for item in doc.get("days", [])}
+    row: dict[str, object] = {"ts_code": doc["_id"], "name": doc.get("name"), "level": level}
+    for idx in range(_AVG_DAYS):
+        day = days.get(trade_dates[idx], {}) if idx < len(trade_dates) else {}
+        row[f"rank_day{idx + 1}"] = day.get("rank")
+    row["rank_avg"] = doc.get("rank_avg")
+    for idx in range(_AVG_DAYS):
+        day = days.get(trade_dates[idx], {}) if idx < len(trade_dates) else {}
+        row[f"pct_day{idx + 1}"] = day.get("pct_change")
+    row["pct_sum"] = doc.get("pct_sum") or 0
+    return row
+
+
+def get_avg_rankings(
+    *,
+    source: str,
+    trade_dates: list[str],
+    level: int,
+    top_n: int = 10,
+    bottom_n: int = 10,
+) -> dict[str, object]:
+    """Strongest/weakest industries by average daily rank, same row shape as ``build_avg_rankings``."""
+    if not trade_dates:
+        return {"trade_dates": [], "strongest": [], "weakest": []}
+    pipeline = build_avg_pipeline(trade_dates=trade_dates, level=level, top_n=top_n, bottom_n=bottom_n)
+    facets = next(iter(_ranking_collection(source).aggregate(pipeline)), {})
+    return {
+        "trade_dates": list(trade_dates),
+        "strongest": [_avg_row(doc, trade_dates, level) for doc in facets.get("strongest", [])[: max(top_n, 0)]],
+        "weakest": [_avg_row(doc, trade_dates, level) for doc in facets.get("weakest", [])[: max(bottom_n, 0)]],
+    }
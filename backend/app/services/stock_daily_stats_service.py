@@ -4,9 +4,11 @@ from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from app.api.stock_code import resolve_ts_codes_input
+from app.features.rolling_stats import ROLLING_WINDOWS, load_rolling_stats_for_date, rolling_stat_column, run_lengths
 from app.data.stock_daily_stats import (
     get_latest_trade_date,
     list_active_citic_member_codes,
@@ -24,6 +26,22 @@ from app.schemas.stock_daily_stats import (
 SUPPORTED_UNIVERSES = {"all_a", "main_board", "chi_next", "star"}
 SUPPORTED_INDUSTRY_SOURCES = {"sw", "citic"}
 SUPPORTED_SORT_FIELDS = {"up_days", "pct_change", "max_up_streak", "avg_amount"}
+STOCK_DAILY_STATS_COLUMNS = (
+    "ts_code",
+    "name",
+    "start_date",
+    "end_date",
+    "trade_days",
+    "up_days",
+    "down_days",
+    "flat_days",
+    "pct_change",
+    "max_up_streak",
+    "max_down_streak",
+    "avg_amount",
+    "latest_close",
+    "latest_pct_chg",
+)
 UNIVERSE_MARKETS: dict[str, list[str] | None] = {
     "all_a": None,
     "main_board": ["主板"],
@@ -196,130 +214,211 @@ def resolve_screen_trade_dates(
     )
 
 
-def _max_streak(directions: Sequence[int], target: int) -> int:
-    best = 0
-    current = 0
-    for direction in directions:
-        if direction == target:
-            current += 1
-            best = max(best, current)
-        else:
-            current = 0
-    return best
+def _segment_max_streak(hits: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Longest run of True per segment; segments begin at the sorted ``starts`` offsets."""
+    return np.maximum.reduceat(run_lengths(hits, starts), starts)
 
 
-def build_stock_daily_stats_items(
+def compute_stock_daily_stats_frame(
     daily_df: pd.DataFrame,
     *,
     trade_dates: Sequence[str],
     basics_by_code: Mapping[str, Mapping[str, Any]],
     start_date: str,
     end_date: str,
-) -> list[dict[str, Any]]:
+) -> pd.DataFrame:
+    """Per-stock window stats with one sort and segment reductions over the sorted arrays."""
+    empty = pd.DataFrame(columns=list(STOCK_DAILY_STATS_COLUMNS))
     if daily_df.empty or not trade_dates:
-        return []
+        return empty
 
-    working = daily_df.copy()
+    working = daily_df[["ts_code", "trade_date", "close", "pre_close", "pct_chg", "amount"]].copy()
     working["ts_code"] = working["ts_code"].astype(str).str.upper()
     working["trade_date"] = working["trade_date"].astype(str)
     working = working[working["trade_date"].isin(list(trade_dates))]
+    if basics_by_code:
+        working = working[working["ts_code"].isin(list(basics_by_code))]
     working = working.drop_duplicates(subset=["ts_code", "trade_date"], keep="last")
-    if working.empty:
-        return []
-
     for column in ["close", "pre_close", "pct_chg", "amount"]:
         working[column] = pd.to_numeric(working[column], errors="coerce")
     working = working.dropna(subset=["close", "pre_close", "amount"])
     if working.empty:
-        return []
+        return empty
+    working = working.sort_values(["ts_code", "trade_date"], kind="stable")
 
-    working["direction"] = 0
-    working.loc[working["close"] > working["pre_close"], "direction"] = 1
-    working.loc[working["close"] < working["pre_close"], "direction"] = -1
-    working["pct_chg_effective"] = working["pct_chg"]
-    missing_pct = working["pct_chg_effective"].isna()
-    working.loc[missing_pct, "pct_chg_effective"] = (
-        (working.loc[missing_pct, "close"] - working.loc[missing_pct, "pre_close"])
-        / working.loc[missing_pct, "pre_close"].where(working.loc[missing_pct, "pre_close"] != 0)
-        * 100
+    codes = working["ts_code"].to_numpy()
+    close = working["close"].to_numpy(dtype=float)
+    pre_close = working["pre_close"].to_numpy(dtype=float)
+    amount = working["amount"].to_numpy(dtype=float)
+    pct_chg = working["pct_chg"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fallback_pct = np.where(pre_close != 0, (close - pre_close) / pre_close * 100, np.nan)
+    pct_chg = np.where(np.isnan(pct_chg), fallback_pct, pct_chg)
+    direction = np.sign(close - pre_close).astype(np.int8)
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    lasts = np.r_[starts[1:], len(codes)] - 1
+    trade_days = lasts - starts + 1
+    first_pre_close = pre_close[starts]
+    last_close = close[lasts]
+    latest_pct_chg = pct_chg[lasts]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_change = (last_close / first_pre_close - 1.0) * 100.0
+
+    stats = pd.DataFrame(
+        {
+            "ts_code": codes[starts],
+            "start_date": start_date,
+            "end_date": end_date,
+            "trade_days": trade_days,
+            "up_days": np.add.reduceat((direction > 0).astype(np.int64), starts),
+            "down_days": np.add.reduceat((direction < 0).astype(np.int64), starts),
+            "flat_days": np.add.reduceat((direction == 0).astype(np.int64), starts),
+            "pct_change": pct_change,
+            "max_up_streak": _segment_max_streak(direction > 0, starts),
+            "max_down_streak": _segment_max_streak(direction < 0, starts),
+            "avg_amount": np.add.reduceat(amount, starts) / trade_days,
+            "latest_close": last_close,
+            "latest_pct_chg": latest_pct_chg,
+        }
     )
-    working = working.sort_values(["ts_code", "trade_date"], kind="stable")
+    stats = stats[(first_pre_close > 0) & ~np.isnan(latest_pct_chg)].reset_index(drop=True)
+    stats.insert(1, "name", [basics_by_code.get(code, {}).get("name") for code in stats["ts_code"]])
+    return stats[list(STOCK_DAILY_STATS_COLUMNS)]
 
-    items: list[dict[str, Any]] = []
-    for ts_code, group in working.groupby("ts_code", sort=False):
-        if basics_by_code and ts_code not in basics_by_code:
-            continue
-        if group.empty:
-            continue
-        first_row = group.iloc[0]
-        last_row = group.iloc[-1]
-        first_pre_close = float(first_row["pre_close"])
-        last_close = float(last_row["close"])
-        latest_pct_chg = last_row["pct_chg_effective"]
-        if first_pre_close <= 0 or pd.isna(latest_pct_chg):
-            continue
-
-        directions = [int(value) for value in group["direction"].tolist()]
-        basic = basics_by_code.get(ts_code, {})
-        items.append(
-            {
-                "ts_code": ts_code,
-                "name": basic.get("name"),
-                "start_date": start_date,
-                "end_date": end_date,
-                "trade_days": int(len(group)),
-                "up_days": int((group["direction"] > 0).sum()),
-                "down_days": int((group["direction"] < 0).sum()),
-                "flat_days": int((group["direction"] == 0).sum()),
-                "pct_change": float((last_close / first_pre_close - 1.0) * 100.0),
-                "max_up_streak": _max_streak(directions, 1),
-                "max_down_streak": _max_streak(directions, -1),
-                "avg_amount": float(group["amount"].mean()),
-                "latest_close": last_close,
-                "latest_pct_chg": float(latest_pct_chg),
-            }
-        )
-    return items
 
+def build_stock_daily_stats_items(
+    daily_df: pd.DataFrame,
+    *,
+    trade_dates: Sequence[str],
+    basics_by_code: Mapping[str, Mapping[str, Any]],
+    start_date: str,
+    end_date: str,
+) -> list[dict[str, Any]]:
+    stats = compute_stock_daily_stats_frame(
+        daily_df,
+        trade_dates=trade_dates,
+        basics_by_code=basics_by_code,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return stats.to_dict(orient="records")
 
-def filter_sort_paginate_stock_daily_stats(
-    items: Sequence[dict[str, Any]],
+
+def filter_sort_paginate_stock_daily_stats_frame(
+    stats: pd.DataFrame,
     request: NormalizedScreenRequest,
     *,
     expected_trade_days: int,
 ) -> StockDailyStatsScreenResult:
-    filtered: list[dict[str, Any]] = []
-    for item in items:
-        if request.exclude_suspended and int(item["trade_days"]) < expected_trade_days:
-            continue
-        if request.up_days_gte is not None and int(item["up_days"]) < request.up_days_gte:
-            continue
-        if request.pct_change_gte is not None and float(item["pct_change"]) < request.pct_change_gte:
-            continue
-        if request.max_up_streak_gte is not None and int(item["max_up_streak"]) < request.max_up_streak_gte:
-            continue
-        if request.avg_amount_gte is not None and float(item["avg_amount"]) < request.avg_amount_gte:
-            continue
-        filtered.append(item)
-
-    reverse = request.sort_order == "desc"
-    if reverse:
-        filtered.sort(key=lambda row: str(row.get("ts_code") or ""))
-        filtered.sort(key=lambda row: float(row.get(request.sort_by) or 0), reverse=True)
-    else:
-        filtered.sort(key=lambda row: (float(row.get(request.sort_by) or 0), str(row.get("ts_code") or "")))
+    """Filter, sort and page on columns; only the returned page is turned into dicts."""
+    mask = np.ones(len(stats), dtype=bool)
+    if request.exclude_suspended:
+        mask &= stats["trade_days"].to_numpy() >= expected_trade_days
+    thresholds = [
+        ("up_days", request.up_days_gte),
+        ("pct_change", request.pct_change_gte),
+        ("max_up_streak", request.max_up_streak_gte),
+        ("avg_amount", request.avg_amount_gte),
+    ]
+    for column, threshold in thresholds:
+        if threshold is not None:
+            mask &= stats[column].to_numpy(dtype=float) >= threshold
+    filtered = stats[mask]
+
+    sort_values = filtered[request.sort_by].to_numpy(dtype=float)
+    sort_values = np.nan_to_num(sort_values, nan=0.0)
+    if request.sort_order == "desc":
+        sort_values = -sort_values
+    order = np.lexsort((filtered["ts_code"].to_numpy(dtype=str), sort_values))
 
     total = len(filtered)
     offset = (request.page - 1) * request.page_size
-    paged = filtered[offset : offset + request.page_size]
+    paged = filtered.iloc[order[offset : offset + request.page_size]]
     return StockDailyStatsScreenResult(
-        data=paged,
+        data=paged.to_dict(orient="records"),
         total=total,
         page=request.page,
         page_size=request.page_size,
     )
 
 
+def filter_sort_paginate_stock_daily_stats(
+    items: Sequence[dict[str, Any]],
+    request: NormalizedScreenRequest,
+    *,
+    expected_trade_days: int,
+) -> StockDailyStatsScreenResult:
+    stats = pd.DataFrame(list(items), columns=list(STOCK_DAILY_STATS_COLUMNS))
+    return filter_sort_paginate_stock_daily_stats_frame(stats, request, expected_trade_days=expected_trade_days)
+
+
+def _stats_from_rolling_store(
+    resolved: ResolvedTradeDateRange,
+    basics_by_code: Mapping[str, Mapping[str, Any]],
+) -> pd.DataFrame | None:
+    """Answer a lookback screen from the rolling-stats row of ``end_date``.
+
+    Stocks whose stored window does not span exactly ``trade_dates`` (suspended inside the
+    window or on ``end_date``) are recomputed from daily rows. Returns None when the store
+    has no rows for ``end_date`` so the caller falls back to the full scan.
+    """
+    window = len(resolved.trade_dates)
+    ts_codes = basics_by_code.keys() if len(basics_by_code) <= 2000 else None
+    stored = load_rolling_stats_for_date(resolved.end_date, window=window, ts_codes=ts_codes)
+    if stored.empty:
+        return None
+
+    stored = stored[stored["ts_code"].isin(list(basics_by_code))]
+    complete = stored[
+        (stored[rolling_stat_column("trade_days", window)] == window)
+        & (stored[rolling_stat_column("first_date", window)] == resolved.start_date)
+    ]
+    complete_codes = set(complete["ts_code"])
+    leftover_codes = [code for code in basics_by_code if code not in complete_codes]
+    if len(leftover_codes) > 2000:
+        return None
+
+    stats = pd.DataFrame(
+        {
+            "ts_code": complete["ts_code"].to_numpy(),
+            "name": [basics_by_code[code].get("name") for code in complete["ts_code"]],
+            "start_date": resolved.start_date,
+            "end_date": resolved.end_date,
+            "trade_days": complete[rolling_stat_column("trade_days", window)].to_numpy(),
+            "up_days": complete[rolling_stat_column("up_days", window)].to_numpy(),
+            "down_days": complete[rolling_stat_column("down_days", window)].to_numpy(),
+            "flat_days": complete[rolling_stat_column("flat_days", window)].to_numpy(),
+            "pct_change": complete[rolling_stat_column("ret", window)].to_numpy(dtype=float),
+            "max_up_streak": complete[rolling_stat_column("max_up_streak", window)].to_numpy(),
+            "max_down_streak": complete[rolling_stat_column("max_down_streak", window)].to_numpy(),
+            "avg_amount": complete[rolling_stat_column("avg_amount", window)].to_numpy(dtype=float),
+            "latest_close": complete["latest_close"].to_numpy(dtype=float),
+            "latest_pct_chg": complete["latest_pct_chg"].to_numpy(dtype=float),
+        },
+        columns=list(STOCK_DAILY_STATS_COLUMNS),
+    )
+    stats = stats[stats["pct_change"].notna() & stats["latest_pct_chg"].notna()]
+    if not leftover_codes:
+        return stats.reset_index(drop=True)
+
+    daily_df = load_daily_frame_for_screen(
+        start_date=resolved.start_date,
+        end_date=resolved.end_date,
+        ts_codes=leftover_codes,
+    )
+    recomputed = compute_stock_daily_stats_frame(
+        daily_df,
+        trade_dates=resolved.trade_dates,
+        basics_by_code={code: basics_by_code[code] for code in leftover_codes},
+        start_date=resolved.start_date,
+        end_date=resolved.end_date,
+    )
+    if recomputed.empty:
+        return stats.reset_index(drop=True)
+    return pd.concat([stats, recomputed], ignore_index=True)
+
+
 def _is_st_name(name: str | None) -> bool:
     text = str(name or "").strip().upper()
     return text.startswith("ST") or text.startswith("*ST")
@@ -375,21 +474,30 @@ def screen_stock_daily_stats(payload: StockDailyStatsScreenRequest) -> StockDail
         for item in basics
         if str(item.get("ts_code") or "").strip()
     }
-    daily_ts_codes = basics_by_code.keys() if len(basics_by_code) <= 2000 else None
-    daily_df = load_daily_frame_for_screen(
-        start_date=resolved.start_date,
-        end_date=resolved.end_date,
-        ts_codes=daily_ts_codes,
+    stats = None
+    use_rolling_store = (
+        not request.start_date
+        and request.lookback_days in ROLLING_WINDOWS
+        and len(resolved.trade_dates) == request.lookback_days
     )
-    items = build_stock_daily_stats_items(
-        daily_df,
-        trade_dates=resolved.trade_dates,
-        basics_by_code=basics_by_code,
-        start_date=resolved.start_date,
-        end_date=resolved.end_date,
-    )
-    return filter_sort_paginate_stock_daily_stats(
-        items,
+    if use_rolling_store:
+        stats = _stats_from_rolling_store(resolved, basics_by_code)
+    if stats is None:
+        daily_ts_codes = basics_by_code.keys() if len(basics_by_code) <= 2000 else None
+        daily_df = load_daily_frame_for_screen(
+            start_date=resolved.start_date,
+            end_date=resolved.end_date,
+            ts_codes=daily_ts_codes,
+        )
+        stats = compute_stock_daily_stats_frame(
+            daily_df,
+            trade_dates=resolved.trade_dates,
+            basics_by_code=basics_by_code,
+            start_date=resolved.start_date,
+            end_date=resolved.end_date,
+        )
+    return filter_sort_paginate_stock_daily_stats_frame(
+        stats,
         request,
         expected_trade_days=len(resolved.trade_dates),
     )
@@ -14,9 +14,10 @@ from app.data.mongo_strategy_signal import (
     list_strategy_signals,
     upsert_strategy_signals,
 )
+from app.features.fundamentals import attach_fundamentals
 from app.quant.allocator import calc_target_amount, calc_target_weight
 from app.quant.params_registry import validate_and_normalize_params
-from app.quant.base import StrategyContext
+from app.quant.base import StrategyContext, score_contexts
 from app.quant.context import load_daily_data_bundle
 from app.quant.engine import (
     _calc_list_days,
@@ -372,6 +373,9 @@ def generate_strategy_signals_for_date(
 
             frame = _apply_universe_index_filter(bundle.frame_t, signal_date=signal_date, params=params)
             frame = _filter_frame(frame, signal_date=signal_date, params=params)
+            if not frame.empty and params.get("fundamental_fields"):
+                # The backtest attaches the same point-in-time fields through load_daily_data_bundle.
+                frame = attach_fundamentals(frame, fields=params["fundamental_fields"], trade_date=signal_date)
             if frame.empty:
                 removed = delete_strategy_signals(
                     signal_date=signal_date,
@@ -495,3 +499,313 @@ def generate_strategy_signals_for_date(
         "version_stats": version_stats,
         "total_upserted": total_upserted,
     }
+
+
+def _list_open_dates_with_next(start_date: str, end_date: str, exchange: str = "SSE") -> list[str]:
+    """Open dates in [start_date, end_date] followed by the first open date after end_date."""
+    cursor = get_collection("trade_calendar").find(
+        {
+            "exchange": exchange,
+            "cal_date": {"$gte": start_date},
+            "is_open": {"$in": ["1", 1]},
+        },
+        {"_id": 0, "cal_date": 1},
+        sort=[("cal_date", 1)],
+    )
+    dates: list[str] = []
+    for item in cursor:
+        cal_date = str(item.get("cal_date") or "").strip()
+        if not cal_date:
+            continue
+        dates.append(cal_date)
+        if cal_date > end_date:
+            break
+    return dates
+
+
+def _prepare_base_frame(frame: pd.DataFrame, *, signal_date: str) -> pd.DataFrame:
+    """Version-independent part of ``_filter_frame``: board, list_days and price checks."""
+    if frame is None or frame.empty:
+        return pd.DataFrame()
+    data = frame.copy()
+    data["board"] = data["ts_code"].map(_infer_board)
+    list_date = pd.to_datetime(data["list_date"].astype(str), format="%Y%m%d", errors="coerce")
+    data["list_days"] = (pd.Timestamp(signal_date) - list_date).dt.days.fillna(0).astype(int)
+    data = data[(data["list_days"] >= 120) & data["close"].notna() & data["open"].notna()]
+    return data
+
+
+def _sector_strength_series(
+    frame: pd.DataFrame,
+    bundle: Any,
+    *,
+    use_member_sector_mapping: bool,
+    sector_source_weights: dict[str, float],
+) -> pd.Series:
+    sector_strength_maps = build_sector_strength_maps(bundle.sector_rows_t)
+    sector_strength_name_map = sector_strength_maps.get("name", {})
+    if not use_member_sector_mapping:
+        return frame["industry"].map(sector_strength_name_map).fillna(50.0)
+    sector_strength_sw_map = sector_strength_maps.get("sw_code", {})
+    sector_strength_ci_map = sector_strength_maps.get("ci_code", {})
+    shenwan_member_codes_map = bundle.shenwan_member_codes_t or {}
+    citic_member_codes_map = bundle.citic_member_codes_t or {}
+    values = [
+        _resolve_sector_strength(
+            ts_code=ts_code,
+            industry_name=industry,
+            shenwan_member_codes_map=shenwan_member_codes_map,
+            citic_member_codes_map=citic_member_codes_map,
+            sector_strength_name_map=sector_strength_name_map,
+            sector_strength_sw_map=sector_strength_sw_map,
+            sector_strength_ci_map=sector_strength_ci_map,
+            source_weights=sector_source_weights,
+        )
+        for ts_code, industry in zip(frame["ts_code"], frame["industry"])
+    ]
+    return pd.Series(values, index=frame.index, dtype=float)
+
+
+def _replace_strategy_signals_for_range(
+    *,
+    start_date: str,
+    end_date: str,
+    strategy_version_id: str,
+    portfolio_id: str,
+    rows: list[dict[str, Any]],
+) -> tuple[int, int]:
+    removed = get_collection("strategy_signals_daily").delete_many(
+        {
+            "strategy_version_id": strategy_version_id,
+            "portfolio_id": portfolio_id,
+            "signal_date": {"$gte": start_date, "$lte": end_date},
+        }
+    ).deleted_count
+    upserted = upsert_strategy_signals(rows) if rows else 0
+    return int(removed), int(upserted)
+
+
+def generate_strategy_signals_for_range(
+    *,
+    start_date: str,
+    end_date: str,
+    strategy_id: str | None = None,
+    strategy_version_id: str | None = None,
+    portfolio_id: str = STRATEGY_PORTFOLIO_ID,
+    portfolio_type: str = "strategy",
+    block_days: int = 60,
+) -> dict[str, Any]:
+    """Backfill signals for every open date in a range.
+
+    Dates are processed in blocks of ``block_days``: each date's data bundle, board,
+    list_days and sector strength are computed once and shared by all versions, every
+    version scores the whole block in one pass (``score_panel`` when available), and its
+    signals for the block's date range are replaced in bulk. A block that fails for a
+    version is recorded in that version's ``failed_blocks`` and later blocks still run;
+    the range result is ``degraded`` when any version failed.
+    """
+    start_date = normalize_date(start_date)
+    end_date = normalize_date(end_date)
+    open_dates = _list_open_dates_with_next(start_date, end_date)
+    signal_dates = [item for item in open_dates if item <= end_date]
+    next_trade_date_map = dict(zip(open_dates[:-1], open_dates[1:]))
+    signal_dates = [item for item in signal_dates if item in next_trade_date_map]
+    result: dict[str, Any] = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "signal_dates": len(signal_dates),
+        "status": "success",
+        "reason": "",
+        "version_stats": [],
+        "total_upserted": 0,
+    }
+    if not signal_dates:
+        result.update({"status": "skipped", "reason": "no_trading_days"})
+        return result
+
+    versions = _load_strategy_versions(strategy_id=strategy_id, strategy_version_id=strategy_version_id)
+    if not versions:
+        result.update({"status": "skipped", "reason": "no_target_strategy_versions"})
+        return result
+
+    version_specs: list[dict[str, Any]] = []
+    version_stats: dict[str, dict[str, Any]] = {}
+    for version in versions:
+        version_id = str(version.get("strategy_version_id") or "").strip()
+        stats = {
+            "strategy_version_id": version_id,
+            "status": "success",
+            "reason": "",
+            "removed": 0,
+            "upserted": 0,
+            "failed_blocks": [],
+        }
+        version_stats[version_id] = stats
+        try:
+            params_snapshot = _normalize_version_params_snapshot(version)
+            strategy_key = str(version.get("strategy_key") or "").strip() or str(params_snapshot.get("strategy_key") or "multifactor_v1")
+            params, _ = validate_and_normalize_params(strategy_key, params_snapshot)
+            version_specs.append(
+                {
+                    "strategy_id": str(version.get("strategy_id") or "").strip(),
+                    "strategy_version_id": version_id,
+                    "strategy_key": strategy_key,
+                    "strategy": load_strategy(strategy_key),
+                    "params": params,
+                    "allowed_boards": _normalize_allowed_boards(params.get("allowed_boards")),
+                    "min_amount": _to_float(params.get("min_avg_amount_20d"), 25_000.0),
+                    "index_code": _normalize_index_code(params.get("universe_index_code")),
+                    "sector_key": (
+                        _to_bool(params.get("use_member_sector_mapping"), True),
+                        tuple(sorted(_normalize_sector_source_weights(params.get("sector_source_weights")).items())),
+                    ),
+                    "score_direction": _normalize_score_direction(params.get("score_direction")),
+                    "fundamental_fields": tuple(params.get("fundamental_fields") or ()),
+                }
+            )
+            stats["strategy_key"] = strategy_key
+        except Exception as exc:
+            logger.exception("prepare strategy version failed strategy_version_id=%s", version_id)
+            stats.update({"status": "degraded", "reason": f"version_exception:{exc}"})
+
+    universe_df = list_stock_universe()
+    block_size = max(int(block_days), 1)
+    for block_start in range(0, len(signal_dates), block_size):
+        block_dates = signal_dates[block_start : block_start + block_size]
+        days: list[dict[str, Any]] = []
+        for signal_date in block_dates:
+            bundle = load_daily_data_bundle(
+                trade_date=signal_date,
+                next_trade_date=next_trade_date_map[signal_date],
+                universe_df=universe_df,
+            )
+            base_frame = _prepare_base_frame(bundle.frame_t, signal_date=signal_date)
+            if base_frame.empty:
+                logger.info("strategy signals range: %s frame empty after base filters", signal_date)
+            days.append(
+                {
+                    "signal_date": signal_date,
+                    "bundle": bundle,
+                    "frame": base_frame,
+                    "sector_strength": {},
+                    "index_members": {},
+                    "fundamentals": {},
+                }
+            )
+
+        for spec in version_specs:
+            stats = version_stats[spec["strategy_version_id"]]
+            try:
+                contexts: list[StrategyContext] = []
+                markets: dict[str, tuple[str, float]] = {}
+                for day in days:
+                    frame = day["frame"]
+                    if frame.empty:
+                        continue
+                    frame = frame[
+                        frame["board"].isin(spec["allowed_boards"])
+                        & (frame["amount"].fillna(0) >= spec["min_amount"])
+                    ]
+                    index_code = spec["index_code"]
+                    if index_code:
+                        members = day["index_members"]
+                        if index_code not in members:
+                            members[index_code] = _load_index_member_codes(
+                                index_code=index_code,
+                                start_date=day["signal_date"],
+                                end_date=day["signal_date"],
+                            )
+                        if members[index_code]:
+                            frame = frame[frame["ts_code"].isin(members[index_code])]
+                    if frame.empty:
+                        continue
+                    fields = spec["fundamental_fields"]
+                    if fields:
+                        fundamentals = day["fundamentals"]
+                        if fields not in fundamentals:
+                            fundamentals[fields] = attach_fundamentals(
+                                day["frame"], fields=list(fields), trade_date=day["signal_date"]
+                            )
+                        frame = fundamentals[fields].loc[frame.index]
+                    sector_cache = day["sector_strength"]
+                    if spec["sector_key"] not in sector_cache:
+                        use_member_sector_mapping, weights = spec["sector_key"]
+                        sector_cache[spec["sector_key"]] = _sector_strength_series(
+                            day["frame"],
+                            day["bundle"],
+                            use_member_sector_mapping=use_member_sector_mapping,
+                            sector_source_weights=dict(weights),
+                        )
+                    frame = frame.assign(sector_strength=sector_cache[spec["sector_key"]].reindex(frame.index))
+                    market_regime, market_exposure = _resolve_market_context(
+                        market_factor_t=day["bundle"].market_factor_t,
+                        params=spec["params"],
+                    )
+                    markets[day["signal_date"]] = (market_regime, market_exposure)
+                    contexts.append(
+                        StrategyContext(
+                            trade_date=day["signal_date"],
+                            frame=frame,
+                            market_regime=market_regime,
+                            market_exposure=market_exposure,
+                            params=spec["params"],
+                        )
+                    )
+
+                rows: list[dict[str, Any]] = []
+                for signal_date, scored in score_contexts(spec["strategy"], contexts).items():
+                    scored = scored.copy()
+                    scored["raw_score"] = pd.to_numeric(scored.get("total_score"), errors="coerce").fillna(0.0)
+                    if spec["score_direction"] == "reverse":
+                        scored["score"] = (100.0 - scored["raw_score"]).clip(lower=0.0, upper=100.0)
+                    else:
+                        scored["score"] = scored["raw_score"].clip(lower=0.0, upper=100.0)
+                    scored = scored.sort_values(by=["score", "sector_strength", "ts_code"], ascending=[False, False, True])
+                    market_regime, market_exposure = markets[signal_date]
+                    rows.extend(
+                        _build_signal_rows(
+                            signal_date=signal_date,
+                            signal_trade_date=next_trade_date_map[signal_date],
+                            strategy_id=spec["strategy_id"],
+                            strategy_version_id=spec["strategy_version_id"],
+                            params=spec["params"],
+                            scored=scored,
+                            market_regime=market_regime,
+                            market_exposure=market_exposure,
+                            portfolio_id=portfolio_id,
+                            portfolio_type=portfolio_type,
+                        )
+                    )
+                removed, upserted = _replace_strategy_signals_for_range(
+                    start_date=block_dates[0],
+                    end_date=block_dates[-1],
+                    strategy_version_id=spec["strategy_version_id"],
+                    portfolio_id=portfolio_id,
+                    rows=rows,
+                )
+                stats["removed"] += removed
+                stats["upserted"] += upserted
+                result["total_upserted"] += upserted
+            except Exception as exc:
+                logger.exception(
+                    "generate range signals failed for strategy_version_id=%s block=%s-%s",
+                    spec["strategy_version_id"],
+                    block_dates[0],
+                    block_dates[-1],
+                )
+                stats["failed_blocks"].append(
+                    {"start_date": block_dates[0], "end_date": block_dates[-1], "reason": f"block_exception:{exc}"}
+                )
+                stats.update({"status": "degraded", "reason": f"failed_blocks:{len(stats['failed_blocks'])}"})
+        logger.info(
+            "strategy signals range block %s-%s done, versions=%s",
+            block_dates[0],
+            block_dates[-1],
+            len(version_specs),
+        )
+
+    result["version_stats"] = list(version_stats.values())
+    degraded = [stats["strategy_version_id"] for stats in result["version_stats"] if stats["status"] != "success"]
+    if degraded:
+        result.update({"status": "degraded", "reason": f"degraded_versions:{','.join(degraded)}"})
+    return result
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_READ_CHUNK_BYTES = 1 << 20
+STREAM_CHUNK_BYTES = 64 * 1024
+# Finished followers nobody is reading any more; kept so a later seek reuses their index.
+_MAX_IDLE_FOLLOWERS = 16
+
+
+class SparseLineIndex:
+    """Byte offsets of every ``every``-th line of an append-only file.
+
+    Seeking to line N starts at the nearest checkpoint at or before N and scans at most
+    ``every`` lines from there, so the index stays small for multi-million-line logs.
+    """
+
+    def __init__(self, every: int) -> None:
+        self.every = max(int(every), 1)
+        self.checkpoints = [0]
+        self.lines = 0
+        self.size = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """Index ``chunk``, which must start at byte ``self.size``."""
+        newlines = chunk.count(b"\n")
+        if (self.lines + newlines) // self.every == self.lines // self.every:
+            self.lines += newlines
+        else:
+            start = 0
+            while (pos := chunk.find(b"\n", start)) >= 0:
+                self.lines += 1
+                if self.lines % self.every == 0:
+                    self.checkpoints.append(self.size + pos + 1)
+                start = pos + 1
+        self.size += len(chunk)
+
+    def locate(self, line: int) -> tuple[int, int]:
+        """Closest checkpoint at or before ``line`` as (byte offset, line number)."""
+        slot = min(max(int(line), 0) // self.every, len(self.checkpoints) - 1)
+        return self.checkpoints[slot], slot * self.every
+
+
+class LogFollower:
+    """Follows one job log file for any number of readers.
+
+    A single thread polls the file size and reads only the appended bytes into the line
+    index; readers watch the indexed size and share its descriptor through ``os.pread``.
+    Once the job is reported finished (``mark_finished`` or the throttled ``is_finished``
+    check) the follower drains the tail, sets ``finished`` and its thread exits.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        is_finished: Callable[[], bool],
+        index_every: int | None = None,
+        poll_interval_seconds: float | None = None,
+        status_check_seconds: float | None = None,
+        thread_factory: Callable[..., Any] = threading.Thread,
+    ) -> None:
+        self.path = Path(path)
+        self.index = SparseLineIndex(index_every or settings.data_sync_log_index_every)
+        self._is_finished = is_finished
+        self._poll_interval = float(poll_interval_seconds or settings.data_sync_log_poll_seconds)
+        self._status_check = float(status_check_seconds or settings.data_sync_status_check_seconds)
+        self._thread_factory = thread_factory
+        self._index_lock = threading.Lock()
+        # Serialises open/fstat/pread/feed: request threads poll too, and the index must see
+        # every appended byte exactly once.
+        self._poll_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._fd: int | None = None
+        self._thread: Any = None
+        self._finish_requested = False
+        self._closed = False
+        self.finished = False
+        self.subscribers = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return self.index.size
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = self._thread_factory(target=self._run, name=f"sync-log-{self.path.stem}", daemon=True)
+        self._thread.start()
+
+    def mark_finished(self) -> None:
+        self._finish_requested = True
+        self._wake.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        with self._poll_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def poll_once(self) -> bool:
+        """Index bytes appended since the last poll; returns whether the file grew."""
+        with self._poll_lock:
+            return self._poll_locked()
+
+    def _poll_locked(self) -> bool:
+        if self._closed:
+            return False
+        if self._fd is None:
+            try:
+                self._fd = os.open(self.path, os.O_RDONLY)
+            except FileNotFoundError:
+                return False
+        size = os.fstat(self._fd).st_size
+        grew = False
+        while self.index.size < size:
+            chunk = os.pread(self._fd, min(size - self.index.size, _READ_CHUNK_BYTES), self.index.size)
+            if not chunk:
+                break
+            with self._index_lock:
+                self.index.feed(chunk)
+            grew = True
+        return grew
+
+    def _run(self) -> None:
+        last_check = 0.0
+        while not self._closed:
+            try:
+                grew = self.poll_once()
+                now = time.monotonic()
+                if not grew and (self._finish_requested or now - last_check >= self._status_check):
+                    last_check = now
+                    if self._finish_requested or self._is_finished():
+                        self.poll_once()
+                        self.finished = True
+                        return
+            except Exception:
+                logger.exception("sync log follower failed: path=%s", self.path)
+            self._wake.wait(self._poll_interval)
+            self._wake.clear()
+
+    def read(self, offset: int, limit: int) -> bytes:
+        end = min(self.index.size, max(int(offset), 0) + max(int(limit), 0))
+        if self._fd is None or offset >= end:
+            return b""
+        return os.pread(self._fd, end - offset, offset)
+
+    def offset_for_line(self, line: int) -> int:
+        """Byte offset where 0-based ``line`` starts (the indexed end if it does not exist yet)."""
+        with self._index_lock:
+            offset, current = self.index.locate(line)
+        while current < line:
+            chunk = self.read(offset, STREAM_CHUNK_BYTES)
+            if not chunk:
+                break
+            start = 0
+            while current < line and (pos := chunk.find(b"\n", start)) >= 0:
+                current += 1
+                start = pos + 1
+            if current == line:
+                return offset + start
+            offset += len(chunk)
+        return offset
+
+    async def wait_for_data(self, offset: int, timeout: float) -> bool:
+        """Wait until the file is longer than ``offset``, the job finished or ``timeout`` passed.
+
+        Sleeps on the event loop in poll-interval steps, so an idle reader holds no thread.
+        """
+        deadline = time.monotonic() + timeout
+        while self.index.size <= offset and not (self.finished or self._closed):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(self._poll_interval, remaining))
+        return self.index.size > offset
+
+
+class LogFollowerHub:
+    """One shared ``LogFollower`` per job, reference-counted by its readers."""
+
+    def __init__(self, *, follower_factory: Callable[..., LogFollower] = LogFollower) -> None:
+        self._follower_factory = follower_factory
+        self._followers: dict[str, LogFollower] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, job_id: str, path: Path, *, is_finished: Callable[[], bool]) -> LogFollower:
+        with self._lock:
+            follower = self._followers.get(job_id)
+            if follower is None:
+                follower = self._follower_factory(path, is_finished=is_finished)
+                self._followers[job_id] = follower
+                follower.start()
+            follower.subscribers += 1
+            follower.last_used = time.monotonic()
+            self._evict_idle()
+        return follower
+
+    def release(self, job_id: str) -> None:
+        with self._lock:
+            follower = self._followers.get(job_id)
+            if follower is not None:
+                follower.subscribers = max(follower.subscribers - 1, 0)
+                follower.last_used = time.monotonic()
+            self._evict_idle()
+
+    def mark_finished(self, job_id: str) -> None:
+        with self._lock:
+            follower = self._followers.get(job_id)
+        if follower is not None:
+            follower.mark_finished()
+
+    def _evict_idle(self) -> None:
+        idle = sorted(
+            (item for item in self._followers.items() if item[1].finished and item[1].subscribers == 0),
+            key=lambda item: item[1].last_used,
+        )
+        for job_id, follower in idle[: max(len(idle) - _MAX_IDLE_FOLLOWERS, 0)]:
+            follower.close()
+            self._followers.pop(job_id, None)
+
+
+def format_sse(event: str, data: dict[str, Any], *, event_id: int | None = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def iter_log_events(
+    follower: LogFollower,
+    *,
+    offset: int,
+    job_status: Callable[[], dict[str, Any]],
+    heartbeat_seconds: float | None = None,
+    chunk_bytes: int = STREAM_CHUNK_BYTES,
+) -> AsyncIterator[str]:
+    """Server-sent events for a log from ``offset``: ``log`` chunks, then ``status`` and ``end``.
+
+    Chunks end on a line boundary unless a single line exceeds ``chunk_bytes`` or the job
+    finished; each event id is the next byte offset, so a reconnect can resume from
+    ``Last-Event-ID``. Idle periods emit comment heartbeats. File reads and the status
+    lookup run in short worker-thread hops; waiting happens on the event loop.
+    """
+    heartbeat = float(heartbeat_seconds or settings.data_sync_log_heartbeat_seconds)
+    position = max(int(offset), 0)
+    while True:
+        finished = follower.finished
+        chunk = await asyncio.to_thread(follower.read, position, chunk_bytes)
+        if chunk:
+            cut = chunk.rfind(b"\n") + 1
+            if cut == 0 and len(chunk) < chunk_bytes and not finished:
+                # Partial trailing line: wait for its newline (or the job end) before sending.
+                if not await follower.wait_for_data(position + len(chunk), heartbeat):
+                    yield ": keep-alive\n\n"
+                continue
+            sent = chunk[:cut] if cut else chunk
+            next_offset = position + len(sent)
+            payload = {"offset": position, "next_offset": next_offset, "content": sent.decode("utf-8", errors="replace")}
+            yield format_sse("log", payload, event_id=next_offset)
+            position = next_offset
+            continue
+        if finished:
+            yield format_sse("status", await asyncio.to_thread(job_status))
+            yield format_sse("end", {"next_offset": position}, event_id=position)
+            return
+        if not await follower.wait_for_data(position, heartbeat):
+            yield ": keep-alive\n\n"
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime as dt
+from collections.abc import Iterator
 from typing import Any
 
 import pandas as pd
@@ -212,6 +213,64 @@ def build_pattern_resonance_documents(*, trade_date: str, stock_rows: list[dict[
     return docs
 
 
+def build_pattern_hit_documents(
+    *,
+    signal_docs: list[dict[str, Any]],
+    resonance_docs: list[dict[str, Any]],
+    pattern_resonance_docs: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Invert the per-group documents into one document per (trade_date, ts_code)."""
+    hits: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def _hit_for(trade_date: str, stock: dict[str, Any]) -> dict[str, Any]:
+        key = (trade_date, str(stock.get("ts_code")))
+        hit = hits.get(key)
+        if hit is None:
+            hit = {
+                "trade_date": trade_date,
+                "ts_code": key[1],
+                "name": stock.get("name"),
+                "industry": stock.get("industry"),
+                "close": stock.get("close"),
+                "pct_chg": stock.get("pct_chg"),
+                "volume_ratio": stock.get("volume_ratio"),
+                "signals": [],
+                "resonance": [],
+                "pattern_resonance": [],
+            }
+            hits[key] = hit
+        return hit
+
+    for doc in signal_docs:
+        for stock in doc.get("stocks", []):
+            _hit_for(doc["trade_date"], stock)["signals"].append(
+                {"signal_type": doc.get("signal_type"), "signal_side": doc.get("signal_side")}
+            )
+    for doc in resonance_docs:
+        for stock in doc.get("stocks", []):
+            _hit_for(doc["trade_date"], stock)["resonance"].append(
+                {
+                    "signal_side": doc.get("signal_side"),
+                    "resonance_level": doc.get("resonance_level"),
+                    "signal_count": stock.get("signal_count"),
+                    "signal_types": list(stock.get("signal_types", [])),
+                }
+            )
+    for doc in pattern_resonance_docs:
+        for stock in doc.get("stocks", []):
+            _hit_for(doc["trade_date"], stock)["pattern_resonance"].append(
+                {
+                    "signal_side": doc.get("signal_side"),
+                    "resonance_level": doc.get("resonance_level"),
+                    "weighted_score": stock.get("weighted_score"),
+                    "patterns": list(stock.get("patterns", [])),
+                    "pattern_categories": dict(stock.get("pattern_categories", {})),
+                    "user_state": stock.get("user_state"),
+                }
+            )
+    return [hits[key] for key in sorted(hits)]
+
+
 def _metrics_for_signal(signal_type: str, row: dict[str, Any], prev_row: dict[str, Any], prior_window: list[dict[str, Any]]) -> dict[str, Any]:
     if signal_type in {"buy_macd_kdj_double_cross", "sell_macd_kdj_double_cross"}:
         return {
@@ -391,28 +450,112 @@ def _build_stock_rows_by_date(frame: pd.DataFrame, limit_frame: pd.DataFrame, *,
     return stock_rows_by_date
 
 
-def generate_daily_stock_signal_docs_for_range(
+DocsForDate = tuple[str, list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]
+
+DEFAULT_STREAM_CHUNK_DAYS = 20
+
+
+def _buffered_start(start_date: str, lookback_days: int) -> str:
+    start_dt = dt.datetime.strptime(start_date, "%Y%m%d") - dt.timedelta(days=max(lookback_days * 2, 120))
+    return start_dt.strftime("%Y%m%d")
+
+
+def _iter_docs_for_window(
     *,
     start_date: str,
     end_date: str,
-    lookback_days: int = 60,
-    target_dates: list[str] | None = None,
-) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
-    start_dt = dt.datetime.strptime(start_date, "%Y%m%d") - dt.timedelta(days=max(lookback_days * 2, 120))
-    buffered_start = start_dt.strftime("%Y%m%d")
+    lookback_days: int,
+    target_dates: list[str] | None,
+) -> Iterator[DocsForDate]:
+    buffered_start = _buffered_start(start_date, lookback_days)
     frame = _load_joined_market_frame(start_date=buffered_start, end_date=end_date)
     limit_frame = _load_limit_frame(start_date=buffered_start, end_date=end_date)
     if frame.empty:
-        return [], [], []
+        return
 
     dates_to_emit = sorted(set(target_dates or [date for date in frame["trade_date"].astype(str).unique().tolist() if start_date <= date <= end_date]))
     stock_rows_by_date = _build_stock_rows_by_date(frame, limit_frame=limit_frame, target_dates=dates_to_emit)
+    del frame, limit_frame
+    for trade_date in dates_to_emit:
+        stock_rows = stock_rows_by_date.pop(trade_date, [])
+        yield (
+            trade_date,
+            build_signal_documents(trade_date=trade_date, stock_rows=_sort_stock_rows(stock_rows, signal_side="buy")),
+            build_resonance_documents(trade_date=trade_date, stock_rows=stock_rows),
+            build_pattern_resonance_documents(trade_date=trade_date, stock_rows=stock_rows),
+        )
+
+
+def _chunk_windows(
+    *,
+    start_date: str,
+    end_date: str,
+    target_dates: list[str] | None,
+    chunk_days: int,
+) -> list[tuple[str, str, list[str] | None]]:
+    chunk_days = max(int(chunk_days), 1)
+    if target_dates:
+        dates = sorted(set(target_dates))
+        return [
+            (chunk[0], chunk[-1], chunk)
+            for chunk in (dates[index : index + chunk_days] for index in range(0, len(dates), chunk_days))
+        ]
+
+    windows: list[tuple[str, str, list[str] | None]] = []
+    cursor = dt.datetime.strptime(start_date, "%Y%m%d")
+    last = dt.datetime.strptime(end_date, "%Y%m%d")
+    while cursor <= last:
+        window_end = min(cursor + dt.timedelta(days=chunk_days - 1), last)
+        windows.append((cursor.strftime("%Y%m%d"), window_end.strftime("%Y%m%d"), None))
+        cursor = window_end + dt.timedelta(days=1)
+    return windows
+
+
+def iter_daily_stock_signal_docs_for_range(
+    *,
+    start_date: str,
+    end_date: str,
+    lookback_days: int = 60,
+    target_dates: list[str] | None = None,
+    chunk_days: int = DEFAULT_STREAM_CHUNK_DAYS,
+) -> Iterator[DocsForDate]:
+    """Yield ``(trade_date, signal_docs, resonance_docs, pattern_resonance_docs)`` in date order.
+
+    The range is loaded ``chunk_days`` at a time (trading days when ``target_dates`` is
+    given, natural days otherwise), each chunk re-reading the same lookback buffer as
+    the one-shot loader, so peak memory is bounded by the chunk instead of the range.
+    """
+    for window_start, window_end, window_dates in _chunk_windows(
+        start_date=start_date,
+        end_date=end_date,
+        target_dates=target_dates,
+        chunk_days=chunk_days,
+    ):
+        yield from _iter_docs_for_window(
+            start_date=window_start,
+            end_date=window_end,
+            lookback_days=lookback_days,
+            target_dates=window_dates,
+        )
+
+
+def generate_daily_stock_signal_docs_for_range(
+    *,
+    start_date: str,
+    end_date: str,
+    lookback_days: int = 60,
+    target_dates: list[str] | None = None,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
     signal_docs: list[dict[str, Any]] = []
     resonance_docs: list[dict[str, Any]] = []
     pattern_resonance_docs: list[dict[str, Any]] = []
-    for trade_date in dates_to_emit:
-        stock_rows = stock_rows_by_date.get(trade_date, [])
-        signal_docs.extend(build_signal_documents(trade_date=trade_date, stock_rows=_sort_stock_rows(stock_rows, signal_side="buy")))
-        resonance_docs.extend(build_resonance_documents(trade_date=trade_date, stock_rows=stock_rows))
-        pattern_resonance_docs.extend(build_pattern_resonance_documents(trade_date=trade_date, stock_rows=stock_rows))
+    for _, date_signal_docs, date_resonance_docs, date_pattern_resonance_docs in _iter_docs_for_window(
+        start_date=start_date,
+        end_date=end_date,
+        lookback_days=lookback_days,
+        target_dates=target_dates,
+    ):
+        signal_docs.extend(date_signal_docs)
+        resonance_docs.extend(date_resonance_docs)
+        pattern_resonance_docs.extend(date_pattern_resonance_docs)
     return signal_docs, resonance_docs, pattern_resonance_docs
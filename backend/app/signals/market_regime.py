@@ -6,9 +6,7 @@ from dataclasses import dataclass
 from pymongo import MongoClient
 
 from app.data.duckdb_store import get_connection
-
-INDEX_TS_CODE = "000001.SH"
-INDEX_COL = "index_factor_pro"
+from app.features.market_breadth import INDEX_COL, INDEX_TS_CODE, load_market_breadth
 
 
 @dataclass(frozen=True)
@@ -120,8 +118,10 @@ def _compute_breadth(trade_date: str, data_dir: str) -> tuple[float, dict]:
 
     if not row or row[0] == 0:
         return 0.0, {"total": 0}
+    return _score_breadth(int(row[0]), int(row[1]), int(row[2]), detail)
+
 
-    total, up, down = int(row[0]), int(row[1]), int(row[2])
+def _score_breadth(total: int, up: int, down: int, detail: dict) -> tuple[float, dict]:
     up_ratio = up / total
     detail["total"] = total
     detail["up"] = up
@@ -139,13 +139,52 @@ def _compute_breadth(trade_date: str, data_dir: str) -> tuple[float, dict]:
     return -2.0, detail
 
 
-def _compute_momentum(idx: dict, mongo_col) -> tuple[float, dict]:
+def _breadth_from_row(row: dict) -> tuple[float, dict] | None:
+    """Breadth score from a precomputed market_breadth row; None if the row has no counts."""
+    total = int(_safe(row.get("total")))
+    if total <= 0:
+        return None
+    score, detail = _score_breadth(total, int(_safe(row.get("up"))), int(_safe(row.get("down"))), {})
+    for key in ("limit_up", "limit_down"):
+        if row.get(key) is not None:
+            detail[key] = int(row[key])
+    if row.get("new_high_share") is not None:
+        detail["new_high_share"] = round(float(row["new_high_share"]), 4)
+    return score, detail
+
+
+def _score_momentum(pcts: dict[str, float]) -> tuple[float, dict]:
     detail: dict = {}
     score = 0.0
+    for field_name, threshold in [("pct_20d", 5), ("pct_60d", 8)]:
+        pct = pcts.get(field_name)
+        if pct is None:
+            continue
+        detail[field_name] = round(pct, 2)
+        if pct > threshold:
+            score += 1
+        elif pct < -threshold:
+            score -= 1
+    return score, detail
+
+
+def _momentum_from_row(row: dict) -> tuple[float, dict] | None:
+    """Momentum score from a precomputed market_breadth row; None if index returns are missing."""
+    pcts = {
+        "pct_20d": row.get("index_ret_20d"),
+        "pct_60d": row.get("index_ret_60d"),
+    }
+    if all(value is None for value in pcts.values()):
+        return None
+    return _score_momentum({key: float(value) for key, value in pcts.items() if value is not None})
+
+
+def _compute_momentum(idx: dict, mongo_col) -> tuple[float, dict]:
     close = _safe(idx.get("close"))
     trade_date = idx.get("trade_date", "")
+    pcts: dict[str, float] = {}
 
-    for skip_n, field_name, threshold in [(20, "pct_20d", 5), (60, "pct_60d", 8)]:
+    for skip_n, field_name in [(20, "pct_20d"), (60, "pct_60d")]:
         cursor = mongo_col.find(
             {"ts_code": INDEX_TS_CODE, "trade_date": {"$lt": trade_date}, "close": {"$ne": None}},
             {"close": 1},
@@ -156,14 +195,9 @@ def _compute_momentum(idx: dict, mongo_col) -> tuple[float, dict]:
             continue
         prev_close = float(docs[0]["close"])
         if prev_close > 0:
-            pct = (close / prev_close - 1) * 100
-            detail[field_name] = round(pct, 2)
-            if pct > threshold:
-                score += 1
-            elif pct < -threshold:
-                score -= 1
+            pcts[field_name] = (close / prev_close - 1) * 100
 
-    return score, detail
+    return _score_momentum(pcts)
 
 
 def compute_market_regime(
@@ -171,7 +205,14 @@ def compute_market_regime(
     mongo_client: MongoClient,
     mongo_db: str = "freedom",
     data_dir: str = "data",
+    breadth_row: dict | None = None,
 ) -> MarketRegimeResult | None:
+    """Score one trade date.
+
+    Breadth and momentum come from the precomputed market_breadth row (``breadth_row``, or
+    looked up when omitted); the per-date market scan and index lookups are only used for
+    dates the store does not cover yet.
+    """
     db = mongo_client[mongo_db]
     col = db[INDEX_COL]
 
@@ -179,9 +220,11 @@ def compute_market_regime(
     if not idx or not idx.get("close"):
         return None
 
+    if breadth_row is None:
+        breadth_row = load_market_breadth(trade_date, trade_date, data_dir=data_dir).get(trade_date, {})
     trend_score, trend_detail = _compute_trend(idx)
-    breadth_score, breadth_detail = _compute_breadth(trade_date, data_dir)
-    momentum_score, momentum_detail = _compute_momentum(idx, col)
+    breadth_score, breadth_detail = _breadth_from_row(breadth_row) or _compute_breadth(trade_date, data_dir)
+    momentum_score, momentum_detail = _momentum_from_row(breadth_row) or _compute_momentum(idx, col)
 
     total = round(trend_score * 0.4 + breadth_score * 0.4 + momentum_score * 0.2, 2)
     regime, label = _regime_from_score(total)
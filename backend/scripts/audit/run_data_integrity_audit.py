@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
 from collections import OrderedDict
 from pathlib import Path
 
 from app.audit.adapters import load_counts_by_date, load_open_trade_dates
+from app.audit.count_cache import AuditCountCache, build_cache_key
 from app.audit.engine import build_coverage_rows, classify_missing_dates, compute_date_gap, compute_rowcount_anomalies, worst_severity
 from app.audit.models import AuditRunResult, DatasetAuditResult
 from app.audit.models import DatasetConfig
@@ -14,6 +16,12 @@ from app.audit.registry import EXCLUDED_FIRST_SCOPE_DATASETS, get_dataset_regist
 from app.audit.report_builder import write_audit_reports
 from app.core.config import settings
 
+# Scans share the process-wide read-only DuckDB connection, so concurrent cursors
+# split its PRAGMA threads budget instead of each opening their own pool.
+DEFAULT_SCAN_WORKERS = 4
+
+CountRequestKey = tuple[str, str]
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Run local data integrity audit and write reports.")
@@ -21,6 +29,12 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--run-id", type=str, default="", help="Fixed run id; defaults to timestamp")
     parser.add_argument("--start-date", type=str, default="", help="Optional lower date bound, YYYYMMDD or YYYY-MM-DD")
     parser.add_argument("--end-date", type=str, default="", help="Optional upper date bound, YYYYMMDD or YYYY-MM-DD")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse cached per-date counts and only rescan dates touched by syncs since the last audit",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_SCAN_WORKERS, help="Concurrent dataset scans")
     return parser
 
 
@@ -59,6 +73,8 @@ def run_audit(
     run_id: str | None = None,
     start_date: str | None = None,
     end_date: str | None = None,
+    count_cache: AuditCountCache | None = None,
+    workers: int = DEFAULT_SCAN_WORKERS,
 ) -> AuditRunResult:
     registry = get_dataset_registry()
     selected = select_datasets(registry, selected_names or [])
@@ -74,27 +90,18 @@ def run_audit(
     effective_run_id = run_id or build_run_id()
     output_dir = resolve_output_dir(effective_run_id)
 
-    daily_counts: dict[str, int] | None = None
-    if "daily" in selected:
-        daily_counts = load_counts_by_date(
-            registry["daily"],
-            count_mode="distinct",
-            start_date=normalized_start,
-            end_date=normalized_end,
-        )
+    count_requests = _plan_count_requests(registry, selected)
+    counts = _load_count_requests(
+        count_requests,
+        start_date=normalized_start,
+        end_date=normalized_end,
+        count_cache=count_cache,
+        workers=workers,
+    )
 
     dataset_results: list[DatasetAuditResult] = []
     for config in selected.values():
-        count_mode = "distinct" if config.audit_mode == "date_and_coverage" else "rows"
-        if config.name == "daily" and daily_counts is not None:
-            counts_by_date = daily_counts
-        else:
-            counts_by_date = load_counts_by_date(
-                config,
-                count_mode=count_mode,
-                start_date=normalized_start,
-                end_date=normalized_end,
-            )
+        counts_by_date = counts[("dataset", config.name)]
         actual_dates = sorted(counts_by_date)
         expected_calendar_dates = calendar_dates if config.use_trade_calendar else actual_dates
         date_gap = compute_date_gap(actual_dates, expected_calendar_dates, normalized_start, normalized_end)
@@ -102,31 +109,9 @@ def run_audit(
         coverage_anomalies = []
         rowcount_anomalies = []
         if config.audit_mode == "date_and_coverage":
-            baseline_counts = daily_counts
-            if config.baseline_dataset != "daily":
-                raise ValueError(f"unsupported baseline dataset: {config.baseline_dataset}")
-            if config.baseline_excluded_ts_code_suffixes or config.baseline_excluded_ts_codes:
-                baseline_config = replace(
-                    registry["daily"],
-                    baseline_excluded_ts_code_suffixes=list(config.baseline_excluded_ts_code_suffixes),
-                    baseline_excluded_ts_codes=list(config.baseline_excluded_ts_codes),
-                )
-                baseline_counts = load_counts_by_date(
-                    baseline_config,
-                    count_mode="distinct",
-                    start_date=normalized_start,
-                    end_date=normalized_end,
-                )
-            elif baseline_counts is None:
-                baseline_counts = load_counts_by_date(
-                    registry["daily"],
-                    count_mode="distinct",
-                    start_date=normalized_start,
-                    end_date=normalized_end,
-                )
             coverage_rows = build_coverage_rows(
                 date_gap.expected_trade_dates,
-                baseline_counts or {},
+                counts[("baseline", config.name)],
                 counts_by_date,
                 dataset=config.name,
             )
@@ -136,21 +121,7 @@ def run_audit(
                 if item.severity != "green" and item.trade_date not in set(config.ignored_trade_dates)
             ]
         elif config.audit_mode == "date_and_rowcount":
-            reference_counts_by_date: dict[str, int] | None = None
-            if config.rowcount_reference_storage_type and config.rowcount_reference_location and config.rowcount_reference_date_field:
-                reference_config = DatasetConfig(
-                    name=f"{config.name}_rowcount_reference",
-                    storage_type=config.rowcount_reference_storage_type,
-                    location=config.rowcount_reference_location,
-                    date_field=config.rowcount_reference_date_field,
-                    audit_mode="date_only",
-                )
-                reference_counts_by_date = load_counts_by_date(
-                    reference_config,
-                    count_mode="rows",
-                    start_date=normalized_start,
-                    end_date=normalized_end,
-                )
+            reference_counts_by_date = counts.get(("reference", config.name))
             rowcount_anomalies = compute_rowcount_anomalies(
                 counts_by_date,
                 dataset=config.name,
@@ -188,6 +159,72 @@ def run_audit(
     return result
 
 
+def _plan_count_requests(
+    registry: OrderedDict[str, DatasetConfig],
+    selected: OrderedDict[str, DatasetConfig],
+) -> OrderedDict[CountRequestKey, tuple[DatasetConfig, str]]:
+    """Collect every count scan the audit needs so they can be resolved up front."""
+    requests: OrderedDict[CountRequestKey, tuple[DatasetConfig, str]] = OrderedDict()
+    for config in selected.values():
+        count_mode = "distinct" if config.audit_mode == "date_and_coverage" or config.name == "daily" else "rows"
+        requests[("dataset", config.name)] = (config, count_mode)
+        if config.audit_mode == "date_and_coverage":
+            if config.baseline_dataset != "daily":
+                raise ValueError(f"unsupported baseline dataset: {config.baseline_dataset}")
+            baseline_config = registry["daily"]
+            if config.baseline_excluded_ts_code_suffixes or config.baseline_excluded_ts_codes:
+                baseline_config = replace(
+                    baseline_config,
+                    baseline_excluded_ts_code_suffixes=list(config.baseline_excluded_ts_code_suffixes),
+                    baseline_excluded_ts_codes=list(config.baseline_excluded_ts_codes),
+                )
+            requests[("baseline", config.name)] = (baseline_config, "distinct")
+        elif config.audit_mode == "date_and_rowcount":
+            if config.rowcount_reference_storage_type and config.rowcount_reference_location and config.rowcount_reference_date_field:
+                reference_config = DatasetConfig(
+                    name=f"{config.name}_rowcount_reference",
+                    storage_type=config.rowcount_reference_storage_type,
+                    location=config.rowcount_reference_location,
+                    date_field=config.rowcount_reference_date_field,
+                    audit_mode="date_only",
+                )
+                requests[("reference", config.name)] = (reference_config, "rows")
+    return requests
+
+
+def _load_count_requests(
+    requests: OrderedDict[CountRequestKey, tuple[DatasetConfig, str]],
+    *,
+    start_date: str | None,
+    end_date: str | None,
+    count_cache: AuditCountCache | None,
+    workers: int,
+) -> dict[CountRequestKey, dict[str, int]]:
+    # The same scan is often requested several times (e.g. the unfiltered daily baseline).
+    unique: OrderedDict[str, tuple[DatasetConfig, str]] = OrderedDict()
+    keys_by_scan: dict[str, list[CountRequestKey]] = {}
+    for key, (config, count_mode) in requests.items():
+        scan_key = build_cache_key(config, count_mode)
+        unique.setdefault(scan_key, (config, count_mode))
+        keys_by_scan.setdefault(scan_key, []).append(key)
+
+    def load(request: tuple[DatasetConfig, str]) -> dict[str, int]:
+        config, count_mode = request
+        if count_cache is not None:
+            return count_cache.load(config, count_mode=count_mode, start_date=start_date, end_date=end_date)
+        return load_counts_by_date(config, count_mode=count_mode, start_date=start_date, end_date=end_date)
+
+    max_workers = max(1, min(int(workers or 1), len(unique)))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="data-audit") as executor:
+        results = list(executor.map(load, unique.values()))
+
+    counts: dict[CountRequestKey, dict[str, int]] = {}
+    for scan_key, result in zip(unique.keys(), results):
+        for key in keys_by_scan[scan_key]:
+            counts[key] = result
+    return counts
+
+
 def _apply_ignored_trade_dates(date_gap, ignored_trade_dates: list[str]) -> None:
     if not ignored_trade_dates:
         return
@@ -211,6 +248,8 @@ def main() -> None:
         run_id=(args.run_id or None),
         start_date=(args.start_date or None),
         end_date=(args.end_date or None),
+        count_cache=(AuditCountCache() if args.incremental else None),
+        workers=args.workers,
     )
     print(f"run_id={result.run_id}")
     print(f"output_dir={result.output_dir}")
@@ -10,11 +10,9 @@ SCRIPT_ROOT = Path(__file__).resolve().parents[2]
 sys.path.append(str(SCRIPT_ROOT))
 
 from app.data.duckdb_backtest_store import normalize_date  # noqa: E402
-from app.data.mongo_backtest import ensure_strategy_backtest_indexes, get_backtest_run, get_strategy_version  # noqa: E402
-from app.quant.engine import BacktestRunConfig, run_backtest_with_guard  # noqa: E402
-from app.quant.params_registry import validate_and_normalize_params  # noqa: E402
-from app.quant.registry import load_strategy  # noqa: E402
-from app.services.backtest_service import create_backtest_run_meta  # noqa: E402
+from app.data.mongo_backtest import ensure_strategy_backtest_indexes, get_backtest_run  # noqa: E402
+from app.quant.engine import run_backtest_with_guard  # noqa: E402
+from app.services.backtest_service import create_backtest_run_meta, prepare_backtest_execution  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +28,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--run-type", type=str, default="range", choices=["range", "full_history"], help="Run type.")
     parser.add_argument("--strategy-key", type=str, default="", help="Engine strategy key, default from params_snapshot.strategy_key or multifactor_v1.")
     parser.add_argument("--created-by", type=str, default="system", help="created_by username.")
+    parser.add_argument("--profile-hotspots", action="store_true", help="Also capture cProfile hotspots into the run profile.")
     return parser.parse_args()
 
 
@@ -65,48 +64,22 @@ def main() -> None:
     args = parse_args()
     run = _resolve_run_from_args(args)
 
-    run_id = str(run.get("run_id") or "")
-    strategy_id = str(run.get("strategy_id") or "")
-    strategy_version_id = str(run.get("strategy_version_id") or "")
-    start_date = str(run.get("start_date") or "")
-    end_date = str(run.get("end_date") or "")
-    initial_capital = float(run.get("initial_capital") or args.initial_capital)
-
-    version = get_strategy_version(strategy_version_id)
-    if not version:
-        raise ValueError(f"strategy version not found: {strategy_version_id}")
-    raw_params_snapshot = dict(version.get("params_snapshot") or {})
-    version_strategy_key = str(version.get("strategy_key") or "").strip() or str(raw_params_snapshot.get("strategy_key") or "multifactor_v1")
-    cli_strategy_key = args.strategy_key.strip()
-    if cli_strategy_key and cli_strategy_key != version_strategy_key:
-        raise ValueError(
-            f"--strategy-key mismatch: cli={cli_strategy_key}, version={version_strategy_key}, strategy_version_id={strategy_version_id}"
-        )
-    strategy_key = cli_strategy_key or version_strategy_key
-    params_snapshot, _ = validate_and_normalize_params(strategy_key, raw_params_snapshot)
-
-    strategy = load_strategy(strategy_key)
+    strategy, config = prepare_backtest_execution(
+        run,
+        strategy_key=args.strategy_key.strip(),
+        profile_hotspots=args.profile_hotspots,
+    )
     logger.info(
         "run_backtest start: run_id=%s strategy_id=%s strategy_version_id=%s strategy_key=%s start=%s end=%s",
-        run_id,
-        strategy_id,
-        strategy_version_id,
-        strategy_key,
-        start_date,
-        end_date,
-    )
-
-    config = BacktestRunConfig(
-        run_id=run_id,
-        strategy_id=strategy_id,
-        strategy_version_id=strategy_version_id,
-        start_date=start_date,
-        end_date=end_date,
-        initial_capital=initial_capital,
-        params_snapshot=params_snapshot,
+        config.run_id,
+        config.strategy_id,
+        config.strategy_version_id,
+        strategy.key,
+        config.start_date,
+        config.end_date,
     )
     summary = run_backtest_with_guard(strategy=strategy, config=config)
-    logger.info("run_backtest done: run_id=%s summary=%s", run_id, summary)
+    logger.info("run_backtest done: run_id=%s summary=%s", config.run_id, summary)
 
 
 if __name__ == "__main__":
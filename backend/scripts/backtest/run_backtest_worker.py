@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+from pathlib import Path
+
+SCRIPT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(SCRIPT_ROOT))
+
+from app.core.config import settings  # noqa: E402
+from app.data.mongo_backtest import ensure_strategy_backtest_indexes  # noqa: E402
+from app.data.mongo_backtest_queue import ensure_backtest_queue_indexes  # noqa: E402
+from app.services.backtest_job_service import BacktestJobDispatcher  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run queued backtests in a pool of worker processes.")
+    parser.add_argument("--workers", type=int, default=settings.backtest_workers, help="Concurrent backtest processes.")
+    parser.add_argument(
+        "--poll-seconds",
+        type=float,
+        default=settings.backtest_queue_poll_seconds,
+        help="Seconds between queue polls and progress updates.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+    args = parse_args()
+    ensure_strategy_backtest_indexes()
+    ensure_backtest_queue_indexes()
+    stop_event = threading.Event()
+
+    def _stop(signum: int, _frame: object) -> None:
+        logger.info("received signal %s, releasing running backtests", signum)
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    dispatcher = BacktestJobDispatcher(max_workers=args.workers, poll_interval_seconds=args.poll_seconds)
+    dispatcher.run_forever(stop_event)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,13 +11,14 @@ SCRIPT_ROOT = Path(__file__).resolve().parents[2]
 sys.path.append(str(SCRIPT_ROOT))
 
 from app.data.mongo import get_collection
+from app.data.mongo_daily_stock_pattern_hits import replace_daily_stock_pattern_hits
 from app.data.mongo_daily_stock_signals import (
     preserve_user_states,
     upsert_daily_stock_pattern_resonance,
     upsert_daily_stock_signal_resonance,
     upsert_daily_stock_signals,
 )
-from app.signals.daily_stock_signals import generate_daily_stock_signal_docs_for_range
+from app.signals.daily_stock_signals import build_pattern_hit_documents, iter_daily_stock_signal_docs_for_range
 
 logger = logging.getLogger(__name__)
 
@@ -53,27 +54,21 @@ def get_open_trading_days(start_date: str, end_date: str, exchange: str = "SSE")
     return [str(doc.get("cal_date")) for doc in cursor if doc.get("cal_date")]
 
 
-def process_batch(dates: list[str], dry_run: bool = False) -> dict[str, int]:
-    if not dates:
-        return {"signal_docs": 0, "resonance_docs": 0, "pattern_resonance_docs": 0}
-    
-    logger.info(f"Processing batch: {dates[0]} to {dates[-1]} ({len(dates)} days)")
-    
-    signal_docs, resonance_docs, pattern_resonance_docs = generate_daily_stock_signal_docs_for_range(
-        start_date=min(dates),
-        end_date=max(dates),
-        lookback_days=60,
-        target_dates=dates,
-    )
-    
+def write_date_docs(
+    trade_date: str,
+    signal_docs: list[dict],
+    resonance_docs: list[dict],
+    pattern_resonance_docs: list[dict],
+    dry_run: bool = False,
+) -> dict[str, int]:
     if dry_run:
-        logger.info(f"DRY RUN: Would write {len(signal_docs)} signal docs, {len(resonance_docs)} resonance docs, {len(pattern_resonance_docs)} pattern resonance docs")
         return {
             "signal_docs": len(signal_docs),
             "resonance_docs": len(resonance_docs),
             "pattern_resonance_docs": len(pattern_resonance_docs),
+            "pattern_hit_docs": 0,
         }
-    
+
     signal_count = upsert_daily_stock_signals(signal_docs)
     resonance_count = upsert_daily_stock_signal_resonance(resonance_docs)
     for doc in pattern_resonance_docs:
@@ -81,13 +76,19 @@ def process_batch(dates: list[str], dry_run: bool = False) -> dict[str, int]:
             doc["trade_date"], doc["signal_side"], doc["resonance_level"], doc["stocks"]
         )
     pattern_resonance_count = upsert_daily_stock_pattern_resonance(pattern_resonance_docs)
-    
-    logger.info(f"Batch complete: signal_docs={signal_count}, resonance_docs={resonance_count}, pattern_resonance_docs={pattern_resonance_count}")
-    
+    pattern_hit_count = replace_daily_stock_pattern_hits(
+        build_pattern_hit_documents(
+            signal_docs=signal_docs,
+            resonance_docs=resonance_docs,
+            pattern_resonance_docs=pattern_resonance_docs,
+        ),
+        trade_dates=[trade_date],
+    )
     return {
         "signal_docs": signal_count,
         "resonance_docs": resonance_count,
         "pattern_resonance_docs": pattern_resonance_count,
+        "pattern_hit_docs": pattern_hit_count,
     }
 
 
@@ -108,20 +109,33 @@ def main() -> None:
     
     logger.info(f"Found {len(all_dates)} trading days")
     
-    totals = {"signal_docs": 0, "resonance_docs": 0, "pattern_resonance_docs": 0}
+    totals = {"signal_docs": 0, "resonance_docs": 0, "pattern_resonance_docs": 0, "pattern_hit_docs": 0}
     
-    for i in range(0, len(all_dates), batch_size):
-        batch = all_dates[i:i + batch_size]
-        result = process_batch(batch, dry_run=args.dry_run)
+    # Documents are written per trade date as each chunk of batch_size days is computed,
+    # so memory stays bounded by one chunk regardless of the backfill range.
+    processed = 0
+    for trade_date, signal_docs, resonance_docs, pattern_resonance_docs in iter_daily_stock_signal_docs_for_range(
+        start_date=all_dates[0],
+        end_date=all_dates[-1],
+        lookback_days=60,
+        target_dates=all_dates,
+        chunk_days=batch_size,
+    ):
+        result = write_date_docs(trade_date, signal_docs, resonance_docs, pattern_resonance_docs, dry_run=args.dry_run)
         for key in totals:
             totals[key] += result[key]
+        processed += 1
+        if processed % batch_size == 0 or processed == len(all_dates):
+            logger.info(f"Progress: {processed}/{len(all_dates)} days, last={trade_date}, totals={totals}")
     
     logger.info(
-        "Backfill complete: total_dates=%s signal_docs=%s resonance_docs=%s pattern_resonance_docs=%s",
+        "Backfill complete: total_dates=%s signal_docs=%s resonance_docs=%s pattern_resonance_docs=%s pattern_hit_docs=%s%s",
         len(all_dates),
         totals["signal_docs"],
         totals["resonance_docs"],
         totals["pattern_resonance_docs"],
+        totals["pattern_hit_docs"],
+        " (dry run)" if args.dry_run else "",
     )
 
 
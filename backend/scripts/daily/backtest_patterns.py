@@ -10,9 +10,9 @@ from pathlib import Path
 SCRIPT_ROOT = Path(__file__).resolve().parents[2]
 sys.path.append(str(SCRIPT_ROOT))
 
-from app.data.duckdb_store import list_daily
 from app.data.mongo import get_collection
 from app.data.mongo_daily_stock_signals import list_daily_stock_signal_dates
+from app.features.forward_returns import FORWARD_HORIZONS, forward_return_column, load_forward_returns
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +22,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--start-date", type=str, default=None, help="YYYYMMDD")
     parser.add_argument("--end-date", type=str, default=None, help="YYYYMMDD")
     parser.add_argument("--pattern", type=str, default=None, help="Specific pattern to test")
-    parser.add_argument("--hold-days", type=int, default=5, help="Hold for N days")
+    parser.add_argument("--hold-days", type=int, default=5, choices=FORWARD_HORIZONS, help="Hold for N days")
     parser.add_argument("--min-samples", type=int, default=30, help="Minimum samples for valid stats")
     return parser.parse_args()
 
@@ -36,33 +36,14 @@ def normalize_date(value: str | None) -> str:
     return text
 
 
-def get_forward_return(ts_code: str, trade_date: str, hold_days: int) -> float | None:
-    rows = list_daily(ts_code)
-    if not rows:
-        return None
-    
-    dates = [str(r["trade_date"]) for r in rows]
-    prices = {str(r["trade_date"]): float(r["close"]) for r in rows}
-    
-    if trade_date not in prices:
-        return None
-    
-    try:
-        idx = dates.index(trade_date)
-    except ValueError:
-        return None
-    
-    target_idx = idx + hold_days
-    if target_idx >= len(dates):
-        return None
-    
-    entry_price = prices[trade_date]
-    exit_price = prices[dates[target_idx]]
-    
-    if entry_price <= 0:
-        return None
-    
-    return round((exit_price - entry_price) / entry_price * 100, 2)
+def load_forward_return_map(start_date: str, end_date: str, hold_days: int) -> dict[tuple[str, str], float]:
+    column = forward_return_column(hold_days, "cc")
+    frame = load_forward_returns(start_date=start_date, end_date=end_date, horizons=[hold_days], bases=["cc"])
+    frame = frame.dropna(subset=[column])
+    return {
+        (trade_date, ts_code): round(float(value), 2)
+        for trade_date, ts_code, value in zip(frame["trade_date"], frame["ts_code"], frame[column])
+    }
 
 
 def analyze_patterns(start_date: str, end_date: str, hold_days: int, min_samples: int, specific_pattern: str | None = None) -> dict:
@@ -75,6 +56,10 @@ def analyze_patterns(start_date: str, end_date: str, hold_days: int, min_samples
         "very_strong": {"returns": [], "wins": 0, "total": 0},
     }
     
+    forward_returns = load_forward_return_map(start_date, end_date, hold_days)
+    if not forward_returns:
+        logger.warning("forward return store is empty for %s-%s, run scripts/daily/build_forward_returns.py", start_date, end_date)
+
     for doc in get_collection("daily_stock_pattern_resonance").find(query, {"_id": 0}):
         trade_date = doc["trade_date"]
         signal_side = doc.get("signal_side", "")
@@ -84,7 +69,7 @@ def analyze_patterns(start_date: str, end_date: str, hold_days: int, min_samples
             ts_code = stock["ts_code"]
             patterns = stock.get("patterns", [])
             
-            ret = get_forward_return(ts_code, trade_date, hold_days)
+            ret = forward_returns.get((trade_date, ts_code))
             if ret is None:
                 continue
             
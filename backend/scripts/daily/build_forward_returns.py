@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import logging
+import sys
+from pathlib import Path
+
+SCRIPT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(SCRIPT_ROOT))
+
+from app.features.forward_returns import build_forward_returns_for_year, years_touched_by_sync  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the (trade_date x ts_code) forward-return store")
+    parser.add_argument("--start-date", type=str, default=None, help="YYYYMMDD or YYYY-MM-DD, first synced date")
+    parser.add_argument("--end-date", type=str, default=None, help="YYYYMMDD or YYYY-MM-DD, last synced date")
+    parser.add_argument("--years", type=str, default=None, help="Comma separated years to rebuild, e.g. 2019,2020")
+    return parser.parse_args()
+
+
+def normalize_date(value: str | None) -> str:
+    if not value:
+        return ""
+    text = str(value).strip().replace("-", "")
+    if len(text) != 8 or not text.isdigit():
+        raise ValueError(f"invalid date: {value}")
+    return text
+
+
+def resolve_years(args: argparse.Namespace) -> list[str]:
+    if args.years:
+        return sorted({item.strip() for item in args.years.split(",") if item.strip()})
+    end_date = normalize_date(args.end_date) or dt.datetime.now().strftime("%Y%m%d")
+    start_date = normalize_date(args.start_date) or end_date
+    return years_touched_by_sync(start_date, end_date)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+    args = parse_args()
+    years = resolve_years(args)
+    total = 0
+    for year in years:
+        total += build_forward_returns_for_year(year)
+    logger.info("build_forward_returns done: years=%s rows=%s", ",".join(years), total)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+SCRIPT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(SCRIPT_ROOT))
+
+from app.features.fundamentals import PIT_FIELDS, build_fundamentals_pit  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the point-in-time fundamentals index from synced financial reports")
+    parser.add_argument(
+        "--dataset",
+        action="append",
+        choices=sorted(PIT_FIELDS),
+        help="Dataset to rebuild; repeatable, defaults to all",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+    args = parse_args()
+    counts = build_fundamentals_pit(args.dataset)
+    logger.info("build_fundamentals_pit done: %s", counts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import logging
+import sys
+from pathlib import Path
+
+SCRIPT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(SCRIPT_ROOT))
+
+from app.features.market_breadth import FULL_HISTORY_START, build_market_breadth  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Update the daily market breadth table for synced trade dates")
+    parser.add_argument("--start-date", type=str, default=None, help="YYYYMMDD or YYYY-MM-DD, first synced date")
+    parser.add_argument("--end-date", type=str, default=None, help="YYYYMMDD or YYYY-MM-DD, last synced date")
+    parser.add_argument("--backfill", action="store_true", help="Rebuild every date up to --end-date in one pass")
+    return parser.parse_args()
+
+
+def normalize_date(value: str | None) -> str:
+    if not value:
+        return ""
+    text = str(value).strip().replace("-", "")
+    if len(text) != 8 or not text.isdigit():
+        raise ValueError(f"invalid date: {value}")
+    return text
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+    args = parse_args()
+    end_date = normalize_date(args.end_date) or dt.datetime.now().strftime("%Y%m%d")
+    if args.backfill and args.start_date:
+        raise ValueError("--backfill cannot be used with --start-date")
+    start_date = FULL_HISTORY_START if args.backfill else normalize_date(args.start_date) or end_date
+    if start_date > end_date:
+        raise ValueError("start-date must be <= end-date")
+    total = build_market_breadth(start_date, end_date)
+    logger.info("build_market_breadth done: start=%s end=%s rows=%s", start_date, end_date, total)
+
+
+if __name__ == "__main__":
+    main()
@@ -87,7 +87,7 @@ conda activate freedom
 
 echo "[INFO] $(date '+%F %T') start daily tasks for ${START_DATE} to ${END_DATE}" | tee -a "${LOG_FILE}"
 
-TOTAL_STEPS=16
+TOTAL_STEPS=17
 
 run_step_task() {
   local step_no="$1"
@@ -214,6 +214,18 @@ run_step_task "15" "同步财务审计意见" "python backend/scripts/daily/sync
 # 16) Sync disclosure_date (财报披露日期) - daily with recent 2 periods
 run_step_task "16" "同步财报披露日期" "python backend/scripts/daily/sync_disclosure_date.py --recent 2"
 
+# 17) Rebuild forward returns for the years touched by today's price sync
+run_step_task "17" "更新前向收益矩阵" "python backend/scripts/daily/build_forward_returns.py --start-date ${START_DATE} --end-date ${END_DATE}"
+
+# 18) Update per-stock rolling stats for the synced trade dates
+run_step_task "18" "更新个股滚动统计" "python backend/scripts/daily/build_rolling_stats.py --start-date ${START_DATE} --end-date ${END_DATE}"
+
+# 19) Rebuild the point-in-time fundamentals index from synced financial reports
+run_step_task "19" "更新财务时点索引" "python backend/scripts/daily/build_fundamentals_pit.py"
+
+# 20) Update per-date market breadth and index momentum for the synced trade dates
+run_step_task "20" "更新市场宽度统计" "python backend/scripts/daily/build_market_breadth.py --start-date ${START_DATE} --end-date ${END_DATE}"
+
 # Note: fina_mainbz (主营业务构成) is NOT included in daily.sh.
 # Run manually per quarter: python backend/scripts/daily/sync_fina_mainbz.py --period YYYYMMDD
 
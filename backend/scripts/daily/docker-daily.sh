@@ -83,7 +83,7 @@ cd "${ROOT_DIR}"
 
 echo "[INFO] $(date '+%F %T') start daily tasks for ${START_DATE} to ${END_DATE}" | tee -a "${LOG_FILE}"
 
-TOTAL_STEPS=11
+TOTAL_STEPS=12
 
 run_step_task() {
   local step_no="$1"
@@ -180,6 +180,18 @@ run_step_task "10" "同步财务审计意见" "python /app/scripts/daily/sync_fi
 # 11) Sync disclosure_date (财报披露日期) - daily with recent 2 periods
 run_step_task "11" "同步财报披露日期" "python /app/scripts/daily/sync_disclosure_date.py --recent 2"
 
+# 12) Rebuild forward returns for the years touched by today's price sync
+run_step_task "12" "更新前向收益矩阵" "python /app/scripts/daily/build_forward_returns.py --start-date ${START_DATE} --end-date ${END_DATE}"
+
+# 13) Update per-stock rolling stats for the synced trade dates
+run_step_task "13" "更新个股滚动统计" "python /app/scripts/daily/build_rolling_stats.py --start-date ${START_DATE} --end-date ${END_DATE}"
+
+# 14) Rebuild the point-in-time fundamentals index from synced financial reports
+run_step_task "14" "更新财务时点索引" "python /app/scripts/daily/build_fundamentals_pit.py"
+
+# 15) Update per-date market breadth and index momentum for the synced trade dates
+run_step_task "15" "更新市场宽度统计" "python /app/scripts/daily/build_market_breadth.py --start-date ${START_DATE} --end-date ${END_DATE}"
+
 # Note: fina_mainbz (主营业务构成) is NOT included in daily.sh.
 # Run manually per quarter: python /app/scripts/daily/sync_fina_mainbz.py --period YYYYMMDD
 
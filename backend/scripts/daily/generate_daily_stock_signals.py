@@ -11,13 +11,17 @@ SCRIPT_ROOT = Path(__file__).resolve().parents[2]
 sys.path.append(str(SCRIPT_ROOT))
 
 from app.data.mongo import get_collection  # noqa: E402
+from app.data.mongo_daily_stock_pattern_hits import replace_daily_stock_pattern_hits  # noqa: E402
 from app.data.mongo_daily_stock_signals import (  # noqa: E402
     preserve_user_states,
     upsert_daily_stock_pattern_resonance,
     upsert_daily_stock_signal_resonance,
     upsert_daily_stock_signals,
 )
-from app.signals.daily_stock_signals import generate_daily_stock_signal_docs_for_range  # noqa: E402
+from app.signals.daily_stock_signals import (  # noqa: E402
+    build_pattern_hit_documents,
+    generate_daily_stock_signal_docs_for_range,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -84,11 +88,20 @@ def generate_for_date(trade_date: str) -> dict[str, object]:
             doc["trade_date"], doc["signal_side"], doc["resonance_level"], doc["stocks"]
         )
     pattern_resonance_count = upsert_daily_stock_pattern_resonance(pattern_resonance_docs)
+    pattern_hit_count = replace_daily_stock_pattern_hits(
+        build_pattern_hit_documents(
+            signal_docs=signal_docs,
+            resonance_docs=resonance_docs,
+            pattern_resonance_docs=pattern_resonance_docs,
+        ),
+        trade_dates=[trade_date],
+    )
     return {
         "trade_date": trade_date,
         "signal_docs": signal_count,
         "resonance_docs": resonance_count,
         "pattern_resonance_docs": pattern_resonance_count,
+        "pattern_hit_docs": pattern_hit_count,
     }
 
 
@@ -113,12 +126,21 @@ def main() -> None:
             doc["trade_date"], doc["signal_side"], doc["resonance_level"], doc["stocks"]
         )
     pattern_resonance_count = upsert_daily_stock_pattern_resonance(pattern_resonance_docs)
+    pattern_hit_count = replace_daily_stock_pattern_hits(
+        build_pattern_hit_documents(
+            signal_docs=signal_docs,
+            resonance_docs=resonance_docs,
+            pattern_resonance_docs=pattern_resonance_docs,
+        ),
+        trade_dates=dates,
+    )
     logger.info(
-        "generate_daily_stock_signals done: dates=%s signal_docs=%s resonance_docs=%s pattern_resonance_docs=%s",
+        "generate_daily_stock_signals done: dates=%s signal_docs=%s resonance_docs=%s pattern_resonance_docs=%s pattern_hit_docs=%s",
         len(dates),
         signal_count,
         resonance_count,
         pattern_resonance_count,
+        pattern_hit_count,
     )
 
 
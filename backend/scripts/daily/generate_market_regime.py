@@ -13,6 +13,7 @@ sys.path.append(str(SCRIPT_ROOT))
 
 from app.data.mongo import get_collection  # noqa: E402
 from app.data.mongo_market_regime import upsert_market_regime  # noqa: E402
+from app.features.market_breadth import load_market_breadth  # noqa: E402
 from app.signals.market_regime import compute_market_regime  # noqa: E402
 
 from pymongo import MongoClient  # noqa: E402
@@ -76,9 +77,21 @@ def main() -> None:
 
     client = MongoClient(settings.mongodb_url)
     data_dir = str(settings.data_dir)
+    breadth = load_market_breadth(dates[0], dates[-1], data_dir=data_dir)
+    missing = [trade_date for trade_date in dates if trade_date not in breadth]
+    if missing:
+        logger.warning(
+            "market_breadth has no rows for %s/%s dates (first=%s); scanning daily files for them, "
+            "run build_market_breadth.py to backfill",
+            len(missing),
+            len(dates),
+            missing[0],
+        )
     docs = []
     for trade_date in dates:
-        result = compute_market_regime(trade_date, client, settings.mongodb_db, data_dir)
+        result = compute_market_regime(
+            trade_date, client, settings.mongodb_db, data_dir, breadth_row=breadth.get(trade_date, {})
+        )
         if result:
             docs.append(asdict(result))
             logger.info("%s → %s (score: %s)", trade_date, result.regime_label_cn, result.total_score)
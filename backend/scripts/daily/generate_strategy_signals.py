@@ -16,7 +16,10 @@ sys.path.append(str(SCRIPT_ROOT))
 
 from app.data.mongo import get_collection  # noqa: E402
 from app.data.mongo_strategy_job_run import finish_strategy_job_run, start_strategy_job_run  # noqa: E402
-from app.services.strategy_signal_service import generate_strategy_signals_for_date  # noqa: E402
+from app.services.strategy_signal_service import (  # noqa: E402
+    generate_strategy_signals_for_date,
+    generate_strategy_signals_for_range,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +38,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--strategy-id", type=str, default="", help="Optional filter by strategy_id")
     parser.add_argument("--strategy-version-id", type=str, default="", help="Optional filter by strategy_version_id")
     parser.add_argument("--sleep", type=float, default=0.0, help="Sleep seconds between dates")
+    parser.add_argument(
+        "--range-mode",
+        action="store_true",
+        help="Backfill the whole range in date blocks, sharing data loads across versions",
+    )
+    parser.add_argument("--block-days", type=int, default=60, help="Trading days per block in --range-mode")
     return parser.parse_args()
 
 
@@ -88,6 +97,59 @@ def load_open_dates(start_date: str, end_date: str, exchange: str = "SSE") -> se
     return {str(item.get("cal_date")) for item in cursor if item.get("cal_date")}
 
 
+def run_range_backfill(
+    *,
+    start_date: str,
+    end_date: str,
+    strategy_id: str | None,
+    strategy_version_id: str | None,
+    block_days: int,
+) -> None:
+    job_params = {
+        "strategy_id": strategy_id or "",
+        "strategy_version_id": strategy_version_id or "",
+        "start_date": start_date,
+        "mode": "range",
+    }
+    start_strategy_job_run(job_name="generate_strategy_signals", run_date=end_date, params=job_params)
+    try:
+        result = generate_strategy_signals_for_range(
+            start_date=start_date,
+            end_date=end_date,
+            strategy_id=strategy_id,
+            strategy_version_id=strategy_version_id,
+            block_days=block_days,
+        )
+    except Exception as exc:
+        finish_strategy_job_run(
+            job_name="generate_strategy_signals",
+            run_date=end_date,
+            status="failed",
+            stats={},
+            error_message=str(exc),
+        )
+        raise
+    finish_strategy_job_run(
+        job_name="generate_strategy_signals",
+        run_date=end_date,
+        status=str(result.get("status") or "failed"),
+        stats={
+            "total_upserted": int(result.get("total_upserted") or 0),
+            "signal_dates": int(result.get("signal_dates") or 0),
+            "version_count": len(result.get("version_stats") or []),
+        },
+        error_message=str(result.get("reason") or ""),
+    )
+    logger.info(
+        "generate_strategy_signals range done: status=%s dates=%s upserted=%s",
+        result.get("status"),
+        result.get("signal_dates"),
+        result.get("total_upserted"),
+    )
+    for item in result.get("version_stats") or []:
+        logger.info("version %s: %s", item.get("strategy_version_id"), item)
+
+
 def main() -> None:
     logging.basicConfig(
         level=logging.INFO,
@@ -117,6 +179,16 @@ def main() -> None:
         strategy_version_id or "-",
     )
 
+    if args.range_mode:
+        run_range_backfill(
+            start_date=start_date,
+            end_date=end_date,
+            strategy_id=strategy_id,
+            strategy_version_id=strategy_version_id,
+            block_days=args.block_days,
+        )
+        return
+
     success = 0
     skipped = 0
     failed = 0
@@ -21,6 +21,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--trade-date", type=str, default="", help="YYYYMMDD or YYYY-MM-DD")
     parser.add_argument("--strategy-version-id", type=str, default="")
     parser.add_argument("--account-id", type=str, default="main")
+    parser.add_argument("--bypass-ai-cache", action="store_true", help="Force fresh AI runner inference for every skill")
     return parser.parse_args()
 
 
@@ -31,6 +32,7 @@ def main() -> None:
         trade_date=args.trade_date or None,
         strategy_version_id=args.strategy_version_id or None,
         account_id=args.account_id,
+        bypass_ai_cache=args.bypass_ai_cache,
     )
     logger.info("agent_freedom finished: %s", json.dumps(result, ensure_ascii=False))
 
@@ -17,6 +17,7 @@ sys.path.append(str(SCRIPT_ROOT))
 
 from app.core.config import settings
 from app.data.duckdb_store import upsert_adj_factor
+from app.data.mongo_data_sync_date import mark_sync_done
 from app.data.mongo_trade_calendar import is_trading_day
 
 logger = logging.getLogger(__name__)
@@ -110,6 +111,7 @@ def main() -> None:
 
             write_start = time.perf_counter()
             inserted = upsert_adj_factor(adj_df)
+            mark_sync_done(trade_date, "sync_adj_factor")
             write_elapsed = time.perf_counter() - write_start
 
             total_rows += inserted
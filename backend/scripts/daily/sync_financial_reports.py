@@ -4,10 +4,15 @@ from __future__ import annotations
 import argparse
 import datetime as dt
 import logging
+import queue
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
 
+import pandas as pd
 from tqdm import tqdm
 
 SCRIPT_ROOT = Path(__file__).resolve().parents[2]
@@ -35,15 +40,25 @@ from app.data.tushare_client import (  # noqa: E402
 
 logger = logging.getLogger(__name__)
 _PAGE_SIZE = 5000
+# Rows buffered per dataset by the writer thread before one upsert call.
+_WRITE_BATCH_ROWS = 20000
+_DATASETS = ("income", "balancesheet", "cashflow", "fina_indicator", "forecast", "express")
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Sync TuShare financial report datasets into DuckDB.")
-    parser.add_argument("--dataset", required=True, choices=["income", "balancesheet", "cashflow", "fina_indicator", "forecast", "express"])
+    parser.add_argument(
+        "--dataset",
+        required=True,
+        nargs="+",
+        choices=[*_DATASETS, "all"],
+        help="One or more datasets fetched in the same run; 'all' selects every dataset",
+    )
     parser.add_argument("--start-date", type=str, default="", help="Announcement start date: YYYYMMDD or YYYY-MM-DD")
     parser.add_argument("--end-date", type=str, default="", help="Announcement end date: YYYYMMDD or YYYY-MM-DD")
     parser.add_argument("--last-days", type=int, default=0, help="Pull most recent N calendar days by ann_date")
-    parser.add_argument("--sleep", type=float, default=1.0, help="Sleep seconds between API calls")
+    parser.add_argument("--sleep", type=float, default=1.0, help="Minimum seconds between API calls, shared by all workers")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent API requests")
     return parser.parse_args()
 
 
@@ -72,11 +87,16 @@ def resolve_dates(args: argparse.Namespace) -> list[str]:
     return [(start + dt.timedelta(days=offset)).strftime("%Y%m%d") for offset in range((end - start).days + 1)]
 
 
-def resolve_windows(args: argparse.Namespace, *, window_days: int = 31) -> list[tuple[str, str]]:
+def resolve_windows(
+    args: argparse.Namespace,
+    *,
+    dataset: str | None = None,
+    window_days: int = 31,
+) -> list[tuple[str, str]]:
     date_list = resolve_dates(args)
     if not date_list:
         return []
-    if args.dataset == "forecast":
+    if (dataset or args.dataset) == "forecast":
         return [(date_value, date_value) for date_value in date_list]
     windows: list[tuple[str, str]] = []
     for start_idx in range(0, len(date_list), window_days):
@@ -134,45 +154,204 @@ def _task_name(dataset: str) -> str:
     return f"sync_{dataset}"
 
 
+class TokenBucket:
+    """Shared request budget: ``rate`` calls per second with bursts of up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(int(capacity), 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    dataset: str
+    start_date: str
+    end_date: str
+    offset: int = 0
+
+
+@dataclass
+class DatasetStats:
+    windows: int = 0
+    api_rows: int = 0
+    upserted: int = 0
+    requests: int = 0
+
+
+class _BatchWriter(threading.Thread):
+    """Single consumer of fetched pages; the only thread that upserts or marks windows done.
+
+    Pages are buffered per dataset and upserted once ``_WRITE_BATCH_ROWS`` rows accumulate.
+    A finished window is marked done only after the flush that contains its last page.
+    """
+
+    _STOP = object()
+
+    def __init__(self, stats: dict[str, DatasetStats], *, max_pending: int):
+        super().__init__(name="sync-financial-writer", daemon=True)
+        self.items: queue.Queue = queue.Queue(maxsize=max_pending)
+        self.error: BaseException | None = None
+        self._stats = stats
+        self._buffers: dict[str, list] = {}
+        self._buffered_rows: dict[str, int] = {}
+        self._pending_done: dict[str, list[str]] = {}
+
+    def put_page(self, dataset: str, frame) -> None:  # noqa: ANN001
+        self.items.put(("page", dataset, frame))
+
+    def put_window_done(self, dataset: str, end_date: str) -> None:
+        self.items.put(("done", dataset, end_date))
+
+    def close(self) -> None:
+        self.items.put(self._STOP)
+        self.join()
+
+    def run(self) -> None:
+        while True:
+            item = self.items.get()
+            if item is self._STOP:
+                break
+            if self.error is not None:
+                continue
+            try:
+                self._handle(*item)
+            except BaseException as exc:  # noqa: BLE001
+                self.error = exc
+        if self.error is None:
+            try:
+                for dataset in list(self._buffers):
+                    self._flush(dataset)
+            except BaseException as exc:  # noqa: BLE001
+                self.error = exc
+
+    def _handle(self, kind: str, dataset: str, payload) -> None:  # noqa: ANN001
+        if kind == "page":
+            self._buffers.setdefault(dataset, []).append(payload)
+            self._buffered_rows[dataset] = self._buffered_rows.get(dataset, 0) + len(payload)
+            if self._buffered_rows[dataset] >= _WRITE_BATCH_ROWS:
+                self._flush(dataset)
+            return
+        self._pending_done.setdefault(dataset, []).append(payload)
+        if not self._buffers.get(dataset):
+            self._flush(dataset)
+
+    def _flush(self, dataset: str) -> None:
+        frames = self._buffers.pop(dataset, [])
+        self._buffered_rows.pop(dataset, None)
+        if frames:
+            batch = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            self._stats[dataset].upserted += _upsert_dataset(dataset, batch)
+        for end_date in self._pending_done.pop(dataset, []):
+            mark_sync_done(end_date, _task_name(dataset))
+
+
+def sync_windows(
+    windows_by_dataset: dict[str, list[tuple[str, str]]],
+    *,
+    workers: int = 4,
+    bucket: TokenBucket | None = None,
+    progress=None,  # noqa: ANN001
+) -> dict[str, DatasetStats]:
+    """Fetch every dataset window concurrently and funnel the pages to one writer thread.
+
+    The first page of every (dataset, window) is queued up front; a follow-up page is only
+    requested when the previous one came back full, so a window that ends mid-page costs no
+    trailing empty call. All workers draw from ``bucket`` before each API call.
+    """
+    bucket = bucket or TokenBucket(0)
+    stats = {dataset: DatasetStats(windows=len(windows)) for dataset, windows in windows_by_dataset.items()}
+    writer = _BatchWriter(stats, max_pending=max(workers, 1) * 4)
+    writer.start()
+
+    def fetch(request: PageRequest):  # noqa: ANN202
+        bucket.acquire()
+        frame = fetch_dataset_page(request.dataset, request.start_date, request.end_date, request.offset)
+        if frame is None or frame.empty:
+            return None
+        return normalize_date_columns(frame)
+
+    pending: dict[Future, PageRequest] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="sync-financial") as executor:
+            try:
+                for dataset, windows in windows_by_dataset.items():
+                    for start_date, end_date in windows:
+                        request = PageRequest(dataset, start_date, end_date)
+                        pending[executor.submit(fetch, request)] = request
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        request = pending.pop(future)
+                        frame = future.result()
+                        item_stats = stats[request.dataset]
+                        item_stats.requests += 1
+                        rows = 0 if frame is None else len(frame)
+                        if rows >= _PAGE_SIZE:
+                            follow_up = PageRequest(
+                                request.dataset, request.start_date, request.end_date, request.offset + _PAGE_SIZE
+                            )
+                            pending[executor.submit(fetch, follow_up)] = follow_up
+                        if rows:
+                            item_stats.api_rows += rows
+                            writer.put_page(request.dataset, frame)
+                        if rows < _PAGE_SIZE:
+                            writer.put_window_done(request.dataset, request.end_date)
+                            if progress is not None:
+                                progress.update(1)
+                        if writer.error is not None:
+                            raise writer.error
+            except BaseException:
+                # Drop the queued requests before the executor's exit waits on them; only the
+                # calls already in flight finish.
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        writer.close()
+    if writer.error is not None:
+        raise writer.error
+    return stats
+
+
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
     args = parse_args()
     if not settings.tushare_token:
         raise SystemExit("TUSHARE_TOKEN is required")
 
+    datasets = list(_DATASETS) if "all" in args.dataset else list(dict.fromkeys(args.dataset))
     ensure_financial_tables()
-    windows = resolve_windows(args)
-    total_rows = 0
-    total_upserted = 0
-    progress = tqdm(windows, total=len(windows), desc=f"sync_{args.dataset}", unit="window", dynamic_ncols=True)
-    for idx, (start_date, end_date) in enumerate(progress, start=1):
-        window_rows = 0
-        window_upserted = 0
-        offset = 0
-        while True:
-            df = fetch_dataset_page(args.dataset, start_date, end_date, offset)
-            if df is None or df.empty:
-                break
-            normalized = normalize_date_columns(df)
-            window_rows += len(normalized)
-            window_upserted += _upsert_dataset(args.dataset, normalized)
-            if len(normalized) < _PAGE_SIZE:
-                break
-            offset += _PAGE_SIZE
-        total_rows += window_rows
-        total_upserted += window_upserted
-        mark_sync_done(end_date, _task_name(args.dataset))
-        progress.set_postfix(start_date=start_date, end_date=end_date, api_rows=window_rows, upserted=window_upserted)
-        if args.sleep > 0 and idx < len(windows):
-            time.sleep(args.sleep)
-
-    logger.info(
-        "sync_financial_reports done: dataset=%s windows=%s api_rows=%s upserted=%s",
-        args.dataset,
-        len(windows),
-        total_rows,
-        total_upserted,
-    )
+    windows_by_dataset = {dataset: resolve_windows(args, dataset=dataset) for dataset in datasets}
+    total_windows = sum(len(windows) for windows in windows_by_dataset.values())
+    bucket = TokenBucket(1.0 / args.sleep if args.sleep > 0 else 0)
+    with tqdm(total=total_windows, desc="sync_financial_reports", unit="window", dynamic_ncols=True) as progress:
+        stats = sync_windows(windows_by_dataset, workers=args.workers, bucket=bucket, progress=progress)
+
+    for dataset, item in stats.items():
+        logger.info(
+            "sync_financial_reports done: dataset=%s windows=%s requests=%s api_rows=%s upserted=%s",
+            dataset,
+            item.windows,
+            item.requests,
+            item.api_rows,
+            item.upserted,
+        )
 
 
 if __name__ == "__main__":
@@ -19,6 +19,7 @@ from app.core.config import settings  # noqa: E402
 from app.data.mongo import get_collection  # noqa: E402
 from app.data.mongo_data_sync_date import mark_sync_done  # noqa: E402
 from app.data.tushare_client import fetch_stk_factor_pro  # noqa: E402
+from app.features.indicators import build_indicators, save_indicator_state  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -138,6 +139,18 @@ def parse_args() -> argparse.Namespace:
         help="Pull most recent N calendar days (auto skip non-trading days)",
     )
     parser.add_argument("--sleep", type=float, default=2.0, help="Sleep seconds between API calls")
+    parser.add_argument(
+        "--source",
+        type=str,
+        default="tushare",
+        choices=["tushare", "local"],
+        help="tushare: pull stk_factor_pro per date; local: compute from raw daily + adj_factor",
+    )
+    parser.add_argument(
+        "--rebuild-state",
+        action="store_true",
+        help="With --source local, ignore stored indicator state and recompute from full history",
+    )
     return parser.parse_args()
 
 
@@ -266,13 +279,37 @@ def flush_year_buffer(year: str, frames: list[pd.DataFrame]) -> tuple[int, int]:
     return saved, len(year_df)
 
 
+def run_local(start_date: str, end_date: str, open_dates: set[str], *, rebuild_state: bool) -> None:
+    rows, state = build_indicators(start_date=start_date, end_date=end_date, rebuild=rebuild_state)
+    total_saved = 0
+    if not rows.empty:
+        years = rows["trade_date"].str[:4]
+        for year, year_rows in rows.groupby(years, sort=True):
+            saved, _ = flush_year_buffer(str(year), [year_rows])
+            total_saved += saved
+    # State is persisted only after the rows it covers are on disk.
+    save_indicator_state(state)
+
+    synced_dates = sorted(set(rows["trade_date"]) & open_dates) if not rows.empty else []
+    for d in synced_dates:
+        mark_sync_done(d, "sync_stk_factor_pro")
+    logger.info(
+        "sync_stk_factor_pro local done: start=%s end=%s synced_days=%s saved_rows=%s stocks=%s",
+        start_date,
+        end_date,
+        len(synced_dates),
+        total_saved,
+        0 if rows.empty else rows["ts_code"].nunique(),
+    )
+
+
 def main() -> None:
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)s %(name)s - %(message)s",
     )
     args = parse_args()
-    if not settings.tushare_token:
+    if args.source == "tushare" and not settings.tushare_token:
         raise SystemExit("TUSHARE_TOKEN is required")
 
     date_list = resolve_dates(args)
@@ -283,6 +320,9 @@ def main() -> None:
     start_date = min(date_list)
     end_date = max(date_list)
     open_dates = load_open_dates(start_date, end_date)
+    if args.source == "local":
+        run_local(start_date, end_date, open_dates, rebuild_state=args.rebuild_state)
+        return
 
     logger.info(
         "sync_stk_factor_pro start: start=%s end=%s days=%s sleep=%.2f",
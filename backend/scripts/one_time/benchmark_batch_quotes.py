@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+SCRIPT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(SCRIPT_ROOT))
+
+from app.core.config import settings  # noqa: E402
+from app.data.duckdb_store import (  # noqa: E402
+    close_read_connection,
+    list_last_n_days_pct_chg,
+    list_latest_daily_basic,
+    list_latest_daily_changes,
+)
+from app.services.batch_quote_service import load_batch_quotes  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Time batch quotes against the per-helper group stock lookups.")
+    parser.add_argument("--sizes", type=str, default="50,500,5000", help="Comma separated code counts.")
+    parser.add_argument("--days", type=int, default=750, help="Trading days of synthetic history per stock.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per reader.")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed.")
+    return parser.parse_args()
+
+
+def _write_dataset(root: Path, dataset: str, frame: pd.DataFrame) -> None:
+    years = frame["trade_date"].str[:4]
+    for (ts_code, year), group in frame.groupby([frame["ts_code"], years], sort=False):
+        partition = root / "raw" / dataset / f"ts_code={ts_code}" / f"year={year}"
+        partition.mkdir(parents=True, exist_ok=True)
+        group.to_parquet(partition / "part-0000.parquet", index=False)
+
+
+def build_store(root: Path, stocks: int, days: int, seed: int) -> list[str]:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2025-03-31", periods=days).strftime("%Y%m%d")
+    codes = [f"{idx:06d}.SZ" for idx in range(stocks)]
+    pct = rng.normal(0.0, 2.0, (days, stocks))
+    close = 10.0 * np.cumprod(1 + pct / 100, axis=0)
+    pre_close = np.vstack([close[:1] / (1 + pct[:1] / 100), close[:-1]])
+    daily = pd.DataFrame(
+        {
+            "ts_code": np.tile(codes, days),
+            "trade_date": np.repeat(dates, stocks),
+            "close": close.ravel(),
+            "pre_close": pre_close.ravel(),
+            "change": (close - pre_close).ravel(),
+            "pct_chg": pct.ravel(),
+        }
+    )
+    _write_dataset(root, "daily", daily)
+    _write_dataset(
+        root,
+        "daily_basic",
+        daily[["ts_code", "trade_date"]].assign(
+            turnover_rate=rng.uniform(0.1, 10.0, len(daily)), total_mv=1e6, circ_mv=8e5
+        ),
+    )
+    _write_dataset(
+        root,
+        "daily_limit",
+        daily[["ts_code", "trade_date"]].assign(up_limit=daily["pre_close"] * 1.1, down_limit=daily["pre_close"] * 0.9),
+    )
+    return codes
+
+
+def legacy_lookup(codes: list[str]) -> int:
+    """The former list_group_stocks data path: three separate Parquet queries plus Python stitching."""
+    change_map = list_latest_daily_changes(codes)
+    basic_map = list_latest_daily_basic(codes)
+    pct_map = list_last_n_days_pct_chg(codes, n=5)
+    rows = 0
+    for code in codes:
+        pct_data = pct_map.get(code) or {}
+        vals = [pct_data.get(f"pct_chg_{i}") for i in range(1, 4)]
+        _ = (change_map.get(code), basic_map.get(code), sum(v for v in vals if v is not None))
+        rows += 1
+    return rows
+
+
+def batch_lookup(codes: list[str]) -> int:
+    return len(load_batch_quotes(codes))
+
+
+def time_reader(reader, codes: list[str], repeat: int) -> float:
+    reader(codes)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        reader(codes)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+    args = parse_args()
+    sizes = [int(item) for item in args.sizes.split(",") if item.strip()]
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        duckdb.connect(str(root / "quant.duckdb")).close()
+        settings.data_dir = root
+        settings.duckdb_path = root / "quant.duckdb"
+        close_read_connection()
+        started = time.perf_counter()
+        codes = build_store(root, max(sizes), args.days, args.seed)
+        logger.info("synthetic store: stocks=%s days=%s built in %.1fs", len(codes), args.days, time.perf_counter() - started)
+        for size in sizes:
+            subset = codes[:size]
+            legacy_seconds = time_reader(legacy_lookup, subset, args.repeat)
+            batch_seconds = time_reader(batch_lookup, subset, args.repeat)
+            logger.info(
+                "codes=%s legacy_median_ms=%.1f batch_median_ms=%.1f (signals excluded: one Mongo aggregation in both paths)",
+                size,
+                legacy_seconds * 1000,
+                batch_seconds * 1000,
+            )
+        close_read_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(SCRIPT_ROOT))
+
+from app.features.indicators import compute_indicators  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Time the local indicator engine on a synthetic price panel.")
+    parser.add_argument("--stocks", type=int, default=5000, help="Number of synthetic stocks.")
+    parser.add_argument("--days", type=int, default=250, help="Trading days per stock.")
+    parser.add_argument("--incremental-days", type=int, default=1, help="Days appended for the incremental run.")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed.")
+    return parser.parse_args()
+
+
+def build_panel(stocks: int, days: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2020-01-01", periods=days).strftime("%Y%m%d")
+    codes = [f"{idx:06d}.SZ" for idx in range(stocks)]
+    close = 10.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, (days, stocks)), axis=0))
+    adj = np.where(rng.random((days, stocks)) < 0.002, 1.1, 1.0).cumprod(axis=0)
+    raw_close = close / adj
+    return pd.DataFrame(
+        {
+            "ts_code": np.tile(codes, days),
+            "trade_date": np.repeat(dates, stocks),
+            "close": raw_close.ravel(),
+            "high": (raw_close * (1 + rng.uniform(0, 0.03, raw_close.shape))).ravel(),
+            "low": (raw_close * (1 - rng.uniform(0, 0.03, raw_close.shape))).ravel(),
+            "adj_factor": adj.ravel(),
+        }
+    )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+    args = parse_args()
+    panel = build_panel(args.stocks, args.days + args.incremental_days, args.seed)
+    dates = sorted(panel["trade_date"].unique())
+    cutoff = dates[args.days - 1]
+    history = panel[panel["trade_date"] <= cutoff]
+
+    started = time.perf_counter()
+    rows, state = compute_indicators(history)
+    full_seconds = time.perf_counter() - started
+    logger.info(
+        "full: stocks=%s days=%s rows=%s seconds=%.2f rows_per_second=%.0f",
+        args.stocks,
+        args.days,
+        len(rows),
+        full_seconds,
+        len(rows) / full_seconds if full_seconds > 0 else 0.0,
+    )
+
+    started = time.perf_counter()
+    new_rows, _ = compute_indicators(panel, state=state)
+    incremental_seconds = time.perf_counter() - started
+    logger.info(
+        "incremental: stocks=%s new_days=%s warmup_days=%s rows=%s seconds=%.2f",
+        args.stocks,
+        args.incremental_days,
+        args.days,
+        len(new_rows),
+        incremental_seconds,
+    )
+
+
+if __name__ == "__main__":
+    main()
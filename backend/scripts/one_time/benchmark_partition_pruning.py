@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+SCRIPT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(SCRIPT_ROOT))
+
+from app.data.partition_paths import partition_files  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+_TS_CODE = "000001.SZ"
+_QUERY = "SELECT * FROM read_parquet(?) WHERE ts_code = ? AND trade_date BETWEEN ? AND ? ORDER BY trade_date"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare files scanned by year=* globs and the partition planner.")
+    parser.add_argument("--years", type=int, default=20, help="Years of history for the synthetic stock.")
+    parser.add_argument("--parts-per-year", type=int, default=12, help="Append-only part files per year partition.")
+    parser.add_argument("--start-date", type=str, default="", help="Query start (YYYYMMDD), defaults to last year's March.")
+    parser.add_argument("--end-date", type=str, default="", help="Query end (YYYYMMDD).")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed repetitions per reader.")
+    return parser.parse_args()
+
+
+def build_history(root: Path, years: int, parts_per_year: int) -> int:
+    last_year = 2025
+    dates = pd.bdate_range(f"{last_year - years + 1}-01-01", f"{last_year}-12-31").strftime("%Y%m%d")
+    frame = pd.DataFrame({"ts_code": _TS_CODE, "trade_date": dates, "close": np.linspace(5.0, 50.0, len(dates))})
+    written = 0
+    for year, group in frame.groupby(frame["trade_date"].str[:4]):
+        partition = root / f"ts_code={_TS_CODE}" / f"year={year}"
+        partition.mkdir(parents=True)
+        for idx, rows in enumerate(np.array_split(np.arange(len(group)), parts_per_year)):
+            group.iloc[rows].to_parquet(partition / f"part-{idx:04d}.parquet", index=False)
+            written += 1
+    return written
+
+
+def time_query(con: duckdb.DuckDBPyConnection, source: str | list[str], start: str, end: str, repeat: int) -> tuple[float, int]:
+    samples = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = len(con.execute(_QUERY, [source, _TS_CODE, start, end]).fetchall())
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), rows
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+    args = parse_args()
+    start = args.start_date or "20250301"
+    end = args.end_date or "20250331"
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "daily"
+        total_files = build_history(root, args.years, args.parts_per_year)
+        con = duckdb.connect()
+        glob = str(root / f"ts_code={_TS_CODE}" / "year=*" / "part-*.parquet")
+        glob_files = con.execute("SELECT COUNT(*) FROM glob(?)", [glob]).fetchone()[0]
+        planned = partition_files(root, _TS_CODE, start_date=start, end_date=end)
+
+        glob_seconds, glob_rows = time_query(con, glob, start, end, args.repeat)
+        planned_seconds, planned_rows = time_query(con, planned, start, end, args.repeat)
+        if glob_rows != planned_rows:
+            raise SystemExit(f"row mismatch: glob={glob_rows} planned={planned_rows}")
+
+    logger.info("history: years=%s files=%s query=%s-%s rows=%s", args.years, total_files, start, end, planned_rows)
+    logger.info("year=* glob: files_scanned=%s median_ms=%.2f", glob_files, glob_seconds * 1000)
+    logger.info("planner: files_scanned=%s median_ms=%.2f", len(planned), planned_seconds * 1000)
+
+
+if __name__ == "__main__":
+    main()
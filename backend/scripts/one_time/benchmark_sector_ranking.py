@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+SCRIPT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(SCRIPT_ROOT))
+
+from app.data.mongo_citic_daily import (  # noqa: E402
+    build_citic_avg_rankings,
+    get_citic_daily_rankings,
+    list_latest_citic_trade_dates,
+)
+from app.data.mongo_shenwan_daily import build_avg_rankings, get_daily_rankings, list_latest_trade_dates  # noqa: E402
+from app.services.sector_ranking_service import get_avg_rankings, get_ranking_history  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare the per-date sector ranking loop with the aggregation service on the configured MongoDB."
+    )
+    parser.add_argument("--source", choices=["sw", "ci"], default="sw")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--days", type=int, default=30, help="History window, as served by /sector-ranking/history.")
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=10, help="Timed repetitions per reader.")
+    return parser.parse_args()
+
+
+def time_call(func: Callable[[], object], repeat: int) -> tuple[float, object]:
+    samples = []
+    result: object = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), result
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+    args = parse_args()
+    if args.source == "ci":
+        list_dates, daily_rankings, avg_rankings = list_latest_citic_trade_dates, get_citic_daily_rankings, build_citic_avg_rankings
+    else:
+        list_dates, daily_rankings, avg_rankings = list_latest_trade_dates, get_daily_rankings, build_avg_rankings
+    dates = list_dates(limit=args.days, level=args.level)
+    if not dates:
+        raise SystemExit(f"no {args.source} ranking data for level {args.level}")
+    top_n = args.top_n
+
+    def loop_history() -> list[dict[str, object]]:
+        data = []
+        for trade_date in dates:
+            top, bottom, _total = daily_rankings(trade_date=trade_date, level=args.level, top_n=top_n, bottom_n=top_n)
+            data.append({"trade_date": trade_date, "top": top, "bottom": bottom})
+        return data
+
+    def pipeline_history() -> list[dict[str, object]]:
+        return get_ranking_history(source=args.source, trade_dates=dates, level=args.level, top_n=top_n, bottom_n=top_n)
+
+    avg_dates = dates[:5]
+    loop_seconds, loop_result = time_call(loop_history, args.repeat)
+    pipeline_seconds, pipeline_result = time_call(pipeline_history, args.repeat)
+    if loop_result != pipeline_result:
+        raise SystemExit("history mismatch between the per-date loop and the aggregation")
+    avg_loop_seconds, avg_loop = time_call(
+        lambda: avg_rankings(trade_dates=avg_dates, level=args.level, top_n=10, bottom_n=10), args.repeat
+    )
+    avg_pipeline_seconds, avg_pipeline = time_call(
+        lambda: get_avg_rankings(source=args.source, trade_dates=avg_dates, level=args.level, top_n=10, bottom_n=10),
+        args.repeat,
+    )
+    for key in ("strongest", "weakest"):
+        if [row["ts_code"] for row in avg_loop[key]] != [row["ts_code"] for row in avg_pipeline[key]]:
+            logger.warning("avg %s order differs (rank_avg ties are ordered by ts_code in the aggregation)", key)
+
+    logger.info("history: source=%s level=%s days=%s top_n=%s", args.source, args.level, len(dates), top_n)
+    logger.info("history loop: round_trips=%s median_ms=%.2f", len(dates) * 3, loop_seconds * 1000)
+    logger.info("history aggregation: round_trips=1 median_ms=%.2f", pipeline_seconds * 1000)
+    logger.info("avg python: median_ms=%.2f", avg_loop_seconds * 1000)
+    logger.info("avg aggregation: median_ms=%.2f", avg_pipeline_seconds * 1000)
+
+
+if __name__ == "__main__":
+    main()
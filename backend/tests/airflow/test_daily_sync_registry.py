@@ -26,6 +26,20 @@ def test_registry_contains_expected_groups_and_task_ids() -> None:
     }
 
 
+def test_feature_store_builds_run_after_market_core() -> None:
+    for task_id in ("build_forward_returns", "build_rolling_stats", "build_market_breadth"):
+        task = get_daily_sync_task(task_id)
+
+        assert task.group == "factor_and_flow"
+        assert task.render_command("20260315")[1:] == [
+            f"backend/scripts/daily/{task_id}.py",
+            "--start-date",
+            "20260315",
+            "--end-date",
+            "20260315",
+        ]
+
+
 def test_render_command_injects_trade_date_and_dataset_args() -> None:
     task = get_daily_sync_task("sync_dividend")
 
@@ -106,3 +106,85 @@ def test_require_admin_user_requires_admin_role() -> None:
         assert exc.detail == "Admin required"
     else:  # pragma: no cover
         raise AssertionError("expected HTTPException")
+
+
+def _personal_user(username: str = "james") -> dict[str, object]:
+    return {
+        "_id": 1,
+        "username": username,
+        "display_name": username,
+        "status": "active",
+        "auth_type": "personal_authenticator",
+        "roles": ["admin"],
+        "created_at": None,
+        "updated_at": None,
+        "last_login_at": None,
+    }
+
+
+def test_verify_caches_successful_verifications_until_cache_ttl(monkeypatch) -> None:
+    calls: list[str] = []
+    now = [1_000.0]
+    monkeypatch.setattr(deps.settings, "auth_verify_cache_seconds", 60)
+    monkeypatch.setattr(deps.time, "time", lambda: now[0])
+    monkeypatch.setattr(deps, "_request_personal_authenticator_verify", lambda token: calls.append(token) or _personal_user())
+    deps._verified_tokens.clear()
+
+    try:
+        first = deps._verify_with_personal_authenticator("token-a")
+        first["roles"].append("mutated")
+        second = deps._verify_with_personal_authenticator("token-a")
+        now[0] += 61
+        deps._verify_with_personal_authenticator("token-a")
+    finally:
+        deps._verified_tokens.clear()
+
+    assert second["roles"] == ["admin"]
+    assert calls == ["token-a", "token-a"]
+
+
+def test_verify_cache_respects_token_expiry_and_never_caches_rejections(monkeypatch) -> None:
+    calls: list[str] = []
+    now = [1_000.0]
+    expiring_token = deps.jwt.encode({"sub": "1", "exp": 1_010}, "secret", algorithm="HS256")
+    monkeypatch.setattr(deps.settings, "auth_verify_cache_seconds", 60)
+    monkeypatch.setattr(deps.time, "time", lambda: now[0])
+
+    def verify(token: str) -> dict[str, object]:
+        calls.append(token)
+        if token == "revoked":
+            raise HTTPException(status_code=401, detail="Invalid token")
+        return _personal_user()
+
+    monkeypatch.setattr(deps, "_request_personal_authenticator_verify", verify)
+    deps._verified_tokens.clear()
+
+    try:
+        deps._verify_with_personal_authenticator(expiring_token)
+        now[0] += 11
+        deps._verify_with_personal_authenticator(expiring_token)
+        for _ in range(2):
+            try:
+                deps._verify_with_personal_authenticator("revoked")
+            except HTTPException as exc:
+                assert exc.status_code == 401
+    finally:
+        deps._verified_tokens.clear()
+
+    assert calls == [expiring_token, expiring_token, "revoked", "revoked"]
+
+
+def test_invalidate_verified_token_forces_reverification(monkeypatch) -> None:
+    calls: list[str] = []
+    monkeypatch.setattr(deps.settings, "auth_verify_cache_seconds", 60)
+    monkeypatch.setattr(deps, "_request_personal_authenticator_verify", lambda token: calls.append(token) or _personal_user())
+    deps._verified_tokens.clear()
+
+    try:
+        deps._verify_with_personal_authenticator("token-a")
+        deps.invalidate_verified_token("token-a")
+        deps._verify_with_personal_authenticator("token-a")
+    finally:
+        deps._verified_tokens.clear()
+
+    assert calls == ["token-a", "token-a"]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user
+from app.api.routers import router as api_router
+
+
+def create_test_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api")
+    app.dependency_overrides[get_current_user] = lambda: {"username": "james", "status": "active"}
+    return TestClient(app)
+
+
+class _StockBasic:
+    def __init__(self, rows: list[dict[str, str]]) -> None:
+        self.rows = rows
+        self.queries: list[dict[str, object]] = []
+
+    def find(self, query: dict[str, object], projection: dict[str, int] | None = None) -> list[dict[str, str]]:
+        self.queries.append(query)
+        symbols = set(query["symbol"]["$in"])
+        return [row for row in self.rows if row["symbol"] in symbols]
+
+
+class BatchQuotesApiTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = create_test_client()
+        self.stock_basic = _StockBasic([{"symbol": "600000", "ts_code": "600000.SH"}, {"symbol": "830799", "ts_code": "830799.BJ"}])
+        patches = [
+            patch("app.api.stock_code.get_collection", lambda name: self.stock_basic),
+            patch("app.api.stock_code.get_ts_code_by_symbol", side_effect=AssertionError("per-symbol lookup")),
+            patch("app.api.routes.stocks.get_batch_quotes", side_effect=self._quotes),
+        ]
+        for item in patches:
+            item.start()
+            self.addCleanup(item.stop)
+        self.requested: list[str] = []
+
+    def _quotes(self, codes: list[str], *, include_signal: bool) -> pd.DataFrame:
+        self.requested = list(codes)
+        return pd.DataFrame({"ts_code": codes})
+
+    def test_symbols_resolve_with_one_lookup_and_blank_entries_are_skipped(self) -> None:
+        response = self.client.post(
+            "/api/stocks/quotes/batch",
+            json={"ts_codes": ["600000", " ", "000001.SZ", "sz000002", "830799", "", "600000"]},
+        )
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(["600000.SH", "000001.SZ", "000002.SZ", "830799.BJ"], self.requested)
+        self.assertEqual([{"symbol": {"$in": ["600000", "830799"]}}], self.stock_basic.queries)
+
+    def test_invalid_or_empty_input_returns_400(self) -> None:
+        cases = [(["600000", "ABC"], "invalid stock code: ABC"), (["", "  "], "ts_codes is required")]
+
+        for ts_codes, message in cases:
+            with self.subTest(ts_codes=ts_codes):
+                response = self.client.post("/api/stocks/quotes/batch", json={"ts_codes": ts_codes})
+                self.assertEqual(400, response.status_code)
+                self.assertIn(message, response.json()["detail"])
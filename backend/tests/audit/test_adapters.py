@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import duckdb
+import pandas as pd
+
+from app.audit.adapters import load_counts_by_date, load_counts_for_dates
+from app.audit.registry import get_dataset_registry
+from app.data.duckdb_store import close_read_connection
+
+
+def _write_partition(root, ts_code: str, year: str, trade_dates: list[str]) -> None:
+    partition = root / f"ts_code={ts_code}" / f"year={year}"
+    partition.mkdir(parents=True, exist_ok=True)
+    frame = pd.DataFrame({"ts_code": [ts_code] * len(trade_dates), "trade_date": trade_dates})
+    frame.to_parquet(partition / "part-0.parquet", index=False)
+
+
+def test_load_counts_for_dates_only_counts_requested_dates(monkeypatch, tmp_path) -> None:
+    root = tmp_path / "raw" / "daily"
+    _write_partition(root, "000001.SZ", "2024", ["20241230", "20241231"])
+    _write_partition(root, "000001.SZ", "2025", ["20250102", "20250103"])
+    _write_partition(root, "000002.SZ", "2025", ["20250102"])
+    duckdb.connect(str(tmp_path / "quant.duckdb")).close()
+    monkeypatch.setattr("app.audit.adapters.settings.data_dir", tmp_path)
+    monkeypatch.setattr("app.data.duckdb_store.settings.duckdb_path", tmp_path / "quant.duckdb")
+    close_read_connection()
+    config = get_dataset_registry()["daily"]
+
+    try:
+        full = load_counts_by_date(config, count_mode="distinct")
+        partial = load_counts_for_dates(config, ["2025-01-02", "20260105"], count_mode="distinct")
+    finally:
+        close_read_connection()
+
+    assert full == {"20241230": 1, "20241231": 1, "20250102": 2, "20250103": 1}
+    assert partial == {"20250102": 2}
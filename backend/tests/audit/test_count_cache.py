@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+
+from app.audit.count_cache import AuditCountCache, build_cache_key
+from app.audit.models import DatasetConfig
+
+
+def _config(**overrides) -> DatasetConfig:
+    values = {
+        "name": "daily",
+        "storage_type": "parquet",
+        "location": "raw/daily",
+        "date_field": "trade_date",
+        "audit_mode": "date_only",
+        "coverage_key": "ts_code",
+        "sync_tasks": ["pull_daily"],
+    }
+    values.update(overrides)
+    return DatasetConfig(**values)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = dt.datetime(2026, 3, 14, 6, 0, tzinfo=dt.UTC)
+
+    def __call__(self) -> dt.datetime:
+        return self.now
+
+
+def test_cold_cache_runs_one_full_scan_and_filters_requested_range(tmp_path) -> None:
+    full_scans = []
+
+    def full_scan(config, *, count_mode, start_date=None, end_date=None):
+        full_scans.append((config.name, count_mode, start_date, end_date))
+        return {"20260310": 10, "20260311": 11, "20260312": 12}
+
+    cache = AuditCountCache(tmp_path, full_scan=full_scan, date_scan=None, touched_dates=None, clock=_Clock())
+
+    counts = cache.load(_config(), count_mode="distinct", start_date="20260311", end_date=None)
+
+    assert counts == {"20260311": 11, "20260312": 12}
+    assert full_scans == [("daily", "distinct", None, None)]
+    stored = json.loads((tmp_path / f"{build_cache_key(_config(), 'distinct')}.json").read_text(encoding="utf-8"))
+    assert stored["counts"] == {"20260310": 10, "20260311": 11, "20260312": 12}
+
+
+def test_warm_cache_only_rescans_dates_touched_since_last_refresh(tmp_path) -> None:
+    clock = _Clock()
+    touched_calls = []
+    date_scans = []
+
+    def full_scan(config, *, count_mode, start_date=None, end_date=None):
+        return {"20260310": 10, "20260311": 11, "20260312": 12}
+
+    def touched_dates(tasks, *, since):
+        touched_calls.append((tasks, since))
+        return ["20260311", "20260312", "20260313"]
+
+    def date_scan(config, trade_dates, *, count_mode):
+        date_scans.append(list(trade_dates))
+        return {"20260311": 15, "20260313": 13}
+
+    cache = AuditCountCache(tmp_path, full_scan=full_scan, date_scan=date_scan, touched_dates=touched_dates, clock=clock)
+    cache.load(_config(), count_mode="distinct")
+    first_refresh = clock.now
+    clock.now = first_refresh + dt.timedelta(days=1)
+
+    counts = cache.load(_config(), count_mode="distinct")
+
+    assert counts == {"20260310": 10, "20260311": 15, "20260313": 13}
+    assert touched_calls == [(["pull_daily"], first_refresh)]
+    assert date_scans == [["20260311", "20260312", "20260313"]]
+
+
+def test_expired_cache_falls_back_to_full_scan(tmp_path) -> None:
+    clock = _Clock()
+    full_scans = []
+
+    def full_scan(config, *, count_mode, start_date=None, end_date=None):
+        full_scans.append(clock.now)
+        return {"20260310": 10}
+
+    def touched_dates(tasks, *, since):
+        raise AssertionError("expired entries must not be patched incrementally")
+
+    cache = AuditCountCache(
+        tmp_path,
+        full_scan=full_scan,
+        date_scan=None,
+        touched_dates=touched_dates,
+        full_refresh_days=7,
+        clock=clock,
+    )
+    cache.load(_config(), count_mode="rows")
+    clock.now = clock.now + dt.timedelta(days=7)
+    cache.load(_config(), count_mode="rows")
+
+    assert len(full_scans) == 2
+
+
+def test_datasets_without_sync_tasks_bypass_the_cache(tmp_path) -> None:
+    calls = []
+
+    def full_scan(config, *, count_mode, start_date=None, end_date=None):
+        calls.append((start_date, end_date))
+        return {"20260311": 1}
+
+    cache = AuditCountCache(tmp_path, full_scan=full_scan, date_scan=None, touched_dates=None, clock=_Clock())
+
+    counts = cache.load(_config(name="moneyflow_hsgt", sync_tasks=[]), count_mode="rows", start_date="20260301", end_date="20260331")
+
+    assert counts == {"20260311": 1}
+    assert calls == [("20260301", "20260331")]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache_key_separates_baseline_filters() -> None:
+    plain = build_cache_key(_config(), "distinct")
+    filtered = build_cache_key(_config(baseline_excluded_ts_code_suffixes=[".BJ"]), "distinct")
+
+    assert plain != filtered
+    assert plain.startswith("daily__distinct__")
@@ -37,6 +37,7 @@ def test_registry_contains_first_scope_datasets_with_expected_rules() -> None:
     assert registry["cyq_perf"].baseline_excluded_ts_code_suffixes == [".BJ"]
     assert registry["cyq_perf"].baseline_excluded_ts_codes == ["300114.SZ", "600898.SH"]
     assert registry["moneyflow_dc"].ignored_trade_dates == ["20231122"]
+    assert registry["adj_factor"].sync_tasks == ["pull_daily", "sync_adj_factor"]
     assert registry["moneyflow_hsgt"].audit_mode == "date_only"
     assert registry["moneyflow_hsgt"].use_trade_calendar is False
     assert registry["market_index_dailybasic"].ignored_rowcount_trade_dates == ["20100531"]
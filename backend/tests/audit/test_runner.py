@@ -180,3 +180,25 @@ def test_run_audit_ignores_known_rowcount_transition_days(monkeypatch, tmp_path)
     assert result.datasets[0].dataset == "market_index_dailybasic"
     assert result.datasets[0].rowcount_anomalies == []
     assert result.datasets[0].status == "green"
+
+
+def test_run_audit_scans_shared_daily_baseline_once(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr("scripts.audit.run_data_integrity_audit.resolve_output_dir", lambda run_id, log_dir=None: tmp_path / run_id)
+    monkeypatch.setattr(
+        "scripts.audit.run_data_integrity_audit.load_open_trade_dates",
+        lambda start_date=None, end_date=None: ["20250102", "20250103"],
+    )
+
+    calls = []
+
+    def fake_load_counts_by_date(config, *, count_mode="auto", start_date=None, end_date=None):
+        calls.append((config.name, count_mode))
+        return {"20250102": 5000, "20250103": 5001}
+
+    monkeypatch.setattr("scripts.audit.run_data_integrity_audit.load_counts_by_date", fake_load_counts_by_date)
+
+    result = run_audit(selected_names=["daily", "indicators", "adj_factor"], run_id="fixed-run", workers=3)
+
+    assert [item.dataset for item in result.datasets] == ["daily", "indicators", "adj_factor"]
+    assert all(item.status == "green" for item in result.datasets)
+    assert sorted(calls) == [("adj_factor", "distinct"), ("daily", "distinct"), ("indicators", "distinct")]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Any
+
+from app.data import mongo_daily_stock_pattern_hits
+from app.data.mongo_daily_stock_pattern_hits import replace_daily_stock_pattern_hits
+
+
+class _FakeCollection:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = {(row["trade_date"], row["ts_code"]): dict(row) for row in rows}
+
+    def bulk_write(self, ops, ordered: bool = True) -> None:
+        for op in ops:
+            key = (op._filter["trade_date"], op._filter["ts_code"])
+            self.rows[key] = dict(op._doc)
+
+    def delete_many(self, query: dict[str, Any]) -> None:
+        keep = set(query["ts_code"]["$nin"])
+        self.rows = {
+            key: row for key, row in self.rows.items() if key[0] != query["trade_date"] or key[1] in keep
+        }
+
+
+def test_replace_upserts_hits_and_clears_stale_rows_per_regenerated_date(monkeypatch) -> None:
+    collection = _FakeCollection(
+        [
+            {"trade_date": "20260416", "ts_code": "000001.SZ", "signals": ["old"]},
+            {"trade_date": "20260416", "ts_code": "000002.SZ", "signals": ["old"]},
+            {"trade_date": "20260417", "ts_code": "000001.SZ", "signals": ["old"]},
+            {"trade_date": "20260415", "ts_code": "000001.SZ", "signals": ["untouched"]},
+        ]
+    )
+    monkeypatch.setattr(mongo_daily_stock_pattern_hits, "get_daily_stock_pattern_hits_collection", lambda: collection)
+
+    written = replace_daily_stock_pattern_hits(
+        [{"trade_date": "20260416", "ts_code": "000001.SZ", "signals": ["new"]}],
+        trade_dates=["20260416", "20260417"],
+    )
+
+    assert written == 1
+    assert sorted(collection.rows) == [("20260415", "000001.SZ"), ("20260416", "000001.SZ")]
+    assert collection.rows[("20260416", "000001.SZ")]["signals"] == ["new"]
+    assert collection.rows[("20260415", "000001.SZ")]["signals"] == ["untouched"]
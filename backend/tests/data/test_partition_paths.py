@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+
+from app.data import duckdb_store, partition_paths
+from app.data.duckdb_store import close_read_connection
+from app.data.partition_paths import clear_partition_cache, partition_codes, partition_files
+
+_OLD = 1_600_000_000
+
+
+def _touch_part(root: Path, ts_code: str, year: int, name: str = "part-a.parquet") -> Path:
+    path = root / f"ts_code={ts_code}" / f"year={year}" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    return path
+
+
+def _age(root: Path) -> None:
+    """Backdate every directory so listings are old enough to be cached."""
+    for path in [root, *root.rglob("*")]:
+        if path.is_dir():
+            os.utime(path, (_OLD, _OLD))
+
+
+def test_partition_files_keeps_only_overlapping_years(tmp_path) -> None:
+    clear_partition_cache()
+    for year in range(2005, 2025):
+        _touch_part(tmp_path, "000001.SZ", year)
+    _touch_part(tmp_path, "000001.SZ", 2024, "part-b.parquet")
+    _touch_part(tmp_path, "000001.SZ", 2024, "part-c.parquet.tmp")
+    _touch_part(tmp_path, "600000.SH", 2023)
+
+    one_month = partition_files(tmp_path, "000001.SZ", start_date="20240101", end_date="20240131")
+    spanning = partition_files(tmp_path, ["600000.SH", "000001.SZ", "000002.SZ"], start_date="20231215", end_date="20240115")
+
+    assert [Path(item).relative_to(tmp_path).as_posix() for item in one_month] == [
+        "ts_code=000001.SZ/year=2024/part-a.parquet",
+        "ts_code=000001.SZ/year=2024/part-b.parquet",
+    ]
+    assert [Path(item).parent.name for item in spanning] == ["year=2023", "year=2023", "year=2024", "year=2024"]
+    assert len(partition_files(tmp_path, "000001.SZ")) == 21
+    assert partition_files(tmp_path, "000002.SZ") == []
+    assert partition_codes(tmp_path) == ["000001.SZ", "600000.SH"]
+
+
+def test_latest_years_skips_empty_year_directories(tmp_path) -> None:
+    clear_partition_cache()
+    for year in (2021, 2022):
+        _touch_part(tmp_path, "000001.SZ", year)
+    (tmp_path / "ts_code=000001.SZ" / "year=2023").mkdir()
+
+    latest = partition_files(tmp_path, "000001.SZ", latest_years=1)
+
+    assert [Path(item).parent.name for item in latest] == ["year=2022"]
+
+
+def test_directory_listings_are_cached_until_mtime_changes(monkeypatch, tmp_path) -> None:
+    clear_partition_cache()
+    for year in (2023, 2024):
+        _touch_part(tmp_path, "000001.SZ", year)
+    _age(tmp_path)
+    listed: list[str] = []
+    real_listdir = os.listdir
+
+    def counting_listdir(path):  # noqa: ANN001, ANN202
+        listed.append(str(path))
+        return real_listdir(path)
+
+    monkeypatch.setattr(partition_paths.os, "listdir", counting_listdir)
+
+    partition_files(tmp_path, "000001.SZ", start_date="20240101")
+    partition_files(tmp_path, "000001.SZ", start_date="20240101")
+    assert len(listed) == 2
+
+    _touch_part(tmp_path, "000001.SZ", 2024, "part-b.parquet")
+    files = partition_files(tmp_path, "000001.SZ", start_date="20240101")
+
+    assert len(listed) == 3
+    assert len(files) == 2
+
+
+def test_list_daily_limit_falls_back_when_newest_years_are_short(monkeypatch, tmp_path) -> None:
+    clear_partition_cache()
+    duckdb.connect(str(tmp_path / "quant.duckdb")).close()
+    monkeypatch.setattr("app.data.duckdb_store.settings.data_dir", tmp_path)
+    monkeypatch.setattr("app.data.duckdb_store.settings.duckdb_path", tmp_path / "quant.duckdb")
+    # Newest-year reads of 1 (limit=2) and 2 (limit=5) years both come back short.
+    monkeypatch.setattr(partition_paths, "_MIN_ROWS_PER_YEAR", 4)
+    daily_root = tmp_path / "raw" / "daily"
+    dates = ["20220103", "20220104", "20220105", "20230103", "20230104", "20240102"]
+    for trade_date in dates:
+        path = _touch_part(daily_root, "000001.SZ", int(trade_date[:4]), f"part-{trade_date}.parquet")
+        pd.DataFrame(
+            {
+                "ts_code": ["000001.SZ"],
+                "trade_date": [trade_date],
+                **{column: [1.0] for column in ["open", "high", "low", "close", "vol", "amount"]},
+            }
+        ).to_parquet(path, index=False)
+    close_read_connection()
+
+    try:
+        recent = duckdb_store.list_daily("000001.SZ", limit=2)
+        longer = duckdb_store.list_daily("000001.SZ", limit=5)
+        everything = duckdb_store.list_daily("000001.SZ")
+    finally:
+        close_read_connection()
+
+    assert [row["trade_date"] for row in recent] == dates[-2:]
+    assert [row["trade_date"] for row in longer] == dates[-5:]
+    assert [row["trade_date"] for row in everything] == dates
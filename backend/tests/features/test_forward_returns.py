@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import math
+
+import duckdb
+import pandas as pd
+
+from app.data.duckdb_store import close_read_connection
+from app.features import forward_returns
+from app.features.forward_returns import compute_forward_returns, load_forward_returns
+
+
+def _prices() -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {"ts_code": "000002.SZ", "trade_date": "20240102", "open": 5.0, "close": 5.0, "adj_factor": 1.0},
+            {"ts_code": "000001.SZ", "trade_date": "20240103", "open": 11.0, "close": 11.0, "adj_factor": None},
+            {"ts_code": "000001.SZ", "trade_date": "20240102", "open": 10.0, "close": 10.0, "adj_factor": 1.0},
+            {"ts_code": "000001.SZ", "trade_date": "20240104", "open": 6.0, "close": 6.5, "adj_factor": 2.0},
+            {"ts_code": "000002.SZ", "trade_date": "20240103", "open": 5.5, "close": 6.0, "adj_factor": 1.0},
+        ]
+    )
+
+
+def test_compute_forward_returns_is_per_stock_and_adjusted() -> None:
+    result = compute_forward_returns(_prices()).set_index(["ts_code", "trade_date"])
+
+    assert result.loc[("000001.SZ", "20240102"), "ret_cc_1d"] == 10.0
+    # adj_factor doubles on 20240104, so the raw halving in price is a +18.18% adjusted move.
+    assert result.loc[("000001.SZ", "20240103"), "ret_cc_1d"] == round((13.0 / 11.0 - 1) * 100, 4)
+    assert result.loc[("000001.SZ", "20240102"), "ret_oo_1d"] == round((12.0 / 11.0 - 1) * 100, 4)
+    assert result.loc[("000002.SZ", "20240102"), "ret_cc_1d"] == 20.0
+    assert math.isnan(result.loc[("000002.SZ", "20240103"), "ret_cc_1d"])
+    assert math.isnan(result.loc[("000001.SZ", "20240102"), "ret_cc_3d"])
+
+
+def test_build_and_load_forward_returns_by_date_range_and_codes(monkeypatch, tmp_path) -> None:
+    duckdb.connect(str(tmp_path / "quant.duckdb")).close()
+    monkeypatch.setattr("app.features.forward_returns.settings.data_dir", tmp_path)
+    monkeypatch.setattr("app.data.duckdb_store.settings.duckdb_path", tmp_path / "quant.duckdb")
+    monkeypatch.setattr(forward_returns, "_load_price_panel", lambda start_date, end_date: _prices())
+    close_read_connection()
+
+    try:
+        written = forward_returns.build_forward_returns_for_year("2024")
+        frame = load_forward_returns(
+            start_date="20240102",
+            end_date="20240102",
+            ts_codes=["000001.SZ"],
+            horizons=[1],
+            bases=["cc"],
+        )
+    finally:
+        close_read_connection()
+
+    assert written == 5
+    assert list(frame.columns) == ["ts_code", "trade_date", "ret_cc_1d"]
+    assert frame.to_dict(orient="records") == [{"ts_code": "000001.SZ", "trade_date": "20240102", "ret_cc_1d": 10.0}]
+
+
+def test_years_touched_by_sync_includes_previous_year_near_january() -> None:
+    assert forward_returns.years_touched_by_sync("20250106", "20250106") == ["2024", "2025"]
+    assert forward_returns.years_touched_by_sync("20250606", "20250606") == ["2025"]
+
+
+def test_price_panel_only_opens_partitions_of_the_requested_years(monkeypatch, tmp_path) -> None:
+    duckdb.connect(str(tmp_path / "quant.duckdb")).close()
+    monkeypatch.setattr("app.features.forward_returns.settings.data_dir", tmp_path)
+    monkeypatch.setattr("app.data.duckdb_store.settings.duckdb_path", tmp_path / "quant.duckdb")
+    prices = _prices()
+    for dataset, columns in (("daily", ["ts_code", "trade_date", "open", "close"]), ("adj_factor", ["ts_code", "trade_date", "adj_factor"])):
+        for ts_code, rows in prices.groupby("ts_code"):
+            partition = tmp_path / "raw" / dataset / f"ts_code={ts_code}" / "year=2024"
+            partition.mkdir(parents=True)
+            rows[columns].drop(columns="ts_code").to_parquet(partition / "part-0.parquet", index=False)
+        stale = tmp_path / "raw" / dataset / "ts_code=000001.SZ" / "year=2010"
+        stale.mkdir(parents=True)
+        (stale / "part-0.parquet").write_bytes(b"not parquet")
+    close_read_connection()
+
+    try:
+        panel = forward_returns._load_price_panel(start_date="20240101", end_date="20240131")
+    finally:
+        close_read_connection()
+
+    assert len(panel) == 5
+    assert set(panel["ts_code"]) == {"000001.SZ", "000002.SZ"}
+
+
+def test_load_forward_returns_warns_when_the_store_is_missing(monkeypatch, tmp_path, caplog) -> None:
+    monkeypatch.setattr("app.features.forward_returns.settings.data_dir", tmp_path)
+
+    with caplog.at_level("WARNING", logger="app.features.forward_returns"):
+        frame = load_forward_returns(start_date="20240102", end_date="20240131", horizons=[1], bases=["cc"])
+
+    assert frame.empty
+    assert "build_forward_returns.py" in caplog.text
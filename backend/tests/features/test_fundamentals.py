@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import duckdb
+import pandas as pd
+import pytest
+
+from app.data.duckdb_store import close_read_connection
+from app.features.fundamentals import attach_fundamentals, build_fundamentals_pit, build_pit_index
+from app.quant import factors_stock
+
+# 000001.SZ: Q3 report, then FY2023, a late restatement of Q3, 2024Q1 and a restatement of 2024Q1.
+_REPORTS = pd.DataFrame(
+    [
+        {"ts_code": "000001.SZ", "ann_date": "20231025", "f_ann_date": "20231025", "end_date": "20230930", "roe": 6.0},
+        {"ts_code": "000001.SZ", "ann_date": "20240320", "f_ann_date": "20240320", "end_date": "20231231", "roe": 10.0},
+        {"ts_code": "000001.SZ", "ann_date": "20240410", "f_ann_date": "20240410", "end_date": "20230930", "roe": 99.0},
+        {"ts_code": "000001.SZ", "ann_date": "20240425", "f_ann_date": "20240425", "end_date": "20240331", "roe": 3.0},
+        {"ts_code": "000001.SZ", "ann_date": "20240520", "f_ann_date": "20240520", "end_date": "20240331", "roe": 4.0},
+        {"ts_code": "600000.SH", "ann_date": "20240415", "f_ann_date": None, "end_date": "20231231", "roe": 8.0},
+    ]
+)
+
+_EXPECTED = [
+    ("000001.SZ", "20231024", None, None),
+    ("000001.SZ", "20231025", 6.0, "20230930"),
+    ("000001.SZ", "20240319", 6.0, "20230930"),
+    ("000001.SZ", "20240320", 10.0, "20231231"),
+    ("000001.SZ", "20240410", 10.0, "20231231"),
+    ("000001.SZ", "20240424", 10.0, "20231231"),
+    ("000001.SZ", "20240425", 3.0, "20240331"),
+    ("000001.SZ", "20240519", 3.0, "20240331"),
+    ("000001.SZ", "20240520", 4.0, "20240331"),
+    ("600000.SH", "20240414", None, None),
+    ("600000.SH", "20240415", 8.0, "20231231"),
+]
+
+
+def test_pit_index_keeps_latest_known_period_per_announcement() -> None:
+    index = build_pit_index(_REPORTS, ["roe"])
+
+    assert index["ts_code"].tolist() == ["000001.SZ"] * 4 + ["600000.SH"]
+    assert index["f_ann_date"].tolist() == ["20231025", "20240320", "20240425", "20240520", "20240415"]
+    assert 99.0 not in index["roe"].tolist()
+
+
+def test_asof_join_never_reads_ahead_of_announcement(monkeypatch, tmp_path) -> None:
+    duckdb.connect(str(tmp_path / "quant.duckdb")).close()
+    monkeypatch.setattr("app.features.fundamentals.settings.data_dir", tmp_path)
+    monkeypatch.setattr("app.data.duckdb_store.settings.duckdb_path", tmp_path / "quant.duckdb")
+    for (ts_code, year), group in _REPORTS.assign(year=_REPORTS["end_date"].str[:4]).groupby(["ts_code", "year"]):
+        partition = tmp_path / "raw" / "fina_indicator" / f"ts_code={ts_code}" / f"year={year}"
+        partition.mkdir(parents=True)
+        group.drop(columns=["year"]).assign(report_type="1").to_parquet(partition / "part-a.parquet", index=False)
+    panel = pd.DataFrame(
+        {
+            "ts_code": [item[0] for item in _EXPECTED][::-1],
+            "trade_date": [item[1] for item in _EXPECTED][::-1],
+            "close": range(len(_EXPECTED)),
+        }
+    )
+    close_read_connection()
+
+    try:
+        counts = build_fundamentals_pit(["fina_indicator"])
+        result = attach_fundamentals(panel, fields=["roe", "eps"])
+        single_date = attach_fundamentals(panel.iloc[[0, -1]], fields=["roe"], trade_date="20240420")
+    finally:
+        close_read_connection()
+
+    assert counts == {"fina_indicator": 5}
+    assert result["close"].tolist() == list(range(len(_EXPECTED)))
+    for row, (ts_code, trade_date, roe, period) in zip(result.to_dict(orient="records"), _EXPECTED[::-1]):
+        assert (row["ts_code"], row["trade_date"]) == (ts_code, trade_date)
+        assert (None if pd.isna(row["roe"]) else row["roe"]) == roe, trade_date
+        assert (None if pd.isna(row["fina_indicator_end_date"]) else row["fina_indicator_end_date"]) == period
+        assert pd.isna(row["eps"])
+    assert single_date["roe"].tolist() == [8.0, 10.0]
+
+
+def test_attach_rejects_unknown_fields() -> None:
+    with pytest.raises(ValueError, match="unsupported fundamental field"):
+        attach_fundamentals(pd.DataFrame(columns=["ts_code", "trade_date"]), fields=["pe_lyr"])
+
+
+def test_value_quality_uses_fundamentals_only_when_attached() -> None:
+    frame = pd.DataFrame({"ts_code": ["A", "B"], "pe_ttm": [10.0, 10.0], "pb": [1.0, 1.0]})
+
+    plain = factors_stock._value_quality_score(frame)
+    with_fundamentals = factors_stock._value_quality_score(frame.assign(roe=[20.0, 5.0], debt_to_assets=[30.0, 30.0]))
+
+    assert plain[0] == plain[1]
+    assert with_fundamentals[0] > with_fundamentals[1]
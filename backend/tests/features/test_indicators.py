@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data.duckdb_store import close_read_connection
+from app.features import indicators
+from app.features.indicators import INDICATOR_COLUMNS, compute_indicators
+
+_COMPARED = [
+    "close_qfq",
+    "ma5",
+    "ma20",
+    "ma60",
+    "macd",
+    "macd_signal",
+    "macd_hist",
+    "kdj_k",
+    "kdj_d",
+    "kdj_j",
+    "boll_upper",
+    "boll_middle",
+    "boll_lower",
+    "rsi6",
+    "rsi12",
+    "rsi24",
+    "atr",
+    "cci",
+    "wr",
+    "wr1",
+    "updays",
+    "downdays",
+]
+
+
+def _prices(days: int = 90) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range("2024-01-01", periods=days).strftime("%Y%m%d")
+    frames = []
+    for code, adj_step in [("000001.SZ", 1.3), ("600000.SH", 1.0)]:
+        close = 10.0 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+        adj = np.where(np.arange(days) >= days // 2, adj_step, 1.0)
+        raw_close = np.round(close / adj, 2)
+        frame = pd.DataFrame(
+            {
+                "ts_code": code,
+                "trade_date": dates,
+                "close": raw_close,
+                "high": np.round(raw_close * (1 + rng.uniform(0, 0.03, days)), 2),
+                "low": np.round(raw_close * (1 - rng.uniform(0, 0.03, days)), 2),
+                "adj_factor": adj,
+            }
+        )
+        if code == "600000.SH":
+            frame = frame.drop(index=[10, 11, 40])
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _reference_row(history: pd.DataFrame) -> dict[str, float]:
+    """TDX-style formulas on one stock's qfq series rebased to the last row's adj_factor."""
+    scale = history["adj_factor"] / history["adj_factor"].iloc[-1]
+    close, high, low = history["close"] * scale, history["high"] * scale, history["low"] * scale
+    prev = close.shift(1)
+
+    def sma(series: pd.Series, n: int) -> pd.Series:
+        return series.ewm(alpha=1.0 / n, adjust=False).mean()
+
+    dif = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    dea = dif.ewm(span=9, adjust=False).mean()
+    rsv = (close - low.rolling(9, min_periods=1).min()) / (
+        high.rolling(9, min_periods=1).max() - low.rolling(9, min_periods=1).min()
+    ) * 100
+    k = sma(rsv, 3)
+    d = sma(k, 3)
+    mid = close.rolling(20).mean()
+    std = close.rolling(20).std(ddof=0)
+    tr = pd.concat([high - low, (prev - high).abs(), (prev - low).abs()], axis=1).max(axis=1, skipna=False)
+    typical = (high + low + close) / 3
+    avedev = typical.rolling(14).apply(lambda x: np.abs(x - x.mean()).mean(), raw=True)
+    change = close.diff()
+    row = {
+        "close_qfq": close.iloc[-1],
+        "ma5": close.rolling(5).mean().iloc[-1],
+        "ma20": mid.iloc[-1],
+        "ma60": close.rolling(60).mean().iloc[-1],
+        "macd": dif.iloc[-1],
+        "macd_signal": dea.iloc[-1],
+        "macd_hist": 2 * (dif - dea).iloc[-1],
+        "kdj_k": k.iloc[-1],
+        "kdj_d": d.iloc[-1],
+        "kdj_j": 3 * k.iloc[-1] - 2 * d.iloc[-1],
+        "boll_upper": (mid + 2 * std).iloc[-1],
+        "boll_middle": mid.iloc[-1],
+        "boll_lower": (mid - 2 * std).iloc[-1],
+        "atr": tr.rolling(20).mean().iloc[-1],
+        "cci": ((typical - typical.rolling(14).mean()) / (0.015 * avedev)).iloc[-1],
+    }
+    for n in (6, 12, 24):
+        row[f"rsi{n}"] = (sma(change.clip(lower=0), n) / sma(change.abs(), n) * 100).iloc[-1]
+    for name, n in (("wr", 10), ("wr1", 6)):
+        highest = high.rolling(n, min_periods=1).max()
+        lowest = low.rolling(n, min_periods=1).min()
+        row[name] = ((highest - close) / (highest - lowest) * 100).iloc[-1]
+    signs = np.sign(change.fillna(0).to_numpy())
+    for name, sign in (("updays", 1), ("downdays", -1)):
+        run = 0
+        for value in signs[::-1]:
+            if value != sign:
+                break
+            run += 1
+        row[name] = run
+    return row
+
+
+def test_indicators_match_reference_formulas_per_row() -> None:
+    prices = _prices()
+    rows, state = compute_indicators(prices)
+
+    assert len(rows) == len(prices)
+    assert sorted(state["ts_code"]) == ["000001.SZ", "600000.SH"]
+    indexed = rows.set_index(["ts_code", "trade_date"])
+    for code, history in prices.groupby("ts_code"):
+        history = history.sort_values("trade_date").reset_index(drop=True)
+        for end in [0, 8, 30, len(history) // 2, len(history) - 1]:
+            expected = _reference_row(history.iloc[: end + 1])
+            actual = indexed.loc[(code, history.loc[end, "trade_date"])]
+            for column in _COMPARED:
+                np.testing.assert_allclose(
+                    actual[column], expected[column], rtol=1e-9, atol=1e-9, err_msg=f"{code} {end} {column}"
+                )
+
+
+def test_constant_prices_give_flat_indicators() -> None:
+    prices = pd.DataFrame(
+        {
+            "ts_code": "000001.SZ",
+            "trade_date": pd.bdate_range("2024-01-01", periods=30).strftime("%Y%m%d"),
+            "close": 5.0,
+            "high": 5.0,
+            "low": 5.0,
+            "adj_factor": 2.0,
+        }
+    )
+    last = compute_indicators(prices)[0].iloc[-1]
+
+    assert last["ma20"] == pytest.approx(5.0)
+    assert last["macd"] == pytest.approx(0.0)
+    assert last["boll_upper"] == pytest.approx(5.0)
+    assert last["atr"] == pytest.approx(0.0)
+    assert last["updays"] == 0 and last["downdays"] == 0
+
+
+def test_incremental_run_continues_from_state() -> None:
+    prices = _prices()
+    full_rows, full_state = compute_indicators(prices)
+    cutoff = sorted(prices["trade_date"].unique())[60]
+
+    _, head_state = compute_indicators(prices[prices["trade_date"] <= cutoff])
+    tail_rows, tail_state = compute_indicators(prices, state=head_state)
+
+    expected = full_rows[full_rows["trade_date"] > cutoff].reset_index(drop=True)
+    pd.testing.assert_frame_equal(tail_rows, expected, rtol=1e-9, atol=1e-9)
+    pd.testing.assert_frame_equal(tail_state, full_state, rtol=1e-9, atol=1e-9)
+
+
+def test_build_indicators_extends_stateful_stocks_and_bootstraps_new_ones(monkeypatch, tmp_path) -> None:
+    prices = _prices()
+    dates = sorted(prices["trade_date"].unique())
+    cutoff, end_date = dates[60], dates[-1]
+    _, head_state = compute_indicators(prices[(prices["trade_date"] <= cutoff) & (prices["ts_code"] == "000001.SZ")])
+    monkeypatch.setattr("app.features.indicators.settings.data_dir", tmp_path)
+    indicators.save_indicator_state(head_state)
+    loads: list[tuple[str, tuple[str, ...]]] = []
+
+    def fake_load(*, start_date: str, end_date: str, ts_codes) -> pd.DataFrame:
+        loads.append((start_date, tuple(ts_codes)))
+        mask = prices["ts_code"].isin(ts_codes) & prices["trade_date"].between(start_date, end_date)
+        return prices[mask]
+
+    monkeypatch.setattr(indicators, "_list_codes_with_rows", lambda **kwargs: ["000001.SZ", "600000.SH"])
+    monkeypatch.setattr(indicators, "_load_price_rows", fake_load)
+    basic = pd.DataFrame({"ts_code": ["000001.SZ"], "trade_date": [end_date]})
+    basic[indicators.DAILY_BASIC_COLUMNS] = 1.0
+    basic["pe"] = 12.5
+    monkeypatch.setattr(indicators, "_load_daily_basic", lambda **kwargs: basic)
+
+    rows, state = indicators.build_indicators(start_date=dates[80], end_date=end_date)
+
+    assert [codes for _, codes in loads] == [("000001.SZ",), ("600000.SH",)]
+    assert loads[1][0] == indicators.FULL_HISTORY_START
+    assert list(rows.columns) == INDICATOR_COLUMNS
+    stateful = rows[rows["ts_code"] == "000001.SZ"]
+    assert stateful["trade_date"].min() == dates[61]
+    assert rows[rows["ts_code"] == "600000.SH"]["trade_date"].min() >= dates[80]
+    assert stateful.set_index("trade_date").loc[end_date, "pe"] == 12.5
+    assert set(state["ts_code"]) == {"000001.SZ", "600000.SH"}
+    assert set(state["trade_date"]) == {end_date}
+
+
+def test_build_indicators_backfills_stocks_whose_state_is_past_the_range(monkeypatch, tmp_path) -> None:
+    prices = _prices()
+    dates = sorted(prices["trade_date"].unique())
+    start_date, end_date = dates[40], dates[50]
+    full_rows, full_state = compute_indicators(prices)
+    monkeypatch.setattr("app.features.indicators.settings.data_dir", tmp_path)
+    indicators.save_indicator_state(full_state)
+
+    def fake_load(*, start_date: str, end_date: str, ts_codes) -> pd.DataFrame:
+        mask = prices["ts_code"].isin(ts_codes) & prices["trade_date"].between(start_date, end_date)
+        return prices[mask]
+
+    monkeypatch.setattr(indicators, "_list_codes_with_rows", lambda **kwargs: ["000001.SZ", "600000.SH"])
+    monkeypatch.setattr(indicators, "_load_price_rows", fake_load)
+    basic = pd.DataFrame(columns=["ts_code", "trade_date", *indicators.DAILY_BASIC_COLUMNS])
+    monkeypatch.setattr(indicators, "_load_daily_basic", lambda **kwargs: basic)
+
+    rows, state = indicators.build_indicators(start_date=start_date, end_date=end_date)
+
+    expected = full_rows[full_rows["trade_date"].between(start_date, end_date)]
+    assert len(rows) == len(expected) > 0
+    merged = rows.merge(expected, on=["ts_code", "trade_date"], suffixes=("", "_expected"))
+    assert merged["macd"].to_numpy() == pytest.approx(merged["macd_expected"].to_numpy())
+    pd.testing.assert_frame_equal(state.reset_index(drop=True), indicators.load_indicator_state().reset_index(drop=True))
+
+
+def test_raw_loaders_only_open_partitions_of_the_requested_years(monkeypatch, tmp_path) -> None:
+    duckdb.connect(str(tmp_path / "quant.duckdb")).close()
+    monkeypatch.setattr("app.features.indicators.settings.data_dir", tmp_path)
+    monkeypatch.setattr("app.data.duckdb_store.settings.duckdb_path", tmp_path / "quant.duckdb")
+    dates = ["20240102", "20240103"]
+    datasets = {
+        "daily": pd.DataFrame({"trade_date": dates, "high": [10.5, 11.0], "low": [9.5, 10.0], "close": [10.0, 10.8]}),
+        "adj_factor": pd.DataFrame({"trade_date": dates, "adj_factor": [1.0, 1.0]}),
+        "daily_basic": pd.DataFrame({"trade_date": dates, **{name: [1.0, 2.0] for name in indicators.DAILY_BASIC_COLUMNS}}),
+    }
+    for dataset, frame in datasets.items():
+        for ts_code in ("000001.SZ", "600000.SH"):
+            partition = tmp_path / "raw" / dataset / f"ts_code={ts_code}" / "year=2024"
+            partition.mkdir(parents=True)
+            frame.to_parquet(partition / "part-0.parquet", index=False)
+            stale = tmp_path / "raw" / dataset / f"ts_code={ts_code}" / "year=2010"
+            stale.mkdir(parents=True)
+            (stale / "part-0.parquet").write_bytes(b"not parquet")
+    close_read_connection()
+
+    try:
+        codes = indicators._list_codes_with_rows(start_date="20240101", end_date="20240131")
+        prices = indicators._load_price_rows(start_date="20240101", end_date="20240131")
+        basic = indicators._load_daily_basic(start_date="20240101", end_date="20240131", ts_codes=["600000.SH"])
+    finally:
+        close_read_connection()
+
+    assert codes == ["000001.SZ", "600000.SH"]
+    assert len(prices) == 4
+    assert prices["adj_factor"].eq(1.0).all()
+    assert basic["ts_code"].tolist() == ["600000.SH", "600000.SH"]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import duckdb
+import pandas as pd
+import pytest
+
+from app.data.duckdb_store import close_read_connection
+from app.features import market_breadth
+from app.signals import market_regime
+
+
+class _FakeCursor(list):
+    def sort(self, key, direction=1):
+        return _FakeCursor(sorted(self, key=lambda doc: doc[key], reverse=direction == -1))
+
+
+class _FakeIndexCollection:
+    def __init__(self, docs: list[dict]) -> None:
+        self.docs = docs
+        self.queries: list[dict] = []
+
+    def find(self, query: dict, projection: dict | None = None) -> _FakeCursor:
+        self.queries.append(query)
+        bounds = query["trade_date"]
+        return _FakeCursor(
+            {"trade_date": doc["trade_date"], "close": doc["close"]}
+            for doc in self.docs
+            if bounds["$gte"] <= doc["trade_date"] <= bounds["$lte"]
+        )
+
+
+def _write(tmp_path, dataset: str, frame: pd.DataFrame) -> None:
+    for (ts_code, year), group in frame.assign(year=frame["trade_date"].str[:4]).groupby(["ts_code", "year"]):
+        partition = tmp_path / "raw" / dataset / f"ts_code={ts_code}" / f"year={year}"
+        partition.mkdir(parents=True, exist_ok=True)
+        group.drop(columns=["year"]).to_parquet(partition / "part-a.parquet", index=False)
+
+
+@pytest.fixture
+def breadth_store(monkeypatch, tmp_path):
+    duckdb.connect(str(tmp_path / "quant.duckdb")).close()
+    monkeypatch.setattr("app.features.market_breadth.settings.data_dir", tmp_path)
+    monkeypatch.setattr("app.data.duckdb_store.settings.duckdb_path", tmp_path / "quant.duckdb")
+    dates = pd.bdate_range("2023-01-02", periods=300).strftime("%Y%m%d").tolist()
+    rows = []
+    for idx, trade_date in enumerate(dates):
+        # A: steady riser (new high every day once the window is full); B: steady faller; C: flat, listed late.
+        rows.append({"ts_code": "A.SZ", "trade_date": trade_date, "close": 10.0 + idx, "pct_chg": 1.0})
+        rows.append({"ts_code": "B.SZ", "trade_date": trade_date, "close": 500.0 - idx, "pct_chg": -1.0})
+        if idx >= 200:
+            rows.append({"ts_code": "C.SZ", "trade_date": trade_date, "close": 5.0, "pct_chg": 0.0})
+    daily = pd.DataFrame(rows)
+    _write(tmp_path, "daily", daily)
+    limits = daily[daily["ts_code"] == "A.SZ"].assign(up_limit=lambda frame: frame["close"], down_limit=1.0)
+    _write(tmp_path, "daily_limit", limits[["ts_code", "trade_date", "up_limit", "down_limit"]])
+    index_docs = [{"trade_date": trade_date, "close": 100.0 + idx} for idx, trade_date in enumerate(dates)]
+    collection = _FakeIndexCollection(index_docs)
+    monkeypatch.setattr(market_breadth, "get_collection", lambda name: collection)
+    close_read_connection()
+    yield dates, collection
+    close_read_connection()
+
+
+def test_breadth_rows_match_per_date_counts(breadth_store) -> None:
+    dates, collection = breadth_store
+
+    written = market_breadth.build_market_breadth(dates[260], dates[-1])
+    rows = market_breadth.load_market_breadth(dates[0], dates[-1])
+
+    assert written == len(dates) - 260
+    assert sorted(rows) == dates[260:]
+    last = rows[dates[-1]]
+    assert (last["total"], last["up"], last["down"], last["flat"]) == (3, 1, 1, 1)
+    assert (last["limit_up"], last["limit_down"], last["new_high"]) == (1, 0, 1)
+    assert last["new_high_share"] == pytest.approx(1 / 3)
+    assert last["index_ret_20d"] == pytest.approx((399.0 / 378.0 - 1) * 100)
+    assert last["index_ret_60d"] == pytest.approx((399.0 / 338.0 - 1) * 100)
+    assert len(collection.queries) == 1
+
+
+def test_partial_rebuild_keeps_other_dates(breadth_store) -> None:
+    dates, _ = breadth_store
+
+    market_breadth.build_market_breadth(dates[250], dates[280])
+    market_breadth.build_market_breadth(dates[270], dates[-1])
+
+    assert sorted(market_breadth.load_market_breadth(dates[0], dates[-1])) == dates[250:]
+
+
+def test_regime_scores_from_breadth_row_without_live_queries(monkeypatch) -> None:
+    idx = {"trade_date": "20240105", "close": 3000.0, "pct_change": 0.5}
+
+    class _Db(dict):
+        def __getitem__(self, name):
+            return self
+
+        def find_one(self, query):
+            return idx
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("live breadth/momentum query used")
+
+    monkeypatch.setattr(market_regime, "_compute_breadth", _fail)
+    monkeypatch.setattr(market_regime, "_compute_momentum", _fail)
+    row = {"total": 100, "up": 80, "down": 15, "limit_up": 12, "new_high_share": 0.05, "index_ret_20d": 6.0, "index_ret_60d": -9.0}
+
+    result = market_regime.compute_market_regime("20240105", _Db(), breadth_row=row)
+
+    assert result.breadth_score == 2.0
+    assert result.breadth_detail["up_ratio"] == 0.8
+    assert result.breadth_detail["limit_up"] == 12
+    assert result.momentum_score == 0.0
+    assert result.momentum_detail == {"pct_20d": 6.0, "pct_60d": -9.0}
+
+
+def test_breadth_counts_skip_partitions_outside_the_lookback(breadth_store, tmp_path) -> None:
+    dates, _ = breadth_store
+    for dataset in ("daily", "daily_limit"):
+        stale = tmp_path / "raw" / dataset / "ts_code=A.SZ" / "year=2010"
+        stale.mkdir(parents=True)
+        (stale / "part-a.parquet").write_bytes(b"not parquet")
+
+    assert market_breadth.build_market_breadth(dates[-1], dates[-1]) == 1
+
+
+def test_regime_reads_the_breadth_store_under_its_data_dir(breadth_store, monkeypatch, tmp_path) -> None:
+    dates, _ = breadth_store
+    market_breadth.build_market_breadth(dates[-1], dates[-1])
+    monkeypatch.setattr("app.features.market_breadth.settings.data_dir", tmp_path / "elsewhere")
+    idx = {"trade_date": dates[-1], "close": 3000.0}
+
+    class _Db(dict):
+        def __getitem__(self, name):
+            return self
+
+        def find_one(self, query):
+            return idx
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("live breadth/momentum query used")
+
+    monkeypatch.setattr(market_regime, "_compute_breadth", _fail)
+    monkeypatch.setattr(market_regime, "_compute_momentum", _fail)
+
+    result = market_regime.compute_market_regime(dates[-1], _Db(), data_dir=str(tmp_path))
+
+    assert result.breadth_detail["total"] == 3
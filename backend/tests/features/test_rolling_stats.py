@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from app.data.duckdb_store import close_read_connection
+from app.features import rolling_stats
+from app.features.rolling_stats import compute_rolling_stats, load_rolling_stats_for_date
+from app.schemas.stock_daily_stats import StockDailyStatsScreenRequest
+from app.services import stock_daily_stats_service as service
+from app.services.stock_daily_stats_service import compute_stock_daily_stats_frame
+
+_DATES = [f"202401{day:02d}" for day in range(1, 31)]
+
+
+def _daily() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    rows = []
+    for code in ["000001.SZ", "000002.SZ", "600000.SH"]:
+        close = 10.0 + np.round(np.cumsum(rng.integers(-2, 3, len(_DATES))) * 0.1, 2)
+        pre_close = np.r_[10.0, close[:-1]]
+        for idx, trade_date in enumerate(_DATES):
+            if code == "600000.SH" and idx in (20, 29):
+                continue
+            rows.append(
+                {
+                    "ts_code": code,
+                    "trade_date": trade_date,
+                    "close": close[idx],
+                    "pre_close": pre_close[idx],
+                    "pct_chg": None,
+                    "amount": float(100 + idx),
+                    "adj_factor": 1.0,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def test_window_stats_match_screen_kernel() -> None:
+    daily = _daily()
+    stats = compute_rolling_stats(daily).set_index(["ts_code", "trade_date"])
+    trade_dates = _DATES[-10:]
+    expected = compute_stock_daily_stats_frame(
+        daily[daily["ts_code"] != "600000.SH"],
+        trade_dates=trade_dates,
+        basics_by_code={},
+        start_date=trade_dates[0],
+        end_date=trade_dates[-1],
+    )
+
+    for item in expected.to_dict(orient="records"):
+        row = stats.loc[(item["ts_code"], trade_dates[-1])]
+        assert row["trade_days_10d"] == item["trade_days"]
+        assert row["first_date_10d"] == trade_dates[0]
+        assert row["up_days_10d"] == item["up_days"]
+        assert row["flat_days_10d"] == item["flat_days"]
+        assert row["max_up_streak_10d"] == item["max_up_streak"]
+        assert row["max_down_streak_10d"] == item["max_down_streak"]
+        assert np.isclose(row["ret_10d"], item["pct_change"])
+        assert np.isclose(row["avg_amount_10d"], item["avg_amount"])
+
+
+def test_streaks_and_drawdown_follow_own_trading_rows() -> None:
+    daily = pd.DataFrame(
+        {
+            "ts_code": ["000001.SZ"] * 5,
+            "trade_date": _DATES[:5],
+            "close": [11.0, 12.0, 9.0, 10.0, 11.0],
+            "pre_close": [10.0, 11.0, 12.0, 9.0, 10.0],
+            "pct_chg": [None] * 5,
+            "amount": [1.0] * 5,
+        }
+    )
+    row = compute_rolling_stats(daily).iloc[-1]
+
+    assert row["up_streak"] == 2
+    assert row["down_streak"] == 0
+    assert row["trade_days_60d"] == 5
+    assert row["max_up_streak_5d"] == 2
+    assert np.isclose(row["max_drawdown_5d"], 25.0)
+
+
+def test_build_replaces_only_requested_dates(monkeypatch, tmp_path) -> None:
+    duckdb.connect(str(tmp_path / "quant.duckdb")).close()
+    monkeypatch.setattr("app.features.rolling_stats.settings.data_dir", tmp_path)
+    monkeypatch.setattr("app.data.duckdb_store.settings.duckdb_path", tmp_path / "quant.duckdb")
+    loads: list[tuple[str, str]] = []
+
+    def fake_load(*, start_date: str, end_date: str) -> pd.DataFrame:
+        loads.append((start_date, end_date))
+        daily = _daily()
+        return daily[(daily["trade_date"] >= start_date) & (daily["trade_date"] <= end_date)]
+
+    monkeypatch.setattr(rolling_stats, "_load_daily_panel", fake_load)
+    close_read_connection()
+
+    try:
+        rolling_stats.build_rolling_stats("20240101", "20240129")
+        written = rolling_stats.build_rolling_stats("20240130", "20240130")
+        frame = load_rolling_stats_for_date("20240130", window=10, ts_codes=["000001.sz"])
+        all_rows = pd.read_parquet(tmp_path / "features" / "rolling_stats" / "year=2024" / "part-0.parquet")
+    finally:
+        close_read_connection()
+
+    assert written == 2
+    assert loads[-1] == ("20230922", "20240130")
+    assert len(all_rows) == len(_daily())
+    assert frame["ts_code"].tolist() == ["000001.SZ"]
+    assert frame.loc[0, "trade_days_10d"] == 10
+    assert "ret_20d" not in frame.columns
+
+
+def test_screen_uses_store_and_recomputes_incomplete_windows(monkeypatch) -> None:
+    daily = _daily()
+    trade_dates = _DATES[-10:]
+    stored = compute_rolling_stats(daily)
+    loaded_codes: list[list[str]] = []
+
+    def fake_load_daily(*, start_date: str, end_date: str, ts_codes) -> pd.DataFrame:
+        codes = sorted(ts_codes)
+        loaded_codes.append(codes)
+        mask = daily["ts_code"].isin(codes) & daily["trade_date"].between(start_date, end_date)
+        return daily[mask]
+
+    def fake_load_store(trade_date: str, *, window: int, ts_codes) -> pd.DataFrame:
+        return stored[stored["trade_date"] == trade_date].reset_index(drop=True)
+
+    monkeypatch.setattr(
+        service,
+        "resolve_screen_trade_dates",
+        lambda request: service.ResolvedTradeDateRange(trade_dates[0], trade_dates[-1], trade_dates),
+    )
+    monkeypatch.setattr(
+        service,
+        "list_stock_basics_for_screen",
+        lambda **kwargs: [{"ts_code": code, "name": code} for code in ["000001.SZ", "000002.SZ", "600000.SH"]],
+    )
+    monkeypatch.setattr(service, "load_daily_frame_for_screen", fake_load_daily)
+    monkeypatch.setattr(service, "load_rolling_stats_for_date", fake_load_store)
+
+    payload = StockDailyStatsScreenRequest(lookback_days=10, sort_by="pct_change", page_size=50)
+    result = service.screen_stock_daily_stats(payload)
+
+    # 600000.SH is suspended on 20240121 and 20240130, so only it is read from daily rows.
+    assert loaded_codes == [["600000.SH"]]
+    expected = compute_stock_daily_stats_frame(
+        daily,
+        trade_dates=trade_dates,
+        basics_by_code={},
+        start_date=trade_dates[0],
+        end_date=trade_dates[-1],
+    ).set_index("ts_code")
+    assert result.total == 3
+    for item in result.data:
+        assert item.trade_days == expected.loc[item.ts_code, "trade_days"]
+        assert np.isclose(item.pct_change, expected.loc[item.ts_code, "pct_change"])
+        assert item.max_up_streak == expected.loc[item.ts_code, "max_up_streak"]
+
+
+def test_daily_panel_only_opens_partitions_of_the_requested_years(monkeypatch, tmp_path) -> None:
+    duckdb.connect(str(tmp_path / "quant.duckdb")).close()
+    monkeypatch.setattr("app.features.rolling_stats.settings.data_dir", tmp_path)
+    monkeypatch.setattr("app.data.duckdb_store.settings.duckdb_path", tmp_path / "quant.duckdb")
+    daily = _daily()
+    for dataset, columns in (
+        ("daily", ["trade_date", "close", "pre_close", "pct_chg", "amount"]),
+        ("adj_factor", ["trade_date", "adj_factor"]),
+    ):
+        for ts_code, rows in daily.groupby("ts_code"):
+            partition = tmp_path / "raw" / dataset / f"ts_code={ts_code}" / "year=2024"
+            partition.mkdir(parents=True)
+            rows[columns].to_parquet(partition / "part-0.parquet", index=False)
+        stale = tmp_path / "raw" / dataset / "ts_code=000001.SZ" / "year=2010"
+        stale.mkdir(parents=True)
+        (stale / "part-0.parquet").write_bytes(b"not parquet")
+    close_read_connection()
+
+    try:
+        panel = rolling_stats._load_daily_panel(start_date="20240110", end_date="20240131")
+    finally:
+        close_read_connection()
+
+    assert len(panel) == len(daily[daily["trade_date"] >= "20240110"])
+    assert panel["adj_factor"].eq(1.0).all()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from app.quant import context, engine
+from app.quant.base import StrategyContext
+from app.quant.context import DailyDataBundle
+from app.quant.profiling import EngineProfiler
+
+_OPEN_DATES = ["20240102", "20240103", "20240104", "20240105"]
+
+
+def test_profiler_accumulates_phases_and_counters() -> None:
+    profiler = EngineProfiler()
+    profiler.start()
+    profiler.switch("order_generation")
+    time.sleep(0.01)
+    profiler.switch("persist")
+    profiler.pause()
+    with profiler.phase("scoring"):
+        time.sleep(0.01)
+    profiler.count("rows_loaded", 5)
+    profiler.count("rows_loaded", 3)
+    profiler.stop()
+    profiler.stop()
+
+    summary = profiler.summary()
+    assert set(summary["phases"]) == {"order_generation", "persist", "scoring"}
+    assert summary["phases"]["scoring"]["calls"] == 1
+    assert summary["phases"]["order_generation"]["seconds"] >= 0.01
+    assert summary["counters"] == {"rows_loaded": 8}
+    assert summary["total_seconds"] >= sum(item["seconds"] for item in summary["phases"].values())
+    assert "hotspots" not in summary
+
+
+def test_profiler_captures_hotspots_on_request() -> None:
+    profiler = EngineProfiler(capture_hotspots=True)
+    profiler.start()
+    sorted(range(1000), key=lambda value: -value)
+    profiler.stop()
+
+    hotspots = profiler.summary()["hotspots"]
+    assert hotspots
+    assert {"function", "calls", "tottime", "cumtime"} <= set(hotspots[0])
+
+
+class _FlatStrategy:
+    key = "flat"
+    default_params: dict[str, Any] = {}
+
+    def score(self, context: StrategyContext) -> pd.DataFrame:
+        return context.frame.assign(total_score=90.0)
+
+
+def _bundle(
+    trade_date: str,
+    next_trade_date: str,
+    universe_df: pd.DataFrame,
+    fundamental_fields: list[str] | None = None,
+) -> DailyDataBundle:
+    frame = universe_df.assign(
+        amount=100_000.0,
+        close=10.0,
+        open=10.0,
+        ma20=10.0,
+        macd_hist=0.0,
+        kdj_k=50.0,
+        kdj_d=50.0,
+        kdj_j=50.0,
+        boll_middle=10.0,
+        boll_lower=9.0,
+        boll_upper=11.0,
+    )
+    return DailyDataBundle(
+        trade_date=trade_date,
+        next_trade_date=next_trade_date,
+        universe_df=universe_df,
+        frame_t=frame,
+        frame_t1=frame[["ts_code", "open", "close"]],
+        limit_t1=pd.DataFrame(),
+        market_factor_t={"pct_change": 0.1},
+        sector_rows_t=[],
+        shenwan_member_codes_t={},
+        citic_member_codes_t={},
+        rows_loaded=len(frame) * 2,
+        query_count=10,
+    )
+
+
+def test_bundle_counts_the_reads_it_issues(monkeypatch) -> None:
+    finds: list[str] = []
+    frame = pd.DataFrame({"ts_code": ["600000.SH"], "trade_date": ["20240102"], "close": [10.0]})
+
+    class _Collection:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def find(self, *args, **kwargs) -> list[dict[str, Any]]:
+            finds.append(self.name)
+            return []
+
+    for name in ["load_daily_for_date", "load_daily_basic_for_date", "load_indicators_for_date", "load_daily_limit_for_date"]:
+        monkeypatch.setattr(context, name, lambda *args, **kwargs: frame.copy())
+    monkeypatch.setattr(context, "list_stock_universe", lambda: frame[["ts_code"]])
+    monkeypatch.setattr(context, "get_market_factor_for_date", lambda **kwargs: None)
+    monkeypatch.setattr(context, "get_collection", _Collection)
+    monkeypatch.setattr(context, "attach_fundamentals", lambda panel, **kwargs: panel)
+
+    loaded = context.load_daily_data_bundle(trade_date="20240102", next_trade_date="20240103")
+    given = context.load_daily_data_bundle(
+        trade_date="20240102", next_trade_date="20240103", universe_df=frame[["ts_code"]], fundamental_fields=["roe"]
+    )
+
+    assert finds[:4] == ["shenwan_daily", "citic_daily", "shenwan_industry_member", "citic_industry_member"]
+    # Universe + five frame loads + market factor + four Mongo finds; then no universe load but a fundamentals join.
+    assert (loaded.query_count, given.query_count) == (11, 11)
+    assert context.load_daily_data_bundle(
+        trade_date="20240102", next_trade_date="20240103", universe_df=frame[["ts_code"]]
+    ).query_count == 10
+
+
+def _patch_engine(monkeypatch) -> list[dict[str, Any]]:
+    updates: list[dict[str, Any]] = []
+    universe = pd.DataFrame(
+        {"ts_code": ["600000.SH", "000001.SZ"], "list_date": ["20100101", "20100101"], "industry": ["银行", "银行"]}
+    )
+    monkeypatch.setattr(engine, "normalize_date", lambda value: value)
+    monkeypatch.setattr(engine, "list_open_trade_dates", lambda **kwargs: _OPEN_DATES)
+    monkeypatch.setattr(engine, "list_stock_universe", lambda: universe)
+    monkeypatch.setattr(engine, "load_daily_data_bundle", lambda **kwargs: _bundle(**kwargs))
+    monkeypatch.setattr(engine, "update_backtest_run", lambda **kwargs: updates.append(kwargs))
+    for name in [
+        "clear_backtest_run_details",
+        "upsert_backtest_nav",
+        "upsert_backtest_positions",
+        "upsert_backtest_signals",
+        "upsert_backtest_trades",
+    ]:
+        monkeypatch.setattr(engine, name, lambda *args, **kwargs: None)
+    return updates
+
+
+def test_engine_run_stores_perf_profile(monkeypatch) -> None:
+    updates = _patch_engine(monkeypatch)
+
+    config = engine.BacktestRunConfig(
+        run_id="run-1",
+        strategy_id="s",
+        strategy_version_id="v",
+        start_date=_OPEN_DATES[0],
+        end_date=_OPEN_DATES[-1],
+        params_snapshot={"use_member_sector_mapping": False, "max_positions": 1},
+    )
+    summary = engine.BacktestEngine(_FlatStrategy()).run(config)
+
+    profile = summary["perf_profile"]
+    assert updates[-1]["summary_metrics"]["perf_profile"] == profile
+    assert {"setup", "load_bundle", "filter", "sector_mapping", "scoring", "order_generation", "execution"} <= set(
+        profile["phases"]
+    )
+    assert profile["phases"]["load_bundle"]["calls"] == len(_OPEN_DATES) - 1
+    assert profile["counters"]["days_simulated"] == len(_OPEN_DATES) - 1
+    assert profile["counters"]["queries_issued"] == 10 * (len(_OPEN_DATES) - 1)
+    assert profile["counters"]["rows_loaded"] == 4 * (len(_OPEN_DATES) - 1)
+
+
+def test_engine_reports_progress_and_stops_on_cancel(monkeypatch) -> None:
+    updates = _patch_engine(monkeypatch)
+    seen: list[tuple[str, int, int]] = []
+
+    def _on_progress(current_date: str, done: int, total: int) -> None:
+        seen.append((current_date, done, total))
+        if done == 2:
+            raise engine.BacktestCancelled("run-1")
+
+    config = engine.BacktestRunConfig(
+        run_id="run-1",
+        strategy_id="s",
+        strategy_version_id="v",
+        start_date=_OPEN_DATES[0],
+        end_date=_OPEN_DATES[-1],
+        params_snapshot={"use_member_sector_mapping": False, "max_positions": 1},
+        on_progress=_on_progress,
+    )
+    with pytest.raises(engine.BacktestCancelled):
+        engine.run_backtest_with_guard(_FlatStrategy(), config)
+
+    assert seen == [(_OPEN_DATES[1], 1, 3), (_OPEN_DATES[2], 2, 3)]
+    assert updates[-1]["status"] == "cancelled"
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import math
+
+import pandas as pd
+
+from app.quant.base import StrategyContext
+from app.quant.factor_analysis import analyze_factor_panel, attach_forward_returns, build_score_panel
+
+
+def _panel() -> pd.DataFrame:
+    rows = []
+    scores = {
+        "20240102": [10.0, 20.0, 30.0, 40.0],
+        "20240103": [40.0, 30.0, 20.0, 10.0],
+        "20240104": [40.0, 30.0, 20.0, 10.0],
+    }
+    codes = ["000001.SZ", "000002.SZ", "000003.SZ", "000004.SZ"]
+    for trade_date, values in scores.items():
+        for code, score in zip(codes, values):
+            rows.append(
+                {
+                    "trade_date": trade_date,
+                    "ts_code": code,
+                    "score": score,
+                    "fwd_1d_ret": score / 1000.0,
+                    "fwd_5d_ret": -score / 1000.0 if trade_date == "20240103" else None,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def test_analyze_factor_panel_daily_metrics() -> None:
+    result = analyze_factor_panel(_panel(), horizons=(1, 5), quantiles=2, top_k=2)
+    daily = result.daily.set_index("trade_date")
+
+    assert list(daily.index) == ["20240102", "20240103", "20240104"]
+    assert daily["rank_ic_1d"].round(6).tolist() == [1.0, 1.0, 1.0]
+    assert daily.loc["20240103", "rank_ic_5d"] == -1.0
+    assert math.isnan(daily.loc["20240102", "rank_ic_5d"])
+    assert daily.loc["20240102", "long_short_1d"] == (0.035 - 0.015)
+    # Top-2 flips from {3, 4} to {1, 2}, then stays.
+    assert math.isnan(daily.loc["20240102", "top_k_turnover"])
+    assert daily.loc["20240103", "top_k_turnover"] == 1.0
+    assert daily.loc["20240104", "top_k_turnover"] == 0.0
+    assert round(daily.loc["20240103", "factor_autocorr"], 6) == -1.0
+    assert round(daily.loc["20240104", "factor_autocorr"], 6) == 1.0
+
+    horizon = result.summary["horizons"]["1"]
+    assert horizon["mean_rank_ic"] == 1.0
+    assert horizon["rank_icir"] is None
+    assert horizon["mean_quantile_ret"] == {"1": 0.015, "2": 0.035}
+    assert result.summary["horizons"]["5"]["ic_days"] == 1
+
+    # Unsuffixed report columns and summary keys follow the shortest horizon.
+    assert daily["rank_ic"].round(6).tolist() == [1.0, 1.0, 1.0]
+    assert daily["bucket_1_ret"].tolist() == [0.015] * 3
+    assert daily["top_bucket_ret"].tolist() == daily["bucket_2_ret"].tolist() == [0.035] * 3
+    assert daily["long_short_ret"].round(6).tolist() == [0.02] * 3
+    summary = result.summary
+    assert (summary["base_horizon"], summary["deciles"]) == (1, 2)
+    assert (summary["mean_top_bucket_ret"], summary["mean_bottom_bucket_ret"]) == (0.035, 0.015)
+    assert horizon["mean_top_bucket_ret"] == 0.035
+    assert math.isclose(summary["long_short_cum_return"], 1.02**3 - 1)
+    assert math.isclose(summary["top_bucket_cum_return"], 1.035**3 - 1)
+    assert math.isclose(summary["bottom_bucket_cum_return"], 1.015**3 - 1)
+
+
+def test_analyze_factor_panel_chunks_match_single_pass() -> None:
+    panel = _panel()
+    single = analyze_factor_panel(panel, horizons=(1,), quantiles=2, top_k=2)
+    chunked = analyze_factor_panel(panel, horizons=(1,), quantiles=2, top_k=2, chunk_days=2)
+
+    pd.testing.assert_frame_equal(single.daily, chunked.daily)
+    pd.testing.assert_frame_equal(single.quantile_returns, chunked.quantile_returns)
+
+
+def test_build_score_panel_and_attach_forward_returns() -> None:
+    class _Strategy:
+        key = "dummy"
+        name = "dummy"
+
+        def score(self, context: StrategyContext) -> pd.DataFrame:
+            return context.frame.assign(total_score=context.frame["close"] * 10)
+
+    panel = pd.DataFrame(
+        [
+            {"trade_date": "20240102", "ts_code": "000001.SZ", "close": 5.0},
+            {"trade_date": "20240102", "ts_code": "000002.SZ", "close": 12.0},
+            {"trade_date": "20240103", "ts_code": "000001.SZ", "close": 6.0},
+        ]
+    )
+    scores = build_score_panel(_Strategy(), panel, score_direction="reverse")
+    returns = pd.DataFrame(
+        [
+            {"ts_code": "000001.SZ", "trade_date": "20240102", "ret_cc_1d": 20.0},
+            {"ts_code": "000002.SZ", "trade_date": "20240102", "ret_cc_1d": -5.0},
+        ]
+    )
+    joined = attach_forward_returns(scores, returns, horizons=(1,))
+
+    assert scores["score"].tolist() == [50.0, 0.0, 40.0]
+    assert joined["fwd_1d_ret"].tolist()[:2] == [0.2, -0.05]
+    assert math.isnan(joined["fwd_1d_ret"].iloc[2])
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from app.quant.nav_compare import align_nav_panel, downsample_indices, nav_columns, relative_metrics
+
+
+def _rows(run_id: str, dates: list[str], navs: list[float]) -> list[dict[str, object]]:
+    return [{"run_id": run_id, "trade_date": trade_date, "nav": nav} for trade_date, nav in zip(dates, navs)]
+
+
+def test_align_nav_panel_uses_union_dates_and_fills_inside_range() -> None:
+    rows = _rows("a", ["20240102", "20240103", "20240105"], [1.0, 1.1, 1.2]) + _rows(
+        "b", ["20240103", "20240104"], [1.0, 0.9]
+    )
+
+    dates, matrix = align_nav_panel(rows, ["a", "b"])
+
+    assert dates == ["20240102", "20240103", "20240104", "20240105"]
+    assert nav_columns(matrix) == [[1.0, 1.1, 1.1, 1.2], [None, 1.0, 0.9, None]]
+
+
+def test_minmax_downsample_keeps_extremes_within_budget() -> None:
+    rng = np.random.default_rng(7)
+    matrix = np.vstack([np.cumprod(1 + rng.normal(0, 0.01, 3000)) for _ in range(3)])
+    matrix[1, 1234] = 5.0
+    matrix[2, 2222] = 0.1
+
+    keep = downsample_indices(matrix, 300, "minmax")
+
+    assert len(keep) <= 300
+    assert keep[0] == 0 and keep[-1] == 2999
+    assert {1234, 2222} <= set(keep.tolist())
+    for series in matrix:
+        assert series[keep].max() == series.max()
+        assert series[keep].min() == series.min()
+
+
+def test_lttb_downsample_returns_budget_and_keeps_spike() -> None:
+    values = np.linspace(1.0, 2.0, 5000)
+    values[2500] = 4.0
+
+    keep = downsample_indices(values[np.newaxis, :], 200, "lttb")
+
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == 4999
+    assert 2500 in keep
+    assert np.array_equal(downsample_indices(values[np.newaxis, :], None), np.arange(5000))
+
+
+def test_relative_metrics_against_first_run() -> None:
+    base_ret = np.array([0.01, -0.02, 0.015, 0.0, 0.01])
+    base = np.concatenate([[1.0], np.cumprod(1 + base_ret)])
+    same = base * 2
+    lagging = np.concatenate([[1.0], np.cumprod(1 + base_ret - 0.01)])
+    matrix = np.vstack([base, same, lagging])
+
+    same_metrics, lagging_metrics = relative_metrics(matrix, ["base", "same", "lagging"])
+
+    assert same_metrics["base_run_id"] == "base"
+    assert math.isclose(same_metrics["correlation"], 1.0)
+    assert math.isclose(same_metrics["tracking_error"], 0.0, abs_tol=1e-12)
+    assert math.isclose(same_metrics["excess_max_drawdown"], 0.0, abs_tol=1e-12)
+    assert lagging_metrics["overlap_days"] == 6
+    assert lagging_metrics["excess_return"] < 0
+    assert math.isclose(lagging_metrics["excess_max_drawdown"], lagging_metrics["excess_return"], rel_tol=1e-9)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.quant.base import MultiFactorV1Strategy, MuseCatV1Strategy, StrategyContext, score_contexts
+
+_COLUMNS = [
+    "close_qfq",
+    "ma20",
+    "ma60",
+    "macd",
+    "macd_signal",
+    "macd_hist",
+    "rsi12",
+    "kdj_k",
+    "kdj_d",
+    "kdj_j",
+    "boll_upper",
+    "boll_middle",
+    "boll_lower",
+    "pct_chg",
+    "pe_ttm",
+    "pb",
+    "amount",
+    "turnover_rate",
+    "atr",
+    "volume_ratio",
+    "sector_strength",
+]
+
+
+def _panel() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    frames = []
+    for offset, trade_date in enumerate(["20240102", "20240103", "20240104"]):
+        size = 30 + offset * 5
+        frame = pd.DataFrame(rng.normal(10.0, 3.0, size=(size, len(_COLUMNS))), columns=_COLUMNS)
+        frame["macd"] = rng.normal(0.0, 1.0, size)
+        frame["pct_chg"] = rng.normal(0.0, 4.0, size)
+        frame.loc[::7, "pe_ttm"] = np.nan
+        frame.insert(0, "ts_code", [f"{i:06d}.SZ" for i in range(size)])
+        frame.insert(0, "trade_date", trade_date)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _contexts(panel: pd.DataFrame, params: dict) -> list[StrategyContext]:
+    return [
+        StrategyContext(
+            trade_date=trade_date,
+            frame=frame.reset_index(drop=True),
+            market_regime="neutral",
+            market_exposure=1.0,
+            params=params,
+        )
+        for trade_date, frame in panel.groupby("trade_date", sort=True)
+    ]
+
+
+@pytest.mark.parametrize("strategy_cls", [MultiFactorV1Strategy, MuseCatV1Strategy])
+def test_score_panel_matches_per_date_score(strategy_cls) -> None:
+    strategy = strategy_cls()
+    panel = _panel()
+    params = {"factor_weights": {"stock_trend": 0.5}, "musecat_breakout_bonus": 3}
+
+    per_date = pd.concat([strategy.score(context) for context in _contexts(panel, params)], ignore_index=True)
+    batched = strategy.score_panel(panel, params)
+
+    pd.testing.assert_frame_equal(batched, per_date)
+
+
+def test_score_contexts_uses_score_panel_when_present() -> None:
+    panel = _panel()
+    contexts = _contexts(panel, {})
+
+    class _PerDateOnly:
+        key = "per_date"
+        name = "per_date"
+
+        def score(self, context: StrategyContext) -> pd.DataFrame:
+            return MuseCatV1Strategy().score(context)
+
+    class _Batched(_PerDateOnly):
+        panel_calls = 0
+
+        def score_panel(self, panel: pd.DataFrame, params: dict) -> pd.DataFrame:
+            self.panel_calls += 1
+            return MuseCatV1Strategy().score_panel(panel, params)
+
+    batched = _Batched()
+    expected = score_contexts(_PerDateOnly(), contexts)
+    result = score_contexts(batched, contexts)
+
+    assert batched.panel_calls == 1
+    assert list(result) == ["20240102", "20240103", "20240104"]
+    for trade_date, frame in expected.items():
+        pd.testing.assert_frame_equal(result[trade_date], frame)
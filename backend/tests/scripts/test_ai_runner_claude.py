@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import threading
+import urllib.request
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+
+def _load_module(name: str, relative_path: str):
+    module_path = Path(__file__).resolve().parents[3] / relative_path
+    spec = importlib.util.spec_from_file_location(name, module_path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+ai_runner_claude = _load_module("ai_runner_claude", "scripts/ai_runner_claude.py")
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    calls: list[dict[str, Any]] = []
+
+    def _builder(**kwargs: Any) -> tuple[dict[str, Any], int, str]:
+        calls.append(kwargs["input_data"])
+        return {"rows": [{"n": len(calls)}]}, 12, "claude-test"
+
+    monkeypatch.setitem(ai_runner_claude._SKILL_BUILDERS, "findata-toolkit-cn", _builder)
+    handler = type(
+        "Handler",
+        (ai_runner_claude.ClaudeAIRunnerHandler,),
+        {"token": "", "model": "claude-test", "cache": ai_runner_claude.SkillResultCache(tmp_path, ttl_seconds=60)},
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def _post(input_data: dict[str, Any], **extra: Any) -> dict[str, Any]:
+        body = json.dumps({"request_id": "r1", "input": input_data, **extra}).encode("utf-8")
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_port}/v1/skills/findata-toolkit-cn",
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return json.loads(response.read())
+
+    yield handler, calls, _post
+    server.shutdown()
+    server.server_close()
+
+
+def test_cache_hit_skips_the_builder_and_a_miss_runs_it(runner) -> None:
+    _, calls, post = runner
+
+    first = post({"ts_code": "000001.SZ"})
+    second = post({"ts_code": "000001.SZ"})
+    other = post({"ts_code": "600000.SH"})
+
+    assert (first["cached"], first["data"]) == (False, {"rows": [{"n": 1}]})
+    assert (second["cached"], second["data"], second["model"]) == (True, {"rows": [{"n": 1}]}, "claude-test")
+    assert (other["cached"], other["data"]) == (False, {"rows": [{"n": 2}]})
+    assert len(calls) == 2
+
+
+def test_expired_entries_are_rebuilt(runner, monkeypatch) -> None:
+    _, calls, post = runner
+    post({"ts_code": "000001.SZ"})
+
+    now = ai_runner_claude.time.time()
+    monkeypatch.setattr(ai_runner_claude.time, "time", lambda: now + 120)
+    refreshed = post({"ts_code": "000001.SZ"})
+
+    assert (refreshed["cached"], refreshed["data"]) == (False, {"rows": [{"n": 2}]})
+    assert len(calls) == 2
+
+
+def test_cache_bypass_rebuilds_and_refreshes_the_entry(runner) -> None:
+    _, calls, post = runner
+    post({"ts_code": "000001.SZ"})
+
+    bypassed = post({"ts_code": "000001.SZ"}, cache_bypass=True)
+    cached = post({"ts_code": "000001.SZ"})
+
+    assert (bypassed["cached"], bypassed["data"]) == (False, {"rows": [{"n": 2}]})
+    assert (cached["cached"], cached["data"]) == (True, {"rows": [{"n": 2}]})
+    assert len(calls) == 2
+
+
+def test_cache_write_failure_still_returns_the_result(runner, monkeypatch) -> None:
+    handler, calls, post = runner
+
+    def _fail(*args: Any, **kwargs: Any) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(handler.cache, "put", _fail)
+    result = post({"ts_code": "000001.SZ"})
+
+    assert (result["ok"], result["status"], result["data"]) == (True, "success", {"rows": [{"n": 1}]})
+    assert len(calls) == 1
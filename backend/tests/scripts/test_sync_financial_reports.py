@@ -2,6 +2,10 @@ from __future__ import annotations
 
 import argparse
 import importlib.util
+import random
+import sys
+import threading
+import time
 from pathlib import Path
 
 import pandas as pd
@@ -10,6 +14,8 @@ MODULE_PATH = Path(__file__).resolve().parents[2] / "scripts" / "daily" / "sync_
 SPEC = importlib.util.spec_from_file_location("sync_financial_reports", MODULE_PATH)
 assert SPEC and SPEC.loader
 sync_financial_reports = importlib.util.module_from_spec(SPEC)
+# Registered before exec so the script's dataclasses can resolve their module.
+sys.modules[SPEC.name] = sync_financial_reports
 SPEC.loader.exec_module(sync_financial_reports)
 
 
@@ -98,3 +104,130 @@ def test_normalize_date_columns_preserves_missing_values() -> None:
     assert normalized.loc[0, "f_ann_date"] is None
     assert normalized.loc[1, "ann_date"] is None
     assert normalized.loc[1, "end_date"] is None
+
+
+class _FakeTushareApi:
+    """Stands in for the TuShare HTTP endpoint: pages ``rows_by_window`` with limit/offset."""
+
+    def __init__(self, rows_by_window: dict[tuple[str, str], int]):
+        self.rows_by_window = rows_by_window
+        self.calls: list[tuple[str, str, int]] = []
+        self.lock = threading.Lock()
+
+    def post(self, url, json, headers, timeout):  # noqa: ANN001, A002
+        params = json["params"]
+        window = params.get("end_date") or params["ann_date"]
+        api_name = json["api_name"]
+        with self.lock:
+            self.calls.append((api_name, window, params["offset"]))
+        # Finish out of submission order so the writer sees pages interleaved.
+        time.sleep(random.uniform(0, 0.01))
+        total = self.rows_by_window.get((api_name, window), 0)
+        items = [
+            [f"{index:06d}.SZ", window, window, "20251231", float(index)]
+            for index in range(params["offset"], min(params["offset"] + params["limit"], total))
+        ]
+        return _FakeResponse({"code": 0, "data": {"fields": ["ts_code", "ann_date", "f_ann_date", "end_date", "value"], "items": items}})
+
+
+class _FakeResponse:
+    def __init__(self, payload: dict):
+        self.payload = payload
+
+    def __bool__(self) -> bool:
+        return True
+
+    def json(self) -> dict:
+        return self.payload
+
+
+def test_sync_windows_fetches_concurrently_and_writes_from_one_thread(monkeypatch) -> None:
+    from app.data import tushare_client
+
+    rows_by_window = {
+        ("income_vip", "20260131"): 7,
+        ("income_vip", "20260228"): 0,
+        ("income_vip", "20260305"): 6,
+        ("forecast_vip", "20260301"): 2,
+        ("forecast_vip", "20260302"): 5,
+    }
+    api = _FakeTushareApi(rows_by_window)
+    monkeypatch.setattr(tushare_client.requests, "post", api.post)
+    monkeypatch.setattr(tushare_client.settings, "tushare_token", "test-token")
+    monkeypatch.setattr(sync_financial_reports, "_PAGE_SIZE", 3)
+    monkeypatch.setattr(sync_financial_reports, "_WRITE_BATCH_ROWS", 4)
+    upserts: list[tuple[str, str, list[tuple[str, str]]]] = []
+    marked: list[tuple[str, str]] = []
+
+    def fake_upsert(dataset: str, frame: pd.DataFrame) -> int:
+        upserts.append((dataset, threading.current_thread().name, list(zip(frame["ts_code"], frame["ann_date"]))))
+        return len(frame)
+
+    monkeypatch.setattr(sync_financial_reports, "_upsert_dataset", fake_upsert)
+    monkeypatch.setattr(sync_financial_reports, "mark_sync_done", lambda date, task: marked.append((task, date)))
+    monkeypatch.setattr(sync_financial_reports, "fetch_forecast", lambda **kwargs: tushare_client._query_pro("forecast_vip", params=kwargs))
+
+    stats = sync_financial_reports.sync_windows(
+        {
+            "income": [("20260101", "20260131"), ("20260201", "20260228"), ("20260301", "20260305")],
+            "forecast": [("20260301", "20260301"), ("20260302", "20260302")],
+        },
+        workers=4,
+    )
+
+    written = sorted(row for _, _, rows in upserts for row in rows)
+    expected = sorted(
+        (f"{index:06d}.SZ", window) for (_, window), total in rows_by_window.items() for index in range(total)
+    )
+    assert written == expected
+    assert {thread for _, thread, _ in upserts} == {"sync-financial-writer"}
+    # ceil(rows / page) calls per window, plus one only when a window ends exactly on a full page.
+    assert stats["income"].requests == 3 + 1 + 3
+    assert stats["forecast"].requests == 1 + 2
+    assert len(api.calls) == 10
+    assert stats["income"].upserted == 13 and stats["forecast"].upserted == 7
+    assert sorted(marked) == [
+        ("sync_forecast", "20260301"),
+        ("sync_forecast", "20260302"),
+        ("sync_income", "20260131"),
+        ("sync_income", "20260228"),
+        ("sync_income", "20260305"),
+    ]
+
+
+def test_token_bucket_spaces_calls_across_threads() -> None:
+    bucket = sync_financial_reports.TokenBucket(50.0)
+    started = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # One token is available up front; the other five wait 1/50s each.
+    assert time.monotonic() - started >= 5 / 50 - 0.01
+
+
+def test_sync_windows_cancels_queued_requests_after_a_failed_fetch(monkeypatch) -> None:
+    calls: list[str] = []
+    lock = threading.Lock()
+
+    def fake_fetch(dataset: str, start_date: str, end_date: str, offset: int = 0) -> pd.DataFrame:
+        with lock:
+            calls.append(end_date)
+        if end_date == "20260101":
+            raise RuntimeError("upstream down")
+        time.sleep(0.02)
+        return pd.DataFrame()
+
+    monkeypatch.setattr(sync_financial_reports, "fetch_dataset_page", fake_fetch)
+    windows = [(f"2026{index:04d}", f"2026{index:04d}") for index in range(101, 151)]
+
+    try:
+        sync_financial_reports.sync_windows({"income": windows}, workers=2)
+    except RuntimeError as exc:
+        assert str(exc) == "upstream down"
+    else:
+        raise AssertionError("fetch error was swallowed")
+
+    assert len(calls) < 10
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from app.services import agent_freedom_service
+from app.services.ai_runner_client import SkillCallResult
+
+
+def _result(skill_name: str, request_id: str, *, ok: bool, data: dict | None = None, status: str = "success") -> SkillCallResult:
+    return SkillCallResult(
+        request_id=request_id,
+        skill_name=skill_name,
+        ok=ok,
+        status=status,
+        data=data,
+        error="" if ok else "boom",
+        latency_ms=10,
+        attempts=1,
+        model="test",
+    )
+
+
+def test_call_p0_skills_runs_skills_concurrently_and_merges_in_order(monkeypatch) -> None:
+    logged: list[str] = []
+    barrier = threading.Barrier(len(agent_freedom_service._SKILL_P0), timeout=5)
+
+    def fake_call_skill(*, skill_name, trade_date, input_payload, request_id=None, deadline=None, bypass_cache=False):  # noqa: ANN001
+        barrier.wait()
+        if skill_name == "quant-factor-screener":
+            return _result(skill_name, request_id, ok=False, status="model_error")
+        return _result(skill_name, request_id, ok=True, data={"skill": skill_name})
+
+    monkeypatch.setattr(agent_freedom_service, "call_skill", fake_call_skill)
+    monkeypatch.setattr(
+        agent_freedom_service,
+        "_log_skill_result",
+        lambda *, trade_date, skill_name, result, input_payload: logged.append(skill_name),
+    )
+
+    results, degrade_flags, explain_refs = agent_freedom_service._call_p0_skills(
+        trade_date="20260313",
+        market_row={},
+        signal_rows=[],
+        shenwan_rows=[],
+    )
+
+    assert list(results) == ["findata-toolkit-cn", "sector-rotation-detector"]
+    assert degrade_flags == ["quant-factor-screener:model_error"]
+    assert logged == agent_freedom_service._SKILL_P0
+    assert len(explain_refs) == 3
+
+
+def test_call_p0_skills_degrades_skills_past_run_deadline(monkeypatch) -> None:
+    release = threading.Event()
+
+    def fake_call_skill(*, skill_name, trade_date, input_payload, request_id=None, deadline=None, bypass_cache=False):  # noqa: ANN001
+        if skill_name == "sector-rotation-detector":
+            release.wait(5)
+        return _result(skill_name, request_id, ok=True, data={})
+
+    monkeypatch.setattr(agent_freedom_service, "call_skill", fake_call_skill)
+    monkeypatch.setattr(agent_freedom_service, "_log_skill_result", lambda **kwargs: None)
+    monkeypatch.setattr(agent_freedom_service.settings, "ai_runner_run_deadline_seconds", 1)
+
+    started = time.monotonic()
+    try:
+        results, degrade_flags, _ = agent_freedom_service._call_p0_skills(
+            trade_date="20260313",
+            market_row={},
+            signal_rows=[],
+            shenwan_rows=[],
+        )
+    finally:
+        release.set()
+
+    assert time.monotonic() - started < 3
+    assert list(results) == ["findata-toolkit-cn", "quant-factor-screener"]
+    assert degrade_flags == ["sector-rotation-detector:timeout"]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import time
+
+from app.services import ai_runner_client
+
+
+def test_call_skill_stops_retrying_once_run_deadline_passes(monkeypatch) -> None:
+    posted = []
+
+    def fake_post_json(*, url, payload, token, timeout_seconds):  # noqa: ANN001
+        posted.append(timeout_seconds)
+        raise ai_runner_client.AIRunnerError("upstream_error", "runner unavailable")
+
+    monkeypatch.setattr(ai_runner_client, "_post_json", fake_post_json)
+    monkeypatch.setattr(ai_runner_client.settings, "ai_runner_base_url", "http://runner.test")
+    monkeypatch.setattr(ai_runner_client.settings, "ai_runner_max_retries", 5)
+
+    result = ai_runner_client.call_skill(
+        skill_name="findata-toolkit-cn",
+        trade_date="20260313",
+        input_payload={},
+        deadline=time.monotonic() - 1,
+    )
+
+    assert posted == []
+    assert result.ok is False
+    assert result.status == "timeout"
+    assert result.error == "run deadline exceeded"
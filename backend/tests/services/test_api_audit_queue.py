@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import datetime as dt
+import threading
+
+from app.services.api_audit_queue import ApiAuditQueue
+
+
+def _record(index: int) -> dict[str, object]:
+    return {"user_id": str(index), "username": "james", "endpoint": "/api/stocks", "method": "GET", "status_code": 200}
+
+
+def test_queue_writes_in_batches_and_flushes_remainder_on_shutdown() -> None:
+    batches: list[list[dict[str, object]]] = []
+    queue = ApiAuditQueue(sink=batches.append, max_size=100, batch_size=3, flush_interval_seconds=60)
+
+    for index in range(7):
+        assert queue.enqueue(_record(index))
+    queue.shutdown(timeout=5)
+
+    assert [len(batch) for batch in batches[:2]] == [3, 3]
+    assert sum(len(batch) for batch in batches) == 7
+    assert [record["user_id"] for batch in batches for record in batch] == [str(i) for i in range(7)]
+    assert queue.written == 7
+    assert not queue.enqueue(_record(99))
+
+
+def test_queue_drops_and_counts_records_when_full() -> None:
+    release = threading.Event()
+    batches: list[list[dict[str, object]]] = []
+
+    def blocking_sink(batch: list[dict[str, object]]) -> None:
+        release.wait(5)
+        batches.append(batch)
+
+    queue = ApiAuditQueue(sink=blocking_sink, max_size=2, batch_size=1, flush_interval_seconds=60)
+    accepted = [queue.enqueue(_record(index)) for index in range(10)]
+    release.set()
+    queue.shutdown(timeout=5)
+
+    assert accepted.count(False) == queue.dropped
+    assert queue.dropped >= 7
+    assert queue.written == accepted.count(True)
+
+
+def test_sink_failures_are_counted_without_stopping_the_writer() -> None:
+    calls: list[int] = []
+
+    def flaky_sink(batch: list[dict[str, object]]) -> None:
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise RuntimeError("mongo down")
+
+    queue = ApiAuditQueue(sink=flaky_sink, max_size=10, batch_size=2, flush_interval_seconds=60)
+    for index in range(4):
+        queue.enqueue(_record(index))
+    queue.shutdown(timeout=5)
+
+    assert queue.failed == 2
+    assert queue.written == 2
+
+
+def test_default_sink_writes_each_batch_with_one_insert(monkeypatch) -> None:
+    from app.data import mongo_api_audit
+
+    class _Collection:
+        def __init__(self) -> None:
+            self.inserts: list[tuple[list[dict[str, object]], bool]] = []
+
+        def insert_many(self, docs: list[dict[str, object]], *, ordered: bool = True) -> None:
+            self.inserts.append((docs, ordered))
+
+    collection = _Collection()
+    monkeypatch.setattr(mongo_api_audit, "get_collection", lambda name: collection)
+    monkeypatch.setattr(mongo_api_audit, "_INDEX_READY", True)
+    queue = ApiAuditQueue(max_size=10, batch_size=2, flush_interval_seconds=60)
+
+    for index in range(3):
+        queue.enqueue({**_record(index), "created_at": dt.datetime(2026, 1, 5, tzinfo=dt.UTC)})
+    queue.shutdown(timeout=5)
+
+    assert [(len(docs), ordered) for docs, ordered in collection.inserts] == [(2, False), (1, False)]
+    assert collection.inserts[0][0][1]["user_id"] == "1"
+    assert collection.inserts[0][0][1]["created_at"] == dt.datetime(2026, 1, 5, tzinfo=dt.UTC)
+    assert queue.written == 3
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from app.services import backtest_service
+
+
+def test_compare_backtests_fetches_nav_once_and_returns_columns(monkeypatch) -> None:
+    runs = [
+        {"run_id": "b", "strategy_id": "s", "status": "success", "summary_metrics": {"total_return": 0.1}},
+        {"run_id": "a", "strategy_id": "s", "status": "success", "summary_metrics": {"total_return": 0.2}},
+    ]
+    nav_rows = [
+        {"run_id": run_id, "trade_date": f"202401{day:02d}", "nav": 1.0 + day * step}
+        for run_id, step in (("a", 0.01), ("b", 0.02))
+        for day in range(1, 31)
+    ]
+    queries: list[list[str]] = []
+
+    def _iter_nav(run_ids: list[str]):
+        queries.append(list(run_ids))
+        return iter(nav_rows)
+
+    monkeypatch.setattr(backtest_service, "list_backtest_runs_by_ids", lambda run_ids: runs)
+    monkeypatch.setattr(backtest_service, "iter_backtest_nav_for_runs", _iter_nav)
+
+    result = backtest_service.compare_backtests(["a", "b", "missing"], max_points=10)
+
+    assert queries == [["a", "b"]]
+    assert result["run_ids"] == ["a", "b"]
+    assert [item["run_id"] for item in result["items"]] == ["a", "b"]
+    assert result["total_points"] == 30
+    assert len(result["dates"]) <= 10
+    assert result["dates"][0] == "20240101" and result["dates"][-1] == "20240130"
+    assert [len(series) for series in result["nav"]] == [len(result["dates"])] * 2
+    assert result["nav"][0][-1] == 1.3
+    assert [row["run_id"] for row in result["relative_metrics"]] == ["b"]
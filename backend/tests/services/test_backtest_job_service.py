@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import datetime as dt
+import multiprocessing
+import os
+import time
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.backtest_job_service import BacktestJobDispatcher, build_progress
+
+# Job processes are forked here so they inherit the test's import setup; production spawns them.
+pytestmark = pytest.mark.filterwarnings("ignore:This process .* is multi-threaded:DeprecationWarning")
+
+
+class _InMemoryQueue:
+    def __init__(self, runs: list[dict[str, Any]]) -> None:
+        now = dt.datetime.now(dt.UTC)
+        self.runs = {
+            run["run_id"]: {"status": "pending", "queued_at": now + dt.timedelta(seconds=idx), "attempts": 0, **run}
+            for idx, run in enumerate(runs)
+        }
+        self.progress_log: dict[str, list[dict[str, Any]]] = {}
+
+    def claim(self, worker_id: str) -> dict[str, Any] | None:
+        pending = [run for run in self.runs.values() if run["status"] == "pending"]
+        if not pending:
+            return None
+        run = min(pending, key=lambda item: item["queued_at"])
+        run.update(status="running", worker_id=worker_id, heartbeat_at=dt.datetime.now(dt.UTC))
+        run["attempts"] += 1
+        return dict(run)
+
+    def report_progress(self, run_id: str, progress: dict[str, Any]) -> bool:
+        run = self.runs[run_id]
+        run.update(progress=progress, heartbeat_at=dt.datetime.now(dt.UTC))
+        self.progress_log.setdefault(run_id, []).append(progress)
+        return bool(run.get("cancel_requested"))
+
+    def finish(self, run_id: str, status: str, error_message: str = "") -> None:
+        run = self.runs[run_id]
+        if run["status"] == "running":
+            run.update(status=status, error_message=error_message)
+        run.pop("worker_id", None)
+
+    def release(self, run_id: str) -> None:
+        self.runs[run_id].update(status="pending")
+
+    def requeue_stale(self, stale_before: dt.datetime, max_attempts: int) -> int:
+        requeued = 0
+        for run in self.runs.values():
+            if run["status"] != "running" or run["heartbeat_at"] >= stale_before:
+                continue
+            if run["attempts"] >= max_attempts:
+                run.update(status="failed", error_message="backtest worker lost")
+            else:
+                run.update(status="pending")
+                requeued += 1
+        return requeued
+
+
+def _panel_job(run: dict[str, Any], on_progress) -> None:
+    """Tiny stand-in for BacktestEngine.run: walks a synthetic Parquet close panel day by day."""
+    panel = pd.read_parquet(run["panel_path"])
+    dates = sorted(panel["trade_date"].unique())
+    for idx, trade_date in enumerate(dates[1:], start=1):
+        day = panel[panel["trade_date"] == trade_date]
+        if day["close"].isna().all():
+            raise ValueError("empty day")
+        if run.get("crash_at") == idx:
+            os._exit(3)
+        time.sleep(run.get("day_seconds", 0.0))
+        on_progress(str(trade_date), idx, len(dates) - 1)
+
+
+def _write_panel(tmp_path, days: int = 12) -> str:
+    dates = pd.bdate_range("2024-01-01", periods=days).strftime("%Y%m%d")
+    frame = pd.DataFrame(
+        {
+            "ts_code": np.repeat(["000001.SZ", "600000.SH"], days),
+            "trade_date": np.tile(dates, 2),
+            "close": np.linspace(10, 12, days * 2),
+        }
+    )
+    path = tmp_path / "panel.parquet"
+    frame.to_parquet(path, index=False)
+    return str(path)
+
+
+def _dispatcher(queue: _InMemoryQueue, **kwargs) -> BacktestJobDispatcher:
+    return BacktestJobDispatcher(
+        backtest_queue=queue,
+        job_target=_panel_job,
+        mp_context=multiprocessing.get_context("fork"),
+        worker_id="test-worker",
+        **kwargs,
+    )
+
+
+def _poll_until_idle(dispatcher: BacktestJobDispatcher, timeout: float = 20.0, on_poll=None) -> int:
+    deadline = time.monotonic() + timeout
+    peak = 0
+    while time.monotonic() < deadline:
+        dispatcher.poll_once()
+        peak = max(peak, len(dispatcher.active_run_ids))
+        if on_poll is not None:
+            on_poll()
+        if not dispatcher.active_run_ids:
+            return peak
+        time.sleep(0.02)
+    dispatcher.shutdown()
+    raise AssertionError("dispatcher did not drain the queue")
+
+
+def test_pool_runs_queued_jobs_with_bounded_concurrency_and_progress(tmp_path) -> None:
+    panel_path = _write_panel(tmp_path)
+    queue = _InMemoryQueue(
+        [{"run_id": f"run-{idx}", "panel_path": panel_path, "day_seconds": 0.01} for idx in range(3)]
+        + [{"run_id": "run-crash", "panel_path": panel_path, "crash_at": 2}]
+    )
+
+    peak = _poll_until_idle(_dispatcher(queue, max_workers=2, stale_seconds=60))
+
+    assert peak == 2
+    assert [queue.runs[f"run-{idx}"]["status"] for idx in range(3)] == ["success"] * 3
+    final = queue.runs["run-0"]["progress"]
+    assert (final["current_date"], final["done_days"], final["total_days"], final["pct"]) == ("20240116", 11, 11, 100.0)
+    assert final["eta_seconds"] == 0.0
+    assert queue.runs["run-crash"]["status"] == "failed"
+    assert "exited with code 3" in queue.runs["run-crash"]["error_message"]
+
+
+def test_cancel_request_stops_job_at_next_progress_report(tmp_path) -> None:
+    panel_path = _write_panel(tmp_path, days=200)
+    queue = _InMemoryQueue([{"run_id": "slow", "panel_path": panel_path, "day_seconds": 0.02}])
+
+    def _request_cancel() -> None:
+        if queue.runs["slow"].get("progress", {}).get("done_days", 0) >= 2:
+            queue.runs["slow"]["cancel_requested"] = True
+
+    _poll_until_idle(_dispatcher(queue, max_workers=1, stale_seconds=60), on_poll=_request_cancel)
+
+    run = queue.runs["slow"]
+    assert run["status"] == "cancelled"
+    assert 2 <= run["progress"]["done_days"] < run["progress"]["total_days"]
+
+
+def test_stale_running_jobs_are_requeued_or_failed(tmp_path) -> None:
+    panel_path = _write_panel(tmp_path)
+    queue = _InMemoryQueue(
+        [
+            {"run_id": "orphan", "panel_path": panel_path},
+            {"run_id": "exhausted", "panel_path": panel_path},
+        ]
+    )
+    lost = dt.datetime.now(dt.UTC) - dt.timedelta(hours=1)
+    queue.runs["orphan"].update(status="running", worker_id="dead-worker", heartbeat_at=lost, attempts=1)
+    queue.runs["exhausted"].update(status="running", worker_id="dead-worker", heartbeat_at=lost, attempts=3)
+
+    _poll_until_idle(_dispatcher(queue, max_workers=2, stale_seconds=60, max_attempts=3))
+
+    assert queue.runs["orphan"]["status"] == "success"
+    assert queue.runs["orphan"]["attempts"] == 2
+    assert queue.runs["exhausted"]["status"] == "failed"
+    assert queue.runs["exhausted"]["error_message"] == "backtest worker lost"
+
+
+def test_build_progress_extrapolates_eta() -> None:
+    progress = build_progress("20240105", 25, 100, 50.0)
+
+    assert progress["pct"] == 25.0
+    assert progress["eta_seconds"] == 150.0
+    assert build_progress(None, 0, 0, 0.0)["eta_seconds"] is None
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import math
+
+import duckdb
+import pandas as pd
+import pytest
+
+from app.data.duckdb_store import close_read_connection, list_last_n_days_pct_chg
+from app.services import batch_quote_service
+
+
+def _write(tmp_path, dataset: str, frame: pd.DataFrame) -> None:
+    for (ts_code, year), group in frame.assign(year=frame["trade_date"].str[:4]).groupby(["ts_code", "year"]):
+        partition = tmp_path / "raw" / dataset / f"ts_code={ts_code}" / f"year={year}"
+        partition.mkdir(parents=True, exist_ok=True)
+        group.drop(columns=["year"]).to_parquet(partition / "part-a.parquet", index=False)
+
+
+@pytest.fixture
+def quote_store(monkeypatch, tmp_path):
+    duckdb.connect(str(tmp_path / "quant.duckdb")).close()
+    monkeypatch.setattr("app.services.batch_quote_service.settings.data_dir", tmp_path)
+    monkeypatch.setattr("app.data.duckdb_store.settings.duckdb_path", tmp_path / "quant.duckdb")
+    # Spans a year boundary so the 20-day window needs the previous year's partition.
+    dates = pd.bdate_range("2024-12-02", "2025-01-10").strftime("%Y%m%d").tolist()
+    rows = []
+    for idx, trade_date in enumerate(dates):
+        rows.append({"ts_code": "A.SZ", "trade_date": trade_date, "close": 10.0 * 1.01 ** (idx + 1), "pre_close": 10.0 * 1.01**idx, "pct_chg": 1.0})
+        if idx >= len(dates) - 4:
+            # B: listed four sessions ago, pct_chg missing so it is derived from close/pre_close.
+            rows.append({"ts_code": "B.SZ", "trade_date": trade_date, "close": 22.0, "pre_close": 20.0, "pct_chg": None})
+    daily = pd.DataFrame(rows).assign(change=None)
+    _write(tmp_path, "daily", daily)
+    latest = dates[-1]
+    _write(
+        tmp_path,
+        "daily_basic",
+        pd.DataFrame([{"ts_code": "A.SZ", "trade_date": latest, "turnover_rate": 3.5, "total_mv": 1e6, "circ_mv": 8e5}]),
+    )
+    _write(
+        tmp_path,
+        "daily_limit",
+        pd.DataFrame([{"ts_code": "B.SZ", "trade_date": latest, "up_limit": 22.0, "down_limit": 18.0}]),
+    )
+    signals = {"A.SZ": {"signal": "BUY", "trading_date": "20250109", "strategy": "x"}}
+    calls: list[list[str]] = []
+
+    def _signals(codes: list[str]) -> dict:
+        calls.append(list(codes))
+        return {code: signals[code] for code in codes if code in signals}
+
+    monkeypatch.setattr(batch_quote_service, "get_latest_stock_signals", _signals)
+    close_read_connection()
+    yield latest, calls
+    close_read_connection()
+
+
+def test_batch_quotes_compound_returns_over_the_window(quote_store) -> None:
+    latest, calls = quote_store
+
+    quotes = batch_quote_service.get_batch_quotes(["B.SZ", "A.SZ", "MISSING.SZ", "A.SZ"]).set_index("ts_code")
+
+    assert list(quotes.index) == ["B.SZ", "A.SZ", "MISSING.SZ"]
+    assert calls == [["B.SZ", "A.SZ", "MISSING.SZ"]]
+    a = quotes.loc["A.SZ"]
+    assert a["trade_date"] == latest
+    for days in (1, 3, 5, 20):
+        assert math.isclose(a[f"pct_chg_{days}d"], (1.01**days - 1) * 100, rel_tol=1e-9)
+    assert (a["turnover_rate"], a["latest_signal"]) == (3.5, "BUY")
+    assert pd.isna(a["limit_status"])
+    b = quotes.loc["B.SZ"]
+    assert math.isclose(b["pct_chg_3d"], (1.1**3 - 1) * 100, rel_tol=1e-9)
+    assert math.isnan(b["pct_chg_5d"]) and math.isnan(b["pct_chg_20d"])
+    assert math.isclose(b["change"], 2.0)
+    assert b["limit_status"] == "up"
+    assert math.isnan(b["turnover_rate"])
+    assert pd.isna(quotes.loc["MISSING.SZ", "close"])
+
+
+def test_quotes_to_columns_is_json_ready(quote_store) -> None:
+    columns = batch_quote_service.quotes_to_columns(batch_quote_service.get_batch_quotes(["A.SZ", "MISSING.SZ"], include_signal=False))
+
+    assert columns["ts_code"] == ["A.SZ", "MISSING.SZ"]
+    assert columns["close"][1] is None
+    assert isinstance(columns["pct_chg_20d"][0], float)
+    assert "latest_signal" not in columns
+
+
+def test_stock_list_horizons_match_the_batch_quotes(quote_store) -> None:
+    quotes = batch_quote_service.load_batch_quotes(["A.SZ", "B.SZ"]).set_index("ts_code")
+
+    for days in (3, 5):
+        listed = list_last_n_days_pct_chg(["A.SZ", "B.SZ"], n=days)
+        for code in ("A.SZ", "B.SZ"):
+            expected = quotes.loc[code, f"pct_chg_{days}d"]
+            if math.isnan(expected):
+                assert listed[code]["pct_chg_nd"] is None
+            else:
+                assert math.isclose(listed[code]["pct_chg_nd"], expected, rel_tol=1e-9)
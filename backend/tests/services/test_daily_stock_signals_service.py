@@ -1,6 +1,29 @@
 from __future__ import annotations
 
-from app.services.daily_stock_signals_service import get_daily_stock_signals_overview
+import pandas as pd
+
+from app.services.daily_stock_signals_service import (
+    get_daily_stock_signals_overview,
+    get_stock_pattern_details,
+    get_stock_recent_signals,
+)
+
+
+_HIT = {
+    "trade_date": "20260417",
+    "ts_code": "000001.SZ",
+    "name": "平安银行",
+    "industry": "银行",
+    "close": 10.0,
+    "pct_chg": 1.5,
+    "volume_ratio": 2.0,
+    "signals": [{"signal_type": "buy_macd_kdj_double_cross", "signal_side": "buy"}],
+    "resonance": [],
+    "pattern_resonance": [
+        {"signal_side": "sell", "resonance_level": "normal", "weighted_score": 3, "patterns": ["dark_cloud"], "user_state": None},
+        {"signal_side": "buy", "resonance_level": "strong", "weighted_score": 7, "patterns": ["hammer"], "user_state": "acknowledged"},
+    ],
+}
 
 
 def test_overview_defaults_to_latest_date_and_limits_to_top_n(monkeypatch) -> None:
@@ -45,3 +68,53 @@ def test_overview_defaults_to_latest_date_and_limits_to_top_n(monkeypatch) -> No
     assert result["trade_date"] == "20260417"
     assert len(result["buy_signals"][0]["stocks"]) == 1
     assert len(result["buy_resonance"][0]["stocks"]) == 1
+
+
+def test_pattern_details_reads_single_hit_and_prefers_buy_side(monkeypatch) -> None:
+    lookups = []
+    monkeypatch.setattr("app.services.daily_stock_signals_service.cache_get", lambda key: None)
+    monkeypatch.setattr("app.services.daily_stock_signals_service.cache_set", lambda key, value, ttl_seconds=None: None)
+    monkeypatch.setattr(
+        "app.services.daily_stock_signals_service.get_daily_stock_pattern_hit",
+        lambda trade_date, ts_code: lookups.append((trade_date, ts_code)) or _HIT,
+    )
+
+    result = get_stock_pattern_details(ts_code="000001.SZ", trade_date="20260417")
+
+    assert lookups == [("20260417", "000001.SZ")]
+    assert result["signal_side"] == "buy"
+    assert result["resonance_level"] == "strong"
+    assert result["user_state"] == "acknowledged"
+    assert [p["pattern"] for p in result["patterns"]] == ["hammer"]
+
+
+def test_recent_signals_expand_hits_within_signal_date_window(monkeypatch) -> None:
+    queries = []
+    monkeypatch.setattr("app.services.daily_stock_signals_service.cache_get", lambda key: None)
+    monkeypatch.setattr("app.services.daily_stock_signals_service.cache_set", lambda key, value, ttl_seconds=None: None)
+    monkeypatch.setattr(
+        "app.services.daily_stock_signals_service.list_daily_stock_signal_dates",
+        lambda limit=365: ["20260420", "20260417"][:limit],
+    )
+    monkeypatch.setattr(
+        "app.services.daily_stock_signals_service.list_daily_stock_pattern_hits_for_stock",
+        lambda ts_code, start_date=None, limit=365: queries.append((ts_code, start_date, limit)) or [_HIT],
+    )
+    monkeypatch.setattr(
+        "app.services.daily_stock_signals_service.load_forward_returns",
+        lambda **kwargs: pd.DataFrame([{"ts_code": "000001.SZ", "trade_date": "20260417", "ret_cc_1d": 10.0, "ret_cc_5d": None}]),
+    )
+
+    rows = get_stock_recent_signals(ts_code="000001.SZ", limit_days=2)
+
+    assert queries == [("000001.SZ", "20260417", 2)]
+    assert [(row.get("signal_type"), row.get("resonance_level")) for row in rows] == [
+        ("buy_macd_kdj_double_cross", None),
+        (None, "normal"),
+        (None, "strong"),
+    ]
+    assert rows[0]["stock"]["weighted_score"] == 7
+    assert (rows[1]["stock"]["weighted_score"], rows[1]["stock"]["patterns"]) == (3, ["dark_cloud"])
+    assert (rows[2]["stock"]["weighted_score"], rows[2]["stock"]["patterns"]) == (7, ["hammer"])
+    assert rows[0]["next_1d_pct"] == 10.0
+    assert rows[0]["next_5d_pct"] is None
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from app.services import factor_analysis_service
+
+
+class _InlineExecutor:
+    def submit(self, fn, *args: Any) -> None:
+        fn(*args)
+
+
+def test_submit_records_job_and_stores_result_or_error(monkeypatch) -> None:
+    jobs: dict[str, dict[str, Any]] = {}
+    monkeypatch.setattr(
+        factor_analysis_service,
+        "create_factor_analysis_job",
+        lambda *, job_id, params, created_by: jobs.update({job_id: {"job_id": job_id, "status": "pending", "params": params}}),
+    )
+    monkeypatch.setattr(factor_analysis_service, "update_factor_analysis_job", lambda job_id, **fields: jobs[job_id].update(fields))
+    monkeypatch.setattr(factor_analysis_service, "get_factor_analysis_job", lambda job_id: dict(jobs[job_id]) if job_id in jobs else None)
+    monkeypatch.setattr(factor_analysis_service, "normalize_date", lambda value: str(value).replace("-", ""))
+
+    def fake_run(**params: Any) -> dict[str, Any]:
+        if params["strategy_key"] == "broken":
+            raise ValueError("stock universe is empty")
+        return {"summary": {"days": 2}, "daily": []}
+
+    monkeypatch.setattr(factor_analysis_service, "run_factor_analysis", fake_run)
+
+    job = factor_analysis_service.submit_factor_analysis(
+        created_by="james", executor=_InlineExecutor(), strategy_key="multifactor_v1", start_date="20240101", end_date="20240131"
+    )
+    failed = factor_analysis_service.submit_factor_analysis(
+        created_by="james", executor=_InlineExecutor(), strategy_key="broken", start_date="20240101", end_date="20240131"
+    )
+
+    assert job["status"] == "success"
+    assert job["result"]["summary"] == {"days": 2}
+    assert (failed["status"], failed["error_message"]) == ("failed", "stock universe is empty")
+    assert factor_analysis_service.get_factor_analysis("missing") is None
+    with pytest.raises(ValueError):
+        factor_analysis_service.submit_factor_analysis(
+            created_by="james", executor=_InlineExecutor(), start_date="20240101", end_date="20240131", horizons=[7]
+        )
+    assert len(jobs) == 2
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import threading
+import time
+
 from app.services.research_service import (
     get_market_research_indexes,
+    get_stock_research_financials,
     get_stock_research_holders,
     get_stock_research_overview,
 )
@@ -69,3 +73,63 @@ def test_market_research_indexes_returns_snapshot(monkeypatch) -> None:
     assert payload["tracked_indexes"][0]["ts_code"] == "000001.SH"
     assert payload["latest_snapshot"][0]["name"] == "上证指数"
     assert payload["available_dates"][0] == "20260313"
+
+
+def test_stock_research_overview_runs_sections_concurrently_with_partial_results(monkeypatch) -> None:
+    barrier = threading.Barrier(3, timeout=5)
+    release = threading.Event()
+
+    def concurrent_section(value):
+        def loader(ts_code):
+            barrier.wait()
+            return value
+
+        return loader
+
+    def failing_section(ts_code):
+        raise RuntimeError("mongo down")
+
+    def slow_section(ts_code):
+        release.wait(5)
+        return {"perf": 1}
+
+    monkeypatch.setattr("app.services.research_service.settings.research_section_timeout_seconds", 0.5)
+    monkeypatch.setattr("app.services.research_service._get_stock_basic", concurrent_section({"name": "平安银行"}))
+    monkeypatch.setattr("app.services.research_service._get_latest_daily", concurrent_section({"close": 12.3}))
+    monkeypatch.setattr("app.services.research_service._get_latest_daily_basic", concurrent_section({"pe": 8.8}))
+    monkeypatch.setattr("app.services.research_service._get_latest_indicator", lambda ts_code: None)
+    monkeypatch.setattr("app.services.research_service._get_latest_financial_indicator", lambda ts_code: None)
+    monkeypatch.setattr("app.services.research_service._get_dividend_summary", lambda ts_code: {})
+    monkeypatch.setattr("app.services.research_service._get_holder_summary", failing_section)
+    monkeypatch.setattr("app.services.research_service._get_flow_summary", lambda ts_code: {})
+    monkeypatch.setattr("app.services.research_service._get_event_summary", lambda ts_code: {})
+    monkeypatch.setattr("app.services.research_service._get_chip_summary", slow_section)
+
+    started = time.monotonic()
+    try:
+        payload = get_stock_research_overview("000001.SZ")
+    finally:
+        release.set()
+
+    assert time.monotonic() - started < 3
+    assert payload["basic"]["name"] == "平安银行"
+    assert payload["latest_daily"]["close"] == 12.3
+    assert payload["latest_holder_summary"] is None
+    assert payload["latest_chip_summary"] is None
+    assert payload["degraded_sections"] == ["latest_holder_summary", "latest_chip_summary"]
+
+
+def test_stock_research_financials_degrades_failed_statement_to_empty_list(monkeypatch) -> None:
+    def fake_query(table, **kwargs):
+        if table == "cashflow":
+            raise RuntimeError("parquet unreadable")
+        return [{"end_date": "20251231", "table": table}]
+
+    monkeypatch.setattr("app.services.research_service._query_duckdb_table", fake_query)
+
+    payload = get_stock_research_financials("000001.SZ")
+
+    assert payload["latest_period"] == "20251231"
+    assert payload["income"][0]["table"] == "income"
+    assert payload["cashflow"] == []
+    assert payload["degraded_sections"] == ["cashflow"]
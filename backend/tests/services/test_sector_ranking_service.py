@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services import sector_ranking_service as service
+
+
+class _FakeCollection:
+    def __init__(self, results: list[dict]) -> None:
+        self.results = results
+        self.pipelines: list[list[dict]] = []
+        self.indexes: list[list[tuple[str, int]]] = []
+
+    def create_index(self, keys, **kwargs) -> str:
+        self.indexes.append(list(keys))
+        return kwargs.get("name", "")
+
+    def aggregate(self, pipeline: list[dict]):
+        self.pipelines.append(pipeline)
+        return iter(self.results)
+
+
+def _patch(monkeypatch, results: list[dict]) -> tuple[_FakeCollection, list[str]]:
+    collection = _FakeCollection(results)
+    names: list[str] = []
+
+    def _get_collection(name: str) -> _FakeCollection:
+        names.append(name)
+        return collection
+
+    monkeypatch.setattr(service, "get_collection", _get_collection)
+    monkeypatch.setattr(service, "_INDEXED", set())
+    return collection, names
+
+
+def test_history_runs_one_aggregation_for_all_dates(monkeypatch) -> None:
+    dates = [f"202401{day:02d}" for day in range(30, 0, -1)]
+    member = {"ts_code": "801010.SI", "name": "农林牧渔", "pct_change": 1.5, "rank": 1}
+    collection, names = _patch(
+        monkeypatch,
+        [{"_id": "20240129", "total": 31, "top": [member], "bottom": [member]}],
+    )
+
+    data = service.get_ranking_history(source="sw", trade_dates=dates, level=1, top_n=3, bottom_n=2)
+
+    assert names == ["shenwan_daily"]
+    assert len(collection.pipelines) == 1
+    assert collection.indexes == [[("level", 1), ("trade_date", 1), ("pct_change", 1)]]
+    match, group = collection.pipelines[0]
+    assert match["$match"] == {"level": 1, "trade_date": {"$in": dates}}
+    assert group["$group"]["top"]["$topN"]["n"] == 3
+    assert group["$group"]["top"]["$topN"]["sortBy"] == {"pct_change": -1, "ts_code": 1}
+    assert group["$group"]["bottom"]["$topN"]["sortBy"] == {"pct_change": 1, "ts_code": 1}
+    assert [item["trade_date"] for item in data] == dates
+    assert data[1] == {"trade_date": "20240129", "top": [member], "bottom": [member]}
+    assert data[0] == {"trade_date": "20240130", "top": [], "bottom": []}
+
+
+def test_avg_rankings_keep_legacy_row_shape(monkeypatch) -> None:
+    dates = ["20240105", "20240104", "20240103"]
+    strongest = {
+        "_id": "CI005001.CI",
+        "name": "石油石化",
+        "days": [
+            {"trade_date": "20240103", "rank": 2, "pct_change": 0.5},
+            {"trade_date": "20240105", "rank": 1, "pct_change": 1.0},
+        ],
+        "rank_avg": 1.5,
+        "pct_sum": 1.5,
+    }
+    collection, names = _patch(monkeypatch, [{"strongest": [strongest], "weakest": []}])
+
+    result = service.get_avg_rankings(source="ci", trade_dates=dates, level=2, top_n=10, bottom_n=10)
+
+    assert names == ["citic_daily"]
+    assert len(collection.pipelines) == 1
+    assert result["trade_dates"] == dates
+    assert result["weakest"] == []
+    assert result["strongest"] == [
+        {
+            "ts_code": "CI005001.CI",
+            "name": "石油石化",
+            "level": 2,
+            "rank_day1": 1,
+            "rank_day2": None,
+            "rank_day3": 2,
+            "rank_day4": None,
+            "rank_day5": None,
+            "rank_avg": 1.5,
+            "pct_day1": 1.0,
+            "pct_day2": None,
+            "pct_day3": 0.5,
+            "pct_day4": None,
+            "pct_day5": None,
+            "pct_sum": 1.5,
+        }
+    ]
+
+
+def test_unknown_source_is_rejected(monkeypatch) -> None:
+    _patch(monkeypatch, [])
+
+    with pytest.raises(ValueError, match="unsupported sector ranking source"):
+        service.get_ranking_history(source="zz", trade_dates=["20240105"], level=1)
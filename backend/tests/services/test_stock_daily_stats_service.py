@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import unittest
 
+import numpy as np
 import pandas as pd
 
 from app.schemas.stock_daily_stats import StockDailyStatsScreenRequest
@@ -103,6 +104,52 @@ class BuildStockDailyStatsItemsTestCase(unittest.TestCase):
         self.assertAlmostEqual(11.0, item["latest_close"], places=6)
         self.assertAlmostEqual(-8.3333333333, item["latest_pct_chg"], places=6)
 
+    def test_streaks_and_counts_match_per_stock_reference(self) -> None:
+        rng = np.random.default_rng(3)
+        dates = [f"202603{day:02d}" for day in range(1, 21)]
+        rows = []
+        for code in ["000001.SZ", "000002.SZ", "600000.SH"]:
+            closes = np.round(10 + rng.integers(-2, 3, len(dates)).cumsum() * 0.1, 2)
+            pre_closes = np.r_[10.0, closes[:-1]]
+            for trade_date, close, pre_close in zip(dates, closes, pre_closes):
+                rows.append(
+                    {
+                        "ts_code": code,
+                        "trade_date": trade_date,
+                        "close": close,
+                        "pre_close": pre_close,
+                        "pct_chg": None,
+                        "amount": float(rng.integers(100, 1000)),
+                    }
+                )
+        frame = pd.DataFrame(rows).sample(frac=1.0, random_state=1)
+
+        items = build_stock_daily_stats_items(
+            frame,
+            trade_dates=dates,
+            basics_by_code={},
+            start_date=dates[0],
+            end_date=dates[-1],
+        )
+
+        def _reference_streak(directions: list[int], target: int) -> int:
+            best = current = 0
+            for direction in directions:
+                current = current + 1 if direction == target else 0
+                best = max(best, current)
+            return best
+
+        self.assertEqual(["000001.SZ", "000002.SZ", "600000.SH"], [item["ts_code"] for item in items])
+        for item in items:
+            group = pd.DataFrame(rows)
+            group = group[group["ts_code"] == item["ts_code"]]
+            directions = np.sign(group["close"] - group["pre_close"]).astype(int).tolist()
+            self.assertEqual(_reference_streak(directions, 1), item["max_up_streak"])
+            self.assertEqual(_reference_streak(directions, -1), item["max_down_streak"])
+            self.assertEqual(directions.count(1), item["up_days"])
+            self.assertEqual(directions.count(0), item["flat_days"])
+            self.assertAlmostEqual(group["amount"].mean(), item["avg_amount"], places=6)
+
 
 class FilterSortPaginateStockDailyStatsTestCase(unittest.TestCase):
     def test_filters_sort_and_paginate(self) -> None:
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from app.services import strategy_signal_service as service
+
+_DATES = ["20240102", "20240103", "20240104", "20240105"]
+
+
+def _frame(trade_date: str) -> pd.DataFrame:
+    rng = np.random.default_rng(int(trade_date))
+    size = 12
+    codes = [f"{600000 + i}.SH" for i in range(size)]
+    close = rng.uniform(5, 20, size)
+    return pd.DataFrame(
+        {
+            "ts_code": codes,
+            "trade_date": trade_date,
+            "name": [f"stock{i}" for i in range(size)],
+            "industry": ["银行", "电子", "医药"] * 4,
+            "list_date": ["20100101"] * (size - 1) + ["20231220"],
+            "open": close,
+            "close": close,
+            "close_qfq": close,
+            "amount": rng.uniform(10_000, 90_000, size),
+            "ma20": close * rng.uniform(0.9, 1.1, size),
+            "ma60": close * rng.uniform(0.9, 1.1, size),
+            "macd": rng.normal(0, 1, size),
+            "macd_signal": rng.normal(0, 1, size),
+            "macd_hist": rng.normal(0, 1, size),
+            "rsi12": rng.uniform(20, 90, size),
+            "kdj_k": rng.uniform(0, 100, size),
+            "kdj_d": rng.uniform(0, 100, size),
+            "kdj_j": rng.uniform(0, 100, size),
+            "boll_upper": close * 1.1,
+            "boll_middle": close,
+            "boll_lower": close * 0.9,
+            "pct_chg": rng.normal(0, 3, size),
+            "pe_ttm": rng.uniform(5, 50, size),
+            "pb": rng.uniform(0.5, 5, size),
+            "turnover_rate": rng.uniform(0.1, 5, size),
+            "atr": rng.uniform(0.1, 1, size),
+            "volume_ratio": rng.uniform(0.5, 3, size),
+        }
+    )
+
+
+class _FakeCollection:
+    def __init__(self) -> None:
+        self.deleted: list[dict] = []
+
+    def delete_many(self, query: dict) -> SimpleNamespace:
+        self.deleted.append(query)
+        return SimpleNamespace(deleted_count=1)
+
+
+def _patch_sources(monkeypatch) -> dict[str, list]:
+    calls: dict[str, list] = {"bundles": [], "upserts": []}
+    versions = [
+        {"strategy_id": "s1", "strategy_version_id": "v1", "strategy_key": "multifactor_v1", "params_snapshot": {}},
+        {
+            "strategy_id": "s2",
+            "strategy_version_id": "v2",
+            "strategy_key": "musecat_v1",
+            "params_snapshot": {"signal_store_topk": 5},
+        },
+    ]
+
+    def _bundle(*, trade_date: str, next_trade_date: str, universe_df: pd.DataFrame) -> SimpleNamespace:
+        calls["bundles"].append(trade_date)
+        return SimpleNamespace(
+            frame_t=_frame(trade_date),
+            market_factor_t={},
+            sector_rows_t=[],
+            shenwan_member_codes_t={},
+            citic_member_codes_t={},
+        )
+
+    def _upsert(rows: list[dict]) -> int:
+        calls["upserts"].append(rows)
+        return len(rows)
+
+    collection = _FakeCollection()
+    calls["collection"] = collection
+    monkeypatch.setattr(service, "normalize_date", lambda value: str(value).replace("-", ""))
+    monkeypatch.setattr(
+        service,
+        "_list_open_dates_with_next",
+        lambda start_date, end_date: [item for item in _DATES if item >= start_date],
+    )
+    monkeypatch.setattr(service, "_load_index_member_codes", lambda **kwargs: set())
+    monkeypatch.setattr(service, "_load_strategy_versions", lambda **kwargs: versions)
+    monkeypatch.setattr(service, "list_stock_universe", lambda: pd.DataFrame({"ts_code": []}))
+    monkeypatch.setattr(service, "load_daily_data_bundle", _bundle)
+    monkeypatch.setattr(service, "upsert_strategy_signals", _upsert)
+    monkeypatch.setattr(service, "get_collection", lambda name: collection)
+    return calls
+
+
+def _comparable(rows: list[dict]) -> list[dict]:
+    return [{key: value for key, value in row.items() if key != "generated_at"} for row in rows]
+
+
+def test_range_backfill_loads_each_date_once_and_replaces_per_block(monkeypatch) -> None:
+    calls = _patch_sources(monkeypatch)
+
+    result = service.generate_strategy_signals_for_range(start_date="20240102", end_date="20240104", block_days=2)
+
+    assert result["status"] == "success"
+    assert result["signal_dates"] == 3
+    assert calls["bundles"] == ["20240102", "20240103", "20240104"]
+    ranges = [
+        (item["strategy_version_id"], item["signal_date"]["$gte"], item["signal_date"]["$lte"])
+        for item in calls["collection"].deleted
+    ]
+    assert ranges == [
+        ("v1", "20240102", "20240103"),
+        ("v2", "20240102", "20240103"),
+        ("v1", "20240104", "20240104"),
+        ("v2", "20240104", "20240104"),
+    ]
+    v2_rows = [row for rows in calls["upserts"] for row in rows if row["strategy_version_id"] == "v2"]
+    assert len(v2_rows) == 15
+    assert {row["signal_trade_date"] for row in v2_rows if row["signal_date"] == "20240104"} == {"20240105"}
+    # The recently listed stock is filtered by list_days.
+    assert all(row["ts_code"] != "600011.SH" for rows in calls["upserts"] for row in rows)
+    assert result["total_upserted"] == sum(len(rows) for rows in calls["upserts"])
+
+
+def test_range_backfill_keeps_going_after_a_failed_block(monkeypatch) -> None:
+    calls = _patch_sources(monkeypatch)
+    replace = service._replace_strategy_signals_for_range
+
+    def _flaky_replace(**kwargs):
+        if kwargs["strategy_version_id"] == "v1" and kwargs["start_date"] == "20240103":
+            raise RuntimeError("mongo down")
+        return replace(**kwargs)
+
+    monkeypatch.setattr(service, "_replace_strategy_signals_for_range", _flaky_replace)
+
+    result = service.generate_strategy_signals_for_range(start_date="20240102", end_date="20240104", block_days=1)
+
+    assert result["status"] == "degraded"
+    stats = {item["strategy_version_id"]: item for item in result["version_stats"]}
+    assert stats["v1"]["status"] == "degraded"
+    assert stats["v1"]["failed_blocks"] == [
+        {"start_date": "20240103", "end_date": "20240103", "reason": "block_exception:mongo down"}
+    ]
+    assert (stats["v2"]["status"], stats["v2"]["failed_blocks"]) == ("success", [])
+    v1_dates = {row["signal_date"] for rows in calls["upserts"] for row in rows if row["strategy_version_id"] == "v1"}
+    assert v1_dates == {"20240102", "20240104"}
+
+
+def test_range_backfill_matches_single_date_generation(monkeypatch) -> None:
+    calls = _patch_sources(monkeypatch)
+    monkeypatch.setattr(service, "is_open_trade_date", lambda trade_date: True)
+    monkeypatch.setattr(service, "get_next_open_trade_date", lambda trade_date: "20240104")
+    monkeypatch.setattr(service, "delete_strategy_signals", lambda **kwargs: 0)
+
+    service.generate_strategy_signals_for_date(signal_date="20240103")
+    single_rows = [row for rows in calls["upserts"] for row in rows]
+    calls["upserts"].clear()
+    service.generate_strategy_signals_for_range(start_date="20240103", end_date="20240103")
+    range_rows = [row for rows in calls["upserts"] for row in rows]
+
+    assert single_rows
+    assert _comparable(range_rows) == _comparable(single_rows)
+
+
+def _with_fundamentals(frame: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    codes = frame["ts_code"].str[:6].astype(int)
+    return frame.assign(roe=(codes % 7) * 3.0, debt_to_assets=(codes % 5) * 15.0)
+
+
+def _scores(rows: list[dict]) -> list[tuple]:
+    return sorted((row["signal_date"], row["ts_code"], row["score"]) for row in rows)
+
+
+def test_version_fundamental_fields_score_like_the_backtest(monkeypatch) -> None:
+    calls = _patch_sources(monkeypatch)
+    monkeypatch.setattr(service, "is_open_trade_date", lambda trade_date: True)
+    monkeypatch.setattr(service, "get_next_open_trade_date", lambda trade_date: "20240104")
+    monkeypatch.setattr(service, "delete_strategy_signals", lambda **kwargs: 0)
+    attached: list[tuple] = []
+
+    def _attach(frame: pd.DataFrame, *, fields, trade_date) -> pd.DataFrame:
+        attached.append((tuple(fields), trade_date))
+        return _with_fundamentals(frame)
+
+    def _versions(params_snapshot: dict) -> list[dict]:
+        return [{"strategy_id": "s1", "strategy_version_id": "v1", "strategy_key": "multifactor_v1", "params_snapshot": params_snapshot}]
+
+    def _run() -> tuple[list[dict], list[dict]]:
+        calls["upserts"].clear()
+        service.generate_strategy_signals_for_date(signal_date="20240103")
+        single = [row for rows in calls["upserts"] for row in rows]
+        calls["upserts"].clear()
+        service.generate_strategy_signals_for_range(start_date="20240102", end_date="20240104")
+        return single, [row for rows in calls["upserts"] for row in rows]
+
+    monkeypatch.setattr(service, "attach_fundamentals", _attach)
+    monkeypatch.setattr(service, "_load_strategy_versions", lambda **kwargs: _versions({"fundamental_fields": ["roe", "debt_to_assets"]}))
+    single, ranged = _run()
+
+    # The backtest engine scores frames loaded with load_daily_data_bundle(fundamental_fields=...).
+    loader = service.load_daily_data_bundle
+    monkeypatch.setattr(
+        service,
+        "load_daily_data_bundle",
+        lambda **kwargs: SimpleNamespace(**{**vars(loader(**kwargs)), "frame_t": _with_fundamentals(loader(**kwargs).frame_t)}),
+    )
+    monkeypatch.setattr(service, "_load_strategy_versions", lambda **kwargs: _versions({}))
+    attached_before = len(attached)
+    backtest_single, backtest_ranged = _run()
+    monkeypatch.setattr(service, "load_daily_data_bundle", loader)
+    plain_single, _ = _run()
+
+    assert {item[0] for item in attached} == {("roe", "debt_to_assets")}
+    assert len(attached) == attached_before == 1 + 3
+    assert _scores(single) == _scores(backtest_single)
+    assert _scores(ranged) == _scores(backtest_ranged)
+    assert _scores(single) != _scores(plain_single)
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import app.services.data_sync_service as data_sync_service
+from app.services.sync_log_stream import LogFollower, LogFollowerHub, SparseLineIndex, iter_log_events
+
+
+def _events(chunks: list[str]) -> list[tuple[str, dict[str, Any]]]:
+    parsed = []
+    for chunk in chunks:
+        if chunk.startswith(":"):
+            continue
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+        parsed.append((fields["event"], json.loads(fields["data"])))
+    return parsed
+
+
+def _follower(path, **kwargs) -> LogFollower:
+    kwargs.setdefault("is_finished", lambda: False)
+    return LogFollower(path, index_every=10, poll_interval_seconds=0.01, status_check_seconds=0.05, **kwargs)
+
+
+def test_sparse_index_seeks_by_line_number(tmp_path) -> None:
+    lines = [f"line {idx}\n".encode() for idx in range(95)]
+    path = tmp_path / "job.log"
+    path.write_bytes(b"".join(lines))
+    follower = _follower(path)
+
+    follower.poll_once()
+
+    assert follower.index.lines == 95
+    assert len(follower.index.checkpoints) == 10
+    assert follower.index.locate(37) == (sum(len(item) for item in lines[:30]), 30)
+    for line in (0, 9, 10, 37, 94):
+        offset = follower.offset_for_line(line)
+        assert follower.read(offset, 64).split(b"\n", 1)[0] == f"line {line}".encode()
+    assert follower.offset_for_line(500) == follower.size
+    follower.close()
+
+    index = SparseLineIndex(every=3)
+    for piece in (b"a\nb", b"\nc\n", b"d\ne\nf\n"):
+        index.feed(piece)
+    assert (index.lines, index.checkpoints) == (6, [0, 6, 12])
+
+
+def test_concurrent_polls_index_every_byte_once(tmp_path) -> None:
+    path = tmp_path / "job.log"
+    path.write_bytes(b"".join(f"row {idx:06d} payload\n".encode() for idx in range(200_000)))
+    follower = _follower(path)
+    barrier = threading.Barrier(4)
+
+    def _poll() -> None:
+        barrier.wait()
+        for _ in range(5):
+            follower.poll_once()
+
+    pollers = [threading.Thread(target=_poll) for _ in range(4)]
+    for poller in pollers:
+        poller.start()
+    for poller in pollers:
+        poller.join(timeout=10)
+
+    assert (follower.size, follower.index.lines) == (path.stat().st_size, 200_000)
+    assert follower.read(follower.offset_for_line(123_456), 64).startswith(b"row 123456 ")
+    follower.close()
+
+
+def test_shared_follower_streams_appends_to_every_subscriber(tmp_path) -> None:
+    path = tmp_path / "job.log"
+    path.write_text("start\n")
+    hub = LogFollowerHub(follower_factory=_follower)
+    first = hub.acquire("job-1", path, is_finished=lambda: False)
+    second = hub.acquire("job-1", path, is_finished=lambda: False)
+    assert first is second and first.subscribers == 2
+
+    def _status() -> dict[str, Any]:
+        return {"status": "success"}
+
+    results: dict[str, list[str]] = {}
+
+    async def _collect(offset: int) -> list[str]:
+        return [chunk async for chunk in iter_log_events(first, offset=offset, job_status=_status, heartbeat_seconds=0.05)]
+
+    def _consume(name: str, offset: int) -> None:
+        results[name] = asyncio.run(_collect(offset))
+
+    readers = [threading.Thread(target=_consume, args=("a", 0)), threading.Thread(target=_consume, args=("b", 6))]
+    for reader in readers:
+        reader.start()
+    with path.open("a") as fh:
+        for idx in range(3):
+            fh.write(f"step {idx}")
+            fh.flush()
+            time.sleep(0.03)
+            fh.write(" done\n")
+            fh.flush()
+    time.sleep(0.05)
+    hub.mark_finished("job-1")
+    for reader in readers:
+        reader.join(timeout=5)
+
+    expected = "start\n" + "".join(f"step {idx} done\n" for idx in range(3))
+    for name, start in (("a", 0), ("b", 6)):
+        events = _events(results[name])
+        logs = [data for event, data in events if event == "log"]
+        assert all(data["content"].endswith("\n") for data in logs)
+        assert "".join(data["content"] for data in logs) == expected[start:]
+        assert [event for event, _ in events[-2:]] == ["status", "end"]
+        assert events[-2][1] == {"status": "success"}
+        assert events[-1][1] == {"next_offset": len(expected)}
+    assert first.finished
+
+    hub.release("job-1")
+    hub.release("job-1")
+    assert first.subscribers == 0
+
+
+def test_stream_subscribes_on_first_pull_and_releases_on_close(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "job.log"
+    path.write_text("a\nb\n")
+    hub = LogFollowerHub(follower_factory=_follower)
+    monkeypatch.setattr(data_sync_service, "_LOG_HUB", hub)
+    monkeypatch.setattr(
+        data_sync_service,
+        "get_sync_job",
+        lambda job_id: {"job_id": job_id, "status": "running", "log_file": str(path)},
+    )
+
+    data_sync_service.stream_sync_job_logs("job-1")
+    assert hub._followers == {}
+
+    async def _first_event_then_disconnect() -> tuple[str, int]:
+        events = data_sync_service.stream_sync_job_logs("job-1")
+        first = await anext(events)
+        subscribers = hub._followers["job-1"].subscribers
+        await events.aclose()
+        return first, subscribers
+
+    first, subscribers = asyncio.run(_first_event_then_disconnect())
+
+    assert subscribers == 1
+    assert _events([first]) == [("log", {"offset": 0, "next_offset": 4, "content": "a\nb\n"})]
+    assert hub._followers["job-1"].subscribers == 0
+    hub._followers["job-1"].close()
+
+
+class _FakeJobRuns:
+    def __init__(self, rows: dict[str, dict[str, Any]]) -> None:
+        self.rows = rows
+
+    def update_one(self, query: dict[str, Any], update: dict[str, Any]) -> SimpleNamespace:
+        row = self.rows.get(query["job_id"])
+        if row is None or row.get("status") not in query["status"]["$in"]:
+            return SimpleNamespace(modified_count=0)
+        row.update(update["$set"])
+        return SimpleNamespace(modified_count=1)
+
+
+def _fake_sync_runtime(tmp_path, monkeypatch) -> tuple[dict[str, dict[str, Any]], list[str], threading.Event]:
+    rows: dict[str, dict[str, Any]] = {}
+    reads: list[str] = []
+    release = threading.Event()
+
+    def _create(**fields: Any) -> None:
+        rows[fields["job_id"]] = dict(fields)
+
+    def _update(*, job_id: str, **fields: Any) -> None:
+        rows[job_id].update(fields)
+
+    def _get(job_id: str) -> dict[str, Any] | None:
+        reads.append(job_id)
+        row = rows.get(job_id)
+        return dict(row) if row else None
+
+    class _FakeProcess:
+        pid = 4242
+
+        def __init__(self, cmd, *, stdout, **kwargs) -> None:
+            stdout.write(b"syncing\n")
+
+        def poll(self) -> int | None:
+            return 0 if release.is_set() else None
+
+        def wait(self) -> int:
+            release.wait(5)
+            return 0
+
+    monkeypatch.setattr(data_sync_service, "create_data_sync_job_run", _create)
+    monkeypatch.setattr(data_sync_service, "update_data_sync_job_run", _update)
+    monkeypatch.setattr(data_sync_service, "get_data_sync_job_run", _get)
+    monkeypatch.setattr(data_sync_service, "get_collection", lambda name: _FakeJobRuns(rows))
+    monkeypatch.setattr(data_sync_service, "_get_script_path", lambda: tmp_path / "scripts" / "daily" / "daily.sh")
+    monkeypatch.setattr(data_sync_service.subprocess, "Popen", _FakeProcess)
+    monkeypatch.setattr(data_sync_service.settings, "log_dir", tmp_path)
+    monkeypatch.setattr(data_sync_service, "_JOB_STATUS", {})
+    return rows, reads, release
+
+
+def _wait_until_not_running(job_id: str) -> None:
+    deadline = time.monotonic() + 5
+    while data_sync_service.get_sync_job(job_id)["status"] == "running" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    while job_id in data_sync_service._JOB_PROCESSES and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_exit_watcher_caches_final_status(tmp_path, monkeypatch) -> None:
+    rows, reads, release = _fake_sync_runtime(tmp_path, monkeypatch)
+
+    job = data_sync_service.create_sync_job(start_date="20260105", end_date="20260105", created_by="james")
+    job_id = job["job_id"]
+    assert job["status"] == "running"
+    reads.clear()
+    assert data_sync_service.get_sync_job(job_id)["status"] == "running"
+    assert data_sync_service.get_sync_job_logs(job_id, line=0)["content"] == "syncing\n"
+    assert reads == []
+
+    release.set()
+    _wait_until_not_running(job_id)
+
+    reads.clear()
+    final = data_sync_service.get_sync_job(job_id)
+    assert (final["status"], final["exit_code"]) == ("success", 0)
+    assert rows[job_id]["status"] == "success"
+    assert reads == []
+    assert job_id not in data_sync_service._JOB_PROCESSES
+
+
+def test_exit_watcher_keeps_a_cancel_written_by_another_worker(tmp_path, monkeypatch) -> None:
+    rows, _, release = _fake_sync_runtime(tmp_path, monkeypatch)
+
+    job_id = data_sync_service.create_sync_job(start_date="20260105", end_date="20260105", created_by="james")["job_id"]
+    rows[job_id]["status"] = "cancelled"
+    release.set()
+    _wait_until_not_running(job_id)
+
+    assert rows[job_id]["status"] == "cancelled"
+    assert rows[job_id].get("exit_code") is None
+    assert data_sync_service.get_sync_job(job_id)["status"] == "cancelled"
+
+
+def test_status_cache_evicts_oldest_finished_jobs(monkeypatch) -> None:
+    monkeypatch.setattr(data_sync_service, "_JOB_STATUS", {})
+    monkeypatch.setattr(data_sync_service, "_MAX_CACHED_FINISHED_JOBS", 2)
+
+    data_sync_service._cache_job({"job_id": "live", "status": "running"})
+    for idx in range(4):
+        data_sync_service._cache_job({"job_id": f"done-{idx}", "status": "success"})
+
+    assert list(data_sync_service._JOB_STATUS) == ["live", "done-2", "done-3"]
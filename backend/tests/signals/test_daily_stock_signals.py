@@ -5,11 +5,13 @@ import unittest
 import pandas as pd
 
 from app.signals.daily_stock_signals import (
+    build_pattern_hit_documents,
     build_resonance_documents,
     build_signal_documents,
     classify_resonance_level,
     compute_signal_flags_for_stock,
     generate_daily_stock_signal_docs_for_range,
+    iter_daily_stock_signal_docs_for_range,
 )
 
 
@@ -287,5 +289,115 @@ class GenerateDailyStockSignalDocsForRangeTestCase(unittest.TestCase):
         self.assertEqual(8, len(docs_for_0417))
 
 
+class IterDailyStockSignalDocsForRangeTestCase(unittest.TestCase):
+    def test_streaming_loads_per_chunk_and_matches_one_shot_documents(self) -> None:
+        dates = ["20260413", "20260414", "20260415", "20260416", "20260417"]
+        rows = []
+        for ts_code, drift in (("000001.SZ", 0.3), ("000002.SZ", -0.3)):
+            for index, trade_date in enumerate(dates):
+                level = 10.0 + drift * index
+                rows.append(
+                    {
+                        "ts_code": ts_code,
+                        "trade_date": trade_date,
+                        "open": level - drift,
+                        "high": level + 0.5,
+                        "low": level - 0.5,
+                        "close": level,
+                        "pct_chg": drift * 3,
+                        "close_qfq": level,
+                        "ma5": level + drift,
+                        "ma10": level,
+                        "ma20": level - drift,
+                        "ma60": level - 2 * drift,
+                        "macd": drift * (index - 2),
+                        "macd_signal": 0.0,
+                        "kdj_k": 50.0 + drift * 10 * (index - 2),
+                        "kdj_d": 50.0,
+                        "rsi6": 50.0 + index,
+                        "rsi12": 52.0,
+                        "volume_ratio": 1.0 + index * 0.2,
+                        "ma30": level,
+                        "ma90": level,
+                        "ma250": level,
+                        "boll_upper": level + 1.0,
+                        "boll_lower": level - 1.0,
+                    }
+                )
+        frame = pd.DataFrame(rows)
+
+        from app.signals import daily_stock_signals as module
+
+        loads = []
+
+        def fake_loader(*, start_date, end_date):
+            loads.append((start_date, end_date))
+            return frame[(frame["trade_date"] >= start_date) & (frame["trade_date"] <= end_date)].reset_index(drop=True)
+
+        originals = (module._load_joined_market_frame, module._load_limit_frame, module.get_stock_basic_map)
+        try:
+            module._load_joined_market_frame = fake_loader
+            module._load_limit_frame = lambda start_date, end_date: pd.DataFrame()
+            module.get_stock_basic_map = lambda ts_codes: {}
+
+            expected = generate_daily_stock_signal_docs_for_range(
+                start_date="20260414", end_date="20260417", target_dates=dates[1:]
+            )
+            loads.clear()
+            streamed = list(
+                iter_daily_stock_signal_docs_for_range(
+                    start_date="20260414", end_date="20260417", target_dates=dates[1:], chunk_days=2
+                )
+            )
+        finally:
+            module._load_joined_market_frame, module._load_limit_frame, module.get_stock_basic_map = originals
+
+        self.assertEqual([end for _, end in loads], ["20260415", "20260417"])
+        self.assertEqual(dates[1:], [trade_date for trade_date, *_ in streamed])
+        for position, docs in enumerate(expected):
+            self.assertEqual(docs, [doc for item in streamed for doc in item[position + 1]])
+
+
+class BuildPatternHitDocumentsTestCase(unittest.TestCase):
+    def test_inverts_group_documents_per_trade_date_and_stock(self) -> None:
+        stock = {"ts_code": "000001.SZ", "name": "平安银行", "industry": "银行", "close": 10.0, "pct_chg": 1.5, "volume_ratio": 2.0}
+        signal_docs = [
+            {"trade_date": "20260417", "signal_type": "buy_macd_kdj_double_cross", "signal_side": "buy", "stocks": [stock]},
+            {"trade_date": "20260417", "signal_type": "buy_rsi_rebound", "signal_side": "buy", "stocks": [stock, {**stock, "ts_code": "000002.SZ"}]},
+        ]
+        resonance_docs = [
+            {
+                "trade_date": "20260417",
+                "signal_side": "buy",
+                "resonance_level": "normal",
+                "stocks": [{**stock, "signal_count": 2, "signal_types": ["buy_macd_kdj_double_cross", "buy_rsi_rebound"]}],
+            }
+        ]
+        pattern_resonance_docs = [
+            {
+                "trade_date": "20260417",
+                "signal_side": "buy",
+                "resonance_level": "strong",
+                "stocks": [{**stock, "weighted_score": 7, "patterns": ["hammer"], "pattern_categories": {}, "user_state": "acknowledged"}],
+            }
+        ]
+
+        hits = build_pattern_hit_documents(
+            signal_docs=signal_docs,
+            resonance_docs=resonance_docs,
+            pattern_resonance_docs=pattern_resonance_docs,
+        )
+
+        self.assertEqual([("20260417", "000001.SZ"), ("20260417", "000002.SZ")], [(h["trade_date"], h["ts_code"]) for h in hits])
+        first = hits[0]
+        self.assertEqual(["buy_macd_kdj_double_cross", "buy_rsi_rebound"], [s["signal_type"] for s in first["signals"]])
+        self.assertEqual(2, first["resonance"][0]["signal_count"])
+        self.assertEqual(
+            [{"signal_side": "buy", "resonance_level": "strong", "weighted_score": 7, "patterns": ["hammer"], "pattern_categories": {}, "user_state": "acknowledged"}],
+            first["pattern_resonance"],
+        )
+        self.assertEqual([], hits[1]["pattern_resonance"])
+
+
 if __name__ == "__main__":
     unittest.main()
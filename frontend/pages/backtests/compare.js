@@ -17,27 +17,26 @@ const formatDate = (value) => {
   return `${text.slice(0, 4)}-${text.slice(4, 6)}-${text.slice(6, 8)}`;
 };
 
-const buildCompareChartOption = (items = []) => {
-  const dateSet = new Set();
-  items.forEach((item) => {
-    (item.nav_series || []).forEach((row) => dateSet.add(String(row.trade_date)));
-  });
-  const dates = Array.from(dateSet).sort();
-  const series = items.map((item, idx) => {
-    const map = new Map((item.nav_series || []).map((row) => [String(row.trade_date), Number(row.nav || 0)]));
+const CHART_MAX_POINTS = 1500;
+
+const buildCompareChartOption = (compare) => {
+  const runIds = compare?.run_ids || [];
+  const dates = compare?.dates || [];
+  const navColumns = compare?.nav || [];
+  const series = runIds.map((runId, idx) => {
     const colorSet = ["#e23b2e", "#0ea5e9", "#16a34a", "#a855f7", "#f59e0b"];
     return {
-      name: item.run_id,
+      name: runId,
       type: "line",
       showSymbol: false,
       smooth: true,
       lineStyle: { width: 2, color: colorSet[idx % colorSet.length] },
-      data: dates.map((date) => map.get(date) ?? null),
+      data: navColumns[idx] || [],
     };
   });
   return {
     tooltip: { trigger: "axis" },
-    legend: { top: 8, data: items.map((item) => item.run_id) },
+    legend: { top: 8, data: runIds },
     grid: { left: 56, right: 24, top: 40, bottom: 36 },
     xAxis: { type: "category", data: dates.map((item) => formatDate(item)) },
     yAxis: { type: "value", name: "净值" },
@@ -52,6 +51,7 @@ export default function BacktestComparePage() {
 
   const [runIdsInput, setRunIdsInput] = useState("");
   const [items, setItems] = useState([]);
+  const [compare, setCompare] = useState(null);
   const [error, setError] = useState("");
   const [loading, setLoading] = useState(false);
 
@@ -64,6 +64,12 @@ export default function BacktestComparePage() {
     return Array.from(set).sort();
   }, [items]);
 
+  const relativeByRun = useMemo(() => {
+    const map = new Map();
+    (compare?.relative_metrics || []).forEach((row) => map.set(row.run_id, row));
+    return map;
+  }, [compare]);
+
   const loadData = async (runIds) => {
     if (!runIds.length) return;
     setLoading(true);
@@ -72,7 +78,7 @@ export default function BacktestComparePage() {
       const res = await apiFetch("/backtests/compare", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ run_ids: runIds }),
+        body: JSON.stringify({ run_ids: runIds, max_points: CHART_MAX_POINTS }),
       });
       if (!res.ok) {
         const detail = await res.json().catch(() => ({}));
@@ -80,9 +86,11 @@ export default function BacktestComparePage() {
       }
       const data = await res.json();
       setItems(data.items || []);
+      setCompare(data);
     } catch (err) {
       setError(err.message || "加载失败");
       setItems([]);
+      setCompare(null);
     } finally {
       setLoading(false);
     }
@@ -101,14 +109,14 @@ export default function BacktestComparePage() {
   }, [router.query.run_ids]);
 
   useEffect(() => {
-    if (!chartRef.current || items.length === 0) return;
+    if (!chartRef.current || !compare || items.length === 0) return;
     let disposed = false;
     import("echarts").then((echarts) => {
       if (disposed || !chartRef.current) return;
       if (!chartInstanceRef.current) {
         chartInstanceRef.current = echarts.init(chartRef.current);
       }
-      chartInstanceRef.current.setOption(buildCompareChartOption(items), true);
+      chartInstanceRef.current.setOption(buildCompareChartOption(compare), true);
     });
     const handleResize = () => chartInstanceRef.current?.resize();
     window.addEventListener("resize", handleResize);
@@ -116,7 +124,7 @@ export default function BacktestComparePage() {
       disposed = true;
       window.removeEventListener("resize", handleResize);
     };
-  }, [items]);
+  }, [compare, items]);
 
   useEffect(() => () => chartInstanceRef.current?.dispose(), []);
 
@@ -142,7 +150,7 @@ export default function BacktestComparePage() {
         <div>
           <p className="eyebrow">Backtests Compare</p>
           <h1>回测对比</h1>
-          <p className="subtitle">最多选择 5 个 run 进行净值与年度指标对比</p>
+          <p className="subtitle">最多选择 5 个 run 进行净值与年度指标对比；相关性/跟踪误差/超额回撤以第一个 run 为基准</p>
         </div>
         <div className="header-actions">
           <Link className="primary" href="/strategies">
@@ -188,6 +196,9 @@ export default function BacktestComparePage() {
             <tr>
               <th>Run ID</th>
               <th>累计收益</th>
+              <th>相关性</th>
+              <th>跟踪误差</th>
+              <th>超额回撤</th>
               {years.map((year) => (
                 <th key={`ret-${year}`}>{year} 年化</th>
               ))}
@@ -199,7 +210,7 @@ export default function BacktestComparePage() {
           <tbody>
             {items.length === 0 ? (
               <tr>
-                <td colSpan={2 + years.length * 2} className="empty">
+                <td colSpan={5 + years.length * 2} className="empty">
                   暂无对比数据
                 </td>
               </tr>
@@ -207,6 +218,8 @@ export default function BacktestComparePage() {
               items.map((item) => {
                 const annualReturns = item?.summary_metrics?.annual_returns || {};
                 const annualDrawdowns = item?.summary_metrics?.annual_max_drawdowns || {};
+                const relative = relativeByRun.get(item.run_id);
+                const correlation = relative?.correlation;
                 return (
                   <tr key={item.run_id}>
                     <td>
@@ -215,6 +228,9 @@ export default function BacktestComparePage() {
                       </Link>
                     </td>
                     <td>{formatPct(item?.summary_metrics?.total_return)}</td>
+                    <td>{correlation === null || correlation === undefined ? "-" : Number(correlation).toFixed(3)}</td>
+                    <td>{formatPct(relative?.tracking_error)}</td>
+                    <td>{formatPct(relative?.excess_max_drawdown)}</td>
                     {years.map((year) => (
                       <td key={`${item.run_id}-ret-${year}`}>{formatPct(annualReturns[year])}</td>
                     ))}
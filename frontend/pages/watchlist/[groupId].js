@@ -127,7 +127,7 @@ function ThSort({ label, field, sortField, sortDir, onSort }) {
 }
 
 /* ── Sort helper ── */
-const SORT_FIELDS = ["total_mv", "latest_pct_chg", "pct_chg_3d", "pct_chg_5d"];
+const SORT_FIELDS = ["total_mv", "latest_pct_chg", "pct_chg_3d", "pct_chg_5d", "pct_chg_20d"];
 
 function sortItems(items, field, dir) {
   if (!field || !SORT_FIELDS.includes(field)) return items;
@@ -330,6 +330,7 @@ export default function WatchlistGroupDetail() {
                 <ThSort label="近1日涨跌" field="latest_pct_chg" sortField={sortField} sortDir={sortDir} onSort={handleSort} />
                 <ThSort label="近3日涨跌" field="pct_chg_3d" sortField={sortField} sortDir={sortDir} onSort={handleSort} />
                 <ThSort label="近5日涨跌" field="pct_chg_5d" sortField={sortField} sortDir={sortDir} onSort={handleSort} />
+                <ThSort label="近20日涨跌" field="pct_chg_20d" sortField={sortField} sortDir={sortDir} onSort={handleSort} />
                 <ThSort label="总市值" field="total_mv" sortField={sortField} sortDir={sortDir} onSort={handleSort} />
                 <th>近期信号</th>
                 <th className="th-remark">备注</th>
@@ -369,6 +370,11 @@ export default function WatchlistGroupDetail() {
                         {formatPct(item.pct_chg_5d)}
                       </span>
                     </td>
+                    <td>
+                      <span className={`change-pill ${getChangeClass(item.pct_chg_20d)}`}>
+                        {formatPct(item.pct_chg_20d)}
+                      </span>
+                    </td>
                     <td className="mv-cell">
                       <span className="mv-value">{formatMarketCap(item.total_mv)}</span>
                     </td>
@@ -292,6 +292,19 @@ async def get_daily_snapshot(
     return _fmt(data)
 
 
+@mcp.tool()
+async def get_batch_quotes(ts_codes: str, include_signal: bool = True) -> str:
+    """批量获取股票最新行情：收盘价、1/3/5/20 日涨跌幅、换手率、涨跌停状态与最新信号（按字段列式返回）。
+
+    Args:
+        ts_codes: 股票代码列表，逗号分隔，如 "600519.SH,000858.SZ"，最多 5000 个
+        include_signal: 是否附带最新 BUY/SELL 信号，默认 True
+    """
+    codes = [code.strip() for code in ts_codes.split(",") if code.strip()]
+    data = await _post("/stocks/quotes/batch", {"ts_codes": codes, "include_signal": include_signal})
+    return _fmt(data)
+
+
 @mcp.tool()
 async def get_stock_daily_basic(
     ts_code: str,
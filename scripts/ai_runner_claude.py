@@ -2,14 +2,29 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import math
+import os
 import subprocess
+import threading
 import time
 from collections import defaultdict
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from typing import Any
+from pathlib import Path
+from typing import Any, Callable
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / "data" / "ai_runner_cache"
+DEFAULT_CACHE_TTL_HOURS = 72.0
+
+# Bump a skill's version whenever its prompt, schema or post-processing changes so
+# cached results produced by the old prompt are no longer served.
+PROMPT_VERSIONS = {
+    "findata-toolkit-cn": "findata-v1",
+    "quant-factor-screener": "quant-factor-v1",
+    "sector-rotation-detector": "sector-rotation-v1",
+}
 
 
 class ClaudeRunnerError(Exception):
@@ -384,10 +399,75 @@ def _build_sector_rotation(
     return {"rows": output_rows}, latency_ms, model_name
 
 
+SkillBuilder = Callable[..., tuple[dict[str, Any], int, str]]
+
+_SKILL_BUILDERS: dict[str, SkillBuilder] = {
+    "findata-toolkit-cn": _build_findata,
+    "quant-factor-screener": _build_quant_factor,
+    "sector-rotation-detector": _build_sector_rotation,
+}
+
+
+class SkillResultCache:
+    """Disk cache of successful skill outputs keyed by (skill, prompt version, model, input)."""
+
+    def __init__(self, cache_dir: Path, ttl_seconds: float) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = max(float(ttl_seconds), 0.0)
+
+    @staticmethod
+    def build_key(*, skill_name: str, model: str, input_data: dict[str, Any]) -> str:
+        normalized = json.dumps(
+            {
+                "skill_name": skill_name,
+                "prompt_version": PROMPT_VERSIONS.get(skill_name, ""),
+                "model": model,
+                "input": input_data,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> tuple[dict[str, Any], str] | None:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        if time.time() - _to_float(entry.get("created_at"), 0.0) > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+        data = entry.get("data")
+        if not isinstance(data, dict):
+            return None
+        return data, str(entry.get("model") or "")
+
+    def put(self, key: str, *, skill_name: str, data: dict[str, Any], model_name: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "created_at": time.time(),
+            "skill_name": skill_name,
+            "prompt_version": PROMPT_VERSIONS.get(skill_name, ""),
+            "model": model_name,
+            "data": data,
+        }
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
 class ClaudeAIRunnerHandler(BaseHTTPRequestHandler):
     token: str = ""
     claude_bin: str = "claude"
     model: str = ""
+    cache: SkillResultCache | None = None
 
     def do_GET(self) -> None:  # noqa: N802
         if self.path.rstrip("/") in {"", "/", "/health"}:
@@ -430,29 +510,10 @@ class ClaudeAIRunnerHandler(BaseHTTPRequestHandler):
         input_data = payload.get("input") if isinstance(payload.get("input"), dict) else {}
 
         skill_name = self.path.split("/v1/skills/", 1)[-1].strip("/")
+        cache_bypass = bool(payload.get("cache_bypass"))
         try:
-            if skill_name == "findata-toolkit-cn":
-                data, latency_ms, model_name = _build_findata(
-                    claude_bin=self.claude_bin,
-                    model=self.model,
-                    timeout_seconds=timeout_sec,
-                    input_data=input_data,
-                )
-            elif skill_name == "quant-factor-screener":
-                data, latency_ms, model_name = _build_quant_factor(
-                    claude_bin=self.claude_bin,
-                    model=self.model,
-                    timeout_seconds=timeout_sec,
-                    input_data=input_data,
-                )
-            elif skill_name == "sector-rotation-detector":
-                data, latency_ms, model_name = _build_sector_rotation(
-                    claude_bin=self.claude_bin,
-                    model=self.model,
-                    timeout_seconds=timeout_sec,
-                    input_data=input_data,
-                )
-            else:
+            builder = _SKILL_BUILDERS.get(skill_name)
+            if builder is None:
                 _json_response(
                     self,
                     {
@@ -468,6 +529,39 @@ class ClaudeAIRunnerHandler(BaseHTTPRequestHandler):
                 )
                 return
 
+            cache_key = ""
+            if self.cache is not None:
+                cache_key = SkillResultCache.build_key(skill_name=skill_name, model=self.model, input_data=input_data)
+                cached = None if cache_bypass else self.cache.get(cache_key)
+                if cached is not None:
+                    data, model_name = cached
+                    _json_response(
+                        self,
+                        {
+                            "ok": True,
+                            "status": "success",
+                            "error": "",
+                            "request_id": request_id,
+                            "data": data,
+                            "latency_ms": 0,
+                            "model": model_name,
+                            "cached": True,
+                        },
+                    )
+                    return
+
+            data, latency_ms, model_name = builder(
+                claude_bin=self.claude_bin,
+                model=self.model,
+                timeout_seconds=timeout_sec,
+                input_data=input_data,
+            )
+            if self.cache is not None:
+                try:
+                    self.cache.put(cache_key, skill_name=skill_name, data=data, model_name=model_name)
+                except Exception as exc:
+                    print(f"[ai-runner-claude] cache write failed for {skill_name}: {exc}", flush=True)
+
             _json_response(
                 self,
                 {
@@ -478,6 +572,7 @@ class ClaudeAIRunnerHandler(BaseHTTPRequestHandler):
                     "data": data,
                     "latency_ms": latency_ms,
                     "model": model_name,
+                    "cached": False,
                 },
             )
         except ClaudeRunnerError as exc:
@@ -518,11 +613,16 @@ def main() -> None:
     parser.add_argument("--token", type=str, default="")
     parser.add_argument("--claude-bin", type=str, default="claude")
     parser.add_argument("--model", type=str, default="")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Skill result cache directory")
+    parser.add_argument("--cache-ttl-hours", type=float, default=DEFAULT_CACHE_TTL_HOURS)
+    parser.add_argument("--no-cache", action="store_true", help="Disable the skill result cache")
     args = parser.parse_args()
 
     ClaudeAIRunnerHandler.token = str(args.token or "").strip()
     ClaudeAIRunnerHandler.claude_bin = str(args.claude_bin or "claude").strip() or "claude"
     ClaudeAIRunnerHandler.model = str(args.model or "").strip()
+    if not args.no_cache:
+        ClaudeAIRunnerHandler.cache = SkillResultCache(args.cache_dir, ttl_seconds=args.cache_ttl_hours * 3600)
 
     server = ThreadingHTTPServer((args.host, args.port), ClaudeAIRunnerHandler)
     print(f"[ai-runner-claude] listening on http://{args.host}:{args.port}")
@@ -531,6 +631,10 @@ def main() -> None:
         print(f"[ai-runner-claude] model={ClaudeAIRunnerHandler.model}")
     else:
         print("[ai-runner-claude] model=default")
+    if ClaudeAIRunnerHandler.cache is not None:
+        print(f"[ai-runner-claude] cache={args.cache_dir} ttl_hours={args.cache_ttl_hours}")
+    else:
+        print("[ai-runner-claude] cache=disabled")
     try:
         server.serve_forever()
     except KeyboardInterrupt: